@@ -0,0 +1,124 @@
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Imported Modules ---------------------------- #
+
+# Basic Modules
+import sys
+import numpy as np
+
+# -------------------------------------------------------------------------- #
+# -------------------------- Growable Array Buffer ------------------------- #
+
+class arrayBuffer:
+    """
+    A float64 Array That Grows as Data is Appended (Capacity Doubles When Full,
+    so Appending is Amortized O(1)). Holds Either a 1D Signal or a Table of Rows
+    (e.g. One Row of Features per Pulse); Unless Given, the Shape is Set by the
+    First Data Added.
+    view() Returns the Filled Part Without Copying; the Buffer Also Acts Like
+    That Array for Indexing, len(), Iteration, and np.array().
+    """
+
+    def __init__(self, numColumns = None, columnNames = None, initialCapacity = 1024):
+        """
+        ----------------------------------------------------------------------
+        Input Parameters:
+            numColumns: The Number of Columns in Each Row (None: Set by the First Data; Taken from columnNames if Given)
+            columnNames: The Name of Each Column (Optional)
+            initialCapacity: The Number of Rows Preallocated
+        ----------------------------------------------------------------------
+        """
+        self.columnNames = list(columnNames) if columnNames is not None else None
+        if numColumns is None and self.columnNames is not None:
+            numColumns = len(self.columnNames)
+        self.numColumns = numColumns
+        self.initialCapacity = max(1, initialCapacity)
+
+        self.reset()
+
+    def reset(self):
+        self.numRows = 0
+        self.bufferData = None
+        if self.numColumns is not None:
+            self.createBuffer((self.numColumns,))
+
+    def createBuffer(self, rowShape):
+        """ Allocate the Buffer Once the Shape of a Row is Known """
+        if self.columnNames is not None and rowShape != (len(self.columnNames),):
+            print("The Data Does Not Match the Column Names:", rowShape, len(self.columnNames))
+            sys.exit()
+        self.bufferData = np.zeros((self.initialCapacity,) + rowShape, dtype=np.float64)
+
+    # ---------------------------------------------------------------------- #
+    # ------------------------------ Add Data ------------------------------ #
+
+    def append(self, newRow):
+        """ Add One Row (or One Point of a 1D Buffer) """
+        if self.bufferData is None:
+            self.createBuffer(np.shape(newRow))
+        self.ensureCapacity(self.numRows + 1)
+        self.bufferData[self.numRows] = newRow
+        self.numRows += 1
+
+    def extend(self, newRows):
+        """ Add Many Rows (or Points of a 1D Buffer) at Once """
+        newRows = np.asarray(newRows, dtype=np.float64)
+        if self.bufferData is None:
+            self.createBuffer(newRows.shape[1:])
+        self.ensureCapacity(self.numRows + len(newRows))
+        self.bufferData[self.numRows:self.numRows + len(newRows)] = newRows
+        self.numRows += len(newRows)
+
+    def extendEmpty(self, numNewRows, fillValue = 0):
+        """ Add numNewRows Rows Holding fillValue; Returns the View of the New Rows (to Fill In Later) """
+        if self.bufferData is None:
+            self.createBuffer(())
+        self.ensureCapacity(self.numRows + numNewRows)
+        newRows = self.bufferData[self.numRows:self.numRows + numNewRows]
+        newRows[:] = fillValue
+        self.numRows += numNewRows
+        return newRows
+
+    def ensureCapacity(self, numRowsNeeded):
+        capacity = len(self.bufferData)
+        if numRowsNeeded <= capacity:
+            return
+        # Double Until the Rows Fit, Copying the Filled Rows Over Once
+        while capacity < numRowsNeeded:
+            capacity *= 2
+        bufferData = np.zeros((capacity,) + self.bufferData.shape[1:], dtype=np.float64)
+        bufferData[0:self.numRows] = self.bufferData[0:self.numRows]
+        self.bufferData = bufferData
+
+    # ---------------------------------------------------------------------- #
+    # ----------------------------- Access Data ---------------------------- #
+
+    def view(self):
+        """ The Filled Rows as an Array (No Copy: Changes Show in the Buffer Until it Next Grows) """
+        if self.bufferData is None:
+            return np.zeros(0, dtype=np.float64)
+        return self.bufferData[0:self.numRows]
+
+    def column(self, columnName):
+        """ The View of One Named Column """
+        if self.columnNames is None or columnName not in self.columnNames:
+            print("The Column Does Not Exist in the Buffer:", columnName)
+            sys.exit()
+        return self.view()[:, self.columnNames.index(columnName)]
+
+    def __len__(self):
+        return self.numRows
+
+    def __getitem__(self, dataInds):
+        return self.view()[dataInds]
+
+    def __setitem__(self, dataInds, newValues):
+        self.view()[dataInds] = newValues
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __array__(self, dtype = None, copy = None):
+        if dtype is None:
+            return self.view()
+        return self.view().astype(dtype)
@@ -0,0 +1,66 @@
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Imported Modules ---------------------------- #
+
+# Basic Modules
+import numpy as np
+
+# -------------------------------------------------------------------------- #
+# --------------------------- Chords Below a Signal ------------------------ #
+
+def findTangentChords(xData, yData, firstLeftInd, lastLeftInd):
+    """
+    For Each leftInd in [firstLeftInd, lastLeftInd], the Farthest rightInd Whose Chord
+    Has No Points Below it: Where the Tangent from leftInd Touches the Lower Convex Hull
+    of the Points to its Right. The Hull is Built Right to Left (Andrew's Monotone Chain);
+    Pushing leftInd Pops the Hull Points Above its Tangent, so All Chords Take O(N).
+    Returns a Dictionary {leftInd: rightInd}. xData Must be Increasing.
+    """
+    tangentChords = {}
+    lowerHull = [len(xData) - 1]    # The Hull's Indices; The Last is the Leftmost
+    for leftInd in range(len(xData) - 2, firstLeftInd - 1, -1):
+        # Pop the Points On or Above the Chord from leftInd to the Next Hull Point
+        while len(lowerHull) >= 2:
+            nearInd = lowerHull[-1]; farInd = lowerHull[-2]
+            nearRise = (yData[nearInd] - yData[leftInd])*(xData[farInd] - xData[leftInd])
+            farRise = (yData[farInd] - yData[leftInd])*(xData[nearInd] - xData[leftInd])
+            if nearRise < farRise:
+                break
+            lowerHull.pop()
+
+        if leftInd <= lastLeftInd:
+            tangentChords[leftInd] = lowerHull[-1]
+        lowerHull.append(leftInd)
+    return tangentChords
+
+def countPointsBelowChords(xData, yData, leftInd, rightInds):
+    """
+    The Number of Points in [leftInd, rightInd) Below Each Chord from leftInd. A Point i is
+    Below the Chord to rightInd if its Slope from leftInd is Smaller, so the Counts are the
+    Number of Earlier Points with a Smaller Slope: Counted Bit by Bit of the Slopes' Ranks
+    (O(N log^2 N)). leftInd Itself is Only Below its Chord by Rounding, Which is Kept.
+    """
+    rightInds = np.asarray(rightInds)
+    pointInds = np.arange(leftInd + 1, rightInds.max() + 1)
+    pointSlopes = (yData[pointInds] - yData[leftInd])/(xData[pointInds] - xData[leftInd])
+    # Equal Slopes Share a Rank (The Points on a Chord are Not Below it)
+    slopeRanks = np.searchsorted(np.sort(pointSlopes), pointSlopes, side = 'left')
+
+    # A Point Ranks Lower if, at the First Bit Where the Ranks Differ, its Bit is 0
+    numLowerBefore = np.zeros(len(pointInds), dtype = int)
+    for bitInd in range(max(1, int(slopeRanks.max()).bit_length())):
+        higherBits = slopeRanks >> (bitInd + 1)
+        # Group the Points with the Same Higher Bits (Keeping Their Order)
+        sortedOrder = np.argsort(higherBits, kind = 'stable')
+        sortedBits = (slopeRanks[sortedOrder] >> bitInd) & 1
+        numZeroBits = np.concatenate(([0], np.cumsum(sortedBits == 0)))
+        groupStarts = np.searchsorted(higherBits[sortedOrder], higherBits[sortedOrder], side = 'left')
+        zeroBitsBefore = numZeroBits[:-1] - numZeroBits[groupStarts]
+        numLowerBefore[sortedOrder] += np.where(sortedBits == 1, zeroBitsBefore, 0)
+
+    # leftInd on its Own Chord (The Line Evaluated as the Brute Force Search Does)
+    lineSlopes = (yData[leftInd] - yData[rightInds])/(xData[leftInd] - xData[rightInds])
+    slopeIntercepts = yData[leftInd] - lineSlopes*xData[leftInd]
+    leftBelow = (lineSlopes*xData[leftInd] + slopeIntercepts) - yData[leftInd] > 0
+
+    return numLowerBefore[rightInds - leftInd - 1] + leftBelow
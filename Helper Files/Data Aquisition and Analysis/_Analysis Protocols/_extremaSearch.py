@@ -0,0 +1,132 @@
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Imported Modules ---------------------------- #
+
+# Basic Modules
+from bisect import bisect_left, bisect_right
+import numpy as np
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Searchable Signal --------------------------- #
+
+class searchSignal:
+    """
+    A Signal Prepared for Repeated Extremum Searches. For Each Search Type, the
+    Points Where a Point-by-Point Walk Would Stop (The Signal Stops Falling for
+    a Minimum, or Stops Rising for a Maximum) are Found Once; Each Search Then
+    Finds its Stop with a Binary Search. Wrap a Signal Once if it is Searched
+    Many Times (e.g. Each Derivative of a Pulse).
+    """
+
+    def __init__(self, data):
+        self.data = np.asarray(data)
+        self.stopInds = {}  # (findMinimum, searchDirection): Sorted Indices i Where the Step Between i and i+1 Stops the Walk
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, dataInds):
+        return self.data[dataInds]
+
+    def getStopInds(self, findMinimum, searchDirection):
+        searchType = (findMinimum, searchDirection)
+        if searchType not in self.stopInds:
+            leftData = self.data[:-1]; rightData = self.data[1:]
+            # The Same Comparisons as the Walk (So NaNs Never Stop It)
+            if findMinimum:
+                stopMask = rightData >= leftData if searchDirection > 0 else leftData >= rightData
+            else:
+                stopMask = rightData < leftData if searchDirection > 0 else leftData < rightData
+            self.stopInds[searchType] = np.flatnonzero(stopMask).tolist()
+        return self.stopInds[searchType]
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Extremum Searches --------------------------- #
+
+def findNearbyMinimum(data, xPointer, binarySearchWindow = 5, maxPointsSearch = 10000):
+    """
+    Walk Downhill from xPointer, Stepping binarySearchWindow Points at a Time (Skips
+    Over Minor Fluctuations); Each Time the Signal Stops Falling, Step Back and
+    Shrink the Step. Returns the Index of the Minimum Found.
+    Search Right: binarySearchWindow > 0
+    Search Left: binarySearchWindow < 0
+    """
+    return findNearbyExtremum(data, xPointer, binarySearchWindow, maxPointsSearch, findMinimum = True)
+
+def findNearbyMaximum(data, xPointer, binarySearchWindow = 5, maxPointsSearch = 10000):
+    """
+    Walk Uphill from xPointer (See findNearbyMinimum). Returns the Index of the Maximum Found.
+    Search Right: binarySearchWindow > 0
+    Search Left: binarySearchWindow < 0
+    """
+    return findNearbyExtremum(data, xPointer, binarySearchWindow, maxPointsSearch, findMinimum = False)
+
+def findNearbyExtremum(data, xPointer, binarySearchWindow, maxPointsSearch, findMinimum):
+    """
+    Iterative Form of the Original Recursive Search (Same Results). Each Pass
+    Strides Through the Data at Once with NumPy; Single-Point Steps Jump
+    Straight to the Stop Using the searchSignal's Precomputed Stops.
+    """
+    signalSearch = data if isinstance(data, searchSignal) else searchSignal(data)
+    data = signalSearch.data; xPointer = int(xPointer)
+
+    while True:
+        # The Maximum Search Stays Within the Data
+        if not findMinimum:
+            xPointer = min(max(xPointer, 0), len(data)-1)
+        # Base Case
+        if abs(binarySearchWindow) < 1 or maxPointsSearch == 0:
+            return refineExtremum(data, xPointer, findMinimum)
+
+        searchDirection = binarySearchWindow//abs(binarySearchWindow)
+        endPointer = max(0, min(xPointer + searchDirection*maxPointsSearch, len(data)))
+        # Single Steps: Binary Search the Precomputed Stops
+        if abs(binarySearchWindow) == 1 and 0 <= xPointer < len(data):
+            return refineExtremum(data, findStepStop(signalSearch, xPointer, endPointer, searchDirection, findMinimum), findMinimum)
+
+        # Stride Through the Data: Each Point is Compared to the One Before It
+        dataPointers = np.arange(max(xPointer, 0), endPointer, binarySearchWindow)
+        if len(dataPointers) == 0:
+            binarySearchWindow = round(binarySearchWindow/2); maxPointsSearch -= 1
+            continue
+        pointValues = data[dataPointers]
+        previousValues = np.concatenate(([data[xPointer]], pointValues[:-1]))
+        if findMinimum:
+            stopMask = (pointValues >= previousValues) & (dataPointers != xPointer)
+        else:
+            stopMask = (pointValues < previousValues) & (dataPointers != xPointer)
+
+        # If the Next Point Goes the Wrong Way, Take a Step Back and Shrink the Step
+        if stopMask.any():
+            dataPointer = int(dataPointers[np.argmax(stopMask)])
+            maxPointsSearch = maxPointsSearch - searchDirection*(abs(dataPointer - binarySearchWindow)) - xPointer
+            xPointer = dataPointer - binarySearchWindow
+            binarySearchWindow = round(binarySearchWindow/4) if findMinimum else round(binarySearchWindow/2)
+        # If the Step is Too Large to Find Anything, Reduce it
+        else:
+            xPointer = int(dataPointers[-1])
+            binarySearchWindow = round(binarySearchWindow/2); maxPointsSearch -= 1
+
+def findStepStop(signalSearch, xPointer, endPointer, searchDirection, findMinimum):
+    """ The Last Point a Single-Step Walk from xPointer Reaches Before Stopping (or Before endPointer) """
+    stopInds = signalSearch.getStopInds(findMinimum, searchDirection)
+    if searchDirection > 0:
+        # Walk xPointer, xPointer+1, ..., endPointer-1
+        stopInd = bisect_left(stopInds, xPointer)
+        if stopInd < len(stopInds) and stopInds[stopInd] <= endPointer - 2:
+            return stopInds[stopInd]
+        return max(xPointer, endPointer - 1)
+    else:
+        # Walk xPointer, xPointer-1, ..., endPointer+1
+        stopInd = bisect_right(stopInds, xPointer - 1) - 1
+        if stopInd >= 0 and stopInds[stopInd] >= endPointer + 1:
+            return stopInds[stopInd] + 1
+        return min(xPointer, endPointer + 1)
+
+def refineExtremum(data, xPointer, findMinimum):
+    """ The Extremum Among xPointer and its Neighbors """
+    searchSegment = data[max(0,xPointer-1):min(xPointer+2, len(data))]
+    xPointer -= np.where(searchSegment==data[xPointer])[0][0]
+    if findMinimum:
+        return xPointer + np.argmin(searchSegment)
+    return xPointer + np.argmax(searchSegment)
@@ -13,7 +13,9 @@ With a citation:
 # ---------------------------- Imported Modules ---------------------------- #
 
 # Basic Modules
+import threading
 import numpy as np
+from collections import OrderedDict
 from scipy.linalg import svd
 # Filtering Modules
 import scipy
@@ -32,18 +34,72 @@ class filteringMethods:
         self.savgolFilter = savgolFilter()
 
 # -------------------------------------------------------------------------- #
-# ------------------ High/Low/Band Pass Filtering Methods ------------------ #
+# -------------------------- Filter Design Cache --------------------------- #
 
-class bandPassFilter:
+class filterDesignCache:
+    """
+    Least Recently Used Cache of Butterworth Filter Designs (SOS Coefficients).
+    The Same Filter is Designed Once Instead of for Every Pulse/File. Sampling
+    Frequencies are Rounded to samplingFreqTolerance, and the Filter is Designed
+    at the Rounded Frequency (So the Result Does Not Depend on Which File Came First).
+    """
     
-    def butterParams(self, cutoffFreq = [0.1, 7], samplingFreq = 800, order=3, filterType = 'band'):
+    def __init__(self, maxDesigns = 128, samplingFreqTolerance = 1E-3):
+        self.maxDesigns = maxDesigns                        # The Most Filter Designs Kept
+        self.samplingFreqTolerance = samplingFreqTolerance  # Sampling Frequencies Closer Than This (Hz) Share a Design
+        self.cacheLock = threading.Lock()
+        self.clear()
+    
+    def clear(self):
+        with self.cacheLock:
+            self.filterDesigns = OrderedDict()
+            self.numHits = 0
+            self.numMisses = 0
+    
+    def getCacheInfo(self):
+        """ The Hit/Miss Counts and Size of the Cache (For Profiling) """
+        with self.cacheLock:
+            return {"hits": self.numHits, "misses": self.numMisses, "numDesigns": len(self.filterDesigns), "maxDesigns": self.maxDesigns}
+    
+    def butterParams(self, cutoffFreq, samplingFreq, order, filterType):
+        # Round the Sampling Frequency and Make the Key Hashable
+        samplingFreq = round(samplingFreq/self.samplingFreqTolerance)*self.samplingFreqTolerance
+        designKey = (order, tuple(np.atleast_1d(cutoffFreq).tolist()), samplingFreq, filterType)
+        
+        with self.cacheLock:
+            if designKey in self.filterDesigns:
+                self.numHits += 1
+                self.filterDesigns.move_to_end(designKey)
+                # A Copy: Callers May Change Their Coefficients (and scipy Needs Writable Arrays)
+                return self.filterDesigns[designKey].copy()
+            self.numMisses += 1
+        
+        # Design the Filter
         nyq = 0.5 * samplingFreq
         if filterType == "band":
             normal_cutoff = [freq/nyq for freq in cutoffFreq]
         else:
             normal_cutoff = cutoffFreq / nyq
         sos = butter(order, normal_cutoff, btype = filterType, analog = False, output='sos')
-        return sos
+        
+        # Store the Design, Removing the Least Recently Used if Full
+        with self.cacheLock:
+            self.filterDesigns[designKey] = sos
+            self.filterDesigns.move_to_end(designKey)
+            while len(self.filterDesigns) > self.maxDesigns:
+                self.filterDesigns.popitem(last = False)
+        return sos.copy()
+
+# The Cache Shared by All the Analysis Protocols
+sharedFilterDesigns = filterDesignCache()
+
+# -------------------------------------------------------------------------- #
+# ------------------ High/Low/Band Pass Filtering Methods ------------------ #
+
+class bandPassFilter:
+    
+    def butterParams(self, cutoffFreq = [0.1, 7], samplingFreq = 800, order=3, filterType = 'band'):
+        return sharedFilterDesigns.butterParams(cutoffFreq, samplingFreq, order, filterType)
     
     def butterFilter(self, data, cutoffFreq, samplingFreq, order = 3, filterType = 'band'):
         sos = self.butterParams(cutoffFreq, samplingFreq, order, filterType)
@@ -0,0 +1,72 @@
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Imported Modules ---------------------------- #
+
+# Basic Modules
+import math
+import numpy as np
+# Fitting Modules
+from scipy.optimize import least_squares
+
+# -------------------------------------------------------------------------- #
+# ------------------------- Sum of Gaussians Fitting ----------------------- #
+
+class gaussianDecomposition:
+    """
+    A Sum of Gaussians, Each Given by (amplitude, fwtm, center) Like the Analysis
+    Protocols' gaussModel, Fit by Bounded Least Squares (scipy's Trust Region
+    Reflective Method) with the Analytic Jacobian. The Parameters are One Flat
+    Array: [amplitude1, fwtm1, center1, amplitude2, ...].
+    One Instance Serves Every Pulse with the Same Number of Gaussians.
+    """
+
+    def __init__(self, numGaussians, maxFunctionEvals = 200):
+        self.numGaussians = numGaussians
+        self.maxFunctionEvals = maxFunctionEvals
+        # sigma = fwtm*fwtmToSigma (The Full Width at a Tenth of the Maximum)
+        self.fwtmToSigma = 1/(2*math.sqrt(2*math.log(10)))
+
+    # ---------------------------------------------------------------------- #
+    # ------------------------------- Model -------------------------------- #
+
+    def evaluateComponents(self, gaussParams, xData):
+        """ Each Gaussian Evaluated at xData (Rows = Gaussians) """
+        amplitudes, fwtms, centers = np.reshape(gaussParams, (self.numGaussians, 3)).T
+        sigmas = (fwtms*self.fwtmToSigma)[:, None]
+        return amplitudes[:, None]*np.exp(-(xData[None, :] - centers[:, None])**2/(2*sigmas**2))
+
+    def residuals(self, gaussParams, xData, yData):
+        return self.evaluateComponents(gaussParams, xData).sum(axis=0) - yData
+
+    def jacobian(self, gaussParams, xData, yData):
+        """ The Derivative of the Residuals with Respect to Each Parameter (Rows = Points) """
+        amplitudes, fwtms, centers = np.reshape(gaussParams, (self.numGaussians, 3)).T
+        sigmas = (fwtms*self.fwtmToSigma)[:, None]
+        centeredX = xData[None, :] - centers[:, None]
+        expTerms = np.exp(-centeredX**2/(2*sigmas**2))
+        components = amplitudes[:, None]*expTerms
+
+        fitJacobian = np.empty((len(xData), 3*self.numGaussians))
+        fitJacobian[:, 0::3] = expTerms.T                                               # d/dAmplitude
+        fitJacobian[:, 1::3] = (components*centeredX**2/sigmas**3).T*self.fwtmToSigma  # d/dFWTM
+        fitJacobian[:, 2::3] = (components*centeredX/sigmas**2).T                       # d/dCenter
+        return fitJacobian
+
+    # ---------------------------------------------------------------------- #
+    # ------------------------------ Fitting ------------------------------- #
+
+    def prepareBounds(self, initialParams, lowerBounds, upperBounds):
+        """ Order the Bounds, Open Up Equal Bounds, and Move the Guess Inside Them """
+        lowerBounds, upperBounds = np.minimum(lowerBounds, upperBounds), np.maximum(lowerBounds, upperBounds)
+        boundSpacing = np.maximum(np.abs(upperBounds), 1)*1E-10
+        upperBounds = np.where(upperBounds - lowerBounds < boundSpacing, lowerBounds + boundSpacing, upperBounds)
+        return np.clip(initialParams, lowerBounds, upperBounds), lowerBounds, upperBounds
+
+    def fit(self, xData, yData, initialParams, lowerBounds, upperBounds):
+        """ Returns the Fit Parameters and the Residuals (Model - Data) """
+        xData = np.asarray(xData, dtype=np.float64); yData = np.asarray(yData, dtype=np.float64)
+        initialParams, lowerBounds, upperBounds = self.prepareBounds(np.asarray(initialParams, dtype=np.float64), lowerBounds, upperBounds)
+
+        fitInfo = least_squares(self.residuals, initialParams, jac = self.jacobian, bounds = (lowerBounds, upperBounds),
+                                method = 'trf', x_scale = 'jac', max_nfev = self.maxFunctionEvals, args = (xData, yData))
+        return fitInfo.x, fitInfo.fun
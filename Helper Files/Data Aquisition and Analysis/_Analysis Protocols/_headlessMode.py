@@ -0,0 +1,42 @@
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Imported Modules ---------------------------- #
+
+# Basic Modules
+import os
+import sys
+import importlib
+
+# -------------------------------------------------------------------------- #
+# ------------------------------ Headless Mode ----------------------------- #
+
+# Kept in the Environment so the Analysis Worker Processes Inherit the Mode
+headlessVariable = "STRESS_ANALYSIS_HEADLESS"
+
+def isHeadless():
+    """ Headless: The Analysis Protocols Make No Figures, PDFs, or Diagnostic Workbooks """
+    return os.environ.get(headlessVariable, "0") == "1"
+
+def setHeadless(headless = True):
+    os.environ[headlessVariable] = "1" if headless else "0"
+    if headless:
+        useNonInteractiveBackend()
+
+def useNonInteractiveBackend():
+    """ Anything Still Plotting (e.g. the Machine Learning Modules) Never Opens a Window """
+    os.environ["MPLBACKEND"] = "Agg"
+    if "matplotlib" in sys.modules:
+        sys.modules["matplotlib"].use("Agg")
+
+class lazyPyplot:
+    """
+    Stands in for matplotlib.pyplot (plt = lazyPyplot()), Importing it Only When a
+    Plot is First Made: Headless Runs Never Import it.
+    """
+
+    def __getattr__(self, attributeName):
+        return getattr(importlib.import_module("matplotlib.pyplot"), attributeName)
+
+# A Headless Environment (e.g. STRESS_ANALYSIS_HEADLESS=1 on a Server) Applies from the Start
+if isHeadless():
+    useNonInteractiveBackend()
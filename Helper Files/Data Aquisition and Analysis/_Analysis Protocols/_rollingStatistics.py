@@ -0,0 +1,145 @@
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Imported Modules ---------------------------- #
+
+# Basic Modules
+import sys
+import numpy as np
+
+# -------------------------------------------------------------------------- #
+# ------------------------- Rolling Trimmed Average ------------------------ #
+
+class rollingTrimmedMean:
+    """
+    Trimmed Mean of Every Feature Over a Sliding Time Window (Same Result as
+    scipy.stats.trim_mean on the Window, Including NaN Propagation). Each Feature's
+    Column in the Window is Kept Sorted, so Adding or Removing a Point Only
+    Shifts the Window Instead of Re-Sorting the Whole History.
+    The Points Must be Added in Time Order (Non-Decreasing Times).
+    """
+
+    def __init__(self, numFeatures, windowSeconds, trimProportion = 0.3, includeWindowStart = True, initialCapacity = 256):
+        """
+        ----------------------------------------------------------------------
+        Input Parameters:
+            numFeatures: The Number of Features in Each Point
+            windowSeconds: The Number of Seconds to Average Over
+            trimProportion: The Fraction of Points Cut Off Each End Before Averaging
+            includeWindowStart: Keep Points Exactly windowSeconds Old (time >= start) or Not (time > start)
+            initialCapacity: The Number of Points Preallocated (Doubles When Full)
+        ----------------------------------------------------------------------
+        """
+        self.numFeatures = numFeatures
+        self.windowSeconds = windowSeconds
+        self.trimProportion = trimProportion
+        self.includeWindowStart = includeWindowStart
+        self.initialCapacity = max(2, initialCapacity)
+
+        self.reset()
+
+    def reset(self):
+        # The Points in the Order They Arrived: The Window is [windowStartInd, windowStartInd + numPoints)
+        self.pointTimes = np.zeros(self.initialCapacity, dtype=np.float64)
+        self.pointFeatures = np.zeros((self.initialCapacity, self.numFeatures), dtype=np.float64)
+        self.windowStartInd = 0
+        self.numPoints = 0
+        # The Same Points, Sorted Within Each Feature (Rows [0, numPoints))
+        self.sortedWindow = np.zeros((self.initialCapacity, self.numFeatures), dtype=np.float64)
+
+    # ---------------------------------------------------------------------- #
+    # ---------------------------- Window Updates -------------------------- #
+
+    def addPoint(self, timePoint, featurePoint):
+        """ Add the Newest Point and Return the Trimmed Mean of the Window Ending at It """
+        featurePoint = np.asarray(featurePoint, dtype=np.float64)
+
+        # Remove the Points That Fell Out of the Window
+        windowStartTime = timePoint - self.windowSeconds
+        while self.numPoints != 0 and not self.inWindow(self.pointTimes[self.windowStartInd], windowStartTime):
+            self.removeSorted(self.pointFeatures[self.windowStartInd])
+            self.windowStartInd += 1
+            self.numPoints -= 1
+
+        # Add the New Point
+        self.ensureCapacity()
+        endInd = self.windowStartInd + self.numPoints
+        self.pointTimes[endInd] = timePoint
+        self.pointFeatures[endInd] = featurePoint
+        self.insertSorted(featurePoint)
+        self.numPoints += 1
+
+        return self.trimmedMean()
+
+    def transform(self, featureTimes, featureList):
+        """ The Rolling Trimmed Mean at Every Point (Rows = Points; Columns = Features) """
+        self.reset()
+        featureList = np.asarray(featureList, dtype=np.float64)
+
+        averagedFeatures = np.empty((len(featureTimes), self.numFeatures), dtype=np.float64)
+        for pointInd in range(len(featureTimes)):
+            averagedFeatures[pointInd] = self.addPoint(featureTimes[pointInd], featureList[pointInd])
+        return averagedFeatures
+
+    def trimmedMean(self):
+        # Cut the Same Number of Points as scipy.stats.trim_mean
+        lowerCut = int(self.trimProportion * self.numPoints)
+        upperCut = self.numPoints - lowerCut
+        if lowerCut >= upperCut:
+            print("The Trim Proportion Removes Every Point:", self.trimProportion)
+            sys.exit()
+        trimmedMean = np.mean(self.sortedWindow[lowerCut:upperCut], axis=0)
+        # Like scipy.stats.trim_mean, a NaN Anywhere in the Window Gives a NaN (NaNs are Sorted Last)
+        trimmedMean[np.isnan(self.sortedWindow[self.numPoints - 1])] = np.nan
+        return trimmedMean
+
+    def inWindow(self, pointTime, windowStartTime):
+        if self.includeWindowStart:
+            return pointTime >= windowStartTime
+        return pointTime > windowStartTime
+
+    # ---------------------------------------------------------------------- #
+    # --------------------------- Sorted Window ---------------------------- #
+
+    def insertSorted(self, featurePoint):
+        """ Insert the Point into Each Feature's Sorted Column (NaNs Go Last) """
+        numPoints = self.numPoints
+        # Each Feature's Insertion Index: The Number of Smaller Values (NaNs are Never Smaller)
+        insertInds = (self.sortedWindow[0:numPoints] < featurePoint).sum(axis=0)
+        insertInds[np.isnan(featurePoint)] = numPoints
+
+        # Shift the Larger Values Down One Row and Place the New Value
+        rowInds = np.arange(numPoints + 1)[:, None]
+        sourceRows = rowInds - (rowInds > insertInds)
+        shiftedWindow = np.take_along_axis(self.sortedWindow[0:numPoints + 1], sourceRows, axis=0)
+        self.sortedWindow[0:numPoints + 1] = np.where(rowInds == insertInds, featurePoint, shiftedWindow)
+
+    def removeSorted(self, featurePoint):
+        """ Remove the Point from Each Feature's Sorted Column """
+        numPoints = self.numPoints
+        # Each Feature's Index Holding the Value (The NaNs are at the End)
+        removeInds = (self.sortedWindow[0:numPoints] < featurePoint).sum(axis=0)
+        removeInds[np.isnan(featurePoint)] = numPoints - 1
+
+        # Shift the Larger Values Up One Row
+        rowInds = np.arange(numPoints - 1)[:, None]
+        sourceRows = rowInds + (rowInds >= removeInds)
+        self.sortedWindow[0:numPoints - 1] = np.take_along_axis(self.sortedWindow[0:numPoints], sourceRows, axis=0)
+
+    def ensureCapacity(self):
+        """ Make Room for One More Point at the End of the Window """
+        capacity = len(self.pointTimes)
+        if self.windowStartInd + self.numPoints < capacity:
+            return
+
+        windowInds = slice(self.windowStartInd, self.windowStartInd + self.numPoints)
+        # Double the Buffers if the Window Fills Most of Them
+        if 2*self.numPoints >= capacity:
+            capacity *= 2
+            sortedWindow = np.zeros((capacity, self.numFeatures), dtype=np.float64)
+            sortedWindow[0:self.numPoints] = self.sortedWindow[0:self.numPoints]
+            self.sortedWindow = sortedWindow
+        # Move the Window to the Start of the Buffers
+        pointTimes = np.zeros(capacity, dtype=np.float64); pointTimes[0:self.numPoints] = self.pointTimes[windowInds]
+        pointFeatures = np.zeros((capacity, self.numFeatures), dtype=np.float64); pointFeatures[0:self.numPoints] = self.pointFeatures[windowInds]
+        self.pointTimes = pointTimes; self.pointFeatures = pointFeatures
+        self.windowStartInd = 0
@@ -3,14 +3,14 @@
 import os
 import sys
 import math
+import threading
+import concurrent.futures
 import numpy as np
 # Peak Detection Modules
 import scipy
 import scipy.signal
 # Data Filtering Modules
 from scipy.signal import savgol_filter
-# Matlab Plotting Modules
-import matplotlib.pyplot as plt
 # Gaussian Decomposition
 from lmfit import Model
 from sklearn.metrics import r2_score
@@ -23,6 +23,11 @@ from scipy.interpolate import UnivariateSpline
 
 # Import Files
 import _filteringProtocols as filteringMethods # Import Files with Filtering Methods
+import _extremaSearch as extremaSearch           # Searches for Nearby Minima/Maxima
+import _baselineSearch as baselineSearch         # Chords Below the Signal (Convex Hull)
+import _headlessMode as headlessMode             # Headless Runs Skip the Plots and Diagnostic Files
+# Matlab Plotting Modules (pyplot is Only Imported Once a Plot is Made)
+plt = headlessMode.lazyPyplot()
 
 # Import Data Extraction Files (And Their Location)
 sys.path.append('./Helper Files/Data Aquisition and Analysis/')  # Folder with All the Helper Files
@@ -32,34 +37,52 @@ import excelProcessing
 # --------------------------------------------------------------------------- #
 # --------------------------------------------------------------------------- #
 
-class signalProcessing:
+class chemicalSession:
+    """
+    The State of One Recording's Chemical Analysis: Where its Plots are Saved,
+    its Stimulus Window, and the Features Extracted. Returned by
+    signalProcessing.analyzeChemicals.
+    """
     
-    def __init__(self, plotData = False):
-        self.lowPassCutoff = 0.01
-        
-        self.minPeakDuration = 200
-        
-        self.minLeftBoundaryInd = 200
-        
-        self.plotData = plotData
-        
-        self.saveDataFolder = None
-        
-        self.resetGlobalVariables()  
-        
-        # Define the Class with all the Filtering Methods
-        self.filteringMethods = filteringMethods.filteringMethods()
-    
-    def resetGlobalVariables(self, stimulusTimes = [None, None], saveDataFolder = "./", stimulusBuffer = 500):
-        self.saveDataFolder = saveDataFolder
-        os.makedirs(self.saveDataFolder, exist_ok=True)
+    def __init__(self, stimulusTimes = [None, None], saveDataFolder = "./", stimulusBuffer = 500):
+        self.saveDataFolder = saveDataFolder    # Only Created Once a Plot is Saved (Never When Headless)
         
+        # The Stimulus Window
+        self.startStimulus = None; self.endStimulus = None
+        self.startStimulusBuffer = None; self.endStimulusBuffer = None
         if stimulusTimes[0] != None:
             self.startStimulus = stimulusTimes[0]
             self.endStimulus = stimulusTimes[1]
             self.endStimulusBuffer = stimulusTimes[1] + stimulusBuffer
             self.startStimulusBuffer = stimulusTimes[0] - 200
         
+        # The Pool Fitting the Gaussian Decompositions (Started When First Needed)
+        self.gaussFitPool = None
+        
+        self.resetFeatures()
+    
+    def getSaveDataFolder(self):
+        """ The Folder for the Recording's Plots, Created the First Time One is Saved """
+        os.makedirs(self.saveDataFolder, exist_ok=True)
+        return self.saveDataFolder
+    
+    def getGaussFitPool(self, executorType, numWorkers):
+        """ The Recording's Pool for the Gaussian Fits: executorType = "thread" or "process" """
+        if self.gaussFitPool is None:
+            if executorType == "process":
+                self.gaussFitPool = concurrent.futures.ProcessPoolExecutor(max_workers = numWorkers)
+            elif executorType == "thread":
+                self.gaussFitPool = concurrent.futures.ThreadPoolExecutor(max_workers = numWorkers)
+            else:
+                print("No Gaussian Fit Executor Named:", executorType); sys.exit()
+        return self.gaussFitPool
+    
+    def closeGaussFitPool(self):
+        if self.gaussFitPool is not None:
+            self.gaussFitPool.shutdown(wait = True, cancel_futures = True)
+            self.gaussFitPool = None
+    
+    def resetFeatures(self):
         self.chemicalFeatures = {
             # Enzym
             'glucoseFeatures': [],
@@ -83,23 +106,61 @@ class signalProcessing:
         }
         
         self.peakData = {"lactate":[], "glucose":[], "uricAcid":[], "sodium":[], "potassium":[], "ammonium":[]}        
+
+# --------------------------------------------------------------------------- #
+# --------------------------------------------------------------------------- #
+
+class signalProcessing:
+    
+    def __init__(self, plotData = False, gaussFitWorkers = 1, gaussFitExecutor = "thread"):
+        self.lowPassCutoff = 0.01
+        
+        self.minPeakDuration = 200
+        
+        self.minLeftBoundaryInd = 200
+        
+        self.plotData = plotData
+        
+        # The Gaussian Decomposition's Model Orders can be Fit at Once (gaussFitWorkers = 1: One by One,
+        #   Stopping at the First Accepted Fit). Threads Stop the Unneeded Fits; Processes Run Truly at Once.
+        self.gaussFitWorkers = gaussFitWorkers
+        self.gaussFitExecutor = gaussFitExecutor  # "thread" or "process"
+        
+        # NOTE: The Protocol Only Holds the Configuration; Everything Tracked While
+        #   Analyzing a Recording Lives in its chemicalSession
+        
+        # Define the Class with all the Filtering Methods
+        self.filteringMethods = filteringMethods.filteringMethods()
+    
+    def getAnalysisParameters(self):
+        """ The Parameters That Change the Extracted Features (Used to Fingerprint Saved Features) """
+        return {"lowPassCutoff": self.lowPassCutoff, "minPeakDuration": self.minPeakDuration, "minLeftBoundaryInd": self.minLeftBoundaryInd}
+    
+    def savePlots(self):
+        """ Whether the Plots (and Their Workbooks) are Made: plotData, Unless Running Headless """
+        return self.plotData and not headlessMode.isHeadless()
+    
+    def createSession(self, stimulusTimes = [None, None], saveDataFolder = "./", stimulusBuffer = 500):
+        """ A New Recording to Analyze (Pass into analyzeChemicals) """
+        return chemicalSession(stimulusTimes, saveDataFolder, stimulusBuffer)
     
-    def analyzeData(self, xData, yData, chemicalName = ""):
+    def analyzeData(self, xData, yData, analysisSession, chemicalName = ""):
         
         # ------------------------- Filter the Data ------------------------- #
         # Apply a Low Pass Filter
-        self.samplingFreq = len(xData)/(xData[-1] - xData[0])
-        yData = self.filteringMethods.bandPassFilter.butterFilter(yData, self.lowPassCutoff, self.samplingFreq, order = 4, filterType = 'low')
+        samplingFreq = len(xData)/(xData[-1] - xData[0])
+        yData = self.filteringMethods.bandPassFilter.butterFilter(yData, self.lowPassCutoff, samplingFreq, order = 4, filterType = 'low')
         #yData = self.filteringMethods.filterSVD.denoise(yData, math.ceil(np.sqrt(len(yData))))
         # ------------------------------------------------------------------- #
         
         # ---------------------- Find the Chemical Peak --------------------- #
         # Find Peaks in the Data
-        chemicalPeakInd = self.findPeak(xData, yData)
+        chemicalPeakInd = self.findPeak(xData, yData, analysisSession)
         # Return None if No Peak Found
         if chemicalPeakInd == None:
             print("No Peak Found in " + chemicalName + " Data")
-            self.plot(xData, yData, [], [], 0, 0, 0, chemicalName + " NO PEAK FOUND")
+            if not headlessMode.isHeadless():
+                self.plot(xData, yData, [], [], 0, 0, 0, analysisSession, chemicalName + " NO PEAK FOUND")
             return []
         # ------------------------------------------------------------------- #
 
@@ -108,7 +169,7 @@ class signalProcessing:
         leftCutInd, rightCutInd = self.findLinearBaseline(xData, yData, chemicalPeakInd)
         if None in [leftCutInd, rightCutInd] or rightCutInd - leftCutInd < self.minPeakDuration:
             print("No Baseline Found in " + chemicalName + " Data")
-            # self.plot(xData, yData, [], [], chemicalPeakInd, 0, 0, chemicalName + " NO BASELINE FOUND")
+            # self.plot(xData, yData, [], [], chemicalPeakInd, 0, 0, analysisSession, chemicalName + " NO BASELINE FOUND")
             # return []
             
             leftCutInd = 250; rightCutInd = len(xData)-1
@@ -132,7 +193,7 @@ class signalProcessing:
 
         leftBaseInd = leftCutInd; rightBaseInd = rightCutInd
         # Extract the Features from the Data
-        peakFeatures = self.extractFeatures(xData[leftBaseInd:rightBaseInd+1] - xData[leftBaseInd], baselineData[leftBaseInd:rightBaseInd+1], chemicalPeakInd-leftBaseInd, chemicalName)
+        peakFeatures = self.extractFeatures(xData[leftBaseInd:rightBaseInd+1] - xData[leftBaseInd], baselineData[leftBaseInd:rightBaseInd+1], chemicalPeakInd-leftBaseInd, chemicalName, analysisSession)
         #peakFeatures = self.extractFeatures_Pointwise(xData[leftBaseInd:rightBaseInd+1] - xData[leftBaseInd], baselineData[leftBaseInd:rightBaseInd+1], chemicalPeakInd-leftBaseInd, chemicalName)
         
         if len(peakFeatures) == 0:
@@ -141,17 +202,21 @@ class signalProcessing:
         # ------------------------------------------------------------------- #
         
         # -------------------------- Plot the Data -------------------------- #
-        if self.plotData:
-            self.plot(xData, yData, baselineData, linearFit, chemicalPeakInd, leftCutInd, rightCutInd, chemicalName)
+        if self.savePlots():
+            self.plot(xData, yData, baselineData, linearFit, chemicalPeakInd, leftCutInd, rightCutInd, analysisSession, chemicalName)
         # ------------------------------------------------------------------- #
         
         # Store the Peak Data
-        self.peakData[chemicalName].append((xData[leftBaseInd:rightBaseInd+1] - xData[leftBaseInd], baselineData[leftBaseInd:rightBaseInd+1]))
+        analysisSession.peakData[chemicalName].append((xData[leftBaseInd:rightBaseInd+1] - xData[leftBaseInd], baselineData[leftBaseInd:rightBaseInd+1]))
         # Return the Peak Features
         return peakFeatures
     
-    def analyzeChemicals(self, timePoints, chemicalDataList, chemicalNames, label, analyzeTogether = True, iseData = False):
+    def analyzeChemicals(self, timePoints, chemicalDataList, chemicalNames, label, analyzeTogether = True, iseData = False, analysisSession = None):
+        """ Extract the Features of Each Chemical; Returns the Recording's chemicalSession Holding Them """
         assert(len(chemicalDataList) == len(chemicalNames))
+        # Start a New Recording if None Given
+        if analysisSession is None:
+            analysisSession = self.createSession()
         
         # Loop through each chemical
         for chemicalInd in range(len(chemicalDataList)):
@@ -162,15 +227,19 @@ class signalProcessing:
             if len(chemicalData) != 0:
                 # Get the Chemical Features
                 if iseData:
-                    chemicalFeatures = self.analyzeData_ISE(timePoints, chemicalData, chemicalName)
+                    chemicalFeatures = self.analyzeData_ISE(timePoints, chemicalData, chemicalName, analysisSession)
                 else:
-                    chemicalFeatures = self.analyzeData(timePoints, chemicalData, chemicalName)
+                    chemicalFeatures = self.analyzeData(timePoints, chemicalData, analysisSession, chemicalName)
             elif analyzeTogether:
-                self.resetGlobalVariables()
+                analysisSession.resetFeatures()
 
             # Save the Data
-            self.chemicalFeatures[chemicalName + "Features"].append(chemicalFeatures)
-            self.chemicalFeatureLabels[chemicalName + "Labels"].append(label)
+            analysisSession.chemicalFeatures[chemicalName + "Features"].append(chemicalFeatures)
+            analysisSession.chemicalFeatureLabels[chemicalName + "Labels"].append(label)
+        # The Recording's Fits are Done
+        analysisSession.closeGaussFitPool()
+        
+        return analysisSession
 
     # ----------------------------------------------------------------------- #
     # ----------------------------------------------------------------------- #
@@ -178,7 +247,7 @@ class signalProcessing:
     def convertToOddInt(self, x):
         return 2*math.floor((x+1)/2) - 1
     
-    def findPeak(self, xData, yData, ignoredBoundaryPoints = 10, deriv = False):
+    def findPeak(self, xData, yData, analysisSession, ignoredBoundaryPoints = 10, deriv = False):
         # Find All Peaks in the Data
         peakInfo = scipy.signal.find_peaks(yData, prominence=10E-10, width=20, distance = 20)
         # Extract the Peak Information
@@ -189,10 +258,10 @@ class signalProcessing:
         allProminences = peakProminences[np.logical_and(peakIndices < len(xData) - ignoredBoundaryPoints, peakIndices >= ignoredBoundaryPoints)]
         peakIndices = peakIndices[np.logical_and(peakIndices < len(xData) - ignoredBoundaryPoints, peakIndices >= ignoredBoundaryPoints)]
         # Seperate Out the Stimulus Window
-        allProminences = allProminences[self.startStimulusBuffer < xData[peakIndices]]
-        peakIndices = peakIndices[self.startStimulusBuffer < xData[peakIndices]]
-        allProminences = allProminences[self.endStimulusBuffer > xData[peakIndices]]
-        peakIndices = peakIndices[self.endStimulusBuffer > xData[peakIndices]]
+        allProminences = allProminences[analysisSession.startStimulusBuffer < xData[peakIndices]]
+        peakIndices = peakIndices[analysisSession.startStimulusBuffer < xData[peakIndices]]
+        allProminences = allProminences[analysisSession.endStimulusBuffer > xData[peakIndices]]
+        peakIndices = peakIndices[analysisSession.endStimulusBuffer > xData[peakIndices]]
 
         # If Peaks are Found
         if len(peakIndices) > 0:
@@ -202,7 +271,7 @@ class signalProcessing:
             return peakInd
         elif not deriv:
             filteredVelocity = savgol_filter(np.gradient(yData), 251, 3)
-            return self.findPeak(xData, filteredVelocity, deriv = True)
+            return self.findPeak(xData, filteredVelocity, analysisSession, deriv = True)
         # If No Peak is Found, Return None
         return None
     
@@ -247,92 +316,72 @@ class signalProcessing:
         """
         Search Right: binarySearchWindow > 0
         Search Left: binarySearchWindow < 0
+        data: An Array, or an extremaSearch.searchSignal if the Data is Searched Many Times
         """
-        # Base Case
-        if abs(binarySearchWindow) < 1 or maxPointsSearch == 0:
-            searchSegment = data[max(0,xPointer-1):min(xPointer+2, len(data))]
-            xPointer -= np.where(searchSegment==data[xPointer])[0][0]
-            return xPointer + np.argmin(searchSegment) 
-        
-        maxHeightPointer = xPointer
-        maxHeight = data[xPointer]; searchDirection = binarySearchWindow//abs(binarySearchWindow)
-        # Binary Search Data to Find the Minimum (Skip Over Minor Fluctuations)
-        for dataPointer in range(max(xPointer, 0), max(0, min(xPointer + searchDirection*maxPointsSearch, len(data))), binarySearchWindow):
-            # If the Next Point is Greater Than the Previous, Take a Step Back
-            if data[dataPointer] >= maxHeight and xPointer != dataPointer:
-                return self.findNearbyMinimum(data, dataPointer - binarySearchWindow, round(binarySearchWindow/4), maxPointsSearch - searchDirection*(abs(dataPointer - binarySearchWindow)) - xPointer)
-            # Else, Continue Searching
-            else:
-                maxHeightPointer = dataPointer
-                maxHeight = data[dataPointer]
-
-        # If Your Binary Search is Too Large, Reduce it
-        return self.findNearbyMinimum(data, maxHeightPointer, round(binarySearchWindow/2), maxPointsSearch-1)
+        return extremaSearch.findNearbyMinimum(data, xPointer, binarySearchWindow, maxPointsSearch)
     
     def findNearbyMaximum(self, data, xPointer, binarySearchWindow = 5, maxPointsSearch = 10000):
         """
         Search Right: binarySearchWindow > 0
         Search Left: binarySearchWindow < 0
+        data: An Array, or an extremaSearch.searchSignal if the Data is Searched Many Times
         """
-        # Base Case
-        xPointer = min(max(xPointer, 0), len(data)-1)
-        if abs(binarySearchWindow) < 1 or maxPointsSearch == 0:
-            searchSegment = data[max(0,xPointer-1):min(xPointer+2, len(data))]
-            xPointer -= np.where(searchSegment==data[xPointer])[0][0]
-            return xPointer + np.argmax(searchSegment)
-        
-        minHeightPointer = xPointer; minHeight = data[xPointer];
-        searchDirection = binarySearchWindow//abs(binarySearchWindow)
-        # Binary Search Data to Find the Minimum (Skip Over Minor Fluctuations)
-        for dataPointer in range(xPointer, max(0, min(xPointer + searchDirection*maxPointsSearch, len(data))), binarySearchWindow):
-            # If the Next Point is Greater Than the Previous, Take a Step Back
-            if data[dataPointer] < minHeight and xPointer != dataPointer:
-                return self.findNearbyMaximum(data, dataPointer - binarySearchWindow, round(binarySearchWindow/2), maxPointsSearch - searchDirection*(abs(dataPointer - binarySearchWindow)) - xPointer)
-            # Else, Continue Searching
-            else:
-                minHeightPointer = dataPointer
-                minHeight = data[dataPointer]
-
-        # If Your Binary Search is Too Large, Reduce it
-        return self.findNearbyMaximum(data, minHeightPointer, round(binarySearchWindow/2), maxPointsSearch-1)
+        return extremaSearch.findNearbyMaximum(data, xPointer, binarySearchWindow, maxPointsSearch)
     
     
     def findLinearBaseline(self, xData, yData, peakInd):
-        # Define a threshold for distinguishing good/bad lines
-        maxBadPointsTotal = int(len(xData)/10)
-        # Store Possibly Good Tangent Indexes
-        goodTangentInd = [[] for _ in range(maxBadPointsTotal)]
-        
-        # For Each Index Pair on the Left and Right of the Peak
-        for rightInd in range(peakInd+2, len(yData), 1):
-            for leftInd in range(peakInd-2, self.minLeftBoundaryInd, -1):
-                
-                # Initialize range of data to check
-                checkPeakBuffer = 0#int((rightInd - leftInd)/4)
-                xDataCut = xData[max(0, leftInd - checkPeakBuffer):rightInd + checkPeakBuffer]
-                yDataCut = yData[max(0, leftInd - checkPeakBuffer):rightInd + checkPeakBuffer]
-                
-                # Draw a Linear Line Between the Points
-                lineSlope = (yData[leftInd] - yData[rightInd])/(xData[leftInd] - xData[rightInd])
-                slopeIntercept = yData[leftInd] - lineSlope*xData[leftInd]
-                linearFit = lineSlope*xDataCut + slopeIntercept
-
-                # Find the Number of Points Above the Tangent Line
-                numWrongSideOfTangent = len(linearFit[linearFit - yDataCut > 0])
-                
-                # If a Tangent Line is Drawn Correctly, Return the Tangent Points' Indexes
-                # if numWrongSideOfTangent == 0 and rightInd - leftInd > self.minPeakDuration:
-                #     return (leftInd, rightInd)
-                # Define a threshold for distinguishing good/bad lines
-                maxBadPoints = int(len(linearFit)/15) # Minimum 1/6
-                if numWrongSideOfTangent < maxBadPoints and rightInd - leftInd > self.minPeakDuration:
-                    goodTangentInd[numWrongSideOfTangent].append((leftInd, rightInd))
-                    
-        # If Nothing Found, Try and Return a Semi-Optimal Tangent Position
-        for goodInd in range(maxBadPointsTotal):
-            if len(goodTangentInd[goodInd]) != 0:
-                return max(goodTangentInd[goodInd], key=lambda tangentPair: tangentPair[1]-tangentPair[0])
-        return None, None
+        """
+        The Longest Chord (leftInd, rightInd) Around the Peak Among Those with the Fewest Points
+        Below it (Fewer Than 1/15 of its Points); the Same Chord as Checking Every Pair of Points.
+        The Chords with No Points Below Come from the Lower Convex Hull in O(N). Only if None
+        Fit are the Points Below Every Chord Counted (O(N^2 log^2 N), Not O(N^3)).
+        """
+        xData = np.asarray(xData, dtype=float); yData = np.asarray(yData, dtype=float)
+        firstLeftInd = self.minLeftBoundaryInd + 1; lastLeftInd = peakInd - 2
+        firstRightInd = peakInd + 2
+        if lastLeftInd < firstLeftInd or firstRightInd >= len(yData):
+            return None, None
+        
+        tangentChord = self.findTangentBaseline(xData, yData, firstLeftInd, lastLeftInd, firstRightInd)
+        if tangentChord is not None:
+            return tangentChord
+        return self.findCountedBaseline(xData, yData, firstLeftInd, lastLeftInd, firstRightInd)
+    
+    def findTangentBaseline(self, xData, yData, firstLeftInd, lastLeftInd, firstRightInd):
+        """ The Longest Chord with No Points Below it (Ties: The Leftmost); None if There is No Such Chord """
+        tangentChord = None
+        tangentChords = baselineSearch.findTangentChords(xData, yData, firstLeftInd, lastLeftInd)
+        for leftInd, rightInd in tangentChords.items():
+            if rightInd >= firstRightInd and rightInd - leftInd > self.minPeakDuration:
+                if tangentChord is None or (leftInd - rightInd, rightInd) < (tangentChord[0] - tangentChord[1], tangentChord[1]):
+                    tangentChord = (leftInd, rightInd)
+        # Keep it if Rounding Does Not Put Points Below the Line Either
+        if tangentChord is not None:
+            leftInd, rightInd = tangentChord
+            lineSlope = (yData[leftInd] - yData[rightInd])/(xData[leftInd] - xData[rightInd])
+            slopeIntercept = yData[leftInd] - lineSlope*xData[leftInd]
+            if not np.any(lineSlope*xData[leftInd:rightInd] + slopeIntercept - yData[leftInd:rightInd] > 0):
+                return tangentChord
+        return None
+    
+    def findCountedBaseline(self, xData, yData, firstLeftInd, lastLeftInd, firstRightInd):
+        """ Count the Points Below Every Chord; Returns the Best Chord (None, None if No Chord Fits) """
+        bestChord = None; bestRank = None
+        rightInds = np.arange(firstRightInd, len(yData))
+        for leftInd in range(lastLeftInd, firstLeftInd - 1, -1):
+            numWrongSideOfTangent = baselineSearch.countPointsBelowChords(xData, yData, leftInd, rightInds)
+            chordLengths = rightInds - leftInd
+            goodChords = np.flatnonzero((numWrongSideOfTangent < chordLengths//15) & (chordLengths > self.minPeakDuration))
+            if len(goodChords) == 0:
+                continue
+            # Rank by the Points Below, Then the Length, Then the Leftmost rightInd
+            chordInd = goodChords[np.lexsort((rightInds[goodChords], -chordLengths[goodChords], numWrongSideOfTangent[goodChords]))[0]]
+            chordRank = (numWrongSideOfTangent[chordInd], -chordLengths[chordInd], rightInds[chordInd])
+            if bestRank is None or chordRank < bestRank:
+                bestChord = (leftInd, int(rightInds[chordInd])); bestRank = chordRank
+        if bestChord is None:
+            return None, None
+        return bestChord
     
     def findLineIntersectionPoint(self, leftLineParams, rightLineParams):
         xPoint = (rightLineParams[1] - leftLineParams[1])/(leftLineParams[0] - rightLineParams[0])
@@ -360,13 +409,14 @@ class signalProcessing:
         # ----------------------- Derivative Analysis ----------------------- #   
         # Calculate the Signal Derivatives
         velocity = np.gradient(baselineData, xData, edge_order = 2)
+        velocitySearch = extremaSearch.searchSignal(velocity)
         # Find the Velocity Extremas
-        leftVelPeakInd = self.findNearbyMaximum(velocity, peakInd, binarySearchWindow = -1) - xData[peakInd]
-        rightVelPeakInd = self.findNearbyMinimum(velocity, peakInd, binarySearchWindow = 1) - xData[peakInd]
+        leftVelPeakInd = self.findNearbyMaximum(velocitySearch, peakInd, binarySearchWindow = -1) - xData[peakInd]
+        rightVelPeakInd = self.findNearbyMinimum(velocitySearch, peakInd, binarySearchWindow = 1) - xData[peakInd]
         while rightVelPeakInd - leftVelPeakInd < 100:
             baselineData = savgol_filter(baselineData, max(3, self.convertToOddInt(len(baselineData)/5)), 2)  # 61/3,2
-            leftVelPeakInd = self.findNearbyMaximum(velocity, peakInd, binarySearchWindow = -2) - xData[peakInd]
-            rightVelPeakInd = self.findNearbyMinimum(velocity, peakInd, binarySearchWindow = 2) - xData[peakInd]
+            leftVelPeakInd = self.findNearbyMaximum(velocitySearch, peakInd, binarySearchWindow = -2) - xData[peakInd]
+            rightVelPeakInd = self.findNearbyMinimum(velocitySearch, peakInd, binarySearchWindow = 2) - xData[peakInd]
         xData -= xData[peakInd];
         
         # Normalize the Data
@@ -402,7 +452,7 @@ class signalProcessing:
         return peakFeatures
         # ------------------------------------------------------------------- #
     
-    def extractFeatures(self, xData, baselineData, peakInd, chemicalName):
+    def extractFeatures(self, xData, baselineData, peakInd, chemicalName, analysisSession):
         
         # ------------------ Pre-Extract Relevant Features ------------------ #   
         # Extract PreNormalized Features
@@ -452,7 +502,7 @@ class signalProcessing:
         baselineData = baselineDataInterpFunc(xData)
         peakInd = np.argmax(baselineData)
         # Gaussdian Decomposition
-        baselineData = self.gausDecomp(xData/max(xData), baselineData/max(baselineData), peakInd, chemicalName)*max(baselineData)
+        baselineData = self.gausDecomp(xData/max(xData), baselineData/max(baselineData), peakInd, chemicalName, analysisSession)*max(baselineData)
         if len(baselineData) == 0:
             print("Bad Gaussian Decomp")
             return []
@@ -478,25 +528,27 @@ class signalProcessing:
         thirdDerivRightMax = self.findNearbyMaximum(thirdDeriv, peakInd, binarySearchWindow = 20, maxPointsSearch = len(thirdDeriv))
         # ------------------------------------------------------------------- #
         
-        fig = plt.figure()
-        # Plot Data
-        plt.plot(xData, baselineData/max(baselineData), 'k', linewidth= 2, label = "Normalized Chemical Peak")
-        plt.plot(xData, velocity/max(abs(velocity)), 'tab:blue', alpha = 0.8, label="Normalized First Derivative")
-        plt.plot(xData, acceleration/max(abs(acceleration)), 'tab:red', alpha = 0.8, label="Normalized Second Derivative")
-        # plt.plot(xData, thirdDeriv/max(abs(thirdDeriv)), 'tab:brown')
-        # Label Peaks
-        plt.plot(xData[peakInd], (baselineData/max(baselineData))[peakInd], 'ko', linewidth = 2)
-        plt.plot(xData[[leftVelPeakInd, rightVelPeakInd]], (velocity/max(abs(velocity)))[[leftVelPeakInd, rightVelPeakInd]], 'o', c="tab:blue")
-        plt.plot(xData[[maxAccelLeftInd, minAccelCenterInd, maxAccelRightInd]], (acceleration/max(abs(acceleration)))[[maxAccelLeftInd, minAccelCenterInd, maxAccelRightInd]], 'o', c="tab:red")
-        # plt.plot(xData[[thirdDerivLeftMin, thirdDerivRightMax]], (thirdDeriv/max(abs(thirdDeriv[maxAccelLeftInd:maxAccelRightInd])))[[thirdDerivLeftMin, thirdDerivRightMax]], 'o')
-        plt.title("Normalized " + chemicalName + " Signal")
-        plt.xlabel("Time (Seconds)")
-        plt.ylabel("Normalized peaks")
-        plt.legend(prop={'size': 8})
-        fig.savefig(self.saveDataFolder + "Normalized " + chemicalName.capitalize() + " Signal.pdf", dpi=300, bbox_inches='tight')
-        plt.show()
+        # Plot the Normalized Signal with its Derivatives (Skipped When Headless)
+        if not headlessMode.isHeadless():
+            fig = plt.figure()
+            # Plot Data
+            plt.plot(xData, baselineData/max(baselineData), 'k', linewidth= 2, label = "Normalized Chemical Peak")
+            plt.plot(xData, velocity/max(abs(velocity)), 'tab:blue', alpha = 0.8, label="Normalized First Derivative")
+            plt.plot(xData, acceleration/max(abs(acceleration)), 'tab:red', alpha = 0.8, label="Normalized Second Derivative")
+            # plt.plot(xData, thirdDeriv/max(abs(thirdDeriv)), 'tab:brown')
+            # Label Peaks
+            plt.plot(xData[peakInd], (baselineData/max(baselineData))[peakInd], 'ko', linewidth = 2)
+            plt.plot(xData[[leftVelPeakInd, rightVelPeakInd]], (velocity/max(abs(velocity)))[[leftVelPeakInd, rightVelPeakInd]], 'o', c="tab:blue")
+            plt.plot(xData[[maxAccelLeftInd, minAccelCenterInd, maxAccelRightInd]], (acceleration/max(abs(acceleration)))[[maxAccelLeftInd, minAccelCenterInd, maxAccelRightInd]], 'o', c="tab:red")
+            # plt.plot(xData[[thirdDerivLeftMin, thirdDerivRightMax]], (thirdDeriv/max(abs(thirdDeriv[maxAccelLeftInd:maxAccelRightInd])))[[thirdDerivLeftMin, thirdDerivRightMax]], 'o')
+            plt.title("Normalized " + chemicalName + " Signal")
+            plt.xlabel("Time (Seconds)")
+            plt.ylabel("Normalized peaks")
+            plt.legend(prop={'size': 8})
+            fig.savefig(analysisSession.getSaveDataFolder() + "Normalized " + chemicalName.capitalize() + " Signal.pdf", dpi=300, bbox_inches='tight')
+            plt.show()
         
-        excelProcessing.dataProcessing().saveResults(np.array([xData, baselineData/max(baselineData), velocity/max(abs(velocity)), acceleration/max(abs(acceleration))]).T, ['xData', 'baselineData with peak at ' + str(peakInd), 'Deriv with cutoffs at' + str(leftVelPeakInd) + ', ' + str(rightVelPeakInd), '2nd Deriv with cutoffs at' + str(maxAccelLeftInd) + ', ' + str(minAccelCenterInd) + "," + str(maxAccelRightInd)], self.saveDataFolder, "Normalized " + chemicalName.capitalize() + " Signal.xlsx")
+            excelProcessing.dataProcessing().saveResults(np.array([xData, baselineData/max(baselineData), velocity/max(abs(velocity)), acceleration/max(abs(acceleration))]).T, ['xData', 'baselineData with peak at ' + str(peakInd), 'Deriv with cutoffs at' + str(leftVelPeakInd) + ', ' + str(rightVelPeakInd), '2nd Deriv with cutoffs at' + str(maxAccelLeftInd) + ', ' + str(minAccelCenterInd) + "," + str(maxAccelRightInd)], analysisSession.saveDataFolder, "Normalized " + chemicalName.capitalize() + " Signal.xlsx")
 
         
         # ----------------------- Indivisual Analysis ----------------------- #   
@@ -663,7 +715,7 @@ class signalProcessing:
         # ------------------------------------------------------------------- #
         
         
-    def analyzeData_ISE(self, xData, yData, chemicalName):
+    def analyzeData_ISE(self, xData, yData, chemicalName, analysisSession):
         
         # ------------------------- Filter the Data ------------------------ #
         # Apply a Low Pass Filter
@@ -674,8 +726,8 @@ class signalProcessing:
         
         # ----------------------- Feature Extraction ----------------------- #
         # Find the Stimulus Start/Stop Ind
-        startStimulusInd = self.startStimulus
-        endStimulusInd = self.endStimulus
+        startStimulusInd = analysisSession.startStimulus
+        endStimulusInd = analysisSession.endStimulus
         
         # Extract Mean of the Data
         meanSignal = np.mean(yData)
@@ -690,7 +742,7 @@ class signalProcessing:
         # Extract Slopes
         restSlope = np.polyfit(xData[int(startStimulusInd/4):int(startStimulusInd*3/4):], yData[int(startStimulusInd/4):int(startStimulusInd*3/4):], 1)[0]
         stressSlope = np.polyfit(xData[startStimulusInd + int((startStimulusInd-endStimulusInd)/4):endStimulusInd], yData[startStimulusInd + int((startStimulusInd-endStimulusInd)/4):endStimulusInd], 1)[0]
-        relaxationSlope = np.polyfit(xData[self.endStimulusBuffer:], yData[self.endStimulusBuffer:], 1)[0]
+        relaxationSlope = np.polyfit(xData[analysisSession.endStimulusBuffer:], yData[analysisSession.endStimulusBuffer:], 1)[0]
 
         # Compile the Features
         peakFeatures = []
@@ -700,7 +752,7 @@ class signalProcessing:
         
         return peakFeatures
     
-    def plot(self, xData, yData, baselineData, linearFit, peakInd, leftCutInd, rightCutInd, chemicalName = "Chemical"):
+    def plot(self, xData, yData, baselineData, linearFit, peakInd, leftCutInd, rightCutInd, analysisSession, chemicalName = "Chemical"):
         fig = plt.figure()
         plt.plot(xData, yData, 'k', linewidth=2)
         plt.plot(xData[peakInd], yData[peakInd], 'bo')
@@ -713,11 +765,11 @@ class signalProcessing:
         plt.title(chemicalName + " Data")
         plt.xlabel("Time (Sec)")
         plt.ylabel("Concentration (uM)")
-        fig.savefig(self.saveDataFolder + chemicalName.capitalize() + " Data.pdf", dpi=300, bbox_inches='tight')
+        fig.savefig(analysisSession.getSaveDataFolder() + chemicalName.capitalize() + " Data.pdf", dpi=300, bbox_inches='tight')
         # Display the Plot
         plt.show()
         
-        excelProcessing.dataProcessing().saveResults(np.array([xData, yData, linearFit, baselineData]).T, ['xData', 'yData with peak at ' + str(peakInd), 'linearFit with cutoffs at' + str(leftCutInd) + ', ' + str(rightCutInd), 'baselineData'], self.saveDataFolder, chemicalName.capitalize() + " Data.xlsx")
+        excelProcessing.dataProcessing().saveResults(np.array([xData, yData, linearFit, baselineData]).T, ['xData', 'yData with peak at ' + str(peakInd), 'linearFit with cutoffs at' + str(leftCutInd) + ', ' + str(rightCutInd), 'baselineData'], analysisSession.saveDataFolder, chemicalName.capitalize() + " Data.xlsx")
         
         
     def gaussModel(self, xData, amplitude, fwtm, center):
@@ -728,12 +780,60 @@ class signalProcessing:
         sigma = fwtm/(2*math.sqrt(2*math.log(10)))
         return amplitude * np.exp(-(xData-center)**2 / (2*sigma**2)) * (1 + scipy.special.erf(gamma*(xData - center)/(math.sqrt(2)*sigma)))
             
-    def gausDecomp(self, xData, yData, peakInd, chemicalName, addExtraGauss = False, addExtraGauss2 = False, addExtraGauss3 = False):
+    def gausDecomp(self, xData, yData, peakInd, chemicalName, analysisSession):
+        """
+        Fit 1, 2, 3, then 4 Gaussians (Skewed, Then Plain) and Return the Largest Gaussian
+        of the First Fit Accepted (The 4 Gaussian Fit if None are). With gaussFitWorkers > 1,
+        the Orders are Fit at Once in the Session's Pool and the Later Orders are Dropped
+        Once an Earlier One is Accepted (Same Result as Fitting Them One by One).
+        """
+        maxNumberOfGaussians = 4
+        if self.gaussFitWorkers > 1:
+            fitPool = analysisSession.getGaussFitPool(self.gaussFitExecutor, min(self.gaussFitWorkers, maxNumberOfGaussians))
+            # Threads Can Stop the Fits Already Running (Processes Only Drop the Ones Waiting)
+            stopFits = threading.Event() if self.gaussFitExecutor == "thread" else None
+            gaussFits = [fitPool.submit(self.fitGaussOrder, xData, yData, peakInd, numberOfGaussians, stopFits) for numberOfGaussians in range(1, 1+maxNumberOfGaussians)]
+            getGaussFit = lambda gaussFit: gaussFit.result()
+        else:
+            gaussFits = range(1, 1+maxNumberOfGaussians)
+            getGaussFit = lambda numberOfGaussians: self.fitGaussOrder(xData, yData, peakInd, numberOfGaussians)
+        
+        # Take the First Accepted Fit
+        triedFits = []
+        for gaussFit in gaussFits:
+            triedFits.append(getGaussFit(gaussFit))
+            if triedFits[-1]["accepted"]:
+                break
+        # Stop the Fits No Longer Needed
+        if self.gaussFitWorkers > 1:
+            for unusedFit in gaussFits[len(triedFits):]:
+                unusedFit.cancel()
+            if stopFits is not None:
+                stopFits.set()
+        
+        # Plot Each Fit Tried (In Order)
+        if self.savePlots():
+            for triedFit in triedFits:
+                self.plotGaussianFit(xData, yData, peakInd, triedFit, chemicalName, analysisSession)
+        
+        gaussFit = triedFits[-1]
+        if not gaussFit["accepted"]:
+            avUncertainty = np.round(sum(gaussFit["bestFit"] - gaussFit["uncertainty"])/len(gaussFit["uncertainty"]), 5)
+            print(avUncertainty, gaussFit["coefficient"])
+        return gaussFit["comps"][gaussFit["bestPrefix"]]
+    
+    def fitGaussOrder(self, xData, yData, peakInd, numberOfGaussians, stopFit = None):
+        """
+        Fit numberOfGaussians Gaussians. Returns a Dictionary (Plain Arrays, so it Can Come Back
+        from Another Process): bestFit, comps (Evaluated Once), coefficient (R2), bestPrefix
+        (The Largest Gaussian), uncertainty (3-Sigma; Only Computed if the R2 Passes, if
+        Plotting, or for the Last Order), and accepted. Setting the stopFit Event Aborts the Fit.
+        """
         # https://lmfit.github.io/lmfit-py/builtin_models.html#example-1-fit-peak-data-to-gaussian-lorentzian-and-voigt-profiles
+        addExtraGauss = numberOfGaussians >= 2; addExtraGauss2 = numberOfGaussians >= 3; addExtraGauss3 = numberOfGaussians >= 4
 
         peakAmp = yData[peakInd]; peakCenter = xData[peakInd];
         fwtm = xData[-1] - xData[0]
-        numberOfGaussians = 1
         
         gmodel =  Model(self.skewedGaussModel, prefix = "g1_", xData = xData)
         pars = gmodel.make_params()
@@ -743,7 +843,6 @@ class signalProcessing:
         pars['g1_amplitude'].set(value = peakAmp, min= 0.1, max = peakAmp*1.1)
         
         if addExtraGauss:
-            numberOfGaussians += 1
             g2PeakInd = len(xData)-peakInd
             peakCenter2 = xData[g2PeakInd]
             peakAmp2 = yData[g2PeakInd]
@@ -757,7 +856,6 @@ class signalProcessing:
             gmodel += gmodel2
             
         if addExtraGauss2:
-            numberOfGaussians += 1
             gmodel3 =  Model(self.gaussModel, prefix = "g3_", xData = xData)
             pars.update(gmodel3.make_params())
             pars['g3_amplitude'].set(value = peakAmp/3, min= 0.025, max = peakAmp)
@@ -766,7 +864,6 @@ class signalProcessing:
             gmodel += gmodel3
         
         if addExtraGauss3:
-            numberOfGaussians += 1
             gmodel4 =  Model(self.gaussModel, prefix = "g4_", xData = xData)
             pars.update(gmodel4.make_params())
             pars['g4_amplitude'].set(value = peakAmp/4, min= 0.025, max = peakAmp)
@@ -774,80 +871,64 @@ class signalProcessing:
             pars['g4_center'].set(value = peakCenter, min = xData[0], max = xData[-1])
             gmodel += gmodel4
             
-        finalFitInfo = gmodel.fit(yData, pars, xData=xData, method='bfgs')
+        # Abort if the Fit is No Longer Needed
+        abortFit = None if stopFit is None else lambda *fitState, **fitKeywords: stopFit.is_set()
+        finalFitInfo = gmodel.fit(yData, pars, xData=xData, method='bfgs', iter_cb=abortFit)
 
         coefficient_of_dermination = np.round(r2_score(yData, finalFitInfo.best_fit), 6)
         comps = finalFitInfo.eval_components(xData=xData)
-    
-        def findBestGaus():
-            Amplitudes = []
-            for prefix in range(1, 1+numberOfGaussians):
-                prefix = 'g' + str(prefix) + '_'
-                data = finalFitInfo.eval_components(xData=xData)[prefix]
-                
-                Amplitudes.append(max(data))
-            return 'g' + str(np.argmax(Amplitudes)+1) + '_'                
-                    
-        # Plot the Pulse with its Fit 
-        def plotGaussianFit(xData, yData, peakInd, comps):
-            gaussDecompInfo = [xData, yData];
-            gaussDecompHeader = ["Normalized X-Data", "Normalized Y-Data"]
-            
-            fig = plt.figure()
-            
-            xData = np.array(xData); yData = np.array(yData)
+        # The Largest Gaussian
+        bestPrefix = 'g' + str(np.argmax([max(comps['g' + str(prefix) + '_']) for prefix in range(1, 1+numberOfGaussians)])+1) + '_'
+        
+        # The Uncertainty is Slow: Only Find it When it Can Change the Outcome
+        goodCoefficient = coefficient_of_dermination > 0.984 or (coefficient_of_dermination > 0.98 and addExtraGauss)
+        dely = None
+        if goodCoefficient or self.savePlots() or addExtraGauss3:
             dely = finalFitInfo.eval_uncertainty(sigma=3)
-            plt.plot(xData, yData, linewidth = 2, color = "black")
-            plt.plot(xData[peakInd], yData[peakInd], 'o')
+        
+        return {"numberOfGaussians": numberOfGaussians, "bestFit": finalFitInfo.best_fit, "comps": comps, "coefficient": coefficient_of_dermination,
+                "bestPrefix": bestPrefix, "uncertainty": dely, "accepted": goodCoefficient and np.mean(dely) < 1}
+    
+    def plotGaussianFit(self, xData, yData, peakInd, gaussFit, chemicalName, analysisSession):
+        """ Plot the Peak with its Fit; Save the Figure and the Fit """
+        numberOfGaussians = gaussFit["numberOfGaussians"]; comps = gaussFit["comps"]; dely = gaussFit["uncertainty"]
+        gaussDecompInfo = [xData, yData];
+        gaussDecompHeader = ["Normalized X-Data", "Normalized Y-Data"]
+        
+        fig = plt.figure()
+        
+        xData = np.array(xData); yData = np.array(yData)
+        plt.plot(xData, yData, linewidth = 2, color = "black")
+        plt.plot(xData[peakInd], yData[peakInd], 'o')
 
-            plt.plot(xData, comps[findBestGaus()], '--', color = "tab:brown", alpha = 1, linewidth=4, label='Chosen Gaussian')
-            plt.plot(xData, comps['g1_'], '--', color = "tab:red", alpha = 0.8, label='Skewed Gaussian Fit')
-            
-            gaussDecompHeader.append("Final Fit"); gaussDecompInfo.append(finalFitInfo.best_fit)
-            gaussDecompHeader.append("Final Fit Uncertainty"); gaussDecompInfo.append(dely)
-            gaussDecompHeader.append("Chosen Gaus Data"); gaussDecompInfo.append(comps[findBestGaus()])
-            gaussDecompHeader.append("Gaus Data"); gaussDecompInfo.append(comps['g1_'])
-
-            if addExtraGauss:
-                plt.plot(xData, comps['g2_'], '--', color = "tab:blue", alpha = 0.5, label='Extra Skewed Gauss')
-                gaussDecompHeader.append("Second Gaus Data"); gaussDecompInfo.append(comps['g2_'])
-            if addExtraGauss2:
-                plt.plot(xData, comps['g3_'], '--', color = "tab:purple", alpha = 0.5, label='Extra Gauss')
-                gaussDecompHeader.append("Third Gaus Data"); gaussDecompInfo.append(comps['g3_'])
-            if addExtraGauss3:
-                plt.plot(xData, comps['g4_'], '--', color = "tab:orange", alpha = 0.5, label='Extra Gauss2')
-                gaussDecompHeader.append("Fourth Gaus Data"); gaussDecompInfo.append(comps['g4_'])
-
-            plt.fill_between(xData, finalFitInfo.best_fit-dely, finalFitInfo.best_fit+dely, color="#ABABAB", label='3-$\sigma$ uncertainty band')
-            
-            plt.legend(loc='best')
-            plt.title("Gaussian Decomposition for " + chemicalName + " " + str(np.round(coefficient_of_dermination, 4)))
-            plt.xlabel("Time (Seconds)")
-            plt.ylabel("Chemical peak")
-            fig.savefig(self.saveDataFolder + chemicalName.capitalize() + " Gaussian Decomposition using " + str(numberOfGaussians) + " Gaussians.pdf", dpi=300, bbox_inches='tight')
-            plt.show()
-            
-            excelProcessing.dataProcessing().saveResults(np.array(gaussDecompInfo).T, gaussDecompHeader, self.saveDataFolder, chemicalName.capitalize() + " Gaussian Decomposition using " + str(numberOfGaussians) + " Gaussians.xlsx")
-        
-        dely = finalFitInfo.eval_uncertainty(sigma=3)
-        avUncertainty = np.round(sum(finalFitInfo.best_fit-dely)/len(dely), 5)
-        plotGaussianFit(xData, yData, peakInd, comps)
-        if np.mean(dely) < 1 and \
-                (coefficient_of_dermination > 0.984 or \
-                (coefficient_of_dermination > 0.98 and addExtraGauss) or \
-                (coefficient_of_dermination > 0.98 and addExtraGauss2) or \
-                (coefficient_of_dermination > 0.98 and addExtraGauss3)):
-            bestPrefix = findBestGaus()
-            return finalFitInfo.eval_components(xData=xData)[bestPrefix]
-        elif not addExtraGauss:
-            return self.gausDecomp(xData, yData, peakInd, chemicalName, addExtraGauss = True)
-        elif not addExtraGauss2:
-            return self.gausDecomp(xData, yData, peakInd, chemicalName, addExtraGauss = True, addExtraGauss2 = True)
-        elif not addExtraGauss3:
-            return self.gausDecomp(xData, yData, peakInd, chemicalName, addExtraGauss = True, addExtraGauss2 = True, addExtraGauss3 = True)
-        else:
-            print(avUncertainty, coefficient_of_dermination)
-            return finalFitInfo.eval_components(xData=xData)[findBestGaus()] #[]
+        plt.plot(xData, comps[gaussFit["bestPrefix"]], '--', color = "tab:brown", alpha = 1, linewidth=4, label='Chosen Gaussian')
+        plt.plot(xData, comps['g1_'], '--', color = "tab:red", alpha = 0.8, label='Skewed Gaussian Fit')
+        
+        gaussDecompHeader.append("Final Fit"); gaussDecompInfo.append(gaussFit["bestFit"])
+        gaussDecompHeader.append("Final Fit Uncertainty"); gaussDecompInfo.append(dely)
+        gaussDecompHeader.append("Chosen Gaus Data"); gaussDecompInfo.append(comps[gaussFit["bestPrefix"]])
+        gaussDecompHeader.append("Gaus Data"); gaussDecompInfo.append(comps['g1_'])
+
+        if numberOfGaussians >= 2:
+            plt.plot(xData, comps['g2_'], '--', color = "tab:blue", alpha = 0.5, label='Extra Skewed Gauss')
+            gaussDecompHeader.append("Second Gaus Data"); gaussDecompInfo.append(comps['g2_'])
+        if numberOfGaussians >= 3:
+            plt.plot(xData, comps['g3_'], '--', color = "tab:purple", alpha = 0.5, label='Extra Gauss')
+            gaussDecompHeader.append("Third Gaus Data"); gaussDecompInfo.append(comps['g3_'])
+        if numberOfGaussians >= 4:
+            plt.plot(xData, comps['g4_'], '--', color = "tab:orange", alpha = 0.5, label='Extra Gauss2')
+            gaussDecompHeader.append("Fourth Gaus Data"); gaussDecompInfo.append(comps['g4_'])
+
+        plt.fill_between(xData, gaussFit["bestFit"]-dely, gaussFit["bestFit"]+dely, color="#ABABAB", label='3-$\\sigma$ uncertainty band')
+        
+        plt.legend(loc='best')
+        plt.title("Gaussian Decomposition for " + chemicalName + " " + str(np.round(gaussFit["coefficient"], 4)))
+        plt.xlabel("Time (Seconds)")
+        plt.ylabel("Chemical peak")
+        fig.savefig(analysisSession.getSaveDataFolder() + chemicalName.capitalize() + " Gaussian Decomposition using " + str(numberOfGaussians) + " Gaussians.pdf", dpi=300, bbox_inches='tight')
+        plt.show()
+        
+        excelProcessing.dataProcessing().saveResults(np.array(gaussDecompInfo).T, gaussDecompHeader, analysisSession.saveDataFolder, chemicalName.capitalize() + " Gaussian Decomposition using " + str(numberOfGaussians) + " Gaussians.xlsx")
 
         
 
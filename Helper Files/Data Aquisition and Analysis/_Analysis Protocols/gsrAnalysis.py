@@ -11,7 +11,6 @@ from scipy.signal import butter
 from scipy.signal import savgol_filter
 # Matlab Plotting Modules
 import matplotlib as mpl
-import matplotlib.pyplot as plt
 # Gaussian Decomposition
 from lmfit import Model
 from sklearn.metrics import r2_score
@@ -27,6 +26,9 @@ from lmfit.models import SkewedGaussianModel, SkewedVoigtModel
 
 # Import Files
 import _filteringProtocols as filteringMethods # Import Files with Filtering Methods
+import _headlessMode as headlessMode           # Headless Runs Skip the Plots and Diagnostic Files
+# Matlab Plotting Modules (pyplot is Only Imported Once a Plot is Made)
+plt = headlessMode.lazyPyplot()
 
 # --------------------------------------------------------------------------- #
 # --------------------------------------------------------------------------- #
@@ -76,6 +78,11 @@ class signalProcessing:
         # Define the Class with all the Filtering Methods
         self.filteringMethods = filteringMethods.filteringMethods()
     
+    def getAnalysisParameters(self):
+        """ The Parameters That Change the Extracted Features (Used to Fingerprint Saved Features) """
+        return {"lowPassCutoff": self.lowPassCutoff, "startStimulusTime": self.startStimulusTime,
+                "endStimulusTime": self.endStimulusTime, "stimulusBufferInd": self.stimulusBufferInd}
+    
     def analyzeGSR(self, xData, yData):
         
         # ------------------------- Filter the Data ------------------------ #
@@ -1,14 +1,15 @@
 
 # Basic Modules
+import sys
 import math
 import numpy as np
-from scipy import stats
+from collections import deque
 from bisect import bisect
 # Peak Detection
 import scipy
 import scipy.signal
+import scipy.linalg
 # Filter the Data
-from scipy.signal import butter
 from scipy.signal import savgol_filter
 # Baseline Subtraction
 from BaselineRemoval import BaselineRemoval
@@ -17,7 +18,16 @@ from lmfit import Model
 from sklearn.metrics import r2_score
 # Matlab Plotting API
 import matplotlib as mpl
-import matplotlib.pyplot as plt
+
+# Import Files
+import _rollingStatistics as rollingStatistics # Rolling Averages of the Features
+import _arrayBuffer as arrayBuffer               # Growable Arrays for the Features and Data
+import _extremaSearch as extremaSearch           # Searches for Nearby Minima/Maxima
+import _filteringProtocols as filteringMethods   # Import Files with Filtering Methods
+import _gaussianFitting as gaussianFitting       # Least Squares Gaussian Decomposition
+import _headlessMode as headlessMode             # Headless Runs Skip the Plots and Diagnostic Files
+# Matlab Plotting API (pyplot is Only Imported Once a Plot is Made)
+plt = headlessMode.lazyPyplot()
 
 
 class plot:
@@ -273,51 +283,45 @@ class plot:
 # ---------------------------------------------------------------------------#
 # ---------------------------------------------------------------------------#
 
-class signalProcessing:
+class pulseSession:
+    """
+    The State of One Recording's Pulse Analysis (One Subject/Stressor; May Span
+    Several Files). Returned by signalProcessing.analyzePulse; Pass it Back in
+    to Continue the Same Recording with the Next File.
+    The Features and Saved Data are arrayBuffers: Use .view() for the Array.
+    With maxPulsesKept, the Per-Pulse Histories are Instead Deques Holding Only
+    the Last maxPulsesKept Pulses (Constant Memory for Online Analysis).
+    """
     
-    def __init__(self, alreadyFilteredData = False, plotGaussFit = False, plotSeperation = False):
-        """
-        ----------------------------------------------------------------------
-        Input Parameters:
-            alreadyFilteredData: Do Not Reprocess Data That has Already been Processed; Just Extract Features
-            plotSeperation: Display the Indeces Identified as Around Mid-Sysolic Along with the Data
-            plotGaussFit: Display the Gaussian Decomposition of Each Pulse
-        ----------------------------------------------------------------------
-        """        
-        # Program Flags
-        self.plotGaussFit = plotGaussFit                # Plot the Guassian Decomposition
-        self.plotSeperation = plotSeperation            # Plot the First Derivative and Labeled Systolic Peak Location (General)
-        self.alreadyFilteredData = alreadyFilteredData  # If the Data is Already Filtered and Normalize, Do NOT Filter Again
-        
-        # Data Processing Parameters
-        self.minGaussianWidth = 10E-5   # THe Minimum Gaussian Width During Guassian Decomposition
-        self.minPeakIndSep = 10         # The Minimum Points Between the Dicrotic and Tail Peak
-        
-        self.resetGlobalVariables()
-        
-    def resetGlobalVariables(self):
+    def __init__(self, featureNames = None, maxPulsesKept = None):
+        self.maxPulsesKept = maxPulsesKept  # Only Keep the Last Pulses' History (None: Keep Everything)
         # Feature Tracking Parameters
         self.timeOffset = 0             # Store the Time Offset Between Files
-        self.numSecondsAverage = 60     # The Number of Swconds to Consider When Taking the Averaging Data
-        self.incomingPulseTimes = []    # An Ongoing List Representing the Times of Each Pulse's Peak
-        self.heartRateListAverage = []  # An Ongoing List Representing the Heart Rate
+        self.timePoint = None           # The Time of the Pulse Being Analyzed
+        self.incomingPulseTimes = self.createHistory()      # An Ongoing List Representing the Times of Each Pulse's Peak
+        self.heartRateListAverage = self.createHistory()    # An Ongoing List Representing the Heart Rate
         # Feature Lists
-        self.featureListExact = []      # List of Lists of Features; Each Index Represents a Pulse; Each Pulse's List Represents its Features
-        self.featureListAverage = []    # List of Lists of Features Averaged in Time by self.numSecondsAverage; Each Index Represents a Pulse; Each Pulse's List Represents its Features
+        self.featureListExact = arrayBuffer.arrayBuffer(columnNames = featureNames, initialCapacity = 256)    # Each Row Represents a Pulse; Each Column Represents a Feature (The First is the Time)
+        self.featureListAverage = arrayBuffer.arrayBuffer(columnNames = featureNames[1:] if featureNames is not None else None, initialCapacity = 256) # The Features Averaged in Time by numSecondsAverage (No Time Column)
+        self.featureAverager = None     # The Rolling Trimmed Mean Giving featureListAverage (Made at the First Pulse)
+        self.numPulseFeatures = 0       # The Number of Pulses With Extracted Features
+        self.previousGaussParams = {}   # The Last Good Gaussian Decomposition for Each Number of Gaussians (Warm Starts the Next Pulse)
 
         # Peak Seperation Parameters
         self.peakStandard = 0;          # The Max First Deriviative of the Previous Pulse's Systolic Peak
         self.peakStandardInd = 0        # The Index of the Max Derivative in the Previous Pulse's Systolic Peak
-        # Peak Filtering Parameters
-        self.lowPassCutoff = 18         # Low Pass Filter Cutoff; Used on SEPERATED Pulses
+        # Sampling Parameters of the Current File
+        self.samplingFreq = None        # The Sampling Frequency of the Current File
+        self.minPointsPerPulse = None   # The Fewest Points a Pulse Can Have
+        self.maxPointsPerPulse = None   # The Most Points a Pulse Can Have
         
         # Systolic and Diastolic References
         self.systolicPressure0 = None   # The Calibrated Systolic Pressure
         self.diastolicPressure0 = None  # The Calibrated Diastolic Pressure
         self.diastolicPressure = None   # The Current Diastolic Pressure
         self.systolicPressure = None   # The Current Systolic Pressure
-        self.diastolicPressureList = []
-        self.systolicPressureList = []
+        self.diastolicPressureList = self.createHistory()
+        self.systolicPressureList = self.createHistory()
         # Systolic and Diastolic Calibration
         self.calibratedSystolicAmplitude = None    # The Average Amplitude for the Calibrated Systolic/Diastolic Pressure
         self.calibratedSystolicAmplitudeList = []  # A List of Systolic Amplitudes for the Calibration
@@ -326,48 +330,144 @@ class signalProcessing:
         self.diastolicPressureInitialList = []
         
         # Save Each Filtered Pulse
-        self.time = []
-        self.signalData = []
-        self.filteredData = []
+        self.time = arrayBuffer.arrayBuffer()
+        self.signalData = arrayBuffer.arrayBuffer()
+        self.filteredData = arrayBuffer.arrayBuffer()
+        
+        # Bounded Feature Histories
+        if maxPulsesKept is not None:
+            self.featureListExact = self.createHistory()
+            self.featureListAverage = self.createHistory()
+
+    def createHistory(self):
+        """ A List Growing by One Item per Pulse (Bounded if maxPulsesKept) """
+        if self.maxPulsesKept is None:
+            return []
+        return deque(maxlen = self.maxPulsesKept)
 
     def setPressureCalibration(self, systolicPressure0, diastolicPressure0):
         self.systolicPressure0 = systolicPressure0    # The Calibrated Systolic Pressure
         self.diastolicPressure0 = diastolicPressure0  # The Calibrated Diastolic Pressure
+    
+    def calibrateAmplitude(self, normalizedPulse):
+        return normalizedPulse*self.conversionSlope
+    
+    def calibratePressure(self, capacitancePoint):
+        return self.conversionSlope*capacitancePoint + self.calibratedZero
+
+# ---------------------------------------------------------------------------#
+# ---------------------------------------------------------------------------#
+
+class signalProcessing:
+    
+    def __init__(self, alreadyFilteredData = False, plotGaussFit = False, plotSeperation = False, batchFilterPulses = False, gaussDecompMethod = "lmfit"):
+        """
+        ----------------------------------------------------------------------
+        Input Parameters:
+            alreadyFilteredData: Do Not Reprocess Data That has Already been Processed; Just Extract Features
+            plotSeperation: Display the Indeces Identified as Around Mid-Sysolic Along with the Data
+            plotGaussFit: Display the Gaussian Decomposition of Each Pulse
+            batchFilterPulses: Filter All the Pulses in a File Together (Pulses of the Same Length Share Each Filter Call)
+            gaussDecompMethod: How gausDecomp Fits the Gaussians: "lmfit" (Powell) or "leastSquares" (Analytic Jacobian, Warm Started).
+                               Not a Feature Parameter: analyzePulse Does Not Call gausDecomp
+        ----------------------------------------------------------------------
+        """        
+        # Program Flags
+        self.plotGaussFit = plotGaussFit                # Plot the Guassian Decomposition
+        self.plotSeperation = plotSeperation            # Plot the First Derivative and Labeled Systolic Peak Location (General)
+        self.alreadyFilteredData = alreadyFilteredData  # If the Data is Already Filtered and Normalize, Do NOT Filter Again
+        self.batchFilterPulses = batchFilterPulses      # Filter the Pulses as 2D Arrays (Same Results up to Float Rounding in the Baseline Fit)
+        self.gaussDecompMethod = gaussDecompMethod      # The Gaussian Decomposition Fitting Method
+        # The Least Squares Fits of the Four Pulse Gaussians, and Five With an Extra Tail Gaussian (Read Only Once Made)
+        self.gaussDecompositions = {numGaussians: gaussianFitting.gaussianDecomposition(numGaussians) for numGaussians in [4, 5]}
+        
+        # Data Processing Parameters
+        self.minGaussianWidth = 10E-5   # THe Minimum Gaussian Width During Guassian Decomposition
+        self.minPeakIndSep = 10         # The Minimum Points Between the Dicrotic and Tail Peak
+        self.numSecondsAverage = 60     # The Number of Swconds to Consider When Taking the Averaging Data
+        # Peak Filtering Parameters
+        self.lowPassCutoff = 18         # Low Pass Filter Cutoff; Used on SEPERATED Pulses
+        
+        # NOTE: The Protocol Only Holds the Configuration; Everything Tracked While
+        #   Analyzing a Recording Lives in its pulseSession, so One Protocol Can
+        #   Analyze Many Recordings at Once (Threads or Processes).
+
+    def getAnalysisParameters(self):
+        """ The Parameters That Change the Extracted Features (Used to Fingerprint Saved Features) """
+        return {"alreadyFilteredData": self.alreadyFilteredData, "minGaussianWidth": self.minGaussianWidth, "minPeakIndSep": self.minPeakIndSep,
+                "numSecondsAverage": self.numSecondsAverage, "lowPassCutoff": self.lowPassCutoff, "batchFilterPulses": self.batchFilterPulses}
+
+    def createSession(self, featureNames = None):
+        """ A New Recording to Analyze (Pass into analyzePulse); featureNames Label the Feature Columns """
+        return pulseSession(featureNames)
+    
+    def createStream(self, samplingFreq, minBPM = 30, maxBPM = 180, calibrationSeconds = 60, featureNames = None):
+        """ A New Online Recording: push() Samples as They Arrive (See pulseStream) """
+        return pulseStream(self, samplingFreq, minBPM, maxBPM, calibrationSeconds, featureNames)
         
     def convertToOddInt(self, x):
         return 2*math.floor((x+1)/2) - 1
         
-    def seperatePulses(self, time, firstDer):
-        self.peakStandardInd = 0
-        # Take First Derivative of Smoothened Data
-        systolicPeaks = [];
-        for pointInd in range(len(firstDer)):
-            # Calcuate the Derivative at pointInd
-            firstDerVal = firstDer[pointInd]
+    def seperatePulses(self, time, firstDer, analysisSession):
+        """
+        Find the Systolic Upstroke (Max First Derivative) of Each Pulse. Vectorized
+        Version of the Point by Point Search (Same Peaks and Session State; Checked in
+        tests/test_seperatePulses.py): Instead of Walking Every Point, Each Step Jumps
+        to the Next Point That Changes the State.
+            1) Before the Peaks Can Start, the Standard is the Largest Derivative Seen.
+            2) A New Peak is the First Point Above Half the Standard, Once minPointsPerPulse
+               Past the Last Peak.
+            3) Within minPointsPerPulse of the Last Peak, a Larger Derivative Replaces It
+               (and Restarts the Window).
+        """
+        firstDer = np.asarray(firstDer); numPoints = len(firstDer)
+        minPointsPerPulse = analysisSession.minPointsPerPulse
+        analysisSession.peakStandardInd = 0
+        systolicPeaks = []
+        
+        # The First Point Where the Peaks Can Start (the Time Increases)
+        canStartPeaks = np.arange(numPoints) > minPointsPerPulse
+        if analysisSession.timeOffset == 0:
+            canStartPeaks &= np.asarray(time) > 1.5
+        startPeakInd = int(np.argmax(canStartPeaks)) if canStartPeaks.any() else numPoints
+        # Use the First Few Peaks as a Standard
+        if startPeakInd != 0:
+            analysisSession.peakStandard = max(analysisSession.peakStandard, np.fmax.reduce(firstDer[0:startPeakInd]))
+        
+        # Find the First Peak
+        pointInd = self.findFirstAbove(firstDer, analysisSession.peakStandard*0.5, startPeakInd)
+        while pointInd is not None:
+            # Save the New Peak
+            systolicPeaks.append(pointInd)
+            analysisSession.peakStandardInd = pointInd
+            analysisSession.peakStandard = firstDer[pointInd]
             
-            # If the Derivative Stands Out, Its the Systolic Peak
-            if firstDerVal > self.peakStandard*0.5:
-                
-                # Use the First Few Peaks as a Standard
-                if (self.timeOffset != 0 or 1.5 < time[pointInd]) and self.minPointsPerPulse < pointInd:
-                    # If the Point is Sufficiently Far Away, its a New R-Peak
-                    if self.peakStandardInd + self.minPointsPerPulse < pointInd:
-                        systolicPeaks.append(pointInd)
-                    # Else, Find the Max of the Peak
-                    elif firstDer[systolicPeaks[-1]] < firstDer[pointInd]:
-                        systolicPeaks[-1] = pointInd
-                    # Else, Dont Update Pointer
-                    else:
-                        continue
-                    self.peakStandardInd = pointInd
-                    self.peakStandard = firstDerVal
-                else:
-                    self.peakStandard = max(self.peakStandard, firstDerVal)
-
-        return systolicPeaks
+            # Move the Peak to the Max Derivative: Each Larger Point Restarts the Window
+            while True:
+                searchWindow = firstDer[analysisSession.peakStandardInd+1:analysisSession.peakStandardInd+minPointsPerPulse+1]
+                if len(searchWindow) == 0: break
+                maxWindowInd = np.argmax(searchWindow)
+                if not searchWindow[maxWindowInd] > analysisSession.peakStandard: break
+                analysisSession.peakStandardInd += int(maxWindowInd) + 1
+                analysisSession.peakStandard = searchWindow[maxWindowInd]
+            systolicPeaks[-1] = analysisSession.peakStandardInd
+            
+            # If the Point is Sufficiently Far Away, its a New R-Peak
+            pointInd = self.findFirstAbove(firstDer, analysisSession.peakStandard*0.5, analysisSession.peakStandardInd + minPointsPerPulse + 1)
         
+        return systolicPeaks
+    
+    def findFirstAbove(self, data, threshold, startInd):
+        """ The First Index >= startInd Where data > threshold (None if There is None); Searched in Growing Blocks """
+        blockSize = 256
+        while startInd < len(data):
+            aboveThreshold = data[startInd:startInd + blockSize] > threshold
+            if aboveThreshold.any():
+                return startInd + int(np.argmax(aboveThreshold))
+            startInd += blockSize; blockSize *= 2
+        return None
     
-    def analyzePulse(self, time, signalData, minBPM = 27, maxBPM = 480):
+    def analyzePulse(self, time, signalData, minBPM = 27, maxBPM = 480, analysisSession = None):
         """
         ----------------------------------------------------------------------
         Input Parameters:
@@ -375,38 +475,44 @@ class signalProcessing:
             signalData:  yData-Axis Data for Blood Pulse (Capacitance)
             minBPM = Minimum Beats Per Minute Possible. 27 BPM is the lowest recorded; 30 is a good threshold
             maxBPM: Maximum Beats Per Minute Possible. 480 is the maximum recorded. 220 is a good threshold
+            analysisSession: The Recording This File Continues (None: Start a New Recording)
+        Output Parameters:
+            analysisSession: The Recording's pulseSession, Holding Its Features and Filtered Data
         Use Case: Seperate the Pulses, Gaussian Decompositions, Feature Extraction
         ----------------------------------------------------------------------
         """       
+        # Start a New Recording if None Given
+        if analysisSession is None:
+            analysisSession = self.createSession()
+        
         print("\nSeperating Pulse Data")
         # ------------------------- Set Up Analysis ------------------------- #
         # Calculate the Sampling Frequency, if None Present
-        self.samplingFreq = len(signalData)/(time[-1]-time[0])
-        print("\tSampling Frequency: " + str(self.samplingFreq))
+        analysisSession.samplingFreq = len(signalData)/(time[-1]-time[0])
+        print("\tSampling Frequency: " + str(analysisSession.samplingFreq))
   
         # Estimate that Defines the Number of Points in a Pulse
-        self.minPointsPerPulse = math.floor(self.samplingFreq*60/maxBPM)
-        self.maxPointsPerPulse = math.ceil(self.samplingFreq*60/minBPM)
+        analysisSession.minPointsPerPulse = math.floor(analysisSession.samplingFreq*60/maxBPM)
+        analysisSession.maxPointsPerPulse = math.ceil(analysisSession.samplingFreq*60/minBPM)
         
         # Save the Data
-        previousData = len(self.time)
-        self.time.extend(time + self.timeOffset)
-        self.signalData.extend(signalData)
-        self.filteredData.extend([0]*len(time))
+        analysisSession.time.extend(time + analysisSession.timeOffset)
+        analysisSession.signalData.extend(signalData)
+        filteredData = analysisSession.filteredData.extendEmpty(len(time))
         # ------------------------------------------------------------------- #
 
         # ------------------------- Seperate Pulses ------------------------- #
         # Calculate Derivatives
-        firstDer = savgol_filter(signalData, 9, 2, mode='nearest', delta=1/self.samplingFreq, deriv=1)
+        firstDer = savgol_filter(signalData, 9, 2, mode='nearest', delta=1/analysisSession.samplingFreq, deriv=1)
         # Take First Derivative of Smoothened Data
-        systolicPeaks = self.seperatePulses(time, firstDer)
+        systolicPeaks = self.seperatePulses(time, firstDer, analysisSession)
         # If no Systolic peaks found, it is likely there was a noise artifact with a high derivative
         while len(systolicPeaks) == 0:
-            self.peakStandard = self.peakStandard/2;
-            systolicPeaks = self.seperatePulses(time, firstDer)
+            analysisSession.peakStandard = analysisSession.peakStandard/2;
+            systolicPeaks = self.seperatePulses(time, firstDer, analysisSession)
         
         # If Questioning: Plot to See How the Pulses Seperated
-        if self.plotSeperation:
+        if self.plotSeperation and not headlessMode.isHeadless():
             systolicPeaks = np.array(systolicPeaks); firstDer = np.array(firstDer)
             scaledData = signalData*max(np.abs(firstDer))/(max(signalData) - min(signalData))
             plt.figure()
@@ -422,115 +528,201 @@ class signalProcessing:
         # -------------------------- Pulse Analysis ------------------------- #
         print("\tAnalyzing Pulses")
         # Seperate Peaks Based on the Minimim Before the R-Peak Rise
-        pulseStartInd = self.findNearbyMinimum(signalData, systolicPeaks[0], binarySearchWindow=-1, maxPointsSearch=self.maxPointsPerPulse)
+        signalSearch = extremaSearch.searchSignal(signalData)
+        pulseBoundaries = [self.findNearbyMinimum(signalSearch, systolicPeak, binarySearchWindow=-1, maxPointsSearch=analysisSession.maxPointsPerPulse) for systolicPeak in systolicPeaks]
+        # Filter All the Good Pulses at Once
+        if self.batchFilterPulses:
+            goodPulses = [(startInd, endInd) for startInd, endInd in zip(pulseBoundaries[:-1], pulseBoundaries[1:]) if analysisSession.minPointsPerPulse <= endInd - startInd <= analysisSession.maxPointsPerPulse]
+            filteredPulses = self.filterPulses(signalData, goodPulses, analysisSession.samplingFreq)
+        
+        pulseStartInd = pulseBoundaries[0]
         for pulseNum in range(1, len(systolicPeaks)):
-            pulseEndInd = self.findNearbyMinimum(signalData, systolicPeaks[pulseNum], binarySearchWindow=-1, maxPointsSearch=self.maxPointsPerPulse)
-            self.timePoint = time[pulseEndInd] + self.timeOffset
+            pulseEndInd = pulseBoundaries[pulseNum]
+            analysisSession.timePoint = time[pulseEndInd] + analysisSession.timeOffset
+            # Calculate Heart Rate
+            self.updateHeartRate(analysisSession)
             
-            # -------------------- Calculate Heart Rate --------------------- #
-            # Save the Pulse's Time
-            self.incomingPulseTimes.append(self.timePoint)
-                        
-            # Average Heart Rate in Time
-            numPulsesAverage = len(self.incomingPulseTimes) - bisect(self.incomingPulseTimes, self.timePoint - self.numSecondsAverage)
-            self.heartRateListAverage.append(numPulsesAverage*60/self.numSecondsAverage)
-            # --------------------------------------------------------------- #
-            
-            # ---------------------- Cull Bad Pulses ------------------------ #
-            # Check if the Pulse is Too Big: Likely Double Pulse
-            if pulseEndInd - pulseStartInd > self.maxPointsPerPulse:
-                print("Pulse Too Big; THIS SHOULDNT HAPPEN")
-                pulseStartInd = pulseEndInd; continue
-            # Check if the Pulse is Too Small; Likely Not an R-Peak
-            elif pulseEndInd - pulseStartInd < self.minPointsPerPulse:
-                print("Pulse Too Small; THIS SHOULDNT HAPPEN")
+            # Cull Bad Pulses
+            if not self.isPulseLengthGood(pulseEndInd - pulseStartInd, analysisSession):
                 pulseStartInd = pulseEndInd; continue
-            # --------------------------------------------------------------- #
             
-            # ----------------------- Filter the Pulse ---------------------- #
-            # Extract Indivisual Pulse Data
-            pulseData = signalData[pulseStartInd:pulseEndInd+1]
-            # Filter the pulse, if not already filtered
-            if not self.alreadyFilteredData:
-                # Apply Low Pass Filter and then Smoothing Function
-                pulseData = self.butterFilter(pulseData, self.lowPassCutoff, self.samplingFreq, order = 3, filterType = 'low')
-                pulseData = savgol_filter(pulseData, self.convertToOddInt(len(pulseData)/8), 2, mode='nearest')
-            # --------------------------------------------------------------- #
-
-            # ------------------ PreProcess the Pulse Data ------------------ #
-            # Calculate the Pulse Derivatives
+            # ------------------ Filter and PreProcess the Pulse ------------------ #
             pulseTime = time[pulseStartInd:pulseEndInd+1] - time[pulseStartInd]
-            pulseVelocity = savgol_filter(pulseData, 3, 2, mode='interp', delta=1/self.samplingFreq, deriv=1)
-            pulseAcceleration = savgol_filter(pulseData, 3, 2, mode='interp', delta=1/self.samplingFreq, deriv=2)
-            thirdDeriv = savgol_filter(pulseAcceleration, 3, 1, mode='interp', delta=1/self.samplingFreq, deriv=1)
-
-            # Normalize the Pulse's Baseline to Zero
-            normalizedPulse = pulseData.copy()
-            if not self.alreadyFilteredData:
-                normalizedPulse = self.normalizePulseBaseline(normalizedPulse, polynomialDegree = 1)
-            
-            # Calculate Diastolic and Systolic Reference of the First Pulse (IF NO REFERENCE GIVEN)
-            if not self.diastolicPressure0:
-                diastolicPressure0 = pulseData[0]
-                systolicPressure0 = self.findNearbyMaximum(signalData, systolicPeaks[pulseNum-1], binarySearchWindow=1, maxPointsSearch=self.maxPointsPerPulse)
-                self.setPressureCalibration(systolicPressure0, diastolicPressure0)
-            # --------------------------------------------------------------- #
-            
-            # -------------------- Extract Pulse Features ------------------- #
-            if self.calibratedSystolicAmplitude != None:
-                # Calculate the Diastolic Pressure
-                self.diastolicPressure = self.calibratePressure(pulseData[0])
-                self.systolicPressure = self.calibratePressure(max(pulseData))
-                self.systolicPressureList.append(self.systolicPressure)
-                self.diastolicPressureList.append(self.diastolicPressure)
-                
-                normalizedPulse = self.calibrateAmplitude(normalizedPulse)
-                self.filteredData[previousData+pulseStartInd:previousData+pulseEndInd+1] = normalizedPulse
-                # Label Systolic, Tidal Wave, Dicrotic, and Tail Wave Peaks Using Gaussian Decomposition   
-                self.extractPulsePeaks(pulseTime, normalizedPulse, pulseVelocity, pulseAcceleration, thirdDeriv)
+            # Filter the Pulse, Calculate the Pulse Derivatives, and Normalize the Pulse's Baseline to Zero
+            if self.batchFilterPulses:
+                pulseData, pulseVelocity, pulseAcceleration, thirdDeriv, normalizedPulse = filteredPulses[pulseStartInd]
             else:
-                self.diastolicPressureInitialList.append(pulseData[0])
-                self.calibratedSystolicAmplitudeList.append(max(normalizedPulse) - normalizedPulse[0])
-            # --------------------------------------------------------------- #
+                pulseData, pulseVelocity, pulseAcceleration, thirdDeriv, normalizedPulse = self.filterPulse(signalData[pulseStartInd:pulseEndInd+1], analysisSession.samplingFreq)
+            
+            # Calibrate the Pressure and Extract the Pulse's Features
+            findSystolicPressure0 = lambda: self.findNearbyMaximum(signalSearch, systolicPeaks[pulseNum-1], binarySearchWindow=1, maxPointsSearch=analysisSession.maxPointsPerPulse)
+            normalizedPulse = self.analyzeFilteredPulse(pulseTime, pulseData, pulseVelocity, pulseAcceleration, thirdDeriv, normalizedPulse, findSystolicPressure0, analysisSession)
+            if normalizedPulse is not None:
+                filteredData[pulseStartInd:pulseEndInd+1] = normalizedPulse
             
             # Reste for Next Pulse
             pulseStartInd = pulseEndInd
         # ------------------------------------------------------------------- #
-        self.timeOffset += time[-1]
+        analysisSession.timeOffset += time[-1]
         
-        if self.calibratedSystolicAmplitude == None:
-            self.calibratedSystolicAmplitude = np.mean(self.calibratedSystolicAmplitudeList)
-            self.conversionSlope = (self.systolicPressure0 - self.diastolicPressure0)/self.calibratedSystolicAmplitude
-            self.calibratedZero = self.diastolicPressure0 - self.conversionSlope*np.mean(self.diastolicPressureInitialList)
+        # The First File Calibrates the Pressure
+        if analysisSession.calibratedSystolicAmplitude == None:
+            self.finishCalibration(analysisSession)
         
-        # plt.plot(self.heartRateListAverage, 'k-', linewidth=2)
+        # plt.plot(analysisSession.heartRateListAverage, 'k-', linewidth=2)
         # plt.ylim(60, 100)
         # plt.show()
+        
+        return analysisSession
     
-    def calibrateAmplitude(self, normalizedPulse):
-        return normalizedPulse*self.conversionSlope
+    def updateHeartRate(self, analysisSession):
+        """ Add the Pulse at analysisSession.timePoint to the Heart Rate """
+        # Save the Pulse's Time
+        analysisSession.incomingPulseTimes.append(analysisSession.timePoint)
+                    
+        # Average Heart Rate in Time
+        numPulsesAverage = len(analysisSession.incomingPulseTimes) - bisect(analysisSession.incomingPulseTimes, analysisSession.timePoint - self.numSecondsAverage)
+        analysisSession.heartRateListAverage.append(numPulsesAverage*60/self.numSecondsAverage)
     
-    def calibratePressure(self, capacitancePoint):
-        return self.conversionSlope*capacitancePoint + self.calibratedZero
+    def isPulseLengthGood(self, numPulsePoints, analysisSession):
+        # Check if the Pulse is Too Big: Likely Double Pulse
+        if numPulsePoints > analysisSession.maxPointsPerPulse:
+            print("Pulse Too Big; THIS SHOULDNT HAPPEN")
+            return False
+        # Check if the Pulse is Too Small; Likely Not an R-Peak
+        elif numPulsePoints < analysisSession.minPointsPerPulse:
+            print("Pulse Too Small; THIS SHOULDNT HAPPEN")
+            return False
+        return True
     
-    def extractPulsePeaks(self, pulseTime, normalizedPulse, pulseVelocity, pulseAcceleration, thirdDeriv):
+    def analyzeFilteredPulse(self, pulseTime, pulseData, pulseVelocity, pulseAcceleration, thirdDeriv, normalizedPulse, findSystolicPressure0, analysisSession):
+        """
+        ----------------------------------------------------------------------
+        Input Parameters:
+            pulseTime, ..., normalizedPulse: One Pulse as Returned by filterPulse (pulseTime Starts at Zero)
+            findSystolicPressure0: Returns the Systolic Reference if the Pulse Sets it (No Reference Given)
+            analysisSession: The Recording's pulseSession
+        Output Parameters:
+            normalizedPulse: The Calibrated Pulse (None While Calibrating the Pressure)
+        Use Case: Calibrate the Pressure or Extract the Features of a Seperated, Filtered Pulse
+        ----------------------------------------------------------------------
+        """
+        # Calculate Diastolic and Systolic Reference of the First Pulse (IF NO REFERENCE GIVEN)
+        if not analysisSession.diastolicPressure0:
+            diastolicPressure0 = pulseData[0]
+            systolicPressure0 = findSystolicPressure0()
+            analysisSession.setPressureCalibration(systolicPressure0, diastolicPressure0)
+        
+        # Collect the Pressure Calibration
+        if analysisSession.calibratedSystolicAmplitude == None:
+            analysisSession.diastolicPressureInitialList.append(pulseData[0])
+            analysisSession.calibratedSystolicAmplitudeList.append(max(normalizedPulse) - normalizedPulse[0])
+            return None
+        
+        # Calculate the Diastolic Pressure
+        analysisSession.diastolicPressure = analysisSession.calibratePressure(pulseData[0])
+        analysisSession.systolicPressure = analysisSession.calibratePressure(max(pulseData))
+        analysisSession.systolicPressureList.append(analysisSession.systolicPressure)
+        analysisSession.diastolicPressureList.append(analysisSession.diastolicPressure)
+        
+        normalizedPulse = analysisSession.calibrateAmplitude(normalizedPulse)
+        # Label Systolic, Tidal Wave, Dicrotic, and Tail Wave Peaks Using Gaussian Decomposition   
+        self.extractPulsePeaks(pulseTime, normalizedPulse, pulseVelocity, pulseAcceleration, thirdDeriv, analysisSession)
+        return normalizedPulse
+    
+    def finishCalibration(self, analysisSession):
+        """ Convert the Collected Calibration Pulses into the Pressure Calibration """
+        analysisSession.calibratedSystolicAmplitude = np.mean(analysisSession.calibratedSystolicAmplitudeList)
+        analysisSession.conversionSlope = (analysisSession.systolicPressure0 - analysisSession.diastolicPressure0)/analysisSession.calibratedSystolicAmplitude
+        analysisSession.calibratedZero = analysisSession.diastolicPressure0 - analysisSession.conversionSlope*np.mean(analysisSession.diastolicPressureInitialList)
+    
+    def filterPulse(self, pulseData, samplingFreq):
+        """ Filter One Pulse; Returns the Filtered Pulse, its Three Derivatives, and the Baseline-Normalized Pulse """
+        # Filter the pulse, if not already filtered
+        if not self.alreadyFilteredData:
+            # Apply Low Pass Filter and then Smoothing Function
+            pulseData = self.butterFilter(pulseData, self.lowPassCutoff, samplingFreq, order = 3, filterType = 'low')
+            pulseData = savgol_filter(pulseData, self.convertToOddInt(len(pulseData)/8), 2, mode='nearest')
+
+        # Calculate the Pulse Derivatives
+        pulseVelocity = savgol_filter(pulseData, 3, 2, mode='interp', delta=1/samplingFreq, deriv=1)
+        pulseAcceleration = savgol_filter(pulseData, 3, 2, mode='interp', delta=1/samplingFreq, deriv=2)
+        thirdDeriv = savgol_filter(pulseAcceleration, 3, 1, mode='interp', delta=1/samplingFreq, deriv=1)
+
+        # Normalize the Pulse's Baseline to Zero
+        normalizedPulse = pulseData.copy()
+        if not self.alreadyFilteredData:
+            normalizedPulse = self.normalizePulseBaseline(normalizedPulse, polynomialDegree = 1)
+        
+        return pulseData, pulseVelocity, pulseAcceleration, thirdDeriv, normalizedPulse
+    
+    def filterPulses(self, signalData, pulseBounds, samplingFreq):
+        """
+        Batched filterPulse: Pulses of the Same Length are Stacked into a 2D Array
+        and Each Filter Runs Once Along the Time Axis.
+        ----------------------------------------------------------------------
+        Input Parameters:
+            signalData: The File's Data
+            pulseBounds: The (Start Index, End Index) of Each Pulse to Filter
+            samplingFreq: The Sampling Frequency of the File
+        Output Parameters:
+            filteredPulses: {pulseStartInd: filterPulse's Output for the Pulse}
+        ----------------------------------------------------------------------
+        """
+        # Group the Pulses by Length
+        pulseGroups = {}
+        for pulseStartInd, pulseEndInd in pulseBounds:
+            pulseGroups.setdefault(pulseEndInd - pulseStartInd + 1, []).append(pulseStartInd)
+        lowPassSOS = self.butterParams(self.lowPassCutoff, samplingFreq, order = 3, filterType = 'low')
+        
+        filteredPulses = {}
+        for pulseLength, pulseStartInds in pulseGroups.items():
+            # Stack the Pulses: Each Row is a Pulse
+            pulseData = signalData[np.array(pulseStartInds)[:, None] + np.arange(pulseLength)]
+            # Filter the pulses, if not already filtered
+            if not self.alreadyFilteredData:
+                pulseData = scipy.signal.sosfiltfilt(lowPassSOS, pulseData, axis = -1)
+                pulseData = savgol_filter(pulseData, self.convertToOddInt(pulseLength/8), 2, mode='nearest', axis = -1)
+            
+            # Calculate the Pulse Derivatives
+            pulseVelocity = savgol_filter(pulseData, 3, 2, mode='interp', delta=1/samplingFreq, deriv=1, axis = -1)
+            pulseAcceleration = savgol_filter(pulseData, 3, 2, mode='interp', delta=1/samplingFreq, deriv=2, axis = -1)
+            thirdDeriv = savgol_filter(pulseAcceleration, 3, 1, mode='interp', delta=1/samplingFreq, deriv=1, axis = -1)
+            
+            # Normalize the Pulses' Baselines to Zero
+            normalizedPulse = pulseData.copy()
+            if not self.alreadyFilteredData:
+                normalizedPulse = self.normalizePulseBaselines(normalizedPulse, polynomialDegree = 1)
+            
+            for pulseInd, pulseStartInd in enumerate(pulseStartInds):
+                filteredPulses[pulseStartInd] = (pulseData[pulseInd], pulseVelocity[pulseInd], pulseAcceleration[pulseInd], thirdDeriv[pulseInd], normalizedPulse[pulseInd])
+        
+        return filteredPulses
+    
+    def extractPulsePeaks(self, pulseTime, normalizedPulse, pulseVelocity, pulseAcceleration, thirdDeriv, analysisSession):
+        
+        # Prepare the Pulse and its Derivatives for the Extrema Searches
+        pulseSearch = extremaSearch.searchSignal(normalizedPulse)
+        velocitySearch = extremaSearch.searchSignal(pulseVelocity)
+        accelerationSearch = extremaSearch.searchSignal(pulseAcceleration)
+        thirdDerivSearch = extremaSearch.searchSignal(thirdDeriv)
         
         # ----------------------- Detect Systolic Peak ---------------------- #        
         # Find Systolic Peak
-        systolicPeakInd = self.findNearbyMaximum(normalizedPulse, 0, binarySearchWindow = 4, maxPointsSearch = len(pulseTime))
+        systolicPeakInd = self.findNearbyMaximum(pulseSearch, 0, binarySearchWindow = 4, maxPointsSearch = len(pulseTime))
         # Find UpStroke Peaks
-        systolicUpstrokeVelInd = self.findNearbyMaximum(pulseVelocity, 0, binarySearchWindow = 1, maxPointsSearch = systolicPeakInd)
-        systolicUpstrokeAccelMaxInd = self.findNearbyMaximum(pulseAcceleration, systolicUpstrokeVelInd, binarySearchWindow = -1, maxPointsSearch = systolicPeakInd)
-        systolicUpstrokeAccelMinInd = self.findNearbyMinimum(pulseAcceleration, systolicUpstrokeVelInd, binarySearchWindow = 1, maxPointsSearch = systolicPeakInd)
+        systolicUpstrokeVelInd = self.findNearbyMaximum(velocitySearch, 0, binarySearchWindow = 1, maxPointsSearch = systolicPeakInd)
+        systolicUpstrokeAccelMaxInd = self.findNearbyMaximum(accelerationSearch, systolicUpstrokeVelInd, binarySearchWindow = -1, maxPointsSearch = systolicPeakInd)
+        systolicUpstrokeAccelMinInd = self.findNearbyMinimum(accelerationSearch, systolicUpstrokeVelInd, binarySearchWindow = 1, maxPointsSearch = systolicPeakInd)
         # ------------------------------------------------------------------- #
                 
         # ---------------------- Detect Tidal Wave Peak --------------------- #     
-        bufferToTidal = self.findNearbyMaximum(thirdDeriv, systolicPeakInd+2, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))
+        bufferToTidal = self.findNearbyMaximum(thirdDerivSearch, systolicPeakInd+2, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))
         # Find Tidal Peak Boundaries
         tidalStartInd = bufferToTidal + np.where(np.diff(np.sign(thirdDeriv[bufferToTidal:])))[0][0]
-        tidalEndInd_Estimate = self.findNearbyMaximum(pulseAcceleration, tidalStartInd, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))
-        tidalEndInd_Estimate = self.findNearbyMinimum(pulseAcceleration, tidalEndInd_Estimate, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))
-        tidalEndInd_Estimate = self.findNearbyMaximum(thirdDeriv, tidalEndInd_Estimate, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))        
+        tidalEndInd_Estimate = self.findNearbyMaximum(accelerationSearch, tidalStartInd, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))
+        tidalEndInd_Estimate = self.findNearbyMinimum(accelerationSearch, tidalEndInd_Estimate, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))
+        tidalEndInd_Estimate = self.findNearbyMaximum(thirdDerivSearch, tidalEndInd_Estimate, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))        
         # Find Tidal Peak
         tidalVelocity_ZeroCrossings = tidalStartInd + np.where(np.diff(np.sign(pulseVelocity[tidalStartInd:tidalEndInd_Estimate])))[0]
         tidalAccel_ZeroCrossings = tidalStartInd + np.where(np.diff(np.sign(pulseAcceleration[tidalStartInd:tidalEndInd_Estimate])))[0]
@@ -542,24 +734,24 @@ class signalProcessing:
             tidalPeakInd = tidalAccel_ZeroCrossings[0] + 1
         # Find Third Derivative Minimum -> Closest First Derivative to Zero
         else:
-            tidalEndInd_Estimate = self.findNearbyMinimum(thirdDeriv, tidalEndInd_Estimate, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
-            tidalEndInd_Estimate = self.findNearbyMaximum(thirdDeriv, tidalEndInd_Estimate, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
-            dicroticNotchInd_Estimate = self.findNearbyMinimum(normalizedPulse, tidalEndInd_Estimate, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))   
-            tidalEndInd_Estimate = self.findNearbyMinimum(thirdDeriv, dicroticNotchInd_Estimate, binarySearchWindow = -2, maxPointsSearch = int(len(pulseTime)/2))
-            tidalEndInd_Estimate = self.findNearbyMaximum(thirdDeriv, tidalEndInd_Estimate, binarySearchWindow = -2, maxPointsSearch = int(len(pulseTime)/2))
-            tidalPeakInd = self.findNearbyMinimum(thirdDeriv, tidalEndInd_Estimate, binarySearchWindow = -4, maxPointsSearch = int(len(pulseTime)/2))
+            tidalEndInd_Estimate = self.findNearbyMinimum(thirdDerivSearch, tidalEndInd_Estimate, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
+            tidalEndInd_Estimate = self.findNearbyMaximum(thirdDerivSearch, tidalEndInd_Estimate, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
+            dicroticNotchInd_Estimate = self.findNearbyMinimum(pulseSearch, tidalEndInd_Estimate, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))   
+            tidalEndInd_Estimate = self.findNearbyMinimum(thirdDerivSearch, dicroticNotchInd_Estimate, binarySearchWindow = -2, maxPointsSearch = int(len(pulseTime)/2))
+            tidalEndInd_Estimate = self.findNearbyMaximum(thirdDerivSearch, tidalEndInd_Estimate, binarySearchWindow = -2, maxPointsSearch = int(len(pulseTime)/2))
+            tidalPeakInd = self.findNearbyMinimum(thirdDerivSearch, tidalEndInd_Estimate, binarySearchWindow = -4, maxPointsSearch = int(len(pulseTime)/2))
         # Find Tidal Peak Ending
-        tidalEndInd = self.findNearbyMinimum(thirdDeriv, tidalPeakInd, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
-        tidalEndInd = self.findNearbyMaximum(thirdDeriv, tidalEndInd, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
+        tidalEndInd = self.findNearbyMinimum(thirdDerivSearch, tidalPeakInd, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
+        tidalEndInd = self.findNearbyMaximum(thirdDerivSearch, tidalEndInd, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
         # ------------------------------------------------------------------- #
         
         # ----------------------  Detect Dicrotic Peak ---------------------- #
-        dicroticNotchInd = self.findNearbyMinimum(normalizedPulse, tidalEndInd, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))
-        dicroticPeakInd = self.findNearbyMaximum(normalizedPulse, dicroticNotchInd, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))
+        dicroticNotchInd = self.findNearbyMinimum(pulseSearch, tidalEndInd, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))
+        dicroticPeakInd = self.findNearbyMaximum(pulseSearch, dicroticNotchInd, binarySearchWindow = 1, maxPointsSearch = int(len(pulseTime)/2))
         
         # Other Extremas Nearby
-        dicroticInflectionInd = self.findNearbyMaximum(pulseVelocity, dicroticNotchInd, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
-        dicroticFallVelMinInd = self.findNearbyMinimum(pulseVelocity, dicroticInflectionInd, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
+        dicroticInflectionInd = self.findNearbyMaximum(velocitySearch, dicroticNotchInd, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
+        dicroticFallVelMinInd = self.findNearbyMinimum(velocitySearch, dicroticInflectionInd, binarySearchWindow = 2, maxPointsSearch = int(len(pulseTime)/2))
         # ------------------------------------------------------------------- #
         
         def plotIt(badReason = ""):
@@ -588,37 +780,37 @@ class signalProcessing:
             
             plt.plot(pulseTime[[dicroticInflectionInd, dicroticFallVelMinInd]], normalizedPulse1[[dicroticInflectionInd, dicroticFallVelMinInd]],  'bo')
             
-            plt.title("Time: " + str(self.timePoint) + "; " + badReason)
+            plt.title("Time: " + str(analysisSession.timePoint) + "; " + badReason)
             plt.show()
 
         # ------------------------- Cull Bad Pulses ------------------------- #
         # Check The Order of the Systolic Peaks
         if not systolicUpstrokeAccelMaxInd < systolicUpstrokeVelInd < systolicUpstrokeAccelMinInd < systolicPeakInd:
-            print("\t\tBad Systolic Sequence. Time = ", self.timePoint)
+            print("\t\tBad Systolic Sequence. Time = ", analysisSession.timePoint)
             # plotIt("SYSTOLIC")
             return None
         # Check The Order of the Tidal Peaks
         elif not tidalPeakInd < tidalEndInd:
-            print("\t\tBad Tidal Sequence. Time = ", self.timePoint); 
+            print("\t\tBad Tidal Sequence. Time = ", analysisSession.timePoint); 
             # plotIt("TIDAL")
             return None
         # Check The Order of the Dicrotic Peaks
         elif not dicroticNotchInd < dicroticInflectionInd < dicroticPeakInd < dicroticFallVelMinInd:
-            print("\t\tBad Dicrotic Sequence. Time = ", self.timePoint); 
+            print("\t\tBad Dicrotic Sequence. Time = ", analysisSession.timePoint); 
             # plotIt("DICROTIC")
             return None
         # Check The Order of the Peaks
         elif not systolicPeakInd < tidalEndInd < dicroticNotchInd - 2:
-            print("\t\tBad Peak Sequence. Time = ", self.timePoint); 
+            print("\t\tBad Peak Sequence. Time = ", analysisSession.timePoint); 
             # plotIt("GENERAL")
             return None
         elif pulseTime[dicroticNotchInd] - pulseTime[0] <= 0.25:
-            print("\t\tToo Early Dicrotic. You Probably Missed the Tidal. Time = ", self.timePoint); 
+            print("\t\tToo Early Dicrotic. You Probably Missed the Tidal. Time = ", analysisSession.timePoint); 
             return None
         
         # Check If the Dicrotic Peak was Skipped
         if pulseTime[-1]*0.75 < pulseTime[dicroticPeakInd] - pulseTime[systolicUpstrokeAccelMaxInd]:
-            print("\t\tDicrotic Peak Likely Skipped Over. Time = ", self.timePoint);
+            print("\t\tDicrotic Peak Likely Skipped Over. Time = ", analysisSession.timePoint);
             return None
         # ------------------------------------------------------------------- #
 
@@ -628,14 +820,14 @@ class signalProcessing:
         allDicroticPeaks = [dicroticNotchInd, dicroticInflectionInd, dicroticPeakInd, dicroticFallVelMinInd]
         
         # Extract the Pulse Features
-        self.extractFeatures(normalizedPulse, pulseTime, pulseVelocity, pulseAcceleration, allSystolicPeaks, allTidalPeaks, allDicroticPeaks)
+        self.extractFeatures(normalizedPulse, pulseTime, pulseVelocity, pulseAcceleration, allSystolicPeaks, allTidalPeaks, allDicroticPeaks, analysisSession)
         # ------------------------------------------------------------------- #
         
         # plotClass = plot()
         # plotClass.plotPulseInfo(pulseTime, normalizedPulse/max(normalizedPulse), pulseVelocity/max(pulseVelocity), pulseAcceleration/max(pulseAcceleration), thirdDeriv/max(thirdDeriv), allSystolicPeaks, allTidalPeaks, allDicroticPeaks)
         # plotClass.plotPulseInfo_Amps(pulseTime, normalizedPulse/max(normalizedPulse), pulseVelocity/max(pulseVelocity), pulseAcceleration/max(pulseAcceleration), thirdDeriv/max(thirdDeriv), allSystolicPeaks, allTidalPeaks, allDicroticPeaks, tidalVelocity_ZeroCrossings, tidalAccel_ZeroCrossings)
 
-        if self.plotGaussFit:
+        if self.plotGaussFit and not headlessMode.isHeadless():
             normalizedPulse1 = normalizedPulse/max(normalizedPulse)
             pulseVelocity1 = pulseVelocity/ max(pulseVelocity)
             pulseAcceleration1 = pulseAcceleration/max(pulseAcceleration)
@@ -663,7 +855,7 @@ class signalProcessing:
             
             plt.axhline(y=0, color='k', linestyle='-', alpha = 0.5)
             
-            plt.title("Time: " + str(self.timePoint))
+            plt.title("Time: " + str(analysisSession.timePoint))
             plt.show()
     
     
@@ -672,9 +864,26 @@ class signalProcessing:
         return amplitude * np.exp(-(xData-center)**2 / (2*sigma**2))
             
     
-    def gausDecomp(self, xData, yData, pulsePeakInds, addExtraGauss = False):
-        # https://lmfit.github.io/lmfit-py/builtin_models.html#example-1-fit-peak-data-to-gaussian-lorentzian-and-voigt-profiles
-
+    def gausDecomp(self, xData, yData, pulsePeakInds, addExtraGauss = False, timePoint = None, analysisSession = None):
+        """
+        Decompose the Pulse into its Systolic, Tidal, Dicrotic, and Tail Gaussians (Plus an Extra
+        Tail Gaussian if the Fit is Bad). Returns pulsePeakInds, gaussPeakInds, gaussPeakAmps
+        ([], [], [] if No Fit is Good). The Fit Uses self.gaussDecompMethod:
+            "lmfit": lmfit Models Fit with Powell's Method
+            "leastSquares": Bounded Least Squares with the Analytic Jacobian; Each Pulse Starts
+                            from the Previous Pulse's Solution (Kept in the analysisSession)
+        The Two Methods Give Close, Not Identical, Fits (Amplitudes Differ by up to ~4E-3; Rarely a Peak by 1 Point).
+        NOTE: Currently Unused; analyzePulse/extractPulsePeaks Do Not Decompose the Pulses.
+        """
+        if self.gaussDecompMethod == "leastSquares":
+            return self.gausDecomp_LeastSquares(xData, yData, pulsePeakInds, addExtraGauss, timePoint, analysisSession)
+        elif self.gaussDecompMethod == "lmfit":
+            return self.gausDecomp_Lmfit(xData, yData, pulsePeakInds, addExtraGauss, timePoint)
+        print("No Gaussian Decomposition Method Called:", self.gaussDecompMethod)
+        sys.exit()
+    
+    def gaussDecompParameters(self, xData, yData, pulsePeakInds, addExtraGauss = False):
+        """ The Initial Guess and Bounds of Each Gaussian: Arrays of [amplitude, fwtm, center] per Gaussian """
         peakAmp = []; peakCenter = []; peakWidth = []
         # Extract Guesses About What the Peak Width, Center, and Amplitude Are
         for currentInd in range(1,5):
@@ -690,60 +899,114 @@ class signalProcessing:
             peakCenter.append(xData[peakInd])
             # Get the Peak's Width: Difference Between the Last Two Centers
             peakWidth.append(2*(peakCenter[currentInd-1] - peakCenter[currentInd-2]))
-            
         
-        # Systolic Peak Model
-        gauss1 = Model(self.gaussModel, prefix = "g1_")
-        pars = gauss1.make_params()
-        pars['g1_center'].set(value = xData[pulsePeakInds[1]], min = xData[pulsePeakInds[1]]*.95, max = min(xData[pulsePeakInds[1]]*1.05, 0.99*xData[pulsePeakInds[2]]))
-        pars['g1_fwtm'].set(value = 2*xData[pulsePeakInds[1]], min = self.minGaussianWidth, max = xData[pulsePeakInds[3]])
-        pars['g1_amplitude'].set(value = yData[pulsePeakInds[1]], min = yData[pulsePeakInds[1]]*0.9, max = yData[pulsePeakInds[1]])
-        
-        # Tidal Wave Model
-        gauss2 = Model(self.gaussModel, prefix = "g2_")
-        pars.update(gauss2.make_params())
-        pars['g2_center'].set(value = xData[pulsePeakInds[2]], min = max(xData[pulsePeakInds[2]]*.8, xData[pulsePeakInds[1]]), max = min(xData[pulsePeakInds[2]]*1.2, xData[pulsePeakInds[3]]))
-        pars['g2_fwtm'].set(value = peakWidth[1], min = self.minGaussianWidth, max = 1.1*(peakCenter[2] - peakCenter[0]))
-        pars['g2_amplitude'].set(value = peakAmp[1], min = peakAmp[1]*.8, max = peakAmp[1]*1.05)
-        
-        # Dicrotic Peak Model
-        gauss3 = Model(self.gaussModel, prefix = "g3_")
-        pars.update(gauss3.make_params())
-        pars['g3_center'].set(value = peakCenter[2], min = peakCenter[2]*.9, max =min(peakCenter[2]*1.1, peakCenter[3]))
-        pars['g3_fwtm'].set(value = peakWidth[2], min = self.minGaussianWidth, max = 2*(peakCenter[2] - peakCenter[0]))
-        pars['g3_amplitude'].set(value = peakAmp[2], min = peakAmp[2]*.9, max = peakAmp[2]*1.02)
-        
-        # Tail Wave Model
-        gauss4 = Model(self.gaussModel, prefix = "g4_")
-        pars.update(gauss4.make_params())
-        pars['g4_center'].set(value = peakCenter[3], min = min(peakCenter[2] + 0.5*(peakCenter[2]- peakCenter[1]), peakCenter[3]), max = min(peakCenter[3]*1.1, xData[-1]))
-        pars['g4_fwtm'].set(value = xData[-1] - peakCenter[3], min = self.minGaussianWidth, max = xData[-1] - peakCenter[1])
-        pars['g4_amplitude'].set(value = peakAmp[3], min = peakAmp[3]*.8, max = peakAmp[3]*1.2)
-        
-        # Add Models Together
-        mod = gauss1 + gauss2 + gauss3 + gauss4
+        # Each Gaussian: (Value, Min, Max) of its Amplitude, FWTM, and Center
+        gaussParameters = [
+            # Systolic Peak Model
+            [(yData[pulsePeakInds[1]], yData[pulsePeakInds[1]]*0.9, yData[pulsePeakInds[1]]),
+             (2*xData[pulsePeakInds[1]], self.minGaussianWidth, xData[pulsePeakInds[3]]),
+             (xData[pulsePeakInds[1]], xData[pulsePeakInds[1]]*.95, min(xData[pulsePeakInds[1]]*1.05, 0.99*xData[pulsePeakInds[2]]))],
+            # Tidal Wave Model
+            [(peakAmp[1], peakAmp[1]*.8, peakAmp[1]*1.05),
+             (peakWidth[1], self.minGaussianWidth, 1.1*(peakCenter[2] - peakCenter[0])),
+             (xData[pulsePeakInds[2]], max(xData[pulsePeakInds[2]]*.8, xData[pulsePeakInds[1]]), min(xData[pulsePeakInds[2]]*1.2, xData[pulsePeakInds[3]]))],
+            # Dicrotic Peak Model
+            [(peakAmp[2], peakAmp[2]*.9, peakAmp[2]*1.02),
+             (peakWidth[2], self.minGaussianWidth, 2*(peakCenter[2] - peakCenter[0])),
+             (peakCenter[2], peakCenter[2]*.9, min(peakCenter[2]*1.1, peakCenter[3]))],
+            # Tail Wave Model
+            [(peakAmp[3], peakAmp[3]*.8, peakAmp[3]*1.2),
+             (xData[-1] - peakCenter[3], self.minGaussianWidth, xData[-1] - peakCenter[1]),
+             (peakCenter[3], min(peakCenter[2] + 0.5*(peakCenter[2]- peakCenter[1]), peakCenter[3]), min(peakCenter[3]*1.1, xData[-1]))],
+        ]
         # Add Extra Gaussian to Tail if The Previous Fit Was Bad
         if addExtraGauss:
-            gauss5 = Model(self.gaussModel, prefix = "g5_")
-            pars.update(gauss5.make_params())
-            pars['g5_amplitude'].set(value = peakAmp[3]/6, min = 0, max = peakAmp[3]/2)
-            pars['g5_fwtm'].set(value = xData[-1] - peakCenter[3], min = 0, max = xData[-1] - peakCenter[2])
-            pars['g5_center'].set(value = min(peakCenter[3]*1.05, xData[-1]), min = min(peakCenter[2] + (peakCenter[2] - peakCenter[1]), peakCenter[3]*1.05, xData[-1]*.99), max = xData[-1])
-            mod += gauss5
-        
-        # Get Fit Information
-        finalFitInfo = mod.fit(yData, pars, xData=xData, method='powell')
-        #fitReport = finalFitInfo.fit_report(min_correl=0.6); print(fitReport)
+            gaussParameters.append(
+                [(peakAmp[3]/6, 0, peakAmp[3]/2),
+                 (xData[-1] - peakCenter[3], 0, xData[-1] - peakCenter[2]),
+                 (min(peakCenter[3]*1.05, xData[-1]), min(peakCenter[2] + (peakCenter[2] - peakCenter[1]), peakCenter[3]*1.05, xData[-1]*.99), xData[-1])])
         
+        initialParams, lowerBounds, upperBounds = np.array(gaussParameters, dtype=np.float64).reshape(-1, 3).T
+        return initialParams, lowerBounds, upperBounds
+    
+    def isGoodGaussFit(self, yData, fitResidual, numParams):
+        """ Only Take Pulses with a Good Fit """
         # Calcluate Different RSquared Methods
         startCheck = 3
-        rSquared1 = 1 - finalFitInfo.residual[startCheck:].var() / np.var(yData[startCheck:])
-        rSquared2 = 1 - finalFitInfo.redchi / np.var(yData[startCheck:], ddof=1)
-        coefficient_of_dermination = r2_score(yData[startCheck:], finalFitInfo.best_fit[startCheck:])
+        rSquared1 = 1 - fitResidual[startCheck:].var() / np.var(yData[startCheck:])
+        rSquared2 = 1 - (np.sum(fitResidual**2)/(len(yData) - numParams)) / np.var(yData[startCheck:], ddof=1)
+        coefficient_of_dermination = r2_score(yData[startCheck:], yData[startCheck:] + fitResidual[startCheck:])
         # Statistics for Fit
-        errorSQ = finalFitInfo.residual[2:-2]**2  # Ignore First/Last 2 Points (Bad EndPoint Fit Given Smoothing)
+        errorSQ = fitResidual[2:-2]**2  # Ignore First/Last 2 Points (Bad EndPoint Fit Given Smoothing)
         meanErrorSQ = np.mean(errorSQ)
         #print(rSquared1, rSquared2, coefficient_of_dermination, meanErrorSQ)
+        return rSquared1 > 0.98 and rSquared2 > 0.98 and coefficient_of_dermination > 0.98 and meanErrorSQ < 2E-2
+    
+    def gausDecomp_LeastSquares(self, xData, yData, pulsePeakInds, addExtraGauss = False, timePoint = None, analysisSession = None):
+        xData = np.asarray(xData, dtype=np.float64); yData = np.asarray(yData, dtype=np.float64)
+        initialParams, lowerBounds, upperBounds = self.gaussDecompParameters(xData, yData, pulsePeakInds, addExtraGauss)
+        numGaussians = len(initialParams)//3
+        gaussDecomposition = self.gaussDecompositions[numGaussians]
+        
+        # Start from the Previous Pulse's Solution; if That Fit is Bad, From the Peaks
+        startingParams = [initialParams]
+        if analysisSession is not None and numGaussians in analysisSession.previousGaussParams:
+            startingParams.insert(0, analysisSession.previousGaussParams[numGaussians])
+        for gaussParams in startingParams:
+            gaussParams, fitResidual = gaussDecomposition.fit(xData, yData, gaussParams, lowerBounds, upperBounds)
+            if self.isGoodGaussFit(yData, fitResidual, len(gaussParams)):
+                break
+        else:
+            # If Bad, Try and Add an Extra Gaussian to the Tail
+            if not addExtraGauss:
+                return self.gausDecomp_LeastSquares(xData, yData, pulsePeakInds, addExtraGauss = True, timePoint = timePoint, analysisSession = analysisSession)
+            # If Still Bad, Throw Out the Pulse
+            return [], [], []
+        if analysisSession is not None:
+            analysisSession.previousGaussParams[numGaussians] = gaussParams
+        
+        # Extract Data From Gaussian's in Fit to Save
+        comps = gaussDecomposition.evaluateComponents(gaussParams, xData)
+        gaussPeakInds = comps[0:4].argmax(axis=1).tolist()
+        gaussPeakAmps = comps[0:4].max(axis=1).tolist()
+        # If We Previously Missed the Tidal Wave, Use the Gaussian's Tidal Wave Index
+        if not pulsePeakInds[2]:
+            pulsePeakInds[2] = gaussPeakInds[1]
+        
+        # Plot Gaussian Fit
+        if self.plotGaussFit and not headlessMode.isHeadless():
+            pulsePeakInds_Plot = np.array(pulsePeakInds, dtype = int)
+            plt.plot(xData, yData, linewidth = 2, color = "black")
+            plt.plot(xData[pulsePeakInds_Plot], yData[pulsePeakInds_Plot], 'o')
+            gaussLabels = ['Systolic Pulse', 'Tidal Wave Pulse', 'Dicrotic Pulse', 'Tail Wave Pulse', 'Extra Tail Pulse']
+            gaussColors = ["tab:red", "tab:green", "tab:blue", "tab:purple", "tab:orange"]
+            for gaussInd in range(numGaussians):
+                plt.plot(xData, comps[gaussInd], '--', color = gaussColors[gaussInd], alpha = 0.8, label = gaussLabels[gaussInd])
+            plt.legend(loc='best')
+            plt.title("Gaussian Decomposition at Time " + str(timePoint))
+            plt.show()
+        return pulsePeakInds, gaussPeakInds, gaussPeakAmps
+    
+    def gausDecomp_Lmfit(self, xData, yData, pulsePeakInds, addExtraGauss = False, timePoint = None):
+        # https://lmfit.github.io/lmfit-py/builtin_models.html#example-1-fit-peak-data-to-gaussian-lorentzian-and-voigt-profiles
+        initialParams, lowerBounds, upperBounds = self.gaussDecompParameters(xData, yData, pulsePeakInds, addExtraGauss)
+        
+        # Systolic, Tidal Wave, Dicrotic, and Tail Wave Models (Plus the Extra Tail Gaussian)
+        mod = None; pars = None
+        for gaussInd in range(len(initialParams)//3):
+            prefix = "g" + str(gaussInd + 1) + "_"
+            gaussModel = Model(self.gaussModel, prefix = prefix)
+            if mod is None:
+                mod = gaussModel; pars = gaussModel.make_params()
+            else:
+                mod += gaussModel; pars.update(gaussModel.make_params())
+            for paramInd, paramName in enumerate(["amplitude", "fwtm", "center"]):
+                parameterInd = 3*gaussInd + paramInd
+                pars[prefix + paramName].set(value = initialParams[parameterInd], min = lowerBounds[parameterInd], max = upperBounds[parameterInd])
+        
+        # Get Fit Information
+        finalFitInfo = mod.fit(yData, pars, xData=xData, method='powell')
+        #fitReport = finalFitInfo.fit_report(min_correl=0.6); print(fitReport)
         
         # Plot the Pulse with its Fit 
         def plotGaussianFit(xData, yData, pulsePeakInds):
@@ -764,13 +1027,14 @@ class signalProcessing:
                  label='3-$\sigma$ uncertainty band')
             
             plt.legend(loc='best')
-            plt.title("Gaussian Decomposition at Time " + str(self.timePoint))
+            plt.title("Gaussian Decomposition at Time " + str(timePoint))
             plt.show()
         
         comps = finalFitInfo.eval_components(xData=xData)
-        plotGaussianFit(xData, yData, pulsePeakInds)
+        if not headlessMode.isHeadless():
+            plotGaussianFit(xData, yData, pulsePeakInds)
         # Only Take Pulses with a Good Fit
-        if rSquared1 > 0.98 and rSquared2 > 0.98 and coefficient_of_dermination > 0.98 and meanErrorSQ < 2E-2:
+        if self.isGoodGaussFit(np.asarray(yData), finalFitInfo.residual, finalFitInfo.nvarys):
             # Extract Data From Gaussian's in Fit to Save
             comps = finalFitInfo.eval_components(xData=xData)
             gaussPeakInds = []; gaussPeakAmps = []
@@ -782,18 +1046,18 @@ class signalProcessing:
             if not pulsePeakInds[2]:
                 pulsePeakInds[2] = gaussPeakInds[1]
             # Plot Gaussian Fit
-            if self.plotGaussFit:
+            if self.plotGaussFit and not headlessMode.isHeadless():
                 plotGaussianFit(xData, yData, pulsePeakInds)
             # Return True if it Worked
             #plotGaussianFit(xData, yData, pulsePeakInds)
             return pulsePeakInds, gaussPeakInds, gaussPeakAmps
         # If Bad, Try and Add an Extra Gaussian to the Tail
         elif not addExtraGauss:
-            return self.gausDecomp(xData, yData, pulsePeakInds, addExtraGauss = True)
+            return self.gausDecomp_Lmfit(xData, yData, pulsePeakInds, addExtraGauss = True, timePoint = timePoint)
         # If Still Bad, Throw Out the Pulse
         return [], [], []
 
-    def extractFeatures(self, normalizedPulse, pulseTime, pulseVelocity, pulseAcceleration, allSystolicPeaks, allTidalPeaks, allDicroticPeaks):
+    def extractFeatures(self, normalizedPulse, pulseTime, pulseVelocity, pulseAcceleration, allSystolicPeaks, allTidalPeaks, allDicroticPeaks, analysisSession):
      
         # ------------------- Extract Data from Peak Inds ------------------- #        
         # Unpack All Peak Inds
@@ -897,8 +1161,8 @@ class signalProcessing:
         
         # ----------------------- Biological Features ----------------------- #        
         # Find the Diastolic and Systolic Pressure
-        diastolicPressure = self.diastolicPressure
-        systolicPressure = self.systolicPressure
+        diastolicPressure = analysisSession.diastolicPressure
+        systolicPressure = analysisSession.systolicPressure
         pressureRatio = systolicPressure/diastolicPressure
 
         momentumDensity = 2*pulseTime[-1]*pulseArea
@@ -920,7 +1184,7 @@ class signalProcessing:
         # ------------------------------------------------------------------- #
         
         # ------------------------ Organize Features ------------------------ #        
-        pulseFeatures = [self.timePoint]
+        pulseFeatures = [analysisSession.timePoint]
         # Saving Features from Section: Extract Data from Peak Inds
         pulseFeatures.extend([systolicUpstrokeAccelMaxTime, systolicUpstrokeVelTime, systolicUpstrokeAccelMinTime, systolicPeakTime])
         pulseFeatures.extend([tidalPeakTime, tidalEndTime])
@@ -962,18 +1226,17 @@ class signalProcessing:
         pulseFeatures.extend(pulseFeatures[1:])
         
         # Save the Pulse Features
-        pulseFeatures = np.array(pulseFeatures)
-        self.featureListExact.append(pulseFeatures)
-        self.featureListAverage.append(stats.trim_mean(np.array(self.featureListExact)[:,1:][ np.array(self.featureListExact)[:,0] >= self.timePoint - self.numSecondsAverage ], 0.3))
+        pulseFeatures = np.array(pulseFeatures, dtype=np.float64)
+        analysisSession.featureListExact.append(pulseFeatures)
+        analysisSession.numPulseFeatures += 1
+        # Average the Features Over the Last numSecondsAverage Seconds
+        if analysisSession.featureAverager is None:
+            analysisSession.featureAverager = rollingStatistics.rollingTrimmedMean(len(pulseFeatures) - 1, self.numSecondsAverage, trimProportion = 0.3, includeWindowStart = True)
+        analysisSession.featureListAverage.append(analysisSession.featureAverager.addPoint(analysisSession.timePoint, pulseFeatures[1:]))
     
     def butterParams(self, cutoffFreq = [0.1, 7], samplingFreq = 800, order=3, filterType = 'band'):
-        nyq = 0.5 * samplingFreq
-        if filterType == "band":
-            normal_cutoff = [freq/nyq for freq in cutoffFreq]
-        else:
-            normal_cutoff = cutoffFreq / nyq
-        sos = butter(order, normal_cutoff, btype = filterType, analog = False, output='sos')
-        return sos
+        # Every Pulse Uses the Same Filter: Design it Once (Shared Cache)
+        return filteringMethods.sharedFilterDesigns.butterParams(cutoffFreq, samplingFreq, order, filterType)
     
     def butterFilter(self, data, cutoffFreq, samplingFreq, order = 3, filterType = 'band'):
         sos = self.butterParams(cutoffFreq, samplingFreq, order, filterType)
@@ -982,54 +1245,17 @@ class signalProcessing:
         """
         Search Right: binarySearchWindow > 0
         Search Left: binarySearchWindow < 0
+        data: An Array, or an extremaSearch.searchSignal if the Data is Searched Many Times
         """
-        # Base Case
-        if abs(binarySearchWindow) < 1 or maxPointsSearch == 0:
-            searchSegment = data[max(0,xPointer-1):min(xPointer+2, len(data))]
-            xPointer -= np.where(searchSegment==data[xPointer])[0][0]
-            return xPointer + np.argmin(searchSegment) 
-        
-        maxHeightPointer = xPointer
-        maxHeight = data[xPointer]; searchDirection = binarySearchWindow//abs(binarySearchWindow)
-        # Binary Search Data to Find the Minimum (Skip Over Minor Fluctuations)
-        for dataPointer in range(max(xPointer, 0), max(0, min(xPointer + searchDirection*maxPointsSearch, len(data))), binarySearchWindow):
-            # If the Next Point is Greater Than the Previous, Take a Step Back
-            if data[dataPointer] >= maxHeight and xPointer != dataPointer:
-                return self.findNearbyMinimum(data, dataPointer - binarySearchWindow, round(binarySearchWindow/4), maxPointsSearch - searchDirection*(abs(dataPointer - binarySearchWindow)) - xPointer)
-            # Else, Continue Searching
-            else:
-                maxHeightPointer = dataPointer
-                maxHeight = data[dataPointer]
-
-        # If Your Binary Search is Too Large, Reduce it
-        return self.findNearbyMinimum(data, maxHeightPointer, round(binarySearchWindow/2), maxPointsSearch-1)
+        return extremaSearch.findNearbyMinimum(data, xPointer, binarySearchWindow, maxPointsSearch)
     
     def findNearbyMaximum(self, data, xPointer, binarySearchWindow = 5, maxPointsSearch = 10000):
         """
         Search Right: binarySearchWindow > 0
         Search Left: binarySearchWindow < 0
+        data: An Array, or an extremaSearch.searchSignal if the Data is Searched Many Times
         """
-        # Base Case
-        xPointer = min(max(xPointer, 0), len(data)-1)
-        if abs(binarySearchWindow) < 1 or maxPointsSearch == 0:
-            searchSegment = data[max(0,xPointer-1):min(xPointer+2, len(data))]
-            xPointer -= np.where(searchSegment==data[xPointer])[0][0]
-            return xPointer + np.argmax(searchSegment)
-        
-        minHeightPointer = xPointer; minHeight = data[xPointer];
-        searchDirection = binarySearchWindow//abs(binarySearchWindow)
-        # Binary Search Data to Find the Minimum (Skip Over Minor Fluctuations)
-        for dataPointer in range(xPointer, max(0, min(xPointer + searchDirection*maxPointsSearch, len(data))), binarySearchWindow):
-            # If the Next Point is Greater Than the Previous, Take a Step Back
-            if data[dataPointer] < minHeight and xPointer != dataPointer:
-                return self.findNearbyMaximum(data, dataPointer - binarySearchWindow, round(binarySearchWindow/2), maxPointsSearch - searchDirection*(abs(dataPointer - binarySearchWindow)) - xPointer)
-            # Else, Continue Searching
-            else:
-                minHeightPointer = dataPointer
-                minHeight = data[dataPointer]
-
-        # If Your Binary Search is Too Large, Reduce it
-        return self.findNearbyMaximum(data, minHeightPointer, round(binarySearchWindow/2), maxPointsSearch-1)
+        return extremaSearch.findNearbyMaximum(data, xPointer, binarySearchWindow, maxPointsSearch)
     
     
     def window_rms(self, inputData, window_size):
@@ -1073,6 +1299,46 @@ class signalProcessing:
         # Return the Data With Removed Baseline
         return pulseData
     
+    def normalizePulseBaselines(self, pulseDataBatch, polynomialDegree):
+        """ normalizePulseBaseline for Many Pulses of the Same Length (Each Row is a Pulse) """
+        # Perform Baseline Removal Twice to Ensure Baseline is Gone
+        for _ in range(2):
+            pulseDataBatch = self.removePolynomialBaselines(pulseDataBatch, polynomialDegree)
+        return pulseDataBatch
+    
+    def removePolynomialBaselines(self, pulseDataBatch, polynomialDegree, repitition = 100, gradient = 0.001):
+        """
+        BaselineRemoval's ModPoly Applied to Every Row at Once: The Same Polynomial
+        Basis, Least Squares Fit, and Stopping Rule, with One Fit for All the Rows
+        Still Improving. (Rows Match the Package up to Float Rounding)
+        """
+        pulseLength = pulseDataBatch.shape[1]
+        # The Orthonormal Polynomial Basis (QR Factorization) Without the Constant Column
+        pointInds = np.arange(1, pulseLength+1, dtype=np.float64)
+        polyBasis = np.linalg.qr(np.transpose(np.vstack([pointInds**k for k in range(polynomialDegree+1)])))[0][:,1:]
+        # Center the Basis Like LinearRegression (the Intercept Absorbs the Means)
+        basisMean = polyBasis.mean(axis=0)
+        basisCentered = polyBasis - basisMean
+        
+        yOrig = pulseDataBatch; yOld = pulseDataBatch.copy()
+        yPred = np.zeros(pulseDataBatch.shape)
+        stillImproving = np.ones(len(pulseDataBatch), dtype=bool)
+        nrep = 0
+        while stillImproving.any() and nrep <= repitition:
+            # Fit the Polynomial to Each Row Still Improving
+            yFit = yOld[stillImproving]; yMean = yFit.mean(axis=1)
+            polyCoeffs = scipy.linalg.lstsq(basisCentered, (yFit - yMean[:, None]).T)[0]
+            yPred[stillImproving] = (polyBasis @ polyCoeffs).T + (yMean - basisMean @ polyCoeffs)[:, None]
+            # Clip Each Row to its Fit
+            yWork = np.minimum(yOrig[stillImproving], yPred[stillImproving])
+            # Summed in Order, Like the Package's Built-in sum
+            criteria = np.cumsum(np.abs((yWork - yFit)/yFit), axis=1)[:, -1]
+            yOld[stillImproving] = yWork
+            stillImproving[stillImproving] = criteria >= gradient
+            nrep += 1
+        
+        return yOrig - yPred
+    
     def findRightMaximum(self, yData, xPointer, searchWindow = 50):
         currentMax = yData[xPointer]
         for dataPoint in range(xPointer+1, min(xPointer + searchWindow, len(yData))):
@@ -1085,4 +1351,202 @@ class signalProcessing:
 
     
     
-    
\ No newline at end of file
+    
+# ---------------------------------------------------------------------------#
+# ---------------------------------------------------------------------------#
+
+class pulseStream:
+    """
+    Online Pulse Analysis: push() the Samples as They Arrive, and Each Pulse is
+    Analyzed as Soon as the Next Systolic Upstroke is Confirmed. Only About Two
+    Pulses of Samples are Kept, and the Session Only Keeps the Recent Pulses'
+    History, so the Memory Stays Constant Over Long (e.g. 24 Hour) Recordings.
+    Each Pulse is Filtered on its Own (as in analyzePulse), so the Only State
+    Carried Across Chunks is the Sample Buffer and the Upstroke Detection.
+    """
+    
+    def __init__(self, analysisProtocol, samplingFreq, minBPM = 30, maxBPM = 180, calibrationSeconds = 60, featureNames = None):
+        """
+        ----------------------------------------------------------------------
+        Input Parameters:
+            analysisProtocol: The signalProcessing Protocol Analyzing the Pulses
+            samplingFreq: The Sampling Frequency of the Incoming Samples
+            minBPM, maxBPM: The Heart Rate Range (See analyzePulse)
+            calibrationSeconds: The Pulses in the First calibrationSeconds Calibrate the Pressure (Like the First File)
+            featureNames: The Feature Names (Optional)
+        ----------------------------------------------------------------------
+        """
+        self.analysisProtocol = analysisProtocol
+        self.calibrationSeconds = calibrationSeconds
+        
+        # Keep Enough Pulses to Cover the Averaging Window at the Fastest Heart Rate
+        maxPulsesKept = math.ceil(maxBPM*analysisProtocol.numSecondsAverage/60) + 1
+        self.analysisSession = pulseSession(featureNames, maxPulsesKept)
+        self.analysisSession.samplingFreq = samplingFreq
+        self.analysisSession.minPointsPerPulse = math.floor(samplingFreq*60/maxBPM)
+        self.analysisSession.maxPointsPerPulse = math.ceil(samplingFreq*60/minBPM)
+        
+        # Sample Buffer: Two Pulses Behind the Newest Upstroke, Plus Room to Add Samples
+        self.maxChunkPoints = self.analysisSession.maxPointsPerPulse
+        self.keepPoints = 2*self.analysisSession.maxPointsPerPulse + self.analysisSession.minPointsPerPulse + 16
+        self.bufferTime = np.zeros(self.keepPoints + self.maxChunkPoints)
+        self.bufferSignal = np.zeros(self.keepPoints + self.maxChunkPoints)
+        self.bufferStartInd = 0         # The Sample Number of the Buffer's First Point
+        self.numBufferPoints = 0        # The Number of Points in the Buffer
+        
+        # Upstroke Detection
+        self.startTime = None           # The Time of the First Sample
+        self.peaksStartInd = None       # The First Sample Where Upstrokes are Counted (Before: Learn the Peak Standard)
+        self.scanInd = 0                # The Next Sample Whose First Derivative is Checked
+        self.pendingPeakInd = None      # The Newest Upstroke (May Still Move to a Larger Derivative)
+        self.pendingPeakDone = True     # If the Newest Upstroke Can No Longer Move
+        self.previousPeakInd = None     # The Upstroke Starting the Pulse in Progress
+        self.previousBoundaryInd = None # The Start of the Pulse in Progress
+    
+    def push(self, time, signalData):
+        """
+        Add New Samples. Returns a List of the Pulses Finished by the Samples;
+        Each is a Dictionary: time (of the Pulse's End), heartRate, features,
+        averageFeatures (Rolling Trimmed Mean), and normalizedPulse.
+        Pulses Used to Calibrate the Pressure are Not Returned.
+        """
+        time = np.asarray(time, dtype=np.float64); signalData = np.asarray(signalData, dtype=np.float64)
+        finishedPulses = []
+        # Add the Samples in Pieces That Fit in the Buffer
+        for chunkStartInd in range(0, len(time), self.maxChunkPoints):
+            self.addToBuffer(time[chunkStartInd:chunkStartInd + self.maxChunkPoints], signalData[chunkStartInd:chunkStartInd + self.maxChunkPoints])
+            for systolicPeakInd in self.findUpstrokes():
+                finishedPulse = self.finishPulse(systolicPeakInd)
+                if finishedPulse is not None:
+                    finishedPulses.append(finishedPulse)
+        return finishedPulses
+    
+    # ---------------------------------------------------------------------- #
+    # ----------------------------- Sample Buffer -------------------------- #
+    
+    def addToBuffer(self, time, signalData):
+        if self.startTime is None and len(time) != 0:
+            self.startTime = time[0]
+        
+        # Remove the Samples No Longer Needed to Make Room
+        if self.numBufferPoints + len(time) > len(self.bufferTime):
+            # Keep Two Pulses Before the Newest Upstroke (Any Later Upstroke Comes After scanInd)
+            newestInd = self.pendingPeakInd if not self.pendingPeakDone else self.scanInd
+            keepStartInd = max(self.bufferStartInd, min(self.scanInd - 4, newestInd - 2*self.analysisSession.maxPointsPerPulse - 8))
+            numRemoved = keepStartInd - self.bufferStartInd
+            self.bufferTime[0:self.numBufferPoints - numRemoved] = self.bufferTime[numRemoved:self.numBufferPoints]
+            self.bufferSignal[0:self.numBufferPoints - numRemoved] = self.bufferSignal[numRemoved:self.numBufferPoints]
+            self.bufferStartInd = keepStartInd; self.numBufferPoints -= numRemoved
+        
+        # Add the New Samples
+        self.bufferTime[self.numBufferPoints:self.numBufferPoints + len(time)] = time
+        self.bufferSignal[self.numBufferPoints:self.numBufferPoints + len(time)] = signalData
+        self.numBufferPoints += len(time)
+    
+    def getBufferSlice(self, startInd, endInd):
+        """ The Buffer Positions of Samples [startInd, endInd) """
+        return slice(startInd - self.bufferStartInd, endInd - self.bufferStartInd)
+    
+    # ---------------------------------------------------------------------- #
+    # -------------------------- Upstroke Detection ------------------------ #
+    
+    def findUpstrokes(self):
+        """ Check the New First Derivatives (See signalProcessing.seperatePulses); Returns the Upstrokes That are Now Final """
+        analysisSession = self.analysisSession
+        bufferEndInd = self.bufferStartInd + self.numBufferPoints
+        # The Derivative Needs the 4 Points After it (Savgol Window of 9)
+        derivEndInd = bufferEndInd - 4
+        derivStartInd = max(self.bufferStartInd, self.scanInd - 4)
+        if derivEndInd <= self.scanInd or bufferEndInd - derivStartInd < 9:
+            return []
+        firstDer = savgol_filter(self.bufferSignal[self.getBufferSlice(derivStartInd, bufferEndInd)], 9, 2, mode='nearest', delta=1/analysisSession.samplingFreq, deriv=1)
+        firstDer = firstDer[self.scanInd - derivStartInd:derivEndInd - derivStartInd]
+        firstDerStartInd = self.scanInd
+        
+        # The First Sample Where the Peaks Can Start: After 1.5 Seconds and minPointsPerPulse Points
+        if self.peaksStartInd is None:
+            bufferTimes = self.bufferTime[self.getBufferSlice(self.scanInd, derivEndInd)]
+            canStartPeaks = (np.arange(self.scanInd, derivEndInd) > analysisSession.minPointsPerPulse) & (bufferTimes - self.startTime > 1.5)
+            if canStartPeaks.any():
+                self.peaksStartInd = self.scanInd + int(np.argmax(canStartPeaks))
+        
+        finalPeaks = []
+        while self.scanInd < derivEndInd:
+            # Use the First Few Peaks as a Standard
+            if self.peaksStartInd is None or self.scanInd < self.peaksStartInd:
+                standardEndInd = derivEndInd if self.peaksStartInd is None else min(derivEndInd, self.peaksStartInd)
+                analysisSession.peakStandard = max(analysisSession.peakStandard, np.fmax.reduce(firstDer[self.scanInd - firstDerStartInd:standardEndInd - firstDerStartInd]))
+                self.scanInd = standardEndInd
+            # Move the Newest Peak to a Larger Derivative Within minPointsPerPulse
+            elif not self.pendingPeakDone:
+                windowEndInd = min(derivEndInd, self.pendingPeakInd + analysisSession.minPointsPerPulse + 1)
+                largerPoints = firstDer[self.scanInd - firstDerStartInd:windowEndInd - firstDerStartInd] > analysisSession.peakStandard
+                if largerPoints.any():
+                    self.pendingPeakInd = self.scanInd + int(np.argmax(largerPoints))
+                    analysisSession.peakStandard = firstDer[self.pendingPeakInd - firstDerStartInd]
+                    self.scanInd = self.pendingPeakInd + 1
+                else:
+                    self.scanInd = windowEndInd
+                    # The Peak is Final Once its Window Passes
+                    if windowEndInd == self.pendingPeakInd + analysisSession.minPointsPerPulse + 1:
+                        self.pendingPeakDone = True
+                        finalPeaks.append(self.pendingPeakInd)
+            # Find the Next Peak
+            else:
+                abovePoints = firstDer[self.scanInd - firstDerStartInd:] > analysisSession.peakStandard*0.5
+                if abovePoints.any():
+                    self.pendingPeakInd = self.scanInd + int(np.argmax(abovePoints))
+                    self.pendingPeakDone = False
+                    analysisSession.peakStandard = firstDer[self.pendingPeakInd - firstDerStartInd]
+                    self.scanInd = self.pendingPeakInd + 1
+                else:
+                    self.scanInd = derivEndInd
+        
+        return finalPeaks
+    
+    # ---------------------------------------------------------------------- #
+    # ---------------------------- Pulse Analysis -------------------------- #
+    
+    def finishPulse(self, systolicPeakInd):
+        """ The Upstroke Ends the Pulse in Progress: Analyze It """
+        analysisProtocol = self.analysisProtocol; analysisSession = self.analysisSession
+        bufferSignal = self.bufferSignal[0:self.numBufferPoints]
+        # The Pulse Starts at the Minimum Before the Upstroke
+        boundaryInd = self.bufferStartInd + analysisProtocol.findNearbyMinimum(bufferSignal, systolicPeakInd - self.bufferStartInd, binarySearchWindow=-1, maxPointsSearch=analysisSession.maxPointsPerPulse)
+        pulseStartInd, pulsePeakInd = self.previousBoundaryInd, self.previousPeakInd
+        self.previousBoundaryInd, self.previousPeakInd = boundaryInd, systolicPeakInd
+        if pulseStartInd is None:
+            return None
+        
+        pulseEndInd = boundaryInd
+        analysisSession.timePoint = self.bufferTime[pulseEndInd - self.bufferStartInd]
+        # Calculate Heart Rate
+        analysisProtocol.updateHeartRate(analysisSession)
+        # Cull Bad Pulses (Too Long Pulses May Have Left the Buffer)
+        if not analysisProtocol.isPulseLengthGood(pulseEndInd - pulseStartInd, analysisSession):
+            return None
+        
+        # Filter the Pulse
+        pulseSlice = self.getBufferSlice(pulseStartInd, pulseEndInd + 1)
+        pulseTime = self.bufferTime[pulseSlice] - self.bufferTime[pulseSlice][0]
+        if analysisProtocol.batchFilterPulses:
+            # A Batch of One: Uses the Faster Baseline Removal
+            pulseData, pulseVelocity, pulseAcceleration, thirdDeriv, normalizedPulse = analysisProtocol.filterPulses(bufferSignal, [(pulseSlice.start, pulseSlice.stop - 1)], analysisSession.samplingFreq)[pulseSlice.start]
+        else:
+            pulseData, pulseVelocity, pulseAcceleration, thirdDeriv, normalizedPulse = analysisProtocol.filterPulse(bufferSignal[pulseSlice].copy(), analysisSession.samplingFreq)
+        
+        # Calibrate the Pressure and Extract the Pulse's Features
+        numPulseFeatures = analysisSession.numPulseFeatures
+        findSystolicPressure0 = lambda: self.bufferStartInd + analysisProtocol.findNearbyMaximum(bufferSignal, pulsePeakInd - self.bufferStartInd, binarySearchWindow=1, maxPointsSearch=analysisSession.maxPointsPerPulse)
+        normalizedPulse = analysisProtocol.analyzeFilteredPulse(pulseTime, pulseData, pulseVelocity, pulseAcceleration, thirdDeriv, normalizedPulse, findSystolicPressure0, analysisSession)
+        
+        # The Calibration Period is Over
+        if analysisSession.calibratedSystolicAmplitude == None and analysisSession.timePoint - self.startTime >= self.calibrationSeconds:
+            analysisProtocol.finishCalibration(analysisSession)
+        # No Features if the Pulse Calibrated or was Rejected
+        if normalizedPulse is None or analysisSession.numPulseFeatures == numPulseFeatures:
+            return None
+        
+        return {"time": analysisSession.timePoint, "heartRate": analysisSession.heartRateListAverage[-1],
+                "features": analysisSession.featureListExact[-1], "averageFeatures": analysisSession.featureListAverage[-1],
+                "normalizedPulse": normalizedPulse}
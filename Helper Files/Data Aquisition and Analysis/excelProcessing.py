@@ -3,6 +3,9 @@
 # Basic Modules
 import os
 import sys
+import glob
+import itertools
+import hashlib
 import numpy as np
 import pandas as pd
 # Read/Write to Excel
@@ -12,10 +15,21 @@ import openpyxl as xl
 # Openpyxl Styles
 from openpyxl.styles import Alignment
 from openpyxl.styles import Font
+from openpyxl.cell import WriteOnlyCell
+# Fast Excel Reader (Optional): Used for Bulk Reads When Installed
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
 
 
 
-class handlingExcelFormat:        
+class handlingExcelFormat:
+    # Binary Cache of the Extracted Data (Skips Reparsing Unchanged Files)
+    useDataCache = True
+    cacheFolderName = "Cached Data/"
+    # Number of Rows Used to Estimate the Column Widths When Saving
+    numWidthSampleRows = 100
         
     def convertToXLSX(self, inputExcelFile):
         """
@@ -100,60 +114,300 @@ class handlingExcelFormat:
             cell.font = Font(color='00FF0000', italic=True, bold=True)
         
         return WB_worksheet
+    
+    # ---------------------------------------------------------------------- #
+    # ------------------------ Streaming Excel Writer ---------------------- #
+    
+    def estimateColumnWidths(self, header, sampleRows):
+        """ Estimate Each Column's Width from the Header and a Sample of the Rows """
+        columnWidths = [len(str(headerVal)) if headerVal else 0 for headerVal in header]
+        for dataRow in sampleRows:
+            for colInd, cellVal in enumerate(dataRow):
+                cellLength = len(str(cellVal)) if cellVal else 0
+                if colInd == len(columnWidths):
+                    columnWidths.append(cellLength)
+                columnWidths[colInd] = max(columnWidths[colInd], cellLength)
+        return columnWidths
+    
+    def createFormattedSheet(self, WB, sheetName, header, columnWidths):
+        """ Create a Worksheet with the Column Widths Set and a Styled Header Row """
+        WB_worksheet = WB.create_sheet(sheetName)
+        # Column Widths Must be Set Before Any Rows are Streamed
+        for colInd, columnWidth in enumerate(columnWidths):
+            WB_worksheet.column_dimensions[xl.utils.get_column_letter(colInd + 1)].width = columnWidth
+        
+        # Header Style: Only the Header is Styled
+        headerRow = []
+        for headerVal in header:
+            headerCell = WriteOnlyCell(WB_worksheet, value = headerVal)
+            headerCell.font = Font(color='00FF0000', italic=True, bold=True)
+            headerCell.alignment = Alignment(horizontal='center',vertical='center',wrap_text=True)
+            headerRow.append(headerCell)
+        WB_worksheet.append(headerRow)
+        
+        return WB_worksheet
+    
+    def saveExcelRows(self, excelFile, sheetName, header, dataRows, saveFirstSheet = False):
+        """
+        Writes the Rows Under a Header, Starting a New Sheet Every Time Excel's Row
+        Limit is Reached. New Files Use a Write-Only Workbook so Memory Stays Flat
+        Regardless of the Number of Rows; Adding a Sheet to an Existing File
+        Requires Loading That Workbook.
+        """
+        maxAddToExcelSheet = 1048500  # Max Rows in a Worksheet
+        # If the File is Not Present: Stream a New Workbook
+        if not os.path.isfile(excelFile):
+            print("\tSaving the Data as New Excel Workbook")
+            WB = xl.Workbook(write_only = True)
+        else:
+            print("\tExcel File Already Exists. Adding New Sheet to File")
+            WB = xl.load_workbook(excelFile, read_only=False)
+        
+        # Estimate the Column Widths Without Holding All the Rows
+        dataRows = iter(dataRows)
+        sampleRows = list(itertools.islice(dataRows, self.numWidthSampleRows))
+        columnWidths = self.estimateColumnWidths(header, sampleRows)
+        
+        # Save Data to Worksheet
+        WB_worksheet = self.createFormattedSheet(WB, sheetName, header, columnWidths); numRowsInSheet = 0
+        for dataRow in itertools.chain(sampleRows, dataRows):
+            # Start a New Sheet When the Current One is Full
+            if numRowsInSheet == maxAddToExcelSheet:
+                if saveFirstSheet:
+                    break
+                WB_worksheet = self.createFormattedSheet(WB, sheetName, header, columnWidths); numRowsInSheet = 0
+            WB_worksheet.append(dataRow)
+            numRowsInSheet += 1
+        
+        # Save as New Excel File
+        WB.save(excelFile)
+        WB.close()
+    
+    def saveBinarySidecar(self, excelFile, sheetName, header, dataMatrix):
+        """ Save the Data Next to the Excel File as a .npz (Header + Data) for Programs to Read """
+        binaryFile = os.path.splitext(excelFile)[0] + " - " + sheetName + ".npz"
+        np.savez(binaryFile, header = np.array(header, dtype=str), data = np.asarray(dataMatrix))
+        print("\tSaved the Data as a Binary File:", binaryFile)
+    
+    # ---------------------------------------------------------------------- #
+    # ------------------------- Bulk Numeric Reader ------------------------ #
+    
+    def extractNumericColumns(self, rowValues, numCols, requiredCols = 1, startDataCol = 1):
+        """
+        Reads the Numeric Block of a Sheet in One Pass and Returns Contiguous
+        float64 Column Arrays. Header Rows are Skipped Until the First Number
+        Appears in the First Column, and Reading Stops at the First Row Where
+        Any of the First 'requiredCols' Columns is Empty. Other Empty Cells are NaN.
+        --------------------------------------------------------------------------
+        Input Variable Definitions:
+            rowValues: An Iterable of Row Values (Tuples of Cell Values)
+            numCols: The Number of Columns to Extract
+            requiredCols: The Number of Leading Columns That Must Have Data
+            startDataCol: The First Column (1-Indexed) to Extract
+        --------------------------------------------------------------------------
+        """
+        firstCol = startDataCol - 1; lastCol = firstCol + numCols
+        rowGenerator = iter(rowValues)
+        # If Header Exists, Skip Until You Find the Data
+        firstDataRow = ()
+        for row in rowGenerator:
+            if len(row) > firstCol and type(row[firstCol]) in [float, int]:
+                firstDataRow = (row,)
+                break
+        
+        # Collect the Rows Until the Data Stops
+        dataRows = []
+        for row in itertools.chain(firstDataRow, rowGenerator):
+            row = row[firstCol:lastCol]
+            # SafeGaurd: If User Edits the Document to Create Empty Rows, Stop Reading in Data
+            if len(row) < requiredCols or any(cellVal in (None, "") for cellVal in row[0:requiredCols]):
+                break
+            dataRows.append(row)
+        
+        # Convert Everything at Once (Empty Cells Become NaN)
+        dataBlock = np.full((len(dataRows), numCols), np.nan)
+        for rowInd, row in enumerate(dataRows):
+            if len(row) == numCols and "" not in row:
+                continue
+            # Pad Short Rows and Blank Strings Before the Bulk Conversion
+            dataRows[rowInd] = tuple(None if cellVal == "" else cellVal for cellVal in row) + (None,)*(numCols - len(row))
+        if len(dataRows) != 0:
+            dataBlock[:] = np.array(dataRows, dtype=np.float64)
+        
+        # Return Each Column as a Contiguous Array
+        return list(np.ascontiguousarray(dataBlock.T))
+    
+    def getSheetValues(self, ExcelSheet, numCols, startDataCol = 1):
+        """ Iterate the Raw Cell Values of an Openpyxl Worksheet (No Cell Objects) """
+        return ExcelSheet.iter_rows(min_col=1, max_col=startDataCol + numCols - 1, values_only=True)
+    
+    def readExcelColumns(self, excelFile, testSheetNum, numCols, requiredCols = 1, startDataCol = 1):
+        """ Bulk Read the Numeric Columns of an Excel File, Using Calamine if Available """
+        if CalamineWorkbook is not None:
+            calamineSheet = CalamineWorkbook.from_path(excelFile).get_sheet_by_index(testSheetNum)
+            return self.extractNumericColumns(calamineSheet.to_python(skip_empty_area=False), numCols, requiredCols, startDataCol)
+        
+        # Otherwise Stream the Values from Openpyxl
+        WB = xl.load_workbook(excelFile, data_only=True, read_only=True)
+        dataColumns = self.extractNumericColumns(self.getSheetValues(WB.worksheets[testSheetNum], numCols, startDataCol), numCols, requiredCols, startDataCol)
+        WB.close()
+        return dataColumns
+    
+    # ---------------------------------------------------------------------- #
+    # ------------------------- Direct Text Reader ------------------------- #
+    
+    def splitTextLine(self, textLine, delimiter = ","):
+        """ Split One Line of a Delimited (or Fixed Width) Text File into its Fields """
+        if delimiter == "fixedWidth":
+            return textLine.split()
+        return textLine.rstrip("\r\n").split(delimiter)
+    
+    def findTextDataStart(self, inputFile, delimiter = ","):
+        """ Find the First Line (0-Indexed) Whose First Field is a Number """
+        with open(inputFile, "r") as inputData:
+            for lineNum, textLine in enumerate(inputData):
+                textFields = self.splitTextLine(textLine, delimiter)
+                try:
+                    float(textFields[0])
+                    return lineNum
+                except (ValueError, IndexError):
+                    continue
+        return None
+    
+    def readTextColumns(self, inputFile, numCols, requiredCols = 1, delimiter = ",", startDataCol = 1, dataStartLine = None, chunkSize = 500000):
+        """
+        Parses a Delimited/Fixed Width Text File Straight into float64 Column Arrays,
+        Streaming the File in Chunks. Uses the Same Rules as extractNumericColumns:
+        Header Lines are Skipped Until the First Number Appears in the First Column,
+        and Reading Stops at the First Row Where a Required Column is Empty.
+        """
+        # If Header Exists, Skip Until You Find the Data
+        if dataStartLine is None:
+            dataStartLine = self.findTextDataStart(inputFile, delimiter)
+        if dataStartLine is None:
+            return [np.array([]) for _ in range(numCols)]
+        
+        # Stream the File Through Pandas' C Parser
+        readOptions = dict(header = None, skiprows = dataStartLine, chunksize = chunkSize, skip_blank_lines = False,
+                           usecols = range(startDataCol - 1, startDataCol - 1 + numCols))
+        if delimiter == "fixedWidth":
+            textChunks = pd.read_fwf(inputFile, **readOptions)
+        else:
+            textChunks = pd.read_csv(inputFile, sep = delimiter, **readOptions)
+        
+        dataChunks = []
+        for textChunk in textChunks:
+            # Stop Collecting Data When there is No More
+            emptyRows = np.flatnonzero(textChunk.iloc[:, 0:requiredCols].isna().to_numpy().any(axis=1))
+            if len(emptyRows) != 0:
+                dataChunks.append(textChunk.iloc[0:emptyRows[0]].to_numpy(dtype=np.float64))
+                break
+            dataChunks.append(textChunk.to_numpy(dtype=np.float64))
+        textChunks.close()
+        
+        # Return Each Column as a Contiguous Array
+        dataBlock = np.concatenate(dataChunks) if len(dataChunks) != 0 else np.empty((0, numCols))
+        return list(np.ascontiguousarray(dataBlock.T))
+    
+    def saveExcelCopy(self, inputFile, testSheetNum = 0, excelDelimiter = ","):
+        """ Write the TXT/CSV File as an Excel Workbook Under 'Excel Files/' for Human Inspection """
+        # Extract Filename Information
+        filename = os.path.splitext(os.path.basename(inputFile))[0]
+        newFilePath = os.path.dirname(inputFile) + "/Excel Files/"
+        # Make Output Folder Directory if Not Already Created
+        os.makedirs(newFilePath, exist_ok = True)
+        
+        # Convert CSV or TXT to XLSX
+        xlWorkbook, _ = self.convertToExcel(inputFile, newFilePath + filename + ".xlsx", excelDelimiter = excelDelimiter, overwriteXL = False, testSheetNum = testSheetNum)
+        xlWorkbook.close()
+    
+    # ---------------------------------------------------------------------- #
+    # -------------------------- Binary Data Cache ------------------------- #
+    
+    def getCacheFiles(self, inputFile, testSheetNum = 0, extractionMethod = ""):
+        """
+        Returns the Cache File Prefix for the Input File. The Key Combines the
+        File Path, Modification Time, File Size, Sheet Index, and Extraction
+        Method; So Any Edit to the Source File Invalidates the Old Cache.
+        """
+        fileStats = os.stat(inputFile)
+        # Build the Unique Key for This Version of the File
+        cacheKey = "|".join([os.path.abspath(inputFile), str(fileStats.st_mtime_ns), str(fileStats.st_size), str(testSheetNum), extractionMethod])
+        cacheKey = hashlib.sha1(cacheKey.encode()).hexdigest()[0:16]
+        
+        # Cache Files Live Next to the Data in Their Own Folder
+        cacheFolder = os.path.dirname(os.path.abspath(inputFile)) + "/" + self.cacheFolderName
+        filePrefix = cacheFolder + os.path.basename(inputFile) + "_" + str(testSheetNum) + "_" + extractionMethod + "_"
+        return filePrefix, filePrefix + cacheKey + "_"
+    
+    def loadCachedData(self, inputFile, testSheetNum = 0, extractionMethod = ""):
+        """ Memory-Map the Cached Arrays of the File; Returns None if the Cache is Missing or Stale """
+        if not self.useDataCache:
+            return None
+        _, cachePrefix = self.getCacheFiles(inputFile, testSheetNum, extractionMethod)
+        cacheFiles = sorted(glob.glob(glob.escape(cachePrefix) + "*.npy"))
+        if len(cacheFiles) == 0:
+            return None
+        
+        print("Loading Cached Data for the File:", inputFile)
+        # Copy-on-Write Mapping: Pages are Read Lazily and Edits Never Reach the Disk
+        return tuple(np.load(cacheFile, mmap_mode = 'c', allow_pickle = False) for cacheFile in cacheFiles)
+    
+    def saveCachedData(self, inputFile, dataArrays, testSheetNum = 0, extractionMethod = ""):
+        """ Store the Extracted Arrays of the File as .npy Files and Remove Stale Versions """
+        if not self.useDataCache:
+            return None
+        # Ragged (Object) Arrays Cannot be Memory-Mapped; Leave Them Uncached
+        dataArrays = [np.asarray(dataArray) for dataArray in dataArrays]
+        if any(dataArray.dtype == object for dataArray in dataArrays):
+            return None
+        filePrefix, cachePrefix = self.getCacheFiles(inputFile, testSheetNum, extractionMethod)
+        
+        try:
+            os.makedirs(os.path.dirname(cachePrefix), exist_ok = True)
+            # Remove Any Cache Written for an Older Version of the File
+            for oldCacheFile in glob.glob(glob.escape(filePrefix) + "*.npy"):
+                os.remove(oldCacheFile)
+            # Write Each Array Atomically (No Half-Written Caches if Interrupted)
+            for arrayInd, dataArray in enumerate(dataArrays):
+                cacheFile = cachePrefix + str(arrayInd) + ".npy"
+                with open(cacheFile + ".tmp", 'wb') as outputFile:
+                    np.save(outputFile, dataArray, allow_pickle = False)
+                os.replace(cacheFile + ".tmp", cacheFile)
+        except OSError as cacheError:
+            # The Cache is Only an Optimization: Never Fail the Analysis Because of It
+            print("\tCould Not Cache the Data:", cacheError)
 
 class dataProcessing(handlingExcelFormat):
 
-    def saveResults(self, featureList, featureLabels, saveDataFolder, saveExcelName, sheetName = "Pulse Features", overwriteSave = True, dontSaveIfExcelExists = False):
+    def saveResults(self, featureList, featureLabels, saveDataFolder, saveExcelName, sheetName = "Pulse Features", overwriteSave = True, dontSaveIfExcelExists = False, saveFormat = "excel"):
+        """
+        Saves the Features Under a Header of the Feature Labels.
+        saveFormat: 'excel' (Default), 'binary' (.npz Sidecar Only), or 'both'
+        """
         print("Saving the Data")
         # Create Output File Directory to Save Data: If None Exists
         os.makedirs(saveDataFolder, exist_ok=True)
         
         # Path to File to Save
         excelFile = saveDataFolder + saveExcelName
+        # Machine Readable Copy of the Data
+        if saveFormat in ["binary", "both"]:
+            self.saveBinarySidecar(excelFile, sheetName, featureLabels, featureList)
+            if saveFormat == "binary":
+                return None
         
         # If You Want to Overwrite the Excel, Remove the File First (Quicker)
         if overwriteSave and os.path.isfile(excelFile):
             print("\tDeleting Old Excel Workbook")
             os.remove(excelFile) 
-        
-        # If the File is Not Present: Create The Excel File
-        if not os.path.isfile(excelFile):
-            print("\tSaving the Data as New Excel Workbook")
-            # Make Excel WorkBook
-            WB = xl.Workbook()
-            WB_worksheet = WB.active 
-            WB_worksheet.title = sheetName
-        elif not dontSaveIfExcelExists:
-            print("\tExcel File Already Exists. Adding New Sheet to File")
-            WB = xl.load_workbook(excelFile, read_only=False)
-            WB_worksheet = WB.create_sheet(sheetName)
-        else:
+        # Do Not Touch an Existing File if Asked
+        elif dontSaveIfExcelExists and os.path.isfile(excelFile):
             print("\tNot Saving Any Data as the Excel File Already Exists")
             return None
-    
-        # Parameters for Worksheet
-        header = featureLabels    # Header Text     
-        maxAddToExcelSheet = 1048500  # Max Rows in a Worksheet
-        
-        # Save Data to Worksheet
-        for firstIndexInList in range(0, len(featureList), maxAddToExcelSheet):
-            # Add the Header to the Worksheet
-            WB_worksheet.append(header)
-            
-            # Add the Features to the Worksheet
-            for featureInd in range(firstIndexInList, min(firstIndexInList+maxAddToExcelSheet, len(featureList))):
-                WB_worksheet.append(list(featureList[featureInd]))
-        
-            # Add Excel Aesthetics
-            WB_worksheet = self.addExcelAesthetics(WB_worksheet)  
-            
-            # Add Sheet
-            WB_worksheet = WB.create_sheet(sheetName)
         
-        WB.remove(WB_worksheet)
-        # Save as New Excel File
-        WB.save(excelFile)
-        WB.close()
+        # Stream the Features to the Worksheet
+        self.saveExcelRows(excelFile, sheetName, featureLabels, (list(featureRow) for featureRow in featureList))
 
     def getSavedFeatures(self, featureExcelFile):
         # Check if File Exists
@@ -247,100 +501,52 @@ class processPulseData(dataProcessing):
         if not os.path.exists(pulseExcelFile):
             print("The following Input File Does Not Exist:", pulseExcelFile)
             sys.exit()
+        # If the File Was Already Parsed, Use the Cached Arrays
+        cachedData = self.loadCachedData(pulseExcelFile, testSheetNum)
+        if cachedData is not None:
+            return cachedData
+        inputFile = pulseExcelFile
         # Convert to Exel if .xls Format; If .xlsx, Do Nothing; If Other, Exit Program
         pulseExcelFile = self.convertToXLSX(pulseExcelFile)
 
         print("Extracting Data from the Excel File:", pulseExcelFile)
-        # Load Data from the Excel File
-        WB = xl.load_workbook(pulseExcelFile, data_only=True, read_only=True)
-        WB_worksheets = WB.worksheets
-        ExcelSheet = WB_worksheets[testSheetNum]
-        
-        # If Header Exists, Skip Until You Find the Data
-        for row in ExcelSheet.rows:
-            cellA = row[0]
-            if type(cellA.value) in [float, int]:
-                dataStartRow = cellA.row
-                break
+        # Bulk Read the Time (Column A) and Capacitance (Column B)
+        timePoints, capacitance = self.readExcelColumns(pulseExcelFile, testSheetNum, numCols = 2, requiredCols = 2)
         
-        data = dict(time=[], Capacitance=[])
-        # Loop Through the Excel Worksheet to collect all the data
-        for pointNum, [colA, colB] in enumerate(ExcelSheet.iter_rows(min_col=1, min_row=dataStartRow, max_col=2, max_row=ExcelSheet.max_row)):
-            # Get Cell Values for First 4 Channels: Represents the Voltage for Each Channel;
-            Time = colA.value; Capacitance = colB.value;
-            
-            # SafeGaurd: If User Edits the Document to Create Empty Rows, Stop Reading in Data
-            if Time == None or Capacitance == None:
-                break
-            
-            # Add Data to Dictionary
-            data["time"].append(Time)
-            data["Capacitance"].append(Capacitance)
-             
-        # Finished Data Collection: Close Workbook and Return Data to User
-        print("Done Data Collecting"); WB.close()
-        return np.array(data["time"]), np.array(data["Capacitance"])
+        print("Done Data Collecting")
+        # Cache the Arrays for the Next Run
+        self.saveCachedData(inputFile, [timePoints, capacitance], testSheetNum)
+        return timePoints, capacitance
     
-    def saveFilteredData(self, time, signalData, filteredData, saveDataFolder, saveExcelName, sheetName = "Pulse Data"):
+    def saveFilteredData(self, time, signalData, filteredData, saveDataFolder, saveExcelName, sheetName = "Pulse Data", saveFormat = "excel"):
         print("Saving the Data")
         # Create Output File Directory to Save Data: If None Exists
         os.makedirs(saveDataFolder, exist_ok=True)
         
         # Path to File to Save
         excelFile = saveDataFolder + saveExcelName
-        
-        # If the File is Not Present: Create The Excel File
-        if not os.path.isfile(excelFile):
-            print("\tSaving the Data as New Excel Workbook")
-            # Make Excel WorkBook
-            WB = xl.Workbook()
-            WB_worksheet = WB.active 
-            WB_worksheet.title = sheetName
-        else:
-            print("Excel File Already Exists. Adding New Sheet to File")
-            WB = xl.load_workbook(excelFile, read_only=False)
-            WB_worksheet = WB.create_sheet(sheetName)
-        
         # Label First Row
         header = ["Time", "Data", "Filtered Data"]
-        WB_worksheet.append(header)
         
-        # Save Data to Worksheet
-        for pulseInd in range(len(time)):
-            row = [time[pulseInd], signalData[pulseInd], filteredData[pulseInd]]
-            WB_worksheet.append(row)
-        
-        # Add Excel Aesthetics
-        WB_worksheet = self.addExcelAesthetics(WB_worksheet)  
+        # Machine Readable Copy of the Data
+        if saveFormat in ["binary", "both"]:
+            self.saveBinarySidecar(excelFile, sheetName, header, np.column_stack((time, signalData, filteredData)))
+            if saveFormat == "binary":
+                return None
         
-        # Save as New Excel File
-        WB.save(excelFile)
-        WB.close()
+        # Stream the Data to the Worksheet
+        self.saveExcelRows(excelFile, sheetName, header, zip(time, signalData, filteredData))
     
 class processTemperatureData(dataProcessing):
     
     def extractTemperatureData(self, ExcelSheet, startDataCol = 1, endDataCol = 2):
-        # If Header Exists, Skip Until You Find the Data
-        for row in ExcelSheet.rows:
-            cellA = row[0]
-            if type(cellA.value) in [int, float]:
-                dataStartRow = cellA.row + 1
-                break
-        
-        # Loop Through the Excel Worksheet to collect all the data
-        timePoints = []; gsrData = [];
-        for dataRow in ExcelSheet.iter_rows(min_col=startDataCol, min_row=dataStartRow-1, max_col=endDataCol, max_row=ExcelSheet.max_row):
-            # Stop Collecting Data When there is No More
-            if dataRow[0].value == None:
-                break
-            
-            # Get Data
-            gsrData.append(float(dataRow[1].value))
-            timePoints.append(float(dataRow[0].value))
+        # Bulk Read the Data: Skips the Header and Stops When there is No More
+        numCols = endDataCol - startDataCol + 1
+        timePoints, gsrData = self.extractNumericColumns(self.getSheetValues(ExcelSheet, numCols, startDataCol), numCols, requiredCols = 1, startDataCol = startDataCol)[0:2]
         
         return timePoints, gsrData
 
-    def getData(self, inputFile, testSheetNum = 0):
+    def getData(self, inputFile, testSheetNum = 0, saveExcelCopy = False):
         """
         Extracts Pulse Data from Excel Document (.xlsx). Data can be in any
         worksheet which the user can specify using 'testSheetNum' (0-indexed).
@@ -352,42 +558,45 @@ class processTemperatureData(dataProcessing):
         Input Variable Definitions:
             tempFile: The Path to the Excel/TXT/CSV File Containing the GSR Data
             testSheetNum: An Integer Representing the Excel Worksheet (0-indexed) Order.
+            saveExcelCopy: Also Write TXT/CSV Inputs as an Excel File (Only for Inspection)
         --------------------------------------------------------------------------
         """
         # Check if File Exists
         if not os.path.exists(inputFile):
             print("The following Input File Does Not Exist:", inputFile)
             sys.exit()
+        # If the File Was Already Parsed, Use the Cached Arrays
+        cachedData = self.loadCachedData(inputFile, testSheetNum)
+        if cachedData is not None:
+            return cachedData
             
-        # Convert to TXT and CSV Files to XLSX
+        # Parse TXT and CSV Files Directly (No Excel Round Trip)
         if inputFile.endswith(".txt") or inputFile.endswith(".csv"):
-            # Extract Filename Information
-            oldFileExtension = os.path.basename(inputFile)
-            filename = os.path.splitext(oldFileExtension)[0]
-            newFilePath = os.path.dirname(inputFile) + "/Excel Files/"
-            # Make Output Folder Directory if Not Already Created
-            os.makedirs(newFilePath, exist_ok = True)
-
-            # Convert CSV or TXT to XLSX
-            excelFile = newFilePath + filename + ".xlsx"
-            xlWorkbook, chiWorksheet = self.convertToExcel(inputFile, excelFile, excelDelimiter = ",", overwriteXL = False, testSheetNum = testSheetNum)
+            print("Extracting Data from the Text File:", inputFile)
+            # Only Write an Excel Version if Someone Wants to Look at It
+            if saveExcelCopy:
+                self.saveExcelCopy(inputFile, testSheetNum)
+            timePoints, temperature = self.readTextColumns(inputFile, numCols = 2)
         # If the File is Already an Excel File, Just Load the File
         elif inputFile.endswith(".xlsx"):
             # Load the GSR Data from the Excel File
             xlWorkbook = xl.load_workbook(inputFile, data_only=True, read_only=True)
             chiWorksheet = xlWorkbook.worksheets[testSheetNum]
+            print("Extracting Data from the Excel File:", inputFile)
+            
+            # Extract Time and Current Data from the File
+            timePoints, temperature = self.extractTemperatureData(chiWorksheet)
+            xlWorkbook.close()
         else:
             print("The Following File is Neither CSV, TXT, Nor XLSX:", inputFile)
-        print("Extracting Data from the Excel File:", inputFile)
-        
-        # Extract Time and Current Data from the File
-        timePoints, temperature = self.extractTemperatureData(chiWorksheet)
-
+            sys.exit()
         
-        xlWorkbook.close()
         # Finished Data Collection: Close Workbook and Return Data to User
         print("Done Collecting GSR Data");
-        return np.array(timePoints), np.array(temperature)
+        timePoints, temperature = np.array(timePoints), np.array(temperature)
+        # Cache the Arrays for the Next Run
+        self.saveCachedData(inputFile, [timePoints, temperature], testSheetNum)
+        return timePoints, temperature
 
 class processGSRData(dataProcessing):
     
@@ -442,28 +651,43 @@ class processGSRData(dataProcessing):
         timePoints = np.array(timePoints)
         return timePoints, currentPoints
     
-    def extractGSRData(self, ExcelSheet, startDataCol = 1, endDataCol = 2):
-        # If Header Exists, Skip Until You Find the Data
-        for row in ExcelSheet.rows:
-            cellA = row[0]
-            if type(cellA.value) in [int, float]:
-                dataStartRow = cellA.row + 1
-                break
+    def extractCHIText_CurrentTime(self, chiFile, delimiter = ","):
+        """ Parse a CHI Text Export Directly: Same Header Rules as extractCHIData_CurrentTime """
+        # Get the CHI Labeled Peaks from the Header
+        peakTimesCHI = []; peakCurrentsCHI = []; peakAmplitudesCHI = []
+        dataStartLine = None
+        with open(chiFile, "r") as inputData:
+            for lineNum, textLine in enumerate(inputData):
+                cellVal = self.splitTextLine(textLine, delimiter)[0]
+                # If Time Peak Found by CHI, Store the Value
+                if cellVal.startswith("tp = "):
+                    peakTimesCHI.append(float(cellVal.split(" = ")[-1][:-1]))
+                # If Current Peak Found by CHI, Store the Value
+                elif cellVal.startswith("ip = "):
+                    peakCurrentsCHI.append(float(cellVal.split(" = ")[-1][:-1]))
+                # If Amplitude Peak Found by CHI, Store the Value
+                elif cellVal.startswith("Ap = "):
+                    peakAmplitudesCHI.append(float(cellVal.split(" = ")[-1][:-1]))
+                # If Current/Time Titles are Present, the Data Starts After the Empty Line
+                elif cellVal == "Time/sec":
+                    dataStartLine = lineNum + 2
+                    break
+        # No Data Title Found: Nothing to Extract
+        if dataStartLine is None:
+            return np.array([]), np.array([])
         
-        # Loop Through the Excel Worksheet to collect all the data
-        timePoints = []; gsrData = [];
-        for dataRow in ExcelSheet.iter_rows(min_col=startDataCol, min_row=dataStartRow-1, max_col=endDataCol, max_row=ExcelSheet.max_row):
-            # Stop Collecting Data When there is No More
-            if dataRow[0].value == None:
-                break
-            
-            # Get Data
-            gsrData.append(float(dataRow[1].value))
-            timePoints.append(float(dataRow[0].value))
+        # Stream the Time and Current Data from the File
+        timePoints, currentPoints = self.readTextColumns(chiFile, numCols = 2, delimiter = delimiter, dataStartLine = dataStartLine)
+        return timePoints, currentPoints
+    
+    def extractGSRData(self, ExcelSheet, startDataCol = 1, endDataCol = 2):
+        # Bulk Read the Data: Skips the Header and Stops When there is No More
+        numCols = endDataCol - startDataCol + 1
+        timePoints, gsrData = self.extractNumericColumns(self.getSheetValues(ExcelSheet, numCols, startDataCol), numCols, requiredCols = 1, startDataCol = startDataCol)[0:2]
         
         return timePoints, gsrData
 
-    def getData(self, inputFile, testSheetNum = 0, method = "useCHI"):
+    def getData(self, inputFile, testSheetNum = 0, method = "useCHI", saveExcelCopy = False):
         """
         Extracts Pulse Data from Excel Document (.xlsx). Data can be in any
         worksheet which the user can specify using 'testSheetNum' (0-indexed).
@@ -475,120 +699,93 @@ class processGSRData(dataProcessing):
         Input Variable Definitions:
             inputFile: The Path to the Excel/TXT/CSV File Containing the GSR Data
             testSheetNum: An Integer Representing the Excel Worksheet (0-indexed) Order.
+            method: 'useCHI' for Raw CHI Exports; 'processed' for Two Column Time/Current Data
+            saveExcelCopy: Also Write TXT/CSV Inputs as an Excel File (Only for Inspection)
         --------------------------------------------------------------------------
         """
         # Check if File Exists
         if not os.path.exists(inputFile):
             print("The following Input File Does Not Exist:", inputFile)
             sys.exit()
+        # If the File Was Already Parsed, Use the Cached Arrays
+        cachedData = self.loadCachedData(inputFile, testSheetNum, method)
+        if cachedData is not None:
+            return cachedData
             
-        # Convert to TXT and CSV Files to XLSX
+        # Parse TXT and CSV Files Directly (No Excel Round Trip)
         if inputFile.endswith(".txt") or inputFile.endswith(".csv"):
-            # Extract Filename Information
-            oldFileExtension = os.path.basename(inputFile)
-            filename = os.path.splitext(oldFileExtension)[0]
-            newFilePath = os.path.dirname(inputFile) + "/Excel Files/"
-            # Make Output Folder Directory if Not Already Created
-            os.makedirs(newFilePath, exist_ok = True)
-
-            # Convert CSV or TXT to XLSX
-            excelFile = newFilePath + filename + ".xlsx"
-            xlWorkbook, chiWorksheet = self.convertToExcel(inputFile, excelFile, excelDelimiter = ",", overwriteXL = False, testSheetNum = testSheetNum)
+            print("Extracting Data from the Text File:", inputFile)
+            # Only Write an Excel Version if Someone Wants to Look at It
+            if saveExcelCopy:
+                self.saveExcelCopy(inputFile, testSheetNum)
+            # Extract Time and Current Data from the File
+            if method == 'useCHI':
+                timePoints, currentPoints = self.extractCHIText_CurrentTime(inputFile)
+            elif method == 'processed':
+                timePoints, currentPoints = self.readTextColumns(inputFile, numCols = 2)
+            else:
+                exit("No Extract Method for GSR Found")
         # If the File is Already an Excel File, Just Load the File
         elif inputFile.endswith(".xlsx"):
             # Load the GSR Data from the Excel File
             xlWorkbook = xl.load_workbook(inputFile, data_only=True, read_only=True)
             chiWorksheet = xlWorkbook.worksheets[testSheetNum]
+            print("Extracting Data from the Excel File:", inputFile)
+            
+            # Extract Time and Current Data from the File
+            if method == 'useCHI':
+                timePoints, currentPoints = self.extractCHIData_CurrentTime(chiWorksheet)
+            elif method == 'processed':
+                timePoints, currentPoints = self.extractGSRData(chiWorksheet)
+            else:
+                exit("No Extract Method for GSR Found")
+            xlWorkbook.close()
         else:
             print("The Following File is Neither CSV, TXT, Nor XLSX:", inputFile)
-        print("Extracting Data from the Excel File:", inputFile)
-        
-        # Extract Time and Current Data from the File
-        if method == 'useCHI':
-            timePoints, currentPoints = self.extractCHIData_CurrentTime(chiWorksheet)
-        elif method == 'processed':
-            timePoints, currentPoints = self.extractGSRData(chiWorksheet)
-        else:
-            exit("No Extract Method for GSR Found")
+            sys.exit()
         
-        xlWorkbook.close()
         # Finished Data Collection: Close Workbook and Return Data to User
         print("Done Collecting GSR Data");
-        return np.array(timePoints), np.array(currentPoints)
+        timePoints, currentPoints = np.array(timePoints), np.array(currentPoints)
+        # Cache the Arrays for the Next Run
+        self.saveCachedData(inputFile, [timePoints, currentPoints], testSheetNum, method)
+        return timePoints, currentPoints
     
-    def saveFilteredData(self, timeGSR, currentGS, saveDataFolder, saveExcelName, sheetName = "Galvanic Skin Response Data"):
+    def saveFilteredData(self, timeGSR, currentGS, saveDataFolder, saveExcelName, sheetName = "Galvanic Skin Response Data", saveFormat = "excel"):
         print("Saving the Data")
         # Create Output File Directory to Save Data: If Not Already Created
         os.makedirs(saveDataFolder, exist_ok=True)
         
         # Create Path to Save the Excel File
         excelFile = saveDataFolder + saveExcelName
-        
-        # If the File is Not Present: Create it
-        if not os.path.isfile(excelFile):
-            # Make Excel WorkBook
-            WB = xl.Workbook()
-            WB_worksheet = WB.active 
-            WB_worksheet.title = sheetName
-        else:
-            print("Excel File Already Exists. Adding New Sheet to File")
-            WB = xl.load_workbook(excelFile)
-            WB_worksheet = WB.create_sheet(sheetName)
-        
         # Label First Row
         header = ["Time (Seconds)", "Current (uAmps)"]
-        WB_worksheet.append(header)
         
-        # Save Data to Worksheet
-        for dataPoint in range(len(timeGSR)):
-            timePoint = timeGSR[dataPoint]
-            currentPoint = currentGS[dataPoint]
-            
-            # Write the Data to Excel
-            WB_worksheet.append([timePoint, currentPoint])
+        # Machine Readable Copy of the Data
+        if saveFormat in ["binary", "both"]:
+            self.saveBinarySidecar(excelFile, sheetName, header, np.column_stack((timeGSR, currentGS)))
+            if saveFormat == "binary":
+                return None
         
-        # Add Excel Aesthetics
-        WB_worksheet = self.addExcelAesthetics(WB_worksheet)    
-            
-        # Save as New Excel File
-        WB.save(excelFile)
-        WB.close()
+        # Stream the Data to the Worksheet
+        self.saveExcelRows(excelFile, sheetName, header, zip(timeGSR, currentGS))
 
 
 class processChemicalData(dataProcessing):
     
     def extractChemicalData(self, ExcelSheet, startDataCol = 1, endDataCol = 4):
-        # If Header Exists, Skip Until You Find the Data
-        for row in ExcelSheet.rows:
-            cellA = row[0]
-            if type(cellA.value) in [int, float]:
-                dataStartRow = cellA.row + 1
-                break
+        # Bulk Read the Data: Skips the Header and Stops When there is No More
+        numCols = endDataCol - startDataCol + 1
+        timePoints, glucose, lactate, uricAcid = self.extractNumericColumns(self.getSheetValues(ExcelSheet, numCols, startDataCol), numCols, requiredCols = 1, startDataCol = startDataCol)[0:4]
         
-        # Loop Through the Excel Worksheet to collect all the data
-        timePoints = []; glucose = []; lactate = []; uricAcid = []
-        for dataRow in ExcelSheet.iter_rows(min_col=startDataCol, min_row=dataStartRow-1, max_col=endDataCol, max_row=ExcelSheet.max_row):
-            # Stop Collecting Data When there is No More
-            if dataRow[0].value == None:
-                break
-            
-            # Get Data
-            glucoseData = dataRow[1].value
-            lactateData = dataRow[2].value
-            uricAcidData = dataRow[3].value
-
-            # Get Cell Values
-            timePoints.append(dataRow[0].value)
-            if glucoseData != None:
-                glucose.append(float(glucoseData))
-            if lactateData != None:
-                lactate.append(float(lactateData))
-            if uricAcidData != None:
-                uricAcid.append(float(uricAcidData))
+        # Each Chemical Only Keeps its Recorded Points
+        glucose = glucose[~np.isnan(glucose)]
+        lactate = lactate[~np.isnan(lactate)]
+        uricAcid = uricAcid[~np.isnan(uricAcid)]
         
         return timePoints, np.array([np.array(glucose), np.array(lactate), np.array(uricAcid)])
             
-    def getData(self, chemicalFile, testSheetNum = 0):
+    def getData(self, chemicalFile, testSheetNum = 0, saveExcelCopy = False):
         """
         Extracts Pulse Data from Excel Document (.xlsx). Data can be in any
         worksheet which the user can specify using 'testSheetNum' (0-indexed).
@@ -600,72 +797,65 @@ class processChemicalData(dataProcessing):
         Input Variable Definitions:
             chemicalFile: The Path to the Excel/TXT/CSV File Containing the Chemical Data
             testSheetNum: An Integer Representing the Excel Worksheet (0-indexed) Order.
+            saveExcelCopy: Also Write TXT/CSV Inputs as an Excel File (Only for Inspection)
         --------------------------------------------------------------------------
         """
         # Check if File Exists
         if not os.path.exists(chemicalFile):
             print("The following Input File Does Not Exist:", chemicalFile)
             sys.exit()
+        # If the File Was Already Parsed, Use the Cached Arrays
+        cachedData = self.loadCachedData(chemicalFile, testSheetNum)
+        if cachedData is not None:
+            return cachedData
             
-        # Convert to TXT and CSV Files to XLSX
+        # Parse TXT and CSV Files Directly (No Excel Round Trip)
         if chemicalFile.endswith(".txt") or chemicalFile.endswith(".csv"):
-            # Extract Filename Information
-            oldFileExtension = os.path.basename(chemicalFile)
-            filename = os.path.splitext(oldFileExtension)[0]
-            newFilePath = os.path.dirname(chemicalFile) + "/Excel Files/"
-            # Make Output Folder Directory if Not Already Created
-            os.makedirs(newFilePath, exist_ok = True)
-
-            # Convert CSV or TXT to XLSX
-            excelFile = newFilePath + filename + ".xlsx"
-            xlWorkbook, chemicalWorksheet = self.convertToExcel(chemicalFile, excelFile, excelDelimiter = ",", overwriteXL = False, testSheetNum = testSheetNum)
+            print("Extracting Data from the Text File:", chemicalFile)
+            # Only Write an Excel Version if Someone Wants to Look at It
+            if saveExcelCopy:
+                self.saveExcelCopy(chemicalFile, testSheetNum)
+            timePoints, glucose, lactate, uricAcid = self.readTextColumns(chemicalFile, numCols = 4)
+            # Each Chemical Only Keeps its Recorded Points
+            chemicalData = [glucose[~np.isnan(glucose)], lactate[~np.isnan(lactate)], uricAcid[~np.isnan(uricAcid)]]
         # If the File is Already an Excel File, Just Load the File
         elif chemicalFile.endswith(".xlsx"):
             # Load the GSR Data from the Excel File
             xlWorkbook = xl.load_workbook(chemicalFile, data_only=True, read_only=True)
             chemicalWorksheet = xlWorkbook.worksheets[testSheetNum]
+            print("Extracting Data from the Excel File:", chemicalFile)
+            
+            # Extract Time and Current Data from the File
+            timePoints, chemicalData = self.extractChemicalData(chemicalWorksheet)
+            xlWorkbook.close()
         else:
             print("The Following File is Neither CSV, TXT, Nor XLSX:", chemicalFile)
-        print("Extracting Data from the Excel File:", chemicalFile)
-        
-        # Extract Time and Current Data from the File
-        timePoints, chemicalData = self.extractChemicalData(chemicalWorksheet)
+            sys.exit()
         
-        xlWorkbook.close()
         # Finished Data Collection: Close Workbook and Return Data to User
         print("Done Collecting Chemical Data");
-        return np.array(timePoints), np.array(chemicalData)
+        timePoints, chemicalData = np.array(timePoints), np.array(chemicalData)
+        # Cache the Arrays for the Next Run
+        self.saveCachedData(chemicalFile, [timePoints, chemicalData], testSheetNum)
+        return timePoints, chemicalData
 
 class processMLData(dataProcessing):
     
-    def saveFeatureComparison(self, dataMatrix, rowHeaders, colHeaders, saveDataFolder, saveExcelName, sheetName = "Feature Comparison", saveFirstSheet = False):
+    def saveFeatureComparison(self, dataMatrix, rowHeaders, colHeaders, saveDataFolder, saveExcelName, sheetName = "Feature Comparison", saveFirstSheet = False, saveFormat = "excel"):
         print("Saving the Data")
         # Create Output File Directory to Save Data: If Not Already Created
         os.makedirs(saveDataFolder, exist_ok=True)
         
         # Create Path to Save the Excel File
         excelFile = saveDataFolder + saveExcelName
-        
-        # If the File is Not Present: Create it
-        if not os.path.isfile(excelFile):
-            # Make Excel WorkBook
-            WB = xl.Workbook()
-            WB_worksheet = WB.active 
-            WB_worksheet.title = sheetName
-        else:
-            print("Excel File Already Exists. Adding New Sheet to File")
-            WB = xl.load_workbook(excelFile)
-            WB_worksheet = WB.create_sheet(sheetName)
-        
-
-        maxAddToExcelSheet = 1048500  # Max Rows in a Worksheet
-        # Save Data to Worksheet
-        for firstIndexInList in range(0, len(dataMatrix), maxAddToExcelSheet):
-            # Label First Row
-            WB_worksheet.append(colHeaders)
-            
-            # Add data to the Worksheet
-            for rowInd in range(firstIndexInList, min(firstIndexInList+maxAddToExcelSheet, len(dataMatrix))):
+        # Machine Readable Copy of the Data
+        if saveFormat in ["binary", "both"]:
+            self.saveBinarySidecar(excelFile, sheetName, colHeaders, dataMatrix)
+            if saveFormat == "binary":
+                return None
+        
+        def comparisonRows():
+            for rowInd in range(len(dataMatrix)):
                 dataRow = []
                 
                 if rowInd < len(rowHeaders):
@@ -675,21 +865,10 @@ class processMLData(dataProcessing):
                 dataRow.extend(dataMatrix[rowInd])
                 dataRow[0] = float(dataRow[0])
                 dataRow[1] = float(dataRow[1])
-                # Write the Data to Excel
-                WB_worksheet.append(dataRow)
+                yield dataRow
         
-            # Add Excel Aesthetics
-            WB_worksheet = self.addExcelAesthetics(WB_worksheet)  
-            # Add Sheet
-            WB_worksheet = WB.create_sheet(sheetName)
-            
-            if saveFirstSheet:
-                break
-
-        WB.remove(WB_worksheet)
-        # Save as New Excel File
-        WB.save(excelFile)
-        WB.close()
+        # Stream the Data to the Worksheet
+        self.saveExcelRows(excelFile, sheetName, colHeaders, comparisonRows(), saveFirstSheet = saveFirstSheet)
     
     def getData(self, MLFile, signalData = [], signalLabels = [], testSheetNum = 0, startCollectionCol = 2):
         """
@@ -0,0 +1,205 @@
+
+# Basic Modules
+import os
+import sys
+import json
+import hashlib
+import inspect
+import numpy as np
+import openpyxl as xl
+
+# Import Excel Processing (For Reading Old Feature List Workbooks)
+import excelProcessing
+
+# --------------------------------------------------------------------------- #
+# --------------------------------------------------------------------------- #
+
+class featureStore:
+    """
+    Columnar Store of the Analyzed Features: One Folder per Sensor/Subject/Stressor.
+    Each Folder Holds:
+        features.npy: The Feature Matrix (Column-Major, so Single Features Load Alone)
+        metadata.json: The Feature Names and the Analysis Parameters That Made Them
+    Entries Also Hold a Fingerprint of the Input Files, Analysis Parameters, and
+    Analysis Code; Entries Whose Fingerprint Changed are Reanalyzed.
+    """
+
+    def __init__(self, storeFolder):
+        # Base Folder of the Store; MUST END IN '/'
+        self.storeFolder = storeFolder
+        # Reader for Feature Lists Saved Before the Store Existed
+        self.excelProcessing = excelProcessing.dataProcessing()
+        
+        # Content Hashes of the Input Files, Reused While a File's Size/Time are Unchanged
+        self.fileHashesFile = self.storeFolder + "fileHashes.json"
+        self.fileHashes = {}
+        if os.path.isfile(self.fileHashesFile):
+            try:
+                with open(self.fileHashesFile, 'r') as fileHashesFile:
+                    self.fileHashes = json.load(fileHashesFile)
+            except ValueError:
+                # An Unreadable Memo Only Means the Files are Rehashed
+                self.fileHashes = {}
+
+    def getEntryFolder(self, subjectName, stressor, sensor):
+        return self.storeFolder + sensor + "/" + subjectName + "/" + stressor + "/"
+
+    def hasFeatures(self, subjectName, stressor, sensor):
+        entryFolder = self.getEntryFolder(subjectName, stressor, sensor)
+        return os.path.isfile(entryFolder + "features.npy") and os.path.isfile(entryFolder + "metadata.json")
+
+    # ---------------------------------------------------------------------- #
+    # ------------------------ Analysis Fingerprints ----------------------- #
+    
+    def hashFile(self, inputFile):
+        """ SHA-1 of the File's Contents; Only Reread if the File's Size or Modification Time Changed """
+        inputFile = os.path.abspath(inputFile)
+        fileStats = os.stat(inputFile)
+        fileKey = [fileStats.st_mtime_ns, fileStats.st_size]
+        # Reuse the Previous Hash if the File was Not Touched
+        if inputFile in self.fileHashes and self.fileHashes[inputFile][0:2] == fileKey:
+            return self.fileHashes[inputFile][2]
+        
+        fileHash = hashlib.sha1()
+        with open(inputFile, 'rb') as dataFile:
+            for dataChunk in iter(lambda: dataFile.read(2**20), b''):
+                fileHash.update(dataChunk)
+        self.fileHashes[inputFile] = fileKey + [fileHash.hexdigest()]
+        
+        # Remember the Hash for the Next Run (Swapped in Whole: Parallel Workers Share the File)
+        os.makedirs(self.storeFolder, exist_ok = True)
+        tempHashesFile = self.fileHashesFile + "." + str(os.getpid()) + ".tmp"
+        with open(tempHashesFile, 'w') as fileHashesFile:
+            json.dump(self.fileHashes, fileHashesFile)
+        os.replace(tempHashesFile, self.fileHashesFile)
+        return self.fileHashes[inputFile][2]
+    
+    def getCodeFiles(self, analysisProtocol):
+        """ The Source Files of the Protocol's Module, its Sibling Modules, and the Data Readers """
+        protocolModule = sys.modules[type(analysisProtocol).__module__]
+        protocolFile = inspect.getsourcefile(protocolModule)
+        codeFiles = [protocolFile, inspect.getsourcefile(excelProcessing)]
+        # Include the Helper Modules Imported from the Same Folder (e.g. Filtering)
+        for moduleObject in vars(protocolModule).values():
+            if inspect.ismodule(moduleObject) and getattr(moduleObject, "__file__", None):
+                if os.path.dirname(os.path.abspath(moduleObject.__file__)) == os.path.dirname(os.path.abspath(protocolFile)):
+                    codeFiles.append(moduleObject.__file__)
+        return sorted(set(os.path.abspath(codeFile) for codeFile in codeFiles))
+    
+    def createFingerprint(self, inputFiles, analysisProtocol = None, analysisParameters = {}):
+        """
+        Fingerprint of Everything That Determines the Features: The Input Files'
+        Contents (Folders Include All Their Files), the Protocol's Analysis
+        Parameters, Any Extra Parameters, and the Analysis Code Itself.
+        """
+        fingerprint = hashlib.sha1()
+        # Hash the Input Data
+        for inputFile in inputFiles:
+            if os.path.isdir(inputFile):
+                folderFiles = sorted(fileName for fileName in os.listdir(inputFile) if not fileName.startswith(("$", "~")))
+                folderFiles = [os.path.join(inputFile, fileName) for fileName in folderFiles if os.path.isfile(os.path.join(inputFile, fileName))]
+            else:
+                folderFiles = [inputFile]
+            for dataFile in folderFiles:
+                fingerprint.update((os.path.basename(dataFile) + self.hashFile(dataFile)).encode())
+        
+        # Hash the Parameters
+        allParameters = dict(analysisParameters)
+        if analysisProtocol is not None:
+            allParameters["protocol"] = analysisProtocol.getAnalysisParameters()
+        fingerprint.update(json.dumps(allParameters, sort_keys = True, default = str).encode())
+        
+        # Hash the Analysis Code
+        if analysisProtocol is not None:
+            for codeFile in self.getCodeFiles(analysisProtocol):
+                fingerprint.update(self.hashFile(codeFile).encode())
+        
+        return fingerprint.hexdigest()
+    
+    # ---------------------------------------------------------------------- #
+    # ---------------------------- Feature Access -------------------------- #
+
+    def saveFeatures(self, subjectName, stressor, sensor, featureList, featureNames, analysisParameters = {}, fingerprint = None):
+        """ Store the Features (Rows = Time Points/Trials; Columns = Features) """
+        entryFolder = self.getEntryFolder(subjectName, stressor, sensor)
+        os.makedirs(entryFolder, exist_ok = True)
+
+        # Column-Major Storage: Each Feature is Contiguous on Disk
+        featureArray = np.asfortranarray(np.array(featureList, dtype=np.float64, ndmin=2))
+        assert featureArray.shape[1] == len(featureNames), "The Number of Features Does Not Match the Feature Names"
+        metadata = {
+            "featureNames": list(featureNames),
+            "analysisParameters": analysisParameters,
+            "fingerprint": fingerprint,
+        }
+
+        # Write the Data First: A Metadata File Means the Entry is Complete
+        if os.path.isfile(entryFolder + "metadata.json"):
+            os.remove(entryFolder + "metadata.json")
+        with open(entryFolder + "features.npy.tmp", 'wb') as featureFile:
+            np.save(featureFile, featureArray, allow_pickle = False)
+        os.replace(entryFolder + "features.npy.tmp", entryFolder + "features.npy")
+        with open(entryFolder + "metadata.json", 'w') as metadataFile:
+            json.dump(metadata, metadataFile, default = str)
+
+    def loadMetadata(self, subjectName, stressor, sensor):
+        with open(self.getEntryFolder(subjectName, stressor, sensor) + "metadata.json", 'r') as metadataFile:
+            return json.load(metadataFile)
+
+    def loadFeatures(self, subjectName, stressor, sensor, featureNames = None, legacyExcelFile = None, fingerprint = None):
+        """
+        Load the Stored Features. Only the Requested Feature Columns are Read from
+        Disk if 'featureNames' is Given. If the Entry is Missing but an Old
+        'Feature List.xlsx' Exists, it is Imported into the Store First (and
+        Trusted as Matching the Given Fingerprint).
+        Returns None if There are No Saved Features or the Fingerprint Changed.
+        """
+        if not self.hasFeatures(subjectName, stressor, sensor):
+            # Import Features Saved Before the Store Existed
+            if legacyExcelFile is None or not os.path.isfile(legacyExcelFile):
+                return None
+            self.importExcelFeatures(subjectName, stressor, sensor, legacyExcelFile, fingerprint)
+        # The Data, Parameters, or Code Changed: The Features Must be Recomputed
+        elif fingerprint is not None and self.loadMetadata(subjectName, stressor, sensor).get("fingerprint") != fingerprint:
+            print("\tThe Saved Features are Out of Date:", sensor, subjectName, stressor)
+            return None
+
+        # Memory-Map the Features and Only Read the Columns Asked For
+        entryFolder = self.getEntryFolder(subjectName, stressor, sensor)
+        storedFeatures = np.load(entryFolder + "features.npy", mmap_mode = 'r', allow_pickle = False)
+        if featureNames is None:
+            return np.array(storedFeatures)
+
+        storedFeatureNames = self.loadMetadata(subjectName, stressor, sensor)["featureNames"]
+        featureInds = [storedFeatureNames.index(featureName) for featureName in featureNames]
+        return np.array(storedFeatures[:, featureInds])
+
+    def loadCohort(self, sensor, featureNames = None):
+        """ Load Every Stored Entry of the Sensor: {(subjectName, stressor): Features} """
+        cohortFeatures = {}
+        sensorFolder = self.storeFolder + sensor + "/"
+        if not os.path.isdir(sensorFolder):
+            return cohortFeatures
+
+        for subjectName in sorted(os.listdir(sensorFolder)):
+            for stressor in sorted(os.listdir(sensorFolder + subjectName)):
+                if self.hasFeatures(subjectName, stressor, sensor):
+                    cohortFeatures[(subjectName, stressor)] = self.loadFeatures(subjectName, stressor, sensor, featureNames)
+        return cohortFeatures
+
+    def importExcelFeatures(self, subjectName, stressor, sensor, featureExcelFile, fingerprint = None):
+        """ Copy an Old 'Feature List.xlsx' Workbook into the Store """
+        featureList = self.excelProcessing.getSavedFeatures(featureExcelFile)
+
+        # The Header of the Workbook Holds the Feature Names
+        featureNames = [str(featureInd) for featureInd in range(featureList.shape[1])]
+        try:
+            WB = xl.load_workbook(featureExcelFile, read_only=True)
+            headerRow = next(WB.worksheets[-1].iter_rows(max_row = 1, values_only = True))
+            if len(headerRow) >= featureList.shape[1]:
+                featureNames = [str(featureName) for featureName in headerRow[0:featureList.shape[1]]]
+            WB.close()
+        except (StopIteration, OSError):
+            pass
+
+        self.saveFeatures(subjectName, stressor, sensor, featureList, featureNames, {"importedFrom": featureExcelFile}, fingerprint)
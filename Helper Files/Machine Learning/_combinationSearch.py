@@ -0,0 +1,313 @@
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Imported Modules ---------------------------- #
+
+# Basic Modules
+import os
+import math
+import time
+import heapq
+import pickle
+import hashlib
+import numpy as np
+# Parallel Processing Modules
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# -------------------------------------------------------------------------- #
+# --------------------------- Combination Indexing ------------------------- #
+
+def countCombinations(numItems, combinationSize):
+    return math.comb(numItems, combinationSize)
+
+def unrankCombination(combinationInd, numItems, combinationSize):
+    """ The combinationInd-th Combination in itertools.combinations Order (Combinatorial Number System) """
+    combination = []; item = 0
+    for position in range(combinationSize):
+        itemsLeft = combinationSize - position - 1
+        # Skip Every Combination Starting with a Smaller Item
+        while combinationInd >= math.comb(numItems - item - 1, itemsLeft):
+            combinationInd -= math.comb(numItems - item - 1, itemsLeft)
+            item += 1
+        combination.append(item); item += 1
+    return tuple(combination)
+
+def rankCombination(combination, numItems):
+    """ The Index of a Sorted Combination in itertools.combinations Order (The Inverse of unrankCombination) """
+    combinationInd = 0; item = 0; combinationSize = len(combination)
+    for position, combinationItem in enumerate(combination):
+        itemsLeft = combinationSize - position - 1
+        # Count Every Combination Starting with a Smaller Item
+        for skippedItem in range(item, combinationItem):
+            combinationInd += math.comb(numItems - skippedItem - 1, itemsLeft)
+        item = combinationItem + 1
+    return combinationInd
+
+def iterateCombinations(numItems, combinationSize, startInd, stopInd):
+    """ The Combinations startInd to stopInd-1 in itertools.combinations Order (No Need to Walk to startInd) """
+    if startInd >= stopInd:
+        return
+    combination = list(unrankCombination(startInd, numItems, combinationSize))
+    for _ in range(startInd, stopInd):
+        yield tuple(combination)
+        # Advance the Last Item That is Not at its Maximum; Reset the Items After It
+        position = combinationSize - 1
+        while position >= 0 and combination[position] == numItems - combinationSize + position:
+            position -= 1
+        if position < 0:
+            return
+        combination[position] += 1
+        for nextPosition in range(position + 1, combinationSize):
+            combination[nextPosition] = combination[nextPosition - 1] + 1
+
+# -------------------------------------------------------------------------- #
+# ------------------------------ Shared Arrays ----------------------------- #
+
+class sharedArrays:
+    """
+    Arrays Copied into Shared Memory Once; Each Worker Attaches to Them (attachSharedArrays)
+    Instead of Receiving a Pickled Copy. Call close() Once the Workers are Done.
+    """
+
+    def __init__(self, namedArrays):
+        self.sharedBlocks = []
+        self.arraySpecs = {}    # {arrayName: (Shared Memory Name, Shape, dtype)}: Picklable
+        for arrayName, array in namedArrays.items():
+            array = np.ascontiguousarray(array)
+            sharedBlock = shared_memory.SharedMemory(create = True, size = max(1, array.nbytes))
+            np.ndarray(array.shape, dtype = array.dtype, buffer = sharedBlock.buf)[...] = array
+            self.sharedBlocks.append(sharedBlock)
+            self.arraySpecs[arrayName] = (sharedBlock.name, array.shape, array.dtype.str)
+
+    def close(self):
+        for sharedBlock in self.sharedBlocks:
+            sharedBlock.close()
+            sharedBlock.unlink()
+        self.sharedBlocks = []
+
+def attachSharedArrays(arraySpecs):
+    """ Returns the Arrays (Read Only) and Their Blocks (Keep These Referenced While Using the Arrays) """
+    namedArrays = {}; sharedBlocks = []
+    for arrayName, (blockName, arrayShape, arrayType) in arraySpecs.items():
+        sharedBlock = shared_memory.SharedMemory(name = blockName)
+        namedArrays[arrayName] = np.ndarray(arrayShape, dtype = np.dtype(arrayType), buffer = sharedBlock.buf)
+        namedArrays[arrayName].flags.writeable = False
+        sharedBlocks.append(sharedBlock)
+    return namedArrays, sharedBlocks
+
+# -------------------------------------------------------------------------- #
+# ------------------------------ Search Workers ---------------------------- #
+
+# What Each Worker Process Needs (Set Once by startSearchWorker)
+workerState = {}
+
+def startSearchWorker(predictionHead, arraySpecs, searchSettings):
+    global workerState
+    namedArrays, sharedBlocks = attachSharedArrays(arraySpecs)
+    workerState = {"predictionHead": predictionHead, "sharedBlocks": sharedBlocks, "searchArrays": namedArrays, "searchSettings": searchSettings}
+
+def scoreWorkerChunk(startInd, stopInd):
+    return scoreCombinationChunk(workerState["predictionHead"], workerState["searchArrays"], workerState["searchSettings"], startInd, stopInd)
+
+def scoreCombinationChunk(predictionHead, searchArrays, searchSettings, startInd, stopInd):
+    """ Score the Combinations startInd to stopInd-1. Returns startInd, Their Scores, and Their STDs """
+    combinationList = list(iterateCombinations(searchSettings["numFeatures"], searchSettings["numFeaturesCombine"], startInd, stopInd))
+    chunkScores, chunkSTDs = predictionHead.scoreFeatureSubsets(searchArrays["signalDataTransform"], searchArrays["signalLabels"], combinationList, searchSettings["allSubjectInds"], searchSettings["randomSeed"])
+    return startInd, chunkScores, chunkSTDs
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Search Progress ----------------------------- #
+
+class searchProgress:
+    """ Reports the Combined Progress and Time Remaining of Every Worker """
+
+    def __init__(self, numCombinations, printUpdateAfterTrial, numScored = 0):
+        self.numCombinations = numCombinations
+        self.printUpdateAfterTrial = max(1, printUpdateAfterTrial)
+        # Combinations Scored Before Resuming Do Not Count Towards the Rate
+        self.numScored = numScored; self.numScoredAtStart = numScored
+        self.nextUpdate = (numScored//self.printUpdateAfterTrial + 1)*self.printUpdateAfterTrial
+        self.startTime = time.time()
+
+    def update(self, numNewScores):
+        self.numScored += numNewScores
+        if self.numScored >= self.nextUpdate and self.numScored < self.numCombinations:
+            self.nextUpdate = (self.numScored//self.printUpdateAfterTrial + 1)*self.printUpdateAfterTrial
+            percentComplete = 100*self.numScored/self.numCombinations
+            minutesLeft = (time.time() - self.startTime)*(self.numCombinations - self.numScored)/((self.numScored - self.numScoredAtStart)*60)
+            print(str(np.round(percentComplete, 2)) + "% Complete; Estimated Time Remaining: " + str(np.round(minutesLeft, 2)) + " Minutes")
+
+# -------------------------------------------------------------------------- #
+# ----------------------------- Best Combinations -------------------------- #
+
+class topCombinations:
+    """
+    The maxKept Best Scoring Combinations, Kept in a Min Heap of (Score, STD, -Index, Feature
+    Indices) so the Worst Kept is Replaced First (Ties: The Later Combination Goes First).
+    The Combinations are Stored as Tuples of Feature Indices; Named Only When Sorted.
+    """
+
+    def __init__(self, maxKept = 100000):
+        self.maxKept = maxKept
+        self.combinationHeap = []
+
+    def __len__(self):
+        return len(self.combinationHeap)
+
+    def addCombination(self, modelScore, modelSTD, combinationInd, combinationInds):
+        heapEntry = (float(modelScore), float(modelSTD), -combinationInd, tuple(int(featureInd) for featureInd in combinationInds))
+        if len(self.combinationHeap) < self.maxKept:
+            heapq.heappush(self.combinationHeap, heapEntry)
+        elif heapEntry > self.combinationHeap[0]:
+            heapq.heapreplace(self.combinationHeap, heapEntry)
+
+    def addChunk(self, numFeatures, numFeaturesCombine, startInd, chunkScores, chunkSTDs):
+        """ Add the Scores of the Combinations startInd Onwards """
+        if self.maxKept <= 0:
+            return
+        # Once Full, Only the Scores Beating the Worst Kept Can Get In
+        candidateInds = np.arange(len(chunkScores))
+        if len(self.combinationHeap) >= self.maxKept:
+            candidateInds = np.flatnonzero(np.asarray(chunkScores) >= self.combinationHeap[0][0])
+        # Find Few Candidates Directly; Walk Through the Chunk for Many
+        if len(candidateInds) < len(chunkScores)//8:
+            for chunkInd in candidateInds:
+                self.addCombination(chunkScores[chunkInd], chunkSTDs[chunkInd], startInd + chunkInd, unrankCombination(startInd + chunkInd, numFeatures, numFeaturesCombine))
+        else:
+            for chunkInd, combinationInds in enumerate(iterateCombinations(numFeatures, numFeaturesCombine, startInd, startInd + len(chunkScores))):
+                self.addCombination(chunkScores[chunkInd], chunkSTDs[chunkInd], startInd + chunkInd, combinationInds)
+
+    def getSortedCombinations(self, featureNames):
+        """ Returns the Scores, STDs, and Feature Names (Space Separated) from Best to Worst """
+        featureNames = np.asarray(featureNames)
+        namedCombinations = [(modelScore, modelSTD, ' '.join(featureNames[np.array(combinationInds)])) for modelScore, modelSTD, _, combinationInds in self.combinationHeap]
+        namedCombinations.sort(reverse = True)
+        modelScores = [namedCombination[0] for namedCombination in namedCombinations]
+        modelSTDs = [namedCombination[1] for namedCombination in namedCombinations]
+        featureNames_Combinations = [namedCombination[2] for namedCombination in namedCombinations]
+        return modelScores, modelSTDs, featureNames_Combinations
+
+# -------------------------------------------------------------------------- #
+# ------------------------------ Checkpoints ------------------------------- #
+
+class searchCheckpoint:
+    """
+    Saves the Best Combinations So Far Every checkpointMinutes, With the Index Every Combination
+    Before Which has Been Scored. A Search with the Same Fingerprint (Data, Features, Model)
+    Resumes From There. The File is Removed Once the Search Finishes.
+    """
+
+    def __init__(self, checkpointFile, searchFingerprint, checkpointMinutes = 10):
+        self.checkpointFile = checkpointFile
+        self.searchFingerprint = searchFingerprint
+        self.checkpointSeconds = checkpointMinutes*60
+        self.lastSaveTime = time.time()
+
+    def resume(self, bestCombinations):
+        """ Load the Saved Best Combinations; Returns the Index to Resume From (0: Start Over) """
+        if not os.path.exists(self.checkpointFile):
+            return 0
+        with open(self.checkpointFile, 'rb') as checkpointHandle:
+            savedSearch = pickle.load(checkpointHandle)
+        if savedSearch["searchFingerprint"] != self.searchFingerprint or savedSearch["maxKept"] != bestCombinations.maxKept:
+            print("The Checkpoint is From a Different Search; Starting Over:", self.checkpointFile)
+            return 0
+        bestCombinations.combinationHeap = savedSearch["combinationHeap"]
+        print("Resuming the Search From Combination", savedSearch["nextCombinationInd"])
+        return savedSearch["nextCombinationInd"]
+
+    def update(self, nextCombinationInd, bestCombinations):
+        if time.time() - self.lastSaveTime >= self.checkpointSeconds:
+            self.save(nextCombinationInd, bestCombinations)
+
+    def save(self, nextCombinationInd, bestCombinations):
+        savedSearch = {"searchFingerprint": self.searchFingerprint, "maxKept": bestCombinations.maxKept,
+                       "nextCombinationInd": nextCombinationInd, "combinationHeap": bestCombinations.combinationHeap}
+        # Write a New File, Then Swap it In (A Crash While Saving Keeps the Last Checkpoint)
+        os.makedirs(os.path.dirname(self.checkpointFile) or ".", exist_ok = True)
+        with open(self.checkpointFile + ".tmp", 'wb') as checkpointHandle:
+            pickle.dump(savedSearch, checkpointHandle, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(self.checkpointFile + ".tmp", self.checkpointFile)
+        self.lastSaveTime = time.time()
+
+    def finish(self):
+        if os.path.exists(self.checkpointFile):
+            os.remove(self.checkpointFile)
+
+def fingerprintSearch(*searchInputs):
+    """ A Hash of the Search's Inputs (Arrays by Their Bytes) """
+    searchHash = hashlib.sha256()
+    for searchInput in searchInputs:
+        if isinstance(searchInput, np.ndarray):
+            searchHash.update(str((searchInput.shape, searchInput.dtype.str)).encode())
+            searchHash.update(np.ascontiguousarray(searchInput).tobytes())
+        else:
+            searchHash.update(repr(searchInput).encode())
+        searchHash.update(b"|")
+    return searchHash.hexdigest()
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Parallel Search ----------------------------- #
+
+class combinationSearch:
+    """
+    Scores Every Feature Combination, in a Process Pool if numWorkers > 1. The Combinations
+    are Split into Chunks of Consecutive Indices (Each Worker Finds its Chunk's Combinations
+    Directly), and the Data is Shared Through Shared Memory. The Scores Match Scoring One by One.
+    """
+
+    def __init__(self, predictionHead, numWorkers, chunkSize = None):
+        self.predictionHead = predictionHead
+        self.numWorkers = numWorkers
+        self.chunkSize = chunkSize  # None: About 8 Chunks per Worker, Capped for Steady Progress Updates
+
+    def getChunkSize(self, numCombinations, printUpdateAfterTrial):
+        if self.chunkSize is not None:
+            return max(1, self.chunkSize)
+        return max(1, min(math.ceil(numCombinations/(8*max(1, self.numWorkers))), printUpdateAfterTrial, 10000))
+
+    def scoreChunks(self, signalDataTransform, signalLabels, numFeatures, numFeaturesCombine, allSubjectInds, randomSeed = None, printUpdateAfterTrial = 15000, startInd = 0):
+        """
+        Yields (startInd, Scores, STDs) for the Chunks of Combinations from startInd Onwards,
+        in Order, so Every Combination Before a Yielded Chunk's End Has Been Scored.
+        """
+        numCombinations = countCombinations(numFeatures, numFeaturesCombine)
+        chunkSize = self.getChunkSize(numCombinations, printUpdateAfterTrial)
+        chunkStarts = iter(range(startInd, numCombinations, chunkSize))
+        progress = searchProgress(numCombinations, printUpdateAfterTrial, numScored = startInd)
+        searchSettings = {"numFeatures": numFeatures, "numFeaturesCombine": numFeaturesCombine, "allSubjectInds": tuple(allSubjectInds), "randomSeed": randomSeed}
+
+        # Score the Chunks Here, One by One
+        if self.numWorkers <= 1:
+            searchArrays = {"signalDataTransform": signalDataTransform, "signalLabels": signalLabels}
+            for chunkStart in chunkStarts:
+                chunkResult = scoreCombinationChunk(self.predictionHead, searchArrays, searchSettings, chunkStart, min(chunkStart + chunkSize, numCombinations))
+                progress.update(len(chunkResult[1]))
+                yield chunkResult
+            return
+
+        dataArrays = sharedArrays({"signalDataTransform": signalDataTransform, "signalLabels": signalLabels})
+        try:
+            with ProcessPoolExecutor(max_workers = self.numWorkers, initializer = startSearchWorker, initargs = (self.predictionHead, dataArrays.arraySpecs, searchSettings)) as searchPool:
+                # Keep a Few Chunks Queued per Worker; Hold the Ones Finishing Early Until Their Turn
+                runningChunks = set(); finishedChunks = {}; nextChunkStart = startInd
+                for chunkStart in chunkStarts:
+                    runningChunks.add(searchPool.submit(scoreWorkerChunk, chunkStart, min(chunkStart + chunkSize, numCombinations)))
+                    if len(runningChunks) >= 4*self.numWorkers:
+                        break
+                while runningChunks:
+                    doneChunks, runningChunks = wait(runningChunks, return_when = FIRST_COMPLETED)
+                    for doneChunk in doneChunks:
+                        chunkStart, chunkScores, chunkSTDs = doneChunk.result()
+                        finishedChunks[chunkStart] = (chunkScores, chunkSTDs)
+                        progress.update(len(chunkScores))
+                        # Queue the Next Chunk
+                        for chunkStart in chunkStarts:
+                            runningChunks.add(searchPool.submit(scoreWorkerChunk, chunkStart, min(chunkStart + chunkSize, numCombinations)))
+                            break
+                    while nextChunkStart in finishedChunks:
+                        chunkScores, chunkSTDs = finishedChunks.pop(nextChunkStart)
+                        yield nextChunkStart, chunkScores, chunkSTDs
+                        nextChunkStart += len(chunkScores)
+        finally:
+            dataArrays.close()
@@ -0,0 +1,121 @@
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Imported Modules ---------------------------- #
+
+# Basic Modules
+import sys
+import heapq
+import numpy as np
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Scored Subsets ------------------------------ #
+
+class subsetScoreCache:
+    """
+    Scores Feature Subsets Through scoreSubsets (A List of Sorted Index Tuples -> Their Scores
+    and STDs), Scoring Each Subset Only Once However Often a Search Comes Back to it.
+    """
+
+    def __init__(self, scoreSubsets):
+        self.scoreSubsets = scoreSubsets
+        self.subsetScores = {}  # {Sorted Feature Indices: (Score, STD)}
+
+    def __len__(self):
+        return len(self.subsetScores)
+
+    def getScores(self, featureSubsets):
+        featureSubsets = [tuple(sorted(featureSubset)) for featureSubset in featureSubsets]
+        newSubsets = list(dict.fromkeys(featureSubset for featureSubset in featureSubsets if featureSubset not in self.subsetScores))
+        if newSubsets:
+            newScores, newSTDs = self.scoreSubsets(newSubsets)
+            for featureSubset, modelScore, modelSTD in zip(newSubsets, newScores, newSTDs):
+                self.subsetScores[featureSubset] = (float(modelScore), float(modelSTD))
+        return np.array([self.subsetScores[featureSubset][0] for featureSubset in featureSubsets])
+
+    def getBestSubsets(self, subsetSize, numKept):
+        """ The numKept Best Scored Subsets of subsetSize Features: [(Score, STD, Feature Indices), ...], Best First """
+        scoredSubsets = [(modelScore, modelSTD, featureSubset) for featureSubset, (modelScore, modelSTD) in self.subsetScores.items() if len(featureSubset) == subsetSize]
+        return heapq.nlargest(numKept, scoredSubsets, key = lambda scoredSubset: scoredSubset[0:2])
+
+# -------------------------------------------------------------------------- #
+# --------------------------- Feature Selection ---------------------------- #
+
+class featureSelection:
+    """
+    Searches for the Best Subsets of numFeaturesCombine Features Without Scoring Every Combination.
+        beamSearch: Grow (or Shrink) the beamWidth Best Subsets One Feature at a Time
+        forwardSelection / backwardElimination: The Beam Search with One Subset
+        branchAndBound: Every Subset, Except Those Whose Supersets Score No Better Than the
+                        numKept-th Best Found (Exact When the Bounds Never Underestimate)
+    Every Subset Scored Along the Way is Kept in the Cache; The Results are its Best Subsets.
+    """
+
+    def __init__(self, scoreSubsets, numFeatures, numKept = 100):
+        self.scoreCache = subsetScoreCache(scoreSubsets)
+        self.numFeatures = numFeatures
+        self.numKept = numKept
+
+    def forwardSelection(self, numFeaturesCombine):
+        return self.beamSearch(numFeaturesCombine, beamWidth = 1, searchDirection = "forward")
+
+    def backwardElimination(self, numFeaturesCombine):
+        return self.beamSearch(numFeaturesCombine, beamWidth = 1, searchDirection = "backward")
+
+    def beamSearch(self, numFeaturesCombine, beamWidth = 10, searchDirection = "forward"):
+        if searchDirection == "forward":
+            currentBeam = [()]
+        elif searchDirection == "backward":
+            currentBeam = [tuple(range(self.numFeatures))]
+        else:
+            print("No Search Direction Called:", searchDirection); sys.exit()
+
+        while len(currentBeam[0]) != numFeaturesCombine:
+            # Every Subset One Feature Away From the Beam
+            nextSubsets = set()
+            for featureSubset in currentBeam:
+                if searchDirection == "forward":
+                    nextSubsets.update(tuple(sorted(featureSubset + (featureInd,))) for featureInd in range(self.numFeatures) if featureInd not in featureSubset)
+                else:
+                    nextSubsets.update(featureSubset[0:removeInd] + featureSubset[removeInd+1:] for removeInd in range(len(featureSubset)))
+            nextSubsets = sorted(nextSubsets)
+            # Keep the Best (Ties: The First Subset)
+            subsetScores = self.scoreCache.getScores(nextSubsets)
+            bestOrder = np.argsort(-subsetScores, kind = 'stable')[0:beamWidth]
+            currentBeam = [nextSubsets[subsetInd] for subsetInd in bestOrder]
+        return self.scoreCache.getBestSubsets(numFeaturesCombine, self.numKept)
+
+    def branchAndBound(self, numFeaturesCombine, boundSubsets = None):
+        """
+        A Depth First Search Deciding Each Feature In or Out (Best Single Features First). A Branch's
+        Best Score is At Most boundSubsets(Its Features and All the Undecided Ones): Branches Whose
+        Bound Cannot Beat the numKept-th Best Subset are Skipped. boundSubsets is Called Like
+        scoreSubsets; None Uses the Scores Themselves (Only Exact if Features Never Lower the Score).
+        """
+        boundCache = subsetScoreCache(boundSubsets) if boundSubsets is not None else self.scoreCache
+        # Try the Strongest Features First to Find Good Subsets (and Prune More) Early
+        singleScores = self.scoreCache.getScores([(featureInd,) for featureInd in range(self.numFeatures)])
+        featureOrder = tuple(int(featureInd) for featureInd in np.argsort(-singleScores, kind = 'stable'))
+
+        bestScores = []     # A Min Heap of the numKept Best Scores
+        def addScore(modelScore):
+            if len(bestScores) < self.numKept:
+                heapq.heappush(bestScores, modelScore)
+            elif modelScore > bestScores[0]:
+                heapq.heapreplace(bestScores, modelScore)
+
+        searchStack = [((), 0)]     # (Chosen Features, Next Feature to Decide)
+        while searchStack:
+            chosenFeatures, orderInd = searchStack.pop()
+            undecidedFeatures = featureOrder[orderInd:]
+            # A Full Subset
+            if len(chosenFeatures) == numFeaturesCombine or len(chosenFeatures) + len(undecidedFeatures) == numFeaturesCombine:
+                featureSubset = (chosenFeatures + undecidedFeatures)[0:numFeaturesCombine]
+                addScore(self.scoreCache.getScores([featureSubset])[0])
+                continue
+            # Skip the Branch if it Cannot Beat the Kept Subsets
+            if len(bestScores) == self.numKept and boundCache.getScores([chosenFeatures + undecidedFeatures])[0] <= bestScores[0]:
+                continue
+            # Leave the Feature Out, Then (Searched First) Put it In
+            searchStack.append((chosenFeatures, orderInd + 1))
+            searchStack.append((chosenFeatures + (featureOrder[orderInd],), orderInd + 1))
+        return self.scoreCache.getBestSubsets(numFeaturesCombine, self.numKept)
@@ -0,0 +1,90 @@
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Imported Modules ---------------------------- #
+
+# Basic Modules
+import numpy as np
+from scipy import stats
+
+# -------------------------------------------------------------------------- #
+# ------------------------ Ridge Scores from Gram Sums --------------------- #
+
+class gramRidgeScorer:
+    """
+    Scores a Ridge (ridgeAlpha = 0: Ordinary Least Squares) Model on Any Subset of the Features
+    Without Refitting: X'X and X'y are Found Once for All the Features (Centered on the Training
+    Rows), and a Subset's Fit Only Needs Their Rows/Columns: Solve (X'X + alpha*I)b = X'y, Then
+    R2 = 1 - SSres/SStot Where SSres = y'y - 2b'X'y + b'X'Xb. Whole Chunks of Subsets are Solved
+    at Once. The Scores Match sklearn's Ridge.fit() Then score() (Up to Rounding).
+        allSubjectInds: The Training Rows of Each Fit (The Testing Rows are All the Rows, as in analyzeFeatureCombinations)
+        leaveOneOut: Score with the Leave One Out R2 of the Training Rows Instead (The Closed Form
+                     Residuals e_i/(1 - h_ii), Where h_ii is the Hat Matrix's Diagonal)
+    """
+
+    def __init__(self, signalData, signalLabels, allSubjectInds, ridgeAlpha = 1.0, fitIntercept = True, leaveOneOut = False):
+        signalData = np.asarray(signalData, dtype = np.float64)
+        signalLabels = np.asarray(signalLabels, dtype = np.float64).reshape(len(signalData))
+        self.ridgeAlpha = ridgeAlpha
+        self.fitIntercept = fitIntercept
+        self.leaveOneOut = leaveOneOut
+
+        # The Gram Sums of Each Set of Training Rows
+        self.subjectSets = []
+        for subjectInds in allSubjectInds:
+            subjectInds = np.asarray(subjectInds)
+            trainingData = signalData[subjectInds]; trainingLabels = signalLabels[subjectInds]
+            dataMean = trainingData.mean(axis=0) if fitIntercept else np.zeros(signalData.shape[1])
+            labelMean = trainingLabels.mean() if fitIntercept else 0
+            trainingData = trainingData - dataMean; trainingLabels = trainingLabels - labelMean
+            subjectSet = {"trainingGram": trainingData.T @ trainingData, "trainingCross": trainingData.T @ trainingLabels}
+
+            if leaveOneOut:
+                subjectSet["trainingData"] = trainingData; subjectSet["trainingLabels"] = trainingLabels
+                subjectSet["labelSumSquares"] = np.sum((trainingLabels - trainingLabels.mean())**2)
+            else:
+                # The Testing Rows, Centered on the Training Means (The Model's Intercept)
+                testingData = signalData - dataMean; testingLabels = signalLabels - labelMean
+                subjectSet["testingGram"] = testingData.T @ testingData
+                subjectSet["testingCross"] = testingData.T @ testingLabels
+                subjectSet["testingLabelSquares"] = testingLabels @ testingLabels
+                subjectSet["labelSumSquares"] = np.sum((signalLabels - signalLabels.mean())**2)
+            self.subjectSets.append(subjectSet)
+
+    def solveSubsets(self, subsetGrams, subsetCross):
+        """ The Coefficients of Each Subset (Singular Systems Fall Back to the Least Squares Solution) """
+        subsetGrams = subsetGrams + self.ridgeAlpha*np.eye(subsetGrams.shape[-1])
+        try:
+            return np.linalg.solve(subsetGrams, subsetCross[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            return (np.linalg.pinv(subsetGrams) @ subsetCross[..., None])[..., 0]
+
+    def getRSquared(self, residualSquares, labelSumSquares):
+        """ sklearn's r2_score: Constant Labels Score 1 if Fit Perfectly, Else 0 """
+        if labelSumSquares == 0:
+            return np.where(np.isclose(residualSquares, 0), 1.0, 0.0)
+        return 1 - residualSquares/labelSumSquares
+
+    def scoreSubjectSet(self, subjectSet, combinationArray):
+        subsetGrams = subjectSet["trainingGram"][combinationArray[:, :, None], combinationArray[:, None, :]]
+        subsetCoefficients = self.solveSubsets(subsetGrams, subjectSet["trainingCross"][combinationArray])
+
+        if self.leaveOneOut:
+            # The Hat Matrix's Diagonal: h_ii = 1/n + x_i'(X'X + alpha*I)^-1x_i (1/n From the Intercept)
+            subsetData = np.transpose(subjectSet["trainingData"][:, combinationArray], (1, 0, 2))
+            solvedData = np.linalg.solve(subsetGrams + self.ridgeAlpha*np.eye(combinationArray.shape[1]), np.transpose(subsetData, (0, 2, 1)))
+            hatDiagonal = np.einsum('bnk,bkn->bn', subsetData, solvedData) + (1/len(subsetData[0]) if self.fitIntercept else 0)
+            fitResiduals = subjectSet["trainingLabels"][None, :] - np.einsum('bnk,bk->bn', subsetData, subsetCoefficients)
+            residualSquares = np.sum((fitResiduals/(1 - hatDiagonal))**2, axis=1)
+        else:
+            testingGrams = subjectSet["testingGram"][combinationArray[:, :, None], combinationArray[:, None, :]]
+            residualSquares = subjectSet["testingLabelSquares"] - 2*np.einsum('bk,bk->b', subsetCoefficients, subjectSet["testingCross"][combinationArray]) \
+                                + np.einsum('bk,bkj,bj->b', subsetCoefficients, testingGrams, subsetCoefficients)
+        return self.getRSquared(residualSquares, subjectSet["labelSumSquares"])
+
+    def scoreCombinations(self, combinationArray):
+        """ The Trimmed Mean Score (and STD) Across the Subject Sets of Each Row of Feature Indices """
+        combinationArray = np.asarray(combinationArray, dtype = int)
+        subsetScores = np.array([self.scoreSubjectSet(subjectSet, combinationArray) for subjectSet in self.subjectSets])
+        if len(subsetScores) > 1:
+            return stats.trim_mean(subsetScores, 0.3, axis=0), np.std(subsetScores, axis=0, ddof=1)
+        return stats.trim_mean(subsetScores, 0.3, axis=0), np.zeros(len(combinationArray))
@@ -0,0 +1,110 @@
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Imported Modules ---------------------------- #
+
+# Basic Modules
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import numpy as np
+
+# -------------------------------------------------------------------------- #
+# -------------------------- Stored Subset Scores -------------------------- #
+
+class subsetScoreStore:
+    """
+    An SQLite File of Feature Subset Scores, Shared by Every Search (and Every Run) so a
+    Subset Already Scored is Never Refit. Each Score is Keyed by:
+        searchKey: The Model and its Hyperparameters, the Labels, and the Subject Sets (getSearchKey)
+        subsetKey: The Subset's Feature Columns (getFeatureKeys), so the Same Features Hit the
+                   Cache Whatever Feature Group or Order They Came From
+    Once More Than maxStoredScores are Kept, the Least Recently Used are Removed.
+    Worker Processes Each Open Their Own Connection (The Store Pickles Without it).
+    """
+
+    def __init__(self, storeFile, maxStoredScores = 5000000):
+        self.storeFile = storeFile
+        self.maxStoredScores = maxStoredScores
+        self.storeConnection = None
+        self.numStored = 0  # About How Many Scores are Stored (Recounted Before Removing Any)
+
+    def __getstate__(self):
+        storeState = dict(self.__dict__); storeState["storeConnection"] = None
+        return storeState
+
+    def getConnection(self):
+        if self.storeConnection is None:
+            os.makedirs(os.path.dirname(self.storeFile) or ".", exist_ok = True)
+            # Wait on Other Processes Writing (WAL: Readers Never Wait)
+            self.storeConnection = sqlite3.connect(self.storeFile, timeout = 120)
+            self.storeConnection.execute("PRAGMA journal_mode=WAL")
+            self.storeConnection.execute("""CREATE TABLE IF NOT EXISTS subsetScores (searchKey TEXT, subsetKey TEXT, modelScore REAL, modelSTD REAL,
+                                            lastUsed REAL, PRIMARY KEY (searchKey, subsetKey)) WITHOUT ROWID""")
+            self.storeConnection.execute("CREATE INDEX IF NOT EXISTS subsetScoresLastUsed ON subsetScores (lastUsed)")
+            self.storeConnection.commit()
+            self.numStored = self.storeConnection.execute("SELECT COUNT(*) FROM subsetScores").fetchone()[0]
+        return self.storeConnection
+
+    def close(self):
+        if self.storeConnection is not None:
+            self.storeConnection.close()
+            self.storeConnection = None
+
+    # ---------------------------------------------------------------------- #
+    # ------------------------------- Keys --------------------------------- #
+
+    def getSearchKey(self, modelType, modelParameters, signalLabels, allSubjectInds, *scoringSettings):
+        """ Everything Besides the Features That Decides a Score """
+        searchHash = hashlib.sha1()
+        searchHash.update(json.dumps([modelType, modelParameters, [list(subjectInds) for subjectInds in allSubjectInds], scoringSettings], sort_keys = True, default = str).encode())
+        searchHash.update(np.ascontiguousarray(signalLabels, dtype = np.float64).tobytes())
+        return searchHash.hexdigest()
+
+    def getFeatureKeys(self, signalData):
+        """ A Short Hash of Each Feature Column """
+        signalData = np.asarray(signalData, dtype = np.float64)
+        return [hashlib.sha1(np.ascontiguousarray(signalData[:, featureInd]).tobytes()).hexdigest()[0:16] for featureInd in range(signalData.shape[1])]
+
+    def getSubsetKey(self, featureKeys, featureSubset, fitSeed = None):
+        subsetKey = ' '.join(sorted(featureKeys[featureInd] for featureInd in featureSubset))
+        # Seeded Fits Also Depend on the Seed
+        return subsetKey if fitSeed is None else subsetKey + " @" + str(fitSeed)
+
+    # ---------------------------------------------------------------------- #
+    # --------------------------- Scores Access ---------------------------- #
+
+    def loadScores(self, searchKey, subsetKeys):
+        """ {subsetKey: (Score, STD)} for the Stored Subsets; Marks Them as Used """
+        storeConnection = self.getConnection()
+        storedScores = {}
+        subsetKeys = list(subsetKeys)
+        for batchStart in range(0, len(subsetKeys), 500):
+            keyBatch = subsetKeys[batchStart:batchStart + 500]
+            storedRows = storeConnection.execute("SELECT subsetKey, modelScore, modelSTD FROM subsetScores WHERE searchKey = ? AND subsetKey IN (" + ",".join("?"*len(keyBatch)) + ")",
+                                                 [searchKey] + keyBatch).fetchall()
+            storedScores.update((subsetKey, (modelScore, modelSTD)) for subsetKey, modelScore, modelSTD in storedRows)
+        if storedScores:
+            storeConnection.executemany("UPDATE subsetScores SET lastUsed = ? WHERE searchKey = ? AND subsetKey = ?", [(time.time(), searchKey, subsetKey) for subsetKey in storedScores])
+            storeConnection.commit()
+        return storedScores
+
+    def saveScores(self, searchKey, subsetKeys, modelScores, modelSTDs):
+        storeConnection = self.getConnection()
+        storeConnection.executemany("INSERT OR REPLACE INTO subsetScores VALUES (?, ?, ?, ?, ?)",
+                                    [(searchKey, subsetKey, float(modelScore), float(modelSTD), time.time()) for subsetKey, modelScore, modelSTD in zip(subsetKeys, modelScores, modelSTDs)])
+        storeConnection.commit()
+        self.numStored += len(subsetKeys)
+        if self.numStored > self.maxStoredScores:
+            self.evictScores()
+
+    def evictScores(self):
+        """ Remove the Least Recently Used Scores Down to 90% of maxStoredScores """
+        storeConnection = self.getConnection()
+        self.numStored = storeConnection.execute("SELECT COUNT(*) FROM subsetScores").fetchone()[0]
+        if self.numStored > self.maxStoredScores:
+            numRemoved = self.numStored - int(self.maxStoredScores*0.9)
+            storeConnection.execute("DELETE FROM subsetScores WHERE (searchKey, subsetKey) IN (SELECT searchKey, subsetKey FROM subsetScores ORDER BY lastUsed LIMIT ?)", (numRemoved,))
+            storeConnection.commit()
+            self.numStored -= numRemoved
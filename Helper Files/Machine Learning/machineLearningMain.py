@@ -8,7 +8,6 @@ Created on Wed Oct 20 18:47:49 2021
 # Basic Modules
 import os
 import sys
-import time
 import numpy as np
 import collections
 import pandas as pd
@@ -46,6 +45,13 @@ sys.path.append('./Helper Files/Data Aquisition and Analysis/_Plotting/')  # Fol
 sys.path.append('./Data Aquisition and Analysis/_Plotting/')  # Folder with Machine Learning Files
 import createHeatMap as createMap       # Functions for Neural Network
 
+sys.path.append('./Helper Files/Machine Learning/')  # Folder with the Feature Combination Search
+sys.path.append('./Machine Learning/')                # Folder with the Feature Combination Search
+import _combinationSearch as combinationSearch  # Scores the Feature Combinations in a Process Pool
+import _linearSubsetScoring as linearSubsetScoring  # Scores Linear Models on Feature Subsets from Gram Matrices
+import _featureSelection as featureSelection        # Greedy, Beam, and Branch and Bound Feature Searches
+import _subsetScoreStore as subsetScoreStore        # Keeps the Subset Scores Between Searches and Runs
+
 # Import Data Extraction Files (And Their Location)
 sys.path.append('../Data Aquisition and Analysis/')  
 sys.path.append('./Helper Files/Data Aquisition and Analysis/')  
@@ -62,6 +68,9 @@ class predictionModelHead:
         self.numClasses = len(machineLearningClasses)
         self.testSize = 0.4
         self.supportVectorKernel = supportVectorKernel
+        self.subsetScorer = None    # Scores Feature Subsets Without Refitting (Linear Models; Set During a Combination Search)
+        self.scoreStore = None      # Stored Subset Scores, Looked Up Before Fitting (openScoreStore)
+        self.scoreStoreKeys = None  # The Search's Key and Each Feature's Key in the Store (Set During a Search)
         
         self.possibleModels = ['RF', 'LR', 'KNN', 'SVM', 'RG', 'EN', "SVR"]
         if modelType not in self.possibleModels:
@@ -185,10 +194,89 @@ class predictionModelHead:
         
         
     def analyzeFeatureCombinations(self, signalData, signalLabels, featureNames, numFeaturesCombine, saveData = True, 
-                                   saveExcelName = "Feature Accuracy for Combination of Features.xlsx", printUpdateAfterTrial = 15000, scaleY = True):
+                                   saveExcelName = "Feature Accuracy for Combination of Features.xlsx", printUpdateAfterTrial = 15000, scaleY = True,
+                                   numWorkers = 1, randomSeed = None, maxCombinationsKept = 100000, checkpointFile = None, checkpointMinutes = 10,
+                                   fastLinearScoring = True, leaveOneOut = False):
+        """
+        Score Every Combination of numFeaturesCombine Features, Keeping the Best maxCombinationsKept.
+            numWorkers: Processes Scoring the Combinations (1: Score Them Here, One by One). Same Results Either Way.
+            randomSeed: Seeds Each Combination's Fit (With its Index), so Random Models Repeat Their Scores
+            checkpointFile: Where the Search is Saved Every checkpointMinutes (None: In saveDataFolder, if Any).
+                            An Interrupted Search Resumes From it if the Data, Features, and Model are the Same.
+            fastLinearScoring: Score Ridge Models from the Features' Gram Matrix (Same Scores, No Refitting)
+            leaveOneOut: Score the Leave One Out R2 Instead (Only with fastLinearScoring and a Ridge Model)
+        """
+        # Normalize the Features and Get the Subject Sets
+        signalDataTransform, signalLabels, allSubjectInds = self.prepareFeatureSearch(signalData, signalLabels, scaleY, fastLinearScoring, leaveOneOut)
+        
+        # Resume an Interrupted Search
+        bestCombinations = combinationSearch.topCombinations(maxCombinationsKept)
+        if checkpointFile is None and self.saveDataFolder:
+            checkpointFile = self.saveDataFolder + "Combination Search Checkpoint (" + str(numFeaturesCombine) + " Features).pkl"
+        searchCheckpoint = None; startInd = 0
+        if checkpointFile:
+            searchFingerprint = combinationSearch.fingerprintSearch(signalDataTransform, signalLabels, list(featureNames), numFeaturesCombine, allSubjectInds,
+                                                                    self.modelType, self.supportVectorKernel, randomSeed, self.subsetScorer is not None, leaveOneOut)
+            searchCheckpoint = combinationSearch.searchCheckpoint(checkpointFile, searchFingerprint, checkpointMinutes)
+            startInd = searchCheckpoint.resume(bestCombinations)
+        
+        # Score the Combinations (in a Process Pool if numWorkers > 1), Keeping the Best
+        searchEngine = combinationSearch.combinationSearch(self, numWorkers)
+        try:
+            for chunkStart, chunkScores, chunkSTDs in searchEngine.scoreChunks(signalDataTransform, signalLabels, len(featureNames), numFeaturesCombine, allSubjectInds, randomSeed, printUpdateAfterTrial, startInd):
+                bestCombinations.addChunk(len(featureNames), numFeaturesCombine, chunkStart, chunkScores, chunkSTDs)
+                if searchCheckpoint is not None:
+                    searchCheckpoint.update(chunkStart + len(chunkScores), bestCombinations)
+        finally:
+            self.subsetScorer = None; self.scoreStoreKeys = None
+        if searchCheckpoint is not None:
+            searchCheckpoint.finish()
+        
+        # Sort the Features
+        modelScores, modelSTDs, featureNames_Combinations = bestCombinations.getSortedCombinations(featureNames)
+        return self.saveFeatureCombinations(modelScores, modelSTDs, featureNames_Combinations, numFeaturesCombine, saveData, saveExcelName)
+    
+    def searchFeatureSubsets(self, signalData, signalLabels, featureNames, numFeaturesCombine, searchMethod = "beam", beamWidth = 10, numBestKept = 100, saveData = True,
+                             saveExcelName = "Feature Accuracy for Selected Features.xlsx", scaleY = True, randomSeed = None, fastLinearScoring = True, leaveOneOut = False):
+        """
+        Search for the Best Combinations of numFeaturesCombine Features Without Scoring Them All. Scored,
+        Normalized, and Saved Like analyzeFeatureCombinations (Each Subset Gets the Same Score as There).
+            searchMethod: "forward", "backward" (Add/Remove the Best Feature Each Step), "beam" (Keep the beamWidth
+                          Best Subsets Each Step), or "branchAndBound" (Exact for Ridge Models Scored In Sample)
+            numBestKept: The Number of Best Subsets Returned
+        """
+        # Normalize the Features and Get the Subject Sets
+        signalDataTransform, signalLabels, allSubjectInds = self.prepareFeatureSearch(signalData, signalLabels, scaleY, fastLinearScoring, leaveOneOut)
+        
+        try:
+            scoreSubsets = lambda featureSubsets: self.scoreFeatureSubsets(signalDataTransform, signalLabels, featureSubsets, allSubjectInds, randomSeed)
+            subsetSearch = featureSelection.featureSelection(scoreSubsets, len(featureNames), numBestKept)
+            # Search for the Best Subsets
+            if searchMethod == "forward":
+                bestSubsets = subsetSearch.forwardSelection(numFeaturesCombine)
+            elif searchMethod == "backward":
+                bestSubsets = subsetSearch.backwardElimination(numFeaturesCombine)
+            elif searchMethod == "beam":
+                bestSubsets = subsetSearch.beamSearch(numFeaturesCombine, beamWidth)
+            elif searchMethod == "branchAndBound":
+                boundScorer = self.getSubsetBoundScorer(signalDataTransform, signalLabels, allSubjectInds)
+                if boundScorer is None:
+                    print("No Score Bound for the Model; Assuming More Features Never Lower the Score:", self.modelType)
+                bestSubsets = subsetSearch.branchAndBound(numFeaturesCombine, None if boundScorer is None else boundScorer.scoreCombinations)
+            else:
+                print("No Feature Search Called:", searchMethod); sys.exit()
+        finally:
+            self.subsetScorer = None; self.scoreStoreKeys = None
+        print("Scored", len(subsetSearch.scoreCache), "Feature Subsets out of", combinationSearch.countCombinations(len(featureNames), numFeaturesCombine), "Combinations")
+        
+        # Sort the Features (Best First; Equal Scores by Name, as in analyzeFeatureCombinations)
+        namedSubsets = sorted(((modelScore, modelSTD, ' '.join(np.array(featureNames)[np.array(featureSubset)])) for modelScore, modelSTD, featureSubset in bestSubsets), reverse=True)
+        modelScores, modelSTDs, featureNames_Combinations = [list(namedColumn) for namedColumn in zip(*namedSubsets)]
+        return self.saveFeatureCombinations(modelScores, modelSTDs, featureNames_Combinations, numFeaturesCombine, saveData, saveExcelName)
+    
+    def prepareFeatureSearch(self, signalData, signalLabels, scaleY, fastLinearScoring, leaveOneOut):
+        """ Normalize the Features (and Labels if scaleY), Get the Subject Sets, and Set Up the Subset Scorer """
         # Get All Possible Combinations
-        modelScores = []; modelSTDs = []; featureNames_Combinations = []
-        featureInds = list(combinations(range(0, len(featureNames)), numFeaturesCombine))
         allSubjectInds = list(combinations(range(0, len(signalLabels)),  len(signalLabels) - int(len(signalLabels)*0)))
         
         # Normalize the Features
@@ -198,51 +286,30 @@ class predictionModelHead:
             sc_y = StandardScaler()
             signalLabels = sc_y.fit_transform(signalLabels.copy().reshape(-1, 1))
         
-        t1 = time.time()
-        # For Each Combination of Features
-        for combinationInd in range(len(featureInds)):
-            combinationInds = featureInds[combinationInd]
-            
-            # Collect the Signal Data for the Specific Features
-            signalData_culledFeatures = signalDataTransform[:,combinationInds]
-                
-            # Collect the Specific Feature Names
-            featureNamesCombination_String = ''
-            for name in np.array(featureNames)[np.array(combinationInds)]:
-                featureNamesCombination_String += name + ' '
-            featureNames_Combinations.append(featureNamesCombination_String[0:-1])
-            
-            modelScore = []
-            for subjectInds in allSubjectInds:
-                # Reset the Input Variab;es
-                self.resetModel() # Reset the ML Model
-                
-                # Collect the Signal Data for the Specific Subjects
-                signalDataCull = signalData_culledFeatures[subjectInds, :]
-                signalLabelCull = signalLabels[subjectInds, :]
-                
-                # Score the model with this data set.
-                Training_Data, Testing_Data, Training_Labels, Testing_Labels = signalDataCull, signalData_culledFeatures, signalLabelCull, signalLabels
-                modelScore.append(self.predictionModel.trainModel(Training_Data, Training_Labels, Testing_Data, Testing_Labels))
-
-            # Save the Model Score
-            modelScores.append(stats.trim_mean(modelScore, 0.3))
-            if len(modelScore) > 1:
-                modelSTDs.append(np.std(modelScore, ddof= 1))
-            else:
-                modelSTDs.append(0)
-            # plt.hist(modelScore); plt.title(featureNamesCombination_String); plt.show()
-            
-            # Report an Update Every Now and Then
-            if (combinationInd%printUpdateAfterTrial == 0 and combinationInd != 0) or combinationInd == 20:
-                t2 = time.time()
-                percentComplete = 100*combinationInd/len(featureInds)
-                setionPercent = 100*min(combinationInd or 1, printUpdateAfterTrial)/len(featureInds)
-                print(str(np.round(percentComplete, 2)) + "% Complete; Estimated Time Remaining: " + str(np.round((t2-t1)*(100-percentComplete)/(setionPercent*60), 2)) + " Minutes")
-                t1 = time.time()
-        
-        # Sort the Features
-        modelScores, modelSTDs, featureNames_Combinations = zip(*sorted(zip(modelScores[0:100000], modelSTDs[0:100000], featureNames_Combinations[0:100000]), reverse=True))
+        # Score Linear Models Without Refitting
+        self.subsetScorer = self.getSubsetScorer(signalDataTransform, signalLabels, allSubjectInds, leaveOneOut) if fastLinearScoring else None
+        if leaveOneOut and self.subsetScorer is None:
+            print("Leave One Out Scores Need fastLinearScoring and a Ridge Model:", self.modelType); sys.exit()
+        
+        # Look Up Refit Models' Scores in the Store (Gram Scores are Faster to Redo Than to Look Up)
+        self.scoreStoreKeys = None
+        if self.scoreStore is not None and self.subsetScorer is None:
+            self.resetModel() # The Model Each Subset Would be Fit With
+            modelParameters = self.predictionModel.model.get_params() if hasattr(self.predictionModel.model, "get_params") else repr(self.predictionModel.model)
+            searchKey = self.scoreStore.getSearchKey(self.modelType, modelParameters, signalLabels, allSubjectInds, self.supportVectorKernel)
+            # Key the Features Before Normalizing (Normalized Columns Can Round Differently in Another Feature Group)
+            self.scoreStoreKeys = (searchKey, self.scoreStore.getFeatureKeys(signalData))
+        return signalDataTransform, signalLabels, allSubjectInds
+    
+    def openScoreStore(self, storeFile, maxStoredScores = 5000000):
+        """
+        Keep the Score of Every Subset Fit in storeFile (SQLite). Later Searches (Any Feature Group,
+        Combination Size, or Search Method, in Any Run) Look a Subset Up Before Fitting it.
+        The Least Recently Used Scores are Removed Past maxStoredScores.
+        """
+        self.scoreStore = subsetScoreStore.subsetScoreStore(storeFile, maxStoredScores)
+    
+    def saveFeatureCombinations(self, modelScores, modelSTDs, featureNames_Combinations, numFeaturesCombine, saveData, saveExcelName):
         print(modelScores[0], modelSTDs[0], featureNames_Combinations[0])
         
         # Save the Data in Excel
@@ -250,6 +317,95 @@ class predictionModelHead:
             excelProcessing.processMLData().saveFeatureComparison(np.dstack((modelScores, modelSTDs, featureNames_Combinations))[0], [], ["Mean Score", "STD", "Feature Combination"], self.saveDataFolder, saveExcelName, sheetName = str(numFeaturesCombine) + " Features in Combination", saveFirstSheet = True)
         return np.array(modelScores), np.array(modelSTDs), np.array(featureNames_Combinations)
     
+    def getSubsetScorer(self, signalDataTransform, signalLabels, allSubjectInds, leaveOneOut = False):
+        """ A Gram Matrix Scorer for Ridge Models (The Other Models' Losses Have No Closed Form Fit: None, Refit with sklearn) """
+        signalLabels = np.asarray(signalLabels)
+        if self.modelType != "RG" or (signalLabels.ndim == 2 and signalLabels.shape[1] != 1):
+            return None
+        self.resetModel() # The Model Each Combination Would be Fit With
+        ridgeModel = self.predictionModel.model
+        if np.ndim(ridgeModel.alpha) != 0 or getattr(ridgeModel, "positive", False):
+            return None
+        return linearSubsetScoring.gramRidgeScorer(signalDataTransform, signalLabels, allSubjectInds, ridgeAlpha = ridgeModel.alpha, 
+                                                   fitIntercept = ridgeModel.fit_intercept, leaveOneOut = leaveOneOut)
+    
+    def getSubsetBoundScorer(self, signalDataTransform, signalLabels, allSubjectInds):
+        """
+        Upper Bounds for Branch and Bound: No Ridge Fit on a Subset's Features Leaves Smaller Residuals Than
+        Ordinary Least Squares on Them, Which Only Shrink as Features are Added. So the OLS Score of a Superset
+        Bounds the In Sample Ridge Score of Every Subset. None if the Models are Not Scored This Way.
+        """
+        if self.subsetScorer is None or self.subsetScorer.leaveOneOut:
+            return None
+        return linearSubsetScoring.gramRidgeScorer(signalDataTransform, signalLabels, allSubjectInds, ridgeAlpha = 0, fitIntercept = self.subsetScorer.fitIntercept)
+    
+    def scoreFeatureSubsets(self, signalDataTransform, signalLabels, featureSubsets, allSubjectInds, randomSeed = None):
+        """ The Scores and STDs of Sorted Feature Index Tuples (Any Sizes), Each Scored as in analyzeFeatureCombinations """
+        if self.scoreStoreKeys is None:
+            return self.fitFeatureSubsets(signalDataTransform, signalLabels, featureSubsets, allSubjectInds, randomSeed)
+        
+        # Look Up the Stored Scores
+        searchKey, featureKeys = self.scoreStoreKeys
+        subsetKeys = []
+        for featureSubset in featureSubsets:
+            fitSeed = None if randomSeed is None else (randomSeed + combinationSearch.rankCombination(featureSubset, signalDataTransform.shape[1])) % 2**32
+            subsetKeys.append(self.scoreStore.getSubsetKey(featureKeys, featureSubset, fitSeed))
+        storedScores = self.scoreStore.loadScores(searchKey, subsetKeys)
+        
+        # Fit the Rest, and Store Their Scores
+        newInds = [subsetInd for subsetInd, subsetKey in enumerate(subsetKeys) if subsetKey not in storedScores]
+        newScores, newSTDs = self.fitFeatureSubsets(signalDataTransform, signalLabels, [featureSubsets[subsetInd] for subsetInd in newInds], allSubjectInds, randomSeed)
+        if newInds:
+            self.scoreStore.saveScores(searchKey, [subsetKeys[subsetInd] for subsetInd in newInds], newScores, newSTDs)
+        
+        modelScores = np.empty(len(featureSubsets)); modelSTDs = np.empty(len(featureSubsets))
+        for subsetInd, subsetKey in enumerate(subsetKeys):
+            if subsetKey in storedScores:
+                modelScores[subsetInd], modelSTDs[subsetInd] = storedScores[subsetKey]
+        modelScores[newInds] = newScores; modelSTDs[newInds] = newSTDs
+        return modelScores, modelSTDs
+    
+    def fitFeatureSubsets(self, signalDataTransform, signalLabels, featureSubsets, allSubjectInds, randomSeed = None):
+        """ Score the Feature Subsets (Without the Store) """
+        modelScores = np.empty(len(featureSubsets)); modelSTDs = np.empty(len(featureSubsets))
+        # Score the Subsets of Each Size Together
+        subsetSizes = np.array([len(featureSubset) for featureSubset in featureSubsets])
+        for subsetSize in np.unique(subsetSizes):
+            sizeInds = np.flatnonzero(subsetSizes == subsetSize)
+            if self.subsetScorer is not None:
+                modelScores[sizeInds], modelSTDs[sizeInds] = self.subsetScorer.scoreCombinations(np.array([featureSubsets[subsetInd] for subsetInd in sizeInds]).reshape(len(sizeInds), subsetSize))
+                continue
+            for subsetInd in sizeInds:
+                # The Exhaustive Search's Seed for This Combination
+                combinationInd = combinationSearch.rankCombination(featureSubsets[subsetInd], signalDataTransform.shape[1])
+                modelScores[subsetInd], modelSTDs[subsetInd] = self.scoreFeatureCombination(signalDataTransform, signalLabels, featureSubsets[subsetInd], allSubjectInds, combinationInd, randomSeed)
+        return modelScores, modelSTDs
+    
+    def scoreFeatureCombination(self, signalDataTransform, signalLabels, combinationInds, allSubjectInds, combinationInd = 0, randomSeed = None):
+        """ The Trimmed Mean Score (and STD) of the Model Trained on the Combination's Features for Each Subject Set """
+        if randomSeed is not None:
+            np.random.seed((randomSeed + combinationInd) % 2**32)
+        # Collect the Signal Data for the Specific Features
+        signalData_culledFeatures = signalDataTransform[:,combinationInds]
+        
+        modelScore = []
+        for subjectInds in allSubjectInds:
+            # Reset the Input Variab;es
+            self.resetModel() # Reset the ML Model
+            
+            # Collect the Signal Data for the Specific Subjects
+            signalDataCull = signalData_culledFeatures[subjectInds, :]
+            signalLabelCull = signalLabels[subjectInds, :]
+            
+            # Score the model with this data set.
+            Training_Data, Testing_Data, Training_Labels, Testing_Labels = signalDataCull, signalData_culledFeatures, signalLabelCull, signalLabels
+            modelScore.append(self.predictionModel.trainModel(Training_Data, Training_Labels, Testing_Data, Testing_Labels))
+        # plt.hist(modelScore); plt.title(featureNamesCombination_String); plt.show()
+        
+        if len(modelScore) > 1:
+            return stats.trim_mean(modelScore, 0.3), np.std(modelScore, ddof= 1)
+        return stats.trim_mean(modelScore, 0.3), 0
+    
     def getSpecificFeatures(self, allFeatureNames, getFeatureNames, signalData):
         newSignalData = []
         for featureName in getFeatureNames:
@@ -0,0 +1,578 @@
+"""
+    --------------------------------------------------------------------------
+    Program Description:
+
+    Live stress scores: a local service that takes the streaming pulse, GSR,
+    and temperature samples of one recording, analyzes them as they arrive,
+    keeps the rest/stress feature aggregates mainProtocol.py compiles (trimmed
+    means, elevations, slopes), and returns the loaded model's prediction after
+    each message, with its latency.
+
+    Messages are JSON, one per line (TCP or Unix socket):
+        {"type": "configure", "samplingFreq": {"pulse": 250, "gsr": 10, "temperature": 10},
+             "stimulusTimes": [start, end], "calibrationSeconds": 60}   (stimulusTimes Optional)
+        {"type": "samples", "sensor": "pulse", "time": [...], "data": [...]}
+        {"type": "stimulus", "event": "start", "time": t}              (or "end")
+        {"type": "stats"}
+    Every Message is Answered with One Line (See stressInferenceSession.handleMessage).
+
+    --------------------------------------------------------------------------
+
+    Run from the Main Folder:
+        python "Helper Files/Machine Learning/stressInferenceService.py" --modelType RG
+            --modelPath model.pkl --modelFeatures modelFeatureNames.txt [--simulate]
+
+    --------------------------------------------------------------------------
+"""
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Imported Modules ---------------------------- #
+
+# Basic Modules
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import numpy as np
+import scipy.signal
+from scipy import stats
+from collections import deque
+
+# Import Data Extraction Files (And Their Location)
+sys.path.append('./Helper Files/Data Aquisition and Analysis/')  # Folder with All the Helper Files
+import excelProcessing
+
+# Import Analysis Files (And Their Locations)
+sys.path.append('./Helper Files/Data Aquisition and Analysis/_Analysis Protocols')  # Folder with All the Helper Files
+import pulseAnalysis
+import _arrayBuffer as arrayBuffer
+import _filteringProtocols as filteringMethods
+
+# Import Machine Learning Files (And They Location)
+sys.path.append("./Helper Files/Machine Learning/")
+import machineLearningMain   # Class Header for All Machine Learning
+
+# -------------------------------------------------------------------------- #
+# --------------------------- Running Aggregates --------------------------- #
+
+class runningLineFit:
+    """
+    Least Squares Line Through Every Point Added So Far (Same Slope as
+    np.polyfit(x, y, 1)), Kept as Running Sums so Each Point is O(1).
+    The y Values May Hold Many Features at Once (One Slope Each).
+    """
+
+    def __init__(self, numFeatures = 1):
+        self.numFeatures = numFeatures
+        self.reset()
+
+    def reset(self):
+        self.numPoints = 0
+        self.xOffset = None     # The First x: Centers the Sums to Avoid Cancellation
+        self.sumX = 0; self.sumXX = 0
+        self.sumY = np.zeros(self.numFeatures); self.sumXY = np.zeros(self.numFeatures)
+
+    def addPoints(self, xPoints, yPoints):
+        xPoints = np.asarray(xPoints, dtype=np.float64)
+        yPoints = np.asarray(yPoints, dtype=np.float64).reshape(len(xPoints), self.numFeatures)
+        if len(xPoints) == 0:
+            return
+        if self.xOffset is None:
+            self.xOffset = xPoints[0]
+        xPoints = xPoints - self.xOffset
+
+        self.numPoints += len(xPoints)
+        self.sumX += xPoints.sum(); self.sumXX += (xPoints*xPoints).sum()
+        self.sumY += yPoints.sum(axis=0); self.sumXY += xPoints @ yPoints
+
+    def slope(self):
+        denominator = self.numPoints*self.sumXX - self.sumX*self.sumX
+        if self.numPoints < 2 or denominator == 0:
+            return np.full(self.numFeatures, np.nan)
+        return (self.numPoints*self.sumXY - self.sumX*self.sumY)/denominator
+
+    def mean(self):
+        if self.numPoints == 0:
+            return np.full(self.numFeatures, np.nan)
+        return self.sumY/self.numPoints
+
+class pulseAggregates:
+    """
+    The Rest/Stress Levels of the Averaged Pulse Features, Taken the Way mainProtocol.py
+    Takes Them from a Finished Recording:
+        Rest: The Trimmed Mean of the Pulses [startStimulusInd/6, startStimulusInd/2)
+        Stress: The Trimmed Mean of the Second Half of the Stimulus (So Far)
+        Slopes: The Line Fit Over the Stimulus (So Far)
+    The Rest Level is Fixed Once the Stimulus Starts; the Stress Level and Slopes
+    Follow the Stimulus Until it Ends.
+    """
+
+    def __init__(self, numFeatures, trimProportion = 0.4):
+        self.numFeatures = numFeatures
+        self.trimProportion = trimProportion
+
+        self.restTimes = arrayBuffer.arrayBuffer(initialCapacity = 1024)
+        self.restPoints = arrayBuffer.arrayBuffer(numFeatures, initialCapacity = 1024)
+        self.stressPoints = arrayBuffer.arrayBuffer(numFeatures, initialCapacity = 256)
+        self.stressLine = runningLineFit(numFeatures)
+        self.restValues = None
+
+    def addPoint(self, featureTime, averageFeatures, stimulusTimes):
+        if stimulusTimes[0] is None or featureTime < stimulusTimes[0]:
+            self.restTimes.append(featureTime)
+            self.restPoints.append(averageFeatures)
+        elif stimulusTimes[1] is None or featureTime <= stimulusTimes[1]:
+            if self.restValues is None:
+                self.finishRest(featureTime, stimulusTimes[0])
+            self.stressPoints.append(averageFeatures)
+            self.stressLine.addPoints([featureTime], [averageFeatures])
+
+    def finishRest(self, firstStressTime, startStimulusTime):
+        """ The Stimulus Started: Fix the Rest Level """
+        # The Pulse Closest to the Stimulus Start (Like np.argmin(abs(featureTimes - startStimulusTime)))
+        startStimulusInd = len(self.restTimes)
+        if startStimulusInd != 0 and abs(self.restTimes[-1] - startStimulusTime) <= abs(firstStressTime - startStimulusTime):
+            startStimulusInd -= 1
+        self.restValues = stats.trim_mean(self.restPoints[int(startStimulusInd/6):int(2*startStimulusInd/4)], self.trimProportion)
+
+        # The Stimulus Includes the Pulse Closest to its Start
+        if startStimulusInd != len(self.restTimes):
+            self.stressPoints.append(self.restPoints[-1])
+            self.stressLine.addPoints(self.restTimes[-1:], self.restPoints[-1:])
+
+    def getAggregates(self):
+        """ The Rest Level, Stress Level, Elevation, and Slopes (None Until the Stimulus Starts) """
+        if self.restValues is None or len(self.stressPoints) == 0:
+            return None
+        numStressPoints = len(self.stressPoints)
+        stressValues = stats.trim_mean(self.stressPoints[int(numStressPoints/2):numStressPoints], self.trimProportion)
+        return {"restValues": self.restValues, "stressValues": stressValues,
+                "stressElevation": stressValues - self.restValues, "stressSlopes": self.stressLine.slope()}
+
+class signalAggregates:
+    """
+    Live Features of a Slow Signal (GSR/Temperature), Following the Analysis Protocols:
+    The Samples are Low Pass Filtered as They Arrive, the Rest Period is Stored Until the
+    Stimulus Starts, and the Stimulus Samples Only Update Running Sums.
+        The Protocols Filter Forward-Backward Over the Whole Recording; the Live
+        Filter is Causal (Same Butterworth Design, Carrying its State Across Messages).
+        With removeBaseline (GSR), the Signal is Normalized and the Rest Baseline is
+        Removed Using Only the Rest Period (The Protocol Uses the Whole Recording to Normalize).
+        The Stress Slope is Taken Over the Stimulus So Far.
+    """
+
+    def __init__(self, samplingFreq, lowPassCutoff, removeBaseline):
+        self.samplingFreq = samplingFreq
+        self.removeBaseline = removeBaseline
+
+        # Low Pass Filter (State Carried Between Messages)
+        self.sos = filteringMethods.sharedFilterDesigns.butterParams(lowPassCutoff, samplingFreq, 4, 'low')
+        self.filterState = None
+
+        self.restTimes = arrayBuffer.arrayBuffer(initialCapacity = 4096)
+        self.restSignal = arrayBuffer.arrayBuffer(initialCapacity = 4096)
+        self.restFeatures = None
+        # The Stimulus Samples (After the Baseline is Removed)
+        self.signalScale = 1; self.signalOffset = 0; self.baselineParams = (0, 0)
+        self.stressLine = runningLineFit(1)
+        self.sumSquares = 0
+        self.peakValue = -np.inf; self.peakTime = None
+
+    def addSamples(self, timePoints, signalData, stimulusTimes):
+        timePoints = np.asarray(timePoints, dtype=np.float64); signalData = np.asarray(signalData, dtype=np.float64)
+        if len(timePoints) == 0:
+            return
+        # Filter the New Samples
+        if self.filterState is None:
+            self.filterState = scipy.signal.sosfilt_zi(self.sos)*signalData[0]
+        signalData, self.filterState = scipy.signal.sosfilt(self.sos, signalData, zi = self.filterState)
+
+        # Split the Samples Into Rest/Stimulus (Samples After the Stimulus are Not Used)
+        restEndInd = len(timePoints) if stimulusTimes[0] is None else np.searchsorted(timePoints, stimulusTimes[0])
+        stressEndInd = len(timePoints) if stimulusTimes[1] is None else np.searchsorted(timePoints, stimulusTimes[1], side='right')
+        self.restTimes.extend(timePoints[0:restEndInd]); self.restSignal.extend(signalData[0:restEndInd])
+        if restEndInd < stressEndInd:
+            if self.restFeatures is None:
+                self.finishRest(stimulusTimes[0])
+            self.addStressSamples(timePoints[restEndInd:stressEndInd], signalData[restEndInd:stressEndInd])
+
+    def finishRest(self, startStimulusTime):
+        """ The Stimulus Started: Fix the Normalization, Baseline, and Rest Features """
+        restTimes = self.restTimes.view(); restSignal = self.restSignal.view()
+        startStimulusInd = len(restTimes)
+        self.stimulusStartTime = startStimulusTime
+        # Too Short a Rest to Fit Lines Through
+        if startStimulusInd < 4:
+            self.restFeatures = {"meanSignalRest": np.nan, "sumSignalRest": np.nan, "numPointsRest": startStimulusInd, "restSlope": np.nan}
+            return
+
+        if self.removeBaseline:
+            # Normalize the Signal, and Remove the Rest Baseline
+            self.signalScale = np.mean(restSignal); self.signalOffset = np.std(restSignal, ddof=1)
+            self.baselineParams = tuple(np.polyfit(restTimes[0:int(startStimulusInd/2)], self.transform(restTimes[0:int(startStimulusInd/2)], restSignal[0:int(startStimulusInd/2)]), 1))
+        restSignal = self.transform(restTimes, restSignal)
+
+        restSlopeInds = slice(int(startStimulusInd/4), int(startStimulusInd*3/4))
+        self.restFeatures = {"meanSignalRest": np.mean(restSignal), "sumSignalRest": np.sum(restSignal), "numPointsRest": len(restSignal),
+                             "restSlope": np.polyfit(restTimes[restSlopeInds], restSignal[restSlopeInds], 1)[0]}
+        # The Rest Period is No Longer Needed
+        self.restTimes.reset(); self.restSignal.reset()
+
+    def transform(self, timePoints, signalData):
+        """ The Normalized Signal Without its Baseline """
+        return (signalData - self.signalOffset)/self.signalScale - (self.baselineParams[0]*timePoints + self.baselineParams[1])
+
+    def addStressSamples(self, timePoints, signalData):
+        signalData = self.transform(timePoints, signalData)
+        self.stressLine.addPoints(timePoints, signalData)
+        self.sumSquares += (signalData*signalData).sum()
+        # Track the Peak
+        peakInd = np.argmax(signalData)
+        if signalData[peakInd] > self.peakValue or self.peakTime is None:
+            self.peakValue = signalData[peakInd]; self.peakTime = timePoints[peakInd]
+
+    def getFeatures(self):
+        """ The Features Known So Far (None Until the Stimulus Starts) """
+        if self.restFeatures is None or self.stressLine.numPoints == 0:
+            return None
+        numStressPoints = self.stressLine.numPoints
+        meanSignalStress = self.stressLine.mean()[0]
+        meanSignalRest = self.restFeatures["meanSignalRest"]
+        # The Standard Deviation from the Running Sums (ddof = 1)
+        peakVariance = (self.sumSquares - numStressPoints*meanSignalStress**2)/(numStressPoints - 1) if numStressPoints > 1 else np.nan
+
+        return {"meanSignal": (self.restFeatures["sumSignalRest"] + self.stressLine.sumY[0])/(self.restFeatures["numPointsRest"] + numStressPoints),
+                "meanSignalRest": meanSignalRest, "meanSignalStress": meanSignalStress, "meanStressIncrease": meanSignalStress - meanSignalRest,
+                "maxHeight": self.peakValue - meanSignalRest, "riseTime": self.peakTime - self.stimulusStartTime,
+                "peakSTD": np.sqrt(max(peakVariance, 0)), "restSlope": self.restFeatures["restSlope"], "stressSlope": self.stressLine.slope()[0]}
+
+# -------------------------------------------------------------------------- #
+# --------------------------- Inference Session ---------------------------- #
+
+class stressInferenceModel:
+    """ The Loaded Model, the Features it Takes, and Every Feature the Live Analysis Can Give """
+
+    def __init__(self, modelType, modelPath, modelFeatureNames, featureNamesFolder, supportVectorKernel = "linear"):
+        if not os.path.isfile(modelPath):
+            print("The Model File Does Not Exist:", modelPath)
+            sys.exit()
+        self.predictionModel = machineLearningMain.predictionModelHead(modelType, modelPath, numFeatures = len(modelFeatureNames), machineLearningClasses = [], saveDataFolder = None, supportVectorKernel = supportVectorKernel).predictionModel
+
+        # The Feature Names (Same Order as mainProtocol.py)
+        featureNameReader = excelProcessing.processPulseData()
+        self.pulseFeatureNames_StressLevel = featureNameReader.extractFeatureNames(featureNamesFolder + "pulseFeatureNames_StressLevel.txt", prependedString = "pulseFeatures.extend([", appendToName = "_StressLevel")[1:]
+        self.pulseFeatureNames_SignalIncrease = featureNameReader.extractFeatureNames(featureNamesFolder + "pulseFeatureNames_SignalIncrease.txt", prependedString = "pulseFeatures.extend([", appendToName = "_SignalIncrease")[1:]
+        self.pulseFeatureNamesFull = featureNameReader.extractFeatureNames(featureNamesFolder + "pulseFeatureNames_SignalIncrease.txt", prependedString = "pulseFeatures.extend([", appendToName = "")
+        self.pulseFeatureNamesFull.extend(featureNameReader.extractFeatureNames(featureNamesFolder + "pulseFeatureNames_StressLevel.txt", prependedString = "pulseFeatures.extend([", appendToName = "")[1:])
+        self.signalFeatureNames = {
+            "gsr": ["meanSignal", "meanSignalRest", "meanSignalStress", "meanStressIncrease", "maxHeight", "riseTime", "peakSTD", "restSlope", "stressSlope"],
+            "temperature": ["meanSignal", "meanSignalRest", "meanSignalStress", "meanStressIncrease", "peakSTD", "restSlope", "stressSlope"],
+        }
+        self.signalFeatureSuffix = {"gsr": "_GSR", "temperature": "_Temperature"}
+
+        # Every Live Feature, in the Order the Session Fills Them
+        self.liveFeatureNames = self.pulseFeatureNames_StressLevel + self.pulseFeatureNames_SignalIncrease
+        for sensor in self.signalFeatureNames:
+            self.liveFeatureNames.extend([featureName + self.signalFeatureSuffix[sensor] for featureName in self.signalFeatureNames[sensor]])
+
+        # Where Each of the Model's Features is in the Live Features
+        missingFeatures = [featureName for featureName in modelFeatureNames if featureName not in self.liveFeatureNames]
+        if missingFeatures:
+            print("The Live Analysis Does Not Give the Model's Features:", missingFeatures)
+            sys.exit()
+        self.modelFeatureNames = list(modelFeatureNames)
+        self.modelFeatureInds = np.array([self.liveFeatureNames.index(featureName) for featureName in modelFeatureNames], dtype=int)
+        # The Sensors the Model Needs
+        self.pulseFeatureEndInd = len(self.pulseFeatureNames_StressLevel) + len(self.pulseFeatureNames_SignalIncrease)
+        self.usesPulse = bool((self.modelFeatureInds < self.pulseFeatureEndInd).any())
+        self.usedSignals = [sensor for sensor in self.signalFeatureNames if any(featureName.endswith(self.signalFeatureSuffix[sensor]) for featureName in modelFeatureNames)]
+
+    def predict(self, liveFeatures):
+        return float(np.ravel(self.predictionModel.predictData(liveFeatures[self.modelFeatureInds].reshape(1, -1)))[0])
+
+class stressInferenceSession:
+    """
+    The State of One Connected Recording: the Pulse Stream, the GSR/Temperature
+    Aggregates, and the Rest/Stress Levels. Each Message Updates the State, and the
+    Model Predicts from the Latest Aggregates Once the Stimulus Has Started.
+    """
+
+    def __init__(self, inferenceModel, pulseAnalysisProtocol, lowPassCutoff = 0.01, maxLatenciesKept = 1000):
+        self.inferenceModel = inferenceModel
+        self.pulseAnalysisProtocol = pulseAnalysisProtocol
+        self.lowPassCutoff = lowPassCutoff
+        self.latencies = deque(maxlen = maxLatenciesKept)  # (Request, Analysis, Feature to Prediction) in ms
+
+        self.pulseStream = None
+        self.pulseAggregates = pulseAggregates(len(inferenceModel.pulseFeatureNamesFull) - 1)
+        self.signalAggregates = {}
+        self.stimulusTimes = [None, None]
+        self.liveFeatures = np.full(len(inferenceModel.liveFeatureNames), np.nan)
+        self.numPulses = 0
+        self.lastPrediction = None
+
+    def configure(self, samplingFreq, stimulusTimes = (None, None), calibrationSeconds = 60):
+        self.stimulusTimes = list(stimulusTimes)
+        self.pulseAggregates = pulseAggregates(len(self.inferenceModel.pulseFeatureNamesFull) - 1)
+        self.pulseStream = None; self.signalAggregates = {}
+        if "pulse" in samplingFreq:
+            self.pulseStream = self.pulseAnalysisProtocol.createStream(samplingFreq["pulse"], minBPM = 30, maxBPM = 180, calibrationSeconds = calibrationSeconds, featureNames = self.inferenceModel.pulseFeatureNamesFull)
+        for sensor in self.inferenceModel.signalFeatureNames:
+            if sensor in samplingFreq:
+                self.signalAggregates[sensor] = signalAggregates(samplingFreq[sensor], self.lowPassCutoff, removeBaseline = sensor == "gsr")
+
+        # Check the Model's Sensors are Streamed
+        missingSensors = [sensor for sensor in self.inferenceModel.usedSignals if sensor not in self.signalAggregates]
+        if self.inferenceModel.usesPulse and self.pulseStream is None:
+            missingSensors.append("pulse")
+        if missingSensors:
+            raise ValueError("The Model Needs the Sensors: " + ", ".join(missingSensors))
+
+    # ---------------------------------------------------------------------- #
+    # ---------------------------- Message Handling ------------------------ #
+
+    def handleMessage(self, message):
+        """
+        Answer One Message:
+            configure/stimulus: {"type": "ok"}
+            samples: {"type": "prediction", "prediction": (None Until the Stimulus Starts), "status",
+                      "numPulses", "latency": {"requestMs", "analysisMs", "featureToPredictionMs"}}
+            stats: {"type": "stats", ...} (Latency Percentiles Over the Recent Requests)
+            Bad Messages: {"type": "error", "message": ...}
+        """
+        requestStartTime = time.perf_counter()
+        try:
+            messageType = message.get("type")
+            if messageType == "configure":
+                self.configure(message["samplingFreq"], message.get("stimulusTimes", (None, None)), message.get("calibrationSeconds", 60))
+                return {"type": "ok"}
+            elif messageType == "stimulus":
+                self.stimulusTimes[["start", "end"].index(message["event"])] = float(message["time"])
+                return {"type": "ok"}
+            elif messageType == "stats":
+                return self.getStats()
+            elif messageType == "samples":
+                return self.handleSamples(message["sensor"], message["time"], message["data"], requestStartTime)
+            return {"type": "error", "message": "Unknown Message Type: " + str(messageType)}
+        except (KeyError, ValueError, TypeError) as error:
+            return {"type": "error", "message": str(error)}
+
+    def handleSamples(self, sensor, timePoints, signalData, requestStartTime):
+        # Analyze the New Samples
+        if sensor == "pulse":
+            if self.pulseStream is None:
+                raise ValueError("The Pulse Sampling Frequency was Not Configured")
+            for finishedPulse in self.pulseStream.push(timePoints, signalData):
+                self.numPulses += 1
+                self.pulseAggregates.addPoint(finishedPulse["time"], finishedPulse["averageFeatures"], self.stimulusTimes)
+        elif sensor in self.signalAggregates:
+            self.signalAggregates[sensor].addSamples(timePoints, signalData, self.stimulusTimes)
+        else:
+            raise ValueError("The Sensor was Not Configured: " + str(sensor))
+        featureStartTime = time.perf_counter()
+
+        # Predict from the Latest Aggregates
+        prediction, status = None, "waitingForStimulus"
+        if self.updateLiveFeatures():
+            prediction, status = self.inferenceModel.predict(self.liveFeatures), "stimulus"
+            self.lastPrediction = prediction
+
+        # Record the Latency
+        requestEndTime = time.perf_counter()
+        latency = {"requestMs": 1000*(requestEndTime - requestStartTime), "analysisMs": 1000*(featureStartTime - requestStartTime),
+                   "featureToPredictionMs": 1000*(requestEndTime - featureStartTime)}
+        self.latencies.append((latency["requestMs"], latency["analysisMs"], latency["featureToPredictionMs"]))
+        return {"type": "prediction", "prediction": prediction, "status": status, "numPulses": self.numPulses, "latency": latency}
+
+    def updateLiveFeatures(self):
+        """ Fill the Live Features from the Aggregates. Returns Whether Every Sensor the Model Needs Has Them """
+        inferenceModel = self.inferenceModel
+        if inferenceModel.usesPulse:
+            pulseLevels = self.pulseAggregates.getAggregates()
+            if pulseLevels is None:
+                return False
+            # Organize the Signals (Same as mainProtocol.py)
+            numStressLevelFeatures = len(inferenceModel.pulseFeatureNames_StressLevel)
+            self.liveFeatures[0:numStressLevelFeatures] = pulseLevels["stressValues"][0:numStressLevelFeatures]
+            self.liveFeatures[numStressLevelFeatures:inferenceModel.pulseFeatureEndInd] = pulseLevels["stressElevation"][numStressLevelFeatures:]
+
+        featureInd = inferenceModel.pulseFeatureEndInd
+        for sensor, featureNames in inferenceModel.signalFeatureNames.items():
+            if sensor in inferenceModel.usedSignals:
+                signalFeatures = self.signalAggregates[sensor].getFeatures()
+                if signalFeatures is None:
+                    return False
+                self.liveFeatures[featureInd:featureInd + len(featureNames)] = [signalFeatures[featureName] for featureName in featureNames]
+            featureInd += len(featureNames)
+        return True
+
+    def getStats(self):
+        serviceStats = {"type": "stats", "numRequests": len(self.latencies), "numPulses": self.numPulses, "lastPrediction": self.lastPrediction}
+        if self.latencies:
+            latencies = np.array(self.latencies)
+            for columnInd, latencyName in enumerate(["requestMs", "analysisMs", "featureToPredictionMs"]):
+                serviceStats[latencyName] = {"p50": float(np.percentile(latencies[:, columnInd], 50)), "p95": float(np.percentile(latencies[:, columnInd], 95)),
+                                      "max": float(latencies[:, columnInd].max())}
+        return serviceStats
+
+# -------------------------------------------------------------------------- #
+# ------------------------------ Socket Server ----------------------------- #
+
+class stressInferenceServer:
+    """ Serves Each Connection its Own stressInferenceSession (Newline Delimited JSON) """
+
+    def __init__(self, inferenceModel, pulseAnalysisProtocol):
+        self.inferenceModel = inferenceModel
+        self.pulseAnalysisProtocol = pulseAnalysisProtocol
+        self.openConnections = set()
+
+    async def start(self, host = "127.0.0.1", port = 8765, unixSocket = None):
+        if unixSocket:
+            return await asyncio.start_unix_server(self.handleConnection, path = unixSocket)
+        return await asyncio.start_server(self.handleConnection, host = host, port = port)
+
+    async def handleConnection(self, reader, writer):
+        inferenceSession = stressInferenceSession(self.inferenceModel, self.pulseAnalysisProtocol)
+        self.openConnections.add(asyncio.current_task())
+        try:
+            while True:
+                messageLine = await reader.readline()
+                if not messageLine:
+                    break
+                try:
+                    reply = inferenceSession.handleMessage(json.loads(messageLine))
+                except ValueError:
+                    reply = {"type": "error", "message": "The Message is Not JSON"}
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        except ConnectionResetError:
+            pass
+        finally:
+            writer.close()
+            self.openConnections.discard(asyncio.current_task())
+
+    async def waitForConnections(self):
+        """ Wait Until Every Client Has Disconnected """
+        await asyncio.gather(*self.openConnections)
+
+# -------------------------------------------------------------------------- #
+# ------------------------- Simulated Sensor Client ------------------------ #
+
+def simulateRecording(numSeconds, stimulusTimes, samplingFreq, seed = 0):
+    """ A Synthetic Recording: Pulses Speed Up and GSR/Temperature Rise During the Stimulus """
+    randomGenerator = np.random.default_rng(seed)
+    inStimulus = lambda timePoints: ((timePoints >= stimulusTimes[0]) & (timePoints <= stimulusTimes[1])).astype(float)
+
+    # Pulse: Three Gaussian Waves per Beat
+    pulseTime = np.arange(0, numSeconds, 1/samplingFreq["pulse"])
+    pulseData = np.zeros(len(pulseTime))
+    beatStartTime = 0.2
+    while beatStartTime < numSeconds:
+        beatLength = 60/(70 + 20*inStimulus(np.array([beatStartTime]))[0]) * (1 + 0.03*randomGenerator.standard_normal())
+        for waveAmp, waveCenter, waveWidth in [(1.0, 0.12, 0.05), (0.55, 0.27, 0.05), (0.35, 0.45, 0.06)]:
+            pulseData += waveAmp*np.exp(-(pulseTime - beatStartTime - waveCenter*beatLength/0.83)**2/(2*(waveWidth*beatLength/0.83)**2))
+        beatStartTime += beatLength
+    pulseData += 0.1*np.sin(2*np.pi*0.1*pulseTime) + 0.002*randomGenerator.standard_normal(len(pulseTime)) + 5
+
+    # GSR and Temperature: Slow Rises
+    gsrTime = np.arange(0, numSeconds, 1/samplingFreq["gsr"])
+    gsrData = 2 + 0.001*gsrTime + 0.5*np.cumsum(inStimulus(gsrTime))/samplingFreq["gsr"]/(stimulusTimes[1] - stimulusTimes[0]) + 0.01*randomGenerator.standard_normal(len(gsrTime))
+    temperatureTime = np.arange(0, numSeconds, 1/samplingFreq["temperature"])
+    temperatureData = 33 + 0.3*np.cumsum(inStimulus(temperatureTime))/samplingFreq["temperature"]/(stimulusTimes[1] - stimulusTimes[0]) + 0.02*randomGenerator.standard_normal(len(temperatureTime))
+
+    return {"pulse": (pulseTime, pulseData), "gsr": (gsrTime, gsrData), "temperature": (temperatureTime, temperatureData)}
+
+async def runSimulatedClient(host = "127.0.0.1", port = 8765, unixSocket = None, numSeconds = 420, stimulusTimes = (180, 360), messageSeconds = 0.25, realTime = False):
+    """ Stream a Synthetic Recording to the Service; Returns the Predictions and the Service's Latency Stats """
+    samplingFreq = {"pulse": 250, "gsr": 10, "temperature": 10}
+    simulatedRecording = simulateRecording(numSeconds, stimulusTimes, samplingFreq)
+    if unixSocket:
+        reader, writer = await asyncio.open_unix_connection(unixSocket)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    async def sendMessage(message):
+        writer.write((json.dumps(message) + "\n").encode())
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    reply = await sendMessage({"type": "configure", "samplingFreq": samplingFreq, "calibrationSeconds": 60})
+    if reply["type"] == "error":
+        print("The Service Refused the Configuration:", reply["message"])
+        sys.exit()
+
+    predictions = []
+    stimulusEvents = [(stimulusTimes[0], "start"), (stimulusTimes[1], "end")]
+    # Send Each Sensor's Samples in Messages of messageSeconds
+    for messageStartTime in np.arange(0, numSeconds, messageSeconds):
+        while stimulusEvents and stimulusEvents[0][0] < messageStartTime + messageSeconds:
+            await sendMessage({"type": "stimulus", "event": stimulusEvents[0][1], "time": stimulusEvents[0][0]})
+            stimulusEvents.pop(0)
+        for sensor, (timePoints, signalData) in simulatedRecording.items():
+            messageInds = slice(*np.searchsorted(timePoints, [messageStartTime, messageStartTime + messageSeconds]))
+            reply = await sendMessage({"type": "samples", "sensor": sensor, "time": timePoints[messageInds].tolist(), "data": signalData[messageInds].tolist()})
+            if reply["type"] == "error":
+                print("The Service Returned an Error:", reply["message"])
+                sys.exit()
+            if reply["prediction"] is not None:
+                predictions.append((messageStartTime + messageSeconds, reply["prediction"]))
+        if realTime:
+            await asyncio.sleep(messageSeconds)
+
+    serviceStats = await sendMessage({"type": "stats"})
+    writer.close()
+    await writer.wait_closed()
+    return predictions, serviceStats
+
+# -------------------------------------------------------------------------- #
+# --------------------------- Program Starts Here -------------------------- #
+
+def readModelFeatureNames(modelFeaturesFile):
+    """ The Model's Feature Names: One per Line (Lines Starting with '#' are Skipped) """
+    if not os.path.isfile(modelFeaturesFile):
+        print("The following Input File Does Not Exist:", modelFeaturesFile)
+        sys.exit()
+    with open(modelFeaturesFile, "r") as featureFile:
+        return [featureName.strip() for featureName in featureFile if featureName.strip() and not featureName.startswith("#")]
+
+async def runService(inferenceModel, pulseAnalysisProtocol, arguments):
+    inferenceServer = stressInferenceServer(inferenceModel, pulseAnalysisProtocol)
+    socketServer = await inferenceServer.start(arguments.host, arguments.port, arguments.unixSocket)
+    print("Stress Inference Service Listening on", arguments.unixSocket or (arguments.host + ":" + str(arguments.port)))
+
+    async with socketServer:
+        if not arguments.simulate:
+            await socketServer.serve_forever()
+            return
+        # Stream a Synthetic Recording Through the Service
+        predictions, serviceStats = await runSimulatedClient(arguments.host, arguments.port, arguments.unixSocket, numSeconds = arguments.simulationSeconds, realTime = arguments.realTime)
+        await inferenceServer.waitForConnections()
+        print("Number of Predictions:", len(predictions))
+        if predictions:
+            print("Final Prediction:", predictions[-1][1])
+        for latencyName in ["requestMs", "analysisMs", "featureToPredictionMs"]:
+            if latencyName in serviceStats:
+                print(latencyName, serviceStats[latencyName])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Live stress score predictions from streaming pulse/GSR/temperature samples.")
+    parser.add_argument("--modelType", default = "RG", help = "The Model Type: RF, LR, KNN, SVM, RG, EN, SVR")
+    parser.add_argument("--modelPath", required = True, help = "The Trained Model (joblib)")
+    parser.add_argument("--modelFeatures", required = True, help = "The Model's Feature Names in Order (One per Line)")
+    parser.add_argument("--supportVectorKernel", default = "linear")
+    parser.add_argument("--featureNamesFolder", default = "./Helper Files/Machine Learning/Compiled Feature Names/All Features/")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--unixSocket", default = None, help = "Listen on a Unix Socket Instead of TCP")
+    parser.add_argument("--simulate", action = "store_true", help = "Stream a Synthetic Recording Through the Service and Report the Latency")
+    parser.add_argument("--simulationSeconds", type = float, default = 420)
+    parser.add_argument("--realTime", action = "store_true", help = "Send the Simulated Samples at the Rate They are Recorded")
+    arguments = parser.parse_args()
+
+    # Load the Model and the Analysis Protocol
+    inferenceModel = stressInferenceModel(arguments.modelType, arguments.modelPath, readModelFeatureNames(arguments.modelFeatures), arguments.featureNamesFolder, arguments.supportVectorKernel)
+    pulseAnalysisProtocol = pulseAnalysis.signalProcessing(batchFilterPulses = True)
+
+    asyncio.run(runService(inferenceModel, pulseAnalysisProtocol, arguments))
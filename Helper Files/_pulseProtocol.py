@@ -127,7 +127,8 @@ if __name__ == "__main__":
     # ---------------------------------------------------------------------- #
     # ------------------- Extract and Analyze Pulse Data ------------------- #
     
-    # For Each PulseFile, Collect the Data in the Same Instance
+    # For Each PulseFile, Collect the Data in the Same Recording
+    pulseRecording = pulseAnalysisProtocol.createSession()
     for pulseExcelFile in pulseExcelFiles:
         # Read Data from Excel
         time, signalData = excelProcessingPulse.getData(pulseExcelFile, testSheetNum = 0)
@@ -138,30 +139,30 @@ if __name__ == "__main__":
         # Calibrate Systolic and Diastolic Pressure
         fileBasename = os.path.basename(pulseExcelFile)
         pressureInfo = fileBasename.split("SYS")
-        if len(pressureInfo) > 1 and pulseAnalysisProtocol.systolicPressure0 == None:
+        if len(pressureInfo) > 1 and pulseRecording.systolicPressure0 == None:
             pressureInfo = pressureInfo[-1].split(".")[0]
             systolicPressure0, diastolicPressure0 = pressureInfo.split("_DIA")
-            pulseAnalysisProtocol.setPressureCalibration(float(systolicPressure0), float(diastolicPressure0))
+            pulseRecording.setPressureCalibration(float(systolicPressure0), float(diastolicPressure0))
         
         # Check Whether the StartTime is Specified in the File
         if fileBasename.lower() in ["cpt", "exercise", "vr", "start"] and stimulusTimes[0] != None:
-            stimulusTimes[0] = pulseAnalysisProtocol.timeOffset
+            stimulusTimes[0] = pulseRecording.timeOffset
         
         # Seperate Pulses, Perform Indivisual Analysis, and Extract Features
-        pulseData = pulseAnalysisProtocol.analyzePulse(time, signalData, minBPM = 30, maxBPM = 180)
+        pulseRecording = pulseAnalysisProtocol.analyzePulse(time, signalData, minBPM = 30, maxBPM = 180, analysisSession = pulseRecording)
     
     # Plot the Features Collected from the Pulses
     if plotFeatures:
-        pulseAnalysisProtocol.featureListExact = np.array(pulseAnalysisProtocol.featureListExact)
-        plotFeatures = featureAnalysis.featureAnalysis(pulseAnalysisProtocol.featureListExact[:,0], pulseAnalysisProtocol.featureListExact[:,1:], pulseFeatureLabels[1:], stimulusTimes, saveDataFolder)
+        pulseFeatureList_Full = pulseRecording.featureListExact.view()
+        plotFeatures = featureAnalysis.featureAnalysis(pulseFeatureList_Full[:,0], pulseFeatureList_Full[:,1:], pulseFeatureLabels[1:], stimulusTimes, saveDataFolder)
         plotFeatures.singleFeatureAnalysis()
     
     # Save Pulse Data
     if saveAnalysis:
         saveCompiledData = saveDataFolder + "Compiled Data in Excel/"
         # Save the Features and Filtered Data
-        excelProcessingPulse.saveResults(pulseAnalysisProtocol.featureListExact, pulseFeatureLabels, saveCompiledData, "Feature List.xlsx", sheetName)
-        excelProcessingPulse.saveFilteredData(pulseAnalysisProtocol.time, pulseAnalysisProtocol.signalData, pulseAnalysisProtocol.filteredData, saveCompiledData, "Filtered Data.xlsx", "Filtered Data")
+        excelProcessingPulse.saveResults(pulseRecording.featureListExact.view(), pulseFeatureLabels, saveCompiledData, "Feature List.xlsx", sheetName)
+        excelProcessingPulse.saveFilteredData(pulseRecording.time.view(), pulseRecording.signalData.view(), pulseRecording.filteredData.view(), saveCompiledData, "Filtered Data.xlsx", "Filtered Data")
         
     # ---------------------------------------------------------------------- #
     #                          Train the Model                               #
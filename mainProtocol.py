@@ -25,13 +25,14 @@ import os
 import sys
 import shutil
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from scipy import stats
-import matplotlib.pyplot as plt
 
 from natsort import natsorted
 # Import Data Extraction Files (And Their Location)
 sys.path.append('./Helper Files/Data Aquisition and Analysis/')  # Folder with All the Helper Files
 import excelProcessing
+import featureStore
 
 # Import Analysis Files (And Their Locations)
 sys.path.append('./Data Aquisition and Analysis/_Analysis Protocols')  # Folder with All the Helper Files
@@ -40,17 +41,17 @@ import gsrAnalysis
 import pulseAnalysis
 import chemicalAnalysis
 import temperatureAnalysis
+import _rollingStatistics as rollingStatistics
+import _headlessMode as headlessMode
 
-# Import Machine Learning Files (And They Location)
+# Machine Learning Files (And They Location): Imported Where Used, as They Load pyplot
 sys.path.append("./Helper Files/Machine Learning/")
-import machineLearningMain   # Class Header for All Machine Learning
-import featureAnalysis       # Functions for Feature Analysis
 
 
 from numpy import arange
 
 import matplotlib as mpl
-from matplotlib import pyplot as plt
+plt = headlessMode.lazyPyplot()
 from matplotlib import cm
 from matplotlib.colors import LinearSegmentedColormap
 
@@ -89,6 +90,425 @@ colors = cm.get_cmap(red_green_cm, N)
 # bfgs
 
 
+# -------------------------------------------------------------------------- #
+# ------------------ Analysis of One Subject's Recording ------------------- #
+
+# The Settings Every Analysis Task Shares (Set Once in Each Worker Process)
+analysisSettings = {}
+
+def setAnalysisSettings(newAnalysisSettings):
+    global analysisSettings
+    analysisSettings = newAnalysisSettings
+
+def analyzeRecording(analysisTask):
+    """ Analyze One Subject/Stressor/Sensor Recording. Returns the Subject's Features and the Raw Data (None if Not Tracked) """
+    sensor, dataFile, subjectFolder, featureLabel = analysisTask
+    
+    if sensor == "pulse":
+        return analyzePulseRecording(dataFile, subjectFolder, featureLabel, analysisSettings)
+    elif sensor == "enzym":
+        return analyzeEnzymRecording(dataFile, subjectFolder, featureLabel, analysisSettings)
+    elif sensor == "ise":
+        return analyzeISERecording(dataFile, subjectFolder, featureLabel, analysisSettings)
+    elif sensor == "gsr":
+        return analyzeGSRRecording(dataFile, subjectFolder, featureLabel, analysisSettings)
+    elif sensor == "temp":
+        return analyzeTemperatureRecording(dataFile, subjectFolder, featureLabel, analysisSettings)
+    print("No Analysis for the Sensor:", sensor)
+    sys.exit()
+
+def analyzePulseRecording(pulseFolder, subjectFolder, featureLabel, settings):
+    # Unpack the Shared Settings (A Copy of the Stimulus Times: A Start Found in This Recording Stays in This Task)
+    stimulusTimes = list(settings["stimulusTimes"])
+    analyzedFeatureStore = settings["analyzedFeatureStore"]
+    excelProcessingPulse = settings["excelProcessingPulse"]
+    pulseAnalysisProtocol = settings["pulseAnalysisProtocol"]
+    pulseFeatureNames, pulseFeatureNamesFull = settings["pulseFeatureNames"], settings["pulseFeatureNamesFull"]
+    pulseFeatureNames_StressLevel, pulseFeatureNames_SignalIncrease = settings["pulseFeatureNames_StressLevel"], settings["pulseFeatureNames_SignalIncrease"]
+    scaleFactor_Pulse = settings["scaleFactor_Pulse"]
+    subjectName = os.path.basename(subjectFolder[:-1])
+    
+    savePulseDataFolder = pulseFolder + "Pulse Analysis/"    # Data Folder to Save the Data; MUST END IN '/'
+    pulseAnalysisParameters = {"scaleFactor": scaleFactor_Pulse, "minBPM": 30, "maxBPM": 180}
+    # Load the Saved Features if This Recording was Already Analyzed
+    pulseFeatureList_Full = None
+    pulseFingerprint = analyzedFeatureStore.createFingerprint([pulseFolder], pulseAnalysisProtocol, pulseAnalysisParameters)
+    if not settings["reanalyzeData_Pulse"]:
+        pulseFeatureList_Full = analyzedFeatureStore.loadFeatures(subjectName, settings["listOfStressors"][featureLabel], "pulse", legacyExcelFile = savePulseDataFolder + "Compiled Data in Excel/Feature List.xlsx", fingerprint = pulseFingerprint)
+    
+    if pulseFeatureList_Full is not None:
+        featureTimes = pulseFeatureList_Full[:,0]
+        pulseFeatureListExact = pulseFeatureList_Full[:,1:]
+        
+        numSecondsAverage = 30
+        # Calculate the Running Average
+        featureAverager = rollingStatistics.rollingTrimmedMean(pulseFeatureListExact.shape[1], numSecondsAverage, trimProportion = 0.3, includeWindowStart = False)
+        pulseFeatureList = featureAverager.transform(featureTimes, pulseFeatureListExact)
+
+    else:
+        pulseExcelFiles = []
+        # Collect all the Pulse Files for the Stressor
+        for file in os.listdir(pulseFolder):
+            file = file.decode("utf-8") if type(file) == type(b'') else file
+            if file.endswith(("xlsx", "xls")) and not file.startswith(("$", '~')):
+                pulseExcelFiles.append(pulseFolder + file)
+        pulseExcelFiles = natsorted(pulseExcelFiles)
+    
+        # Loop Through Each Pulse File
+        pulseRecording = pulseAnalysisProtocol.createSession(pulseFeatureNamesFull)
+        for pulseExcelFile in pulseExcelFiles:
+            
+            # Read Data from Excel
+            time, signalData = excelProcessingPulse.getData(pulseExcelFile, testSheetNum = 0)
+            signalData = signalData*scaleFactor_Pulse
+                            
+            # Calibrate Systolic and Diastolic Pressure
+            fileBasename = os.path.basename(pulseExcelFile)
+            pressureInfo = fileBasename.split("SYS")
+            if len(pressureInfo) > 1 and pulseRecording.systolicPressure0 == None:
+                pressureInfo = pressureInfo[-1].split(".")[0]
+                systolicPressure0, diastolicPressure0 = pressureInfo.split("_DIA")
+                pulseRecording.setPressureCalibration(float(systolicPressure0), float(diastolicPressure0))
+            
+            # Check Whether the StartTime is Specified in the File
+            if fileBasename.lower() in ["cpt", "exer", "vr", "start"] and not stimulusTimes[0]:
+                stimulusTimes[0] = pulseRecording.timeOffset
+                                        
+            # Seperate Pulses, Perform Indivisual Analysis, and Extract Features
+            pulseAnalysisProtocol.analyzePulse(time, signalData, minBPM = 30, maxBPM = 180, analysisSession = pulseRecording)
+        
+        # Remove Previous Analysis if Present
+        if os.path.isdir(savePulseDataFolder):
+            shutil.rmtree(savePulseDataFolder)
+        pulseFeatureList_Full = pulseRecording.featureListExact.view()
+        # Save the Features and Filtered Data
+        saveCompiledDataPulse = savePulseDataFolder + "Compiled Data in Excel/"
+        excelProcessingPulse.saveResults(pulseFeatureList_Full, pulseFeatureNamesFull, saveCompiledDataPulse, "Feature List.xlsx", sheetName = "Pulse Features")
+        excelProcessingPulse.saveFilteredData(pulseRecording.time.view(), pulseRecording.signalData.view(), pulseRecording.filteredData.view(), saveCompiledDataPulse, "Filtered Data.xlsx", "Filtered Data")
+        analyzedFeatureStore.saveFeatures(subjectName, settings["listOfStressors"][featureLabel], "pulse", pulseFeatureList_Full, pulseFeatureNamesFull, pulseAnalysisParameters, pulseFingerprint)
+        
+        # Compile the Features from the Data
+        featureTimes = pulseFeatureList_Full[:,0]
+        pulseFeatureList = pulseRecording.featureListAverage.view()
+        pulseFeatureListExact = pulseFeatureList_Full[:,1:]
+        # Assert That There are Equal Features and Feature Times
+        assert len(featureTimes) == len(pulseFeatureList)
+
+    # Quick Check that All Points Have the Correct Number of Features
+    for feature in pulseFeatureList:
+        assert len(feature) == len(pulseFeatureNames)
+    
+    # Plot the Features in Time
+    if settings["timePermits"]:
+        import featureAnalysis       # Functions for Feature Analysis
+        plotPulseFeatures = featureAnalysis.featureAnalysis(featureTimes, pulseFeatureListExact, pulseFeatureNamesFull[1:], stimulusTimes, savePulseDataFolder)
+        plotPulseFeatures.singleFeatureAnalysis()   
+        
+    # Downsize the Features into One Data Point
+    # ********************************
+    # FInd the Indices of the Stimuli
+    startStimulusInd = np.argmin(abs(featureTimes - stimulusTimes[0]))
+    endStimulusInd = np.argmin(abs(featureTimes - stimulusTimes[1]))
+    
+    # Caluclate the Baseline/Stress Levels
+    restValues = stats.trim_mean(pulseFeatureList[ int(startStimulusInd/6):int(2*startStimulusInd/4),:], 0.4)
+    stressValues = stats.trim_mean(pulseFeatureList[ int((endStimulusInd+startStimulusInd)/2) :endStimulusInd,: ], 0.4)
+    stressElevation = stressValues - restValues
+    # Calculate the Stress Rise/Fall
+    stressSlopes = np.polyfit(featureTimes[startStimulusInd:endStimulusInd], pulseFeatureList[ startStimulusInd:endStimulusInd,: ], 1)[0]
+
+    # Organize the Signals
+    pulseFeatures_StressLevel = stressValues[0:len(pulseFeatureNames_StressLevel)]
+    pulseFeatures_SignalIncrease = stressElevation[len(pulseFeatureNames_StressLevel):]
+    # Compile the Signals
+    subjectPulseFeatures = []
+    subjectPulseFeatures.extend(pulseFeatures_StressLevel)
+    subjectPulseFeatures.extend(pulseFeatures_SignalIncrease)
+    # Assert the Number of Signals are Correct
+    assert len(subjectPulseFeatures) == len(pulseFeatureNames)
+    assert len(pulseFeatures_StressLevel) == len(pulseFeatureNames_StressLevel)
+    assert len(pulseFeatures_SignalIncrease) == len(pulseFeatureNames_SignalIncrease)
+    # ********************************
+    
+    rawPulseData = None
+    if settings["trackRawData"]:
+        # Track raw feature
+        rawPulseData = [
+                featureTimes, 
+                # pulseFeatureList[:, pulseFeatureNames.index("centralAugmentationIndex_EST_SignalIncrease")]
+                # pulseFeatureList[:, pulseFeatureNames.index("reflectionIndex_SignalIncrease")]
+                # pulseFeatureList[:, pulseFeatureNames.index("systolicDicroticNotchAmpRatio_SignalIncrease")]
+                # pulseFeatureList[:, pulseFeatureNames.index("dicroticRiseVelMaxTime_StressLevel")]
+                pulseFeatureList[:, pulseFeatureNames.index("dicroticNotchDicroticAccelRatio_SignalIncrease")]
+                
+            ]
+    
+    return subjectPulseFeatures, rawPulseData
+
+def analyzeEnzymRecording(chemicalFile, subjectFolder, featureLabel, settings):
+    # Unpack the Shared Settings
+    stimulusTimes_Delayed = settings["stimulusTimes_Delayed"]
+    analyzedFeatureStore = settings["analyzedFeatureStore"]
+    excelProcessingChemical = settings["excelProcessingChemical"]
+    chemicalAnalysisProtocol = settings["chemicalAnalysisProtocol"]
+    chemicalFeatureNames_Enzym = settings["chemicalFeatureNames_Enzym"]
+    glucoseFeatureNames, lactateFeatureNames, uricAcidFeatureNames = settings["glucoseFeatureNames"], settings["lactateFeatureNames"], settings["uricAcidFeatureNames"]
+    scaleFactor_Chemical_Enzym = settings["scaleFactor_Chemical_Enzym"]
+    subjectName = os.path.basename(subjectFolder[:-1])
+    
+    # Extract the Specific Chemical Filename
+    chemicalFilename = os.path.basename(chemicalFile[:-1]).split(".")[0]
+    saveCompiledDataChemical = subjectFolder + "Chemical Analysis/Compiled Data in Excel/" + chemicalFilename + "/"
+    chemicalAnalysisParameters = {"scaleFactor": scaleFactor_Chemical_Enzym, "stimulusTimes": stimulusTimes_Delayed}
+    # Load the Saved Features if This Recording was Already Analyzed
+    subjectChemicalFeatures = None
+    chemicalFingerprint = analyzedFeatureStore.createFingerprint([chemicalFile], chemicalAnalysisProtocol, chemicalAnalysisParameters)
+    if not settings["reanalyzeData_Chemical"]:
+        subjectChemicalFeatures = analyzedFeatureStore.loadFeatures(subjectName, settings["listOfStressors"][featureLabel], "enzym", legacyExcelFile = saveCompiledDataChemical + "Feature List.xlsx", fingerprint = chemicalFingerprint)
+
+    if subjectChemicalFeatures is not None:
+        subjectChemicalFeatures = subjectChemicalFeatures[0]
+        
+        # Organize the Features of Enzymatic
+        glucoseFeatures = subjectChemicalFeatures[0:len(glucoseFeatureNames)]
+        lactateFeatures = subjectChemicalFeatures[len(glucoseFeatureNames):len(glucoseFeatureNames) + len(lactateFeatureNames)]
+        uricAcidFeatures = subjectChemicalFeatures[len(lactateFeatureNames) + len(glucoseFeatureNames):]
+        
+        # Quick Check that All Points Have the Correct Number of Features
+        assert len(subjectChemicalFeatures) == len(chemicalFeatureNames_Enzym)
+        assert len(glucoseFeatures) == len(glucoseFeatureNames)
+        assert len(lactateFeatures) == len(lactateFeatureNames)
+        assert len(uricAcidFeatures) == len(uricAcidFeatureNames)
+    else:
+        # Read in the Chemical Data from Excel
+        timePoints, chemicalData = excelProcessingChemical.getData(chemicalFile, testSheetNum = 0)
+        glucose, lactate, uricAcid = chemicalData*scaleFactor_Chemical_Enzym # Extract the Specific Chemicals
+        lactate = lactate*1000 # Correction on Lactate Data
+        
+        # Cull Subjects with Missing Data
+        if len(glucose) == 0 or len(lactate) == 0 or len(uricAcid) == 0:
+            print("Missing Chemical Data in Folder:", subjectFolder)
+            sys.exit()
+
+        # Compile the Features from the Data
+        chemicalRecording = chemicalAnalysisProtocol.createSession(stimulusTimes_Delayed, saveCompiledDataChemical)
+        chemicalAnalysisProtocol.analyzeChemicals(timePoints, [glucose, lactate, uricAcid], ['glucose', 'lactate', 'uricAcid'], featureLabel, analysisSession = chemicalRecording)
+        # Get the ChemicalFeatures
+        glucoseFeatures = chemicalRecording.chemicalFeatures['glucoseFeatures'][0][0]
+        lactateFeatures = chemicalRecording.chemicalFeatures['lactateFeatures'][0][0]
+        uricAcidFeatures = chemicalRecording.chemicalFeatures['uricAcidFeatures'][0][0]
+        # Verify that Features were Found in for All Chemicals
+        if len(glucoseFeatures) == 0 or len(lactateFeatures) == 0 or len(uricAcidFeatures) == 0:
+            print("No Features Found in Some Chemical Data in Folder:", subjectFolder)
+            sys.exit()   
+            
+        # Quick Check that All Points Have the Correct Number of Features
+        assert len(glucoseFeatures) == len(glucoseFeatureNames)
+        assert len(lactateFeatures) == len(lactateFeatureNames)
+        assert len(uricAcidFeatures) == len(uricAcidFeatureNames)
+        
+        # Organize the Chemical Features
+        subjectChemicalFeatures = []
+        subjectChemicalFeatures.extend(glucoseFeatures)
+        subjectChemicalFeatures.extend(lactateFeatures)
+        subjectChemicalFeatures.extend(uricAcidFeatures)
+        
+        # Save the Features and Filtered Data
+        excelProcessingChemical.saveResults([subjectChemicalFeatures], chemicalFeatureNames_Enzym, saveCompiledDataChemical, "Feature List.xlsx", sheetName = "Chemical Features")
+        analyzedFeatureStore.saveFeatures(subjectName, settings["listOfStressors"][featureLabel], "enzym", [subjectChemicalFeatures], chemicalFeatureNames_Enzym, chemicalAnalysisParameters, chemicalFingerprint)
+    
+    rawEnzymData = None
+    if settings["trackRawData"]:
+        # Read in the Chemical Data from Excel
+        timePoints, chemicalData = excelProcessingChemical.getData(chemicalFile, testSheetNum = 0)
+        glucose, lactate, uricAcid = chemicalData*scaleFactor_Chemical_Enzym # Extract the Specific Chemicals
+        lactate = lactate*1000 # Correction on Lactate Data
+        # Track raw feature
+        rawEnzymData = [timePoints, glucose, lactate, uricAcid]
+    
+    return subjectChemicalFeatures, rawEnzymData
+
+def analyzeISERecording(chemicalFile, subjectFolder, featureLabel, settings):
+    # Unpack the Shared Settings
+    stimulusTimes_Delayed = settings["stimulusTimes_Delayed"]
+    analyzedFeatureStore = settings["analyzedFeatureStore"]
+    excelProcessingChemical = settings["excelProcessingChemical"]
+    chemicalAnalysisProtocol = settings["chemicalAnalysisProtocol"]
+    chemicalFeatureNames_ISE = settings["chemicalFeatureNames_ISE"]
+    sodiumFeatureNames, potassiumFeatureNames, ammoniumFeatureNames = settings["sodiumFeatureNames"], settings["potassiumFeatureNames"], settings["ammoniumFeatureNames"]
+    scaleFactor_Chemical_ISE = settings["scaleFactor_Chemical_ISE"]
+    subjectName = os.path.basename(subjectFolder[:-1])
+    
+    # Extract the Specific Chemical Filename
+    chemicalFilename = os.path.basename(chemicalFile[:-1]).split(".")[0]
+    saveCompiledDataChemical = subjectFolder + "Chemical Analysis/Compiled Data in Excel/" + chemicalFilename + "/"
+    chemicalAnalysisParameters = {"scaleFactor": scaleFactor_Chemical_ISE, "stimulusTimes": stimulusTimes_Delayed}
+    # Load the Saved Features if This Recording was Already Analyzed
+    subjectChemicalFeatures = None
+    chemicalFingerprint = analyzedFeatureStore.createFingerprint([chemicalFile], chemicalAnalysisProtocol, chemicalAnalysisParameters)
+    if not settings["reanalyzeData_Chemical"]:
+        subjectChemicalFeatures = analyzedFeatureStore.loadFeatures(subjectName, settings["listOfStressors"][featureLabel], "ise", legacyExcelFile = saveCompiledDataChemical + "Feature List.xlsx", fingerprint = chemicalFingerprint)
+
+    if subjectChemicalFeatures is not None:
+        subjectChemicalFeatures = subjectChemicalFeatures[0]
+        
+        # Organize the Features of ISE
+        sodiumFeatures = subjectChemicalFeatures[0:len(sodiumFeatureNames)]
+        potassiumFeatures = subjectChemicalFeatures[len(sodiumFeatureNames):len(sodiumFeatureNames) + len(potassiumFeatureNames)]
+        ammoniumFeatures = subjectChemicalFeatures[len(sodiumFeatureNames) + len(potassiumFeatureNames):]
+        
+        # Quick Check that All Points Have the Correct Number of Features
+        assert len(subjectChemicalFeatures) == len(chemicalFeatureNames_ISE)
+        assert len(sodiumFeatures) == len(sodiumFeatureNames)
+        assert len(potassiumFeatures) == len(potassiumFeatureNames)
+        assert len(ammoniumFeatures) == len(ammoniumFeatureNames)
+    else:
+        # Read in the Chemical Data from Excel
+        timePoints, chemicalData = excelProcessingChemical.getData(chemicalFile, testSheetNum = 0)
+        sodium, potassium, ammonium = chemicalData*scaleFactor_Chemical_ISE # Extract the Specific Chemicals
+                            
+        # Cull Subjects with Missing Data
+        if len(sodium) == 0 or len(potassium) == 0 or len(ammonium) == 0:
+            print("Missing Chemical Data in Folder:", subjectFolder)
+            sys.exit()
+
+        # Compile the Features from the Data
+        chemicalRecording = chemicalAnalysisProtocol.createSession(stimulusTimes_Delayed, saveCompiledDataChemical)
+        chemicalAnalysisProtocol.analyzeChemicals(timePoints, [sodium, potassium, ammonium], ['sodium', 'potassium', 'ammonium'], featureLabel, iseData = True, analysisSession = chemicalRecording)
+        # Get the ChemicalFeatures
+        sodiumFeatures = chemicalRecording.chemicalFeatures['sodiumFeatures'][0]
+        potassiumFeatures = chemicalRecording.chemicalFeatures['potassiumFeatures'][0]
+        ammoniumFeatures = chemicalRecording.chemicalFeatures['ammoniumFeatures'][0]
+        # Verify that Features were Found in for All Chemicals
+        if len(sodiumFeatures) == 0 or len(potassiumFeatures) == 0 or len(ammoniumFeatures) == 0:
+            print("No Features Found in Some Chemical Data in Folder:", subjectFolder)
+            sys.exit()   
+            
+        # Quick Check that All Points Have the Correct Number of Features
+        assert len(sodiumFeatures) == len(sodiumFeatureNames)
+        assert len(potassiumFeatures) == len(potassiumFeatureNames)
+        assert len(ammoniumFeatures) == len(ammoniumFeatureNames)
+        
+        # Organize the Chemical Features
+        subjectChemicalFeatures = []
+        subjectChemicalFeatures.extend(sodiumFeatures)
+        subjectChemicalFeatures.extend(potassiumFeatures)
+        subjectChemicalFeatures.extend(ammoniumFeatures)
+        
+        # Save the Features and Filtered Data
+        excelProcessingChemical.saveResults([subjectChemicalFeatures], chemicalFeatureNames_ISE, saveCompiledDataChemical, "Feature List.xlsx", sheetName = "Chemical Features")
+        analyzedFeatureStore.saveFeatures(subjectName, settings["listOfStressors"][featureLabel], "ise", [subjectChemicalFeatures], chemicalFeatureNames_ISE, chemicalAnalysisParameters, chemicalFingerprint)
+    
+    rawISEData = None
+    if settings["trackRawData"]:
+        # Read in the Chemical Data from Excel
+        timePoints, chemicalData = excelProcessingChemical.getData(chemicalFile, testSheetNum = 0)
+        sodium, potassium, ammonium = chemicalData*scaleFactor_Chemical_ISE # Extract the Specific Chemicals
+        # Track raw feature
+        rawISEData = [timePoints, sodium, potassium, ammonium]
+    
+    return subjectChemicalFeatures, rawISEData
+
+def analyzeGSRRecording(gsrFile, subjectFolder, featureLabel, settings):
+    # Unpack the Shared Settings
+    analyzedFeatureStore = settings["analyzedFeatureStore"]
+    excelProcessingGSR = settings["excelProcessingGSR"]
+    gsrAnalysisProtocol = settings["gsrAnalysisProtocol"]
+    gsrFeatureNames = settings["gsrFeatureNames"]
+    scaleFactor_GSR = settings["scaleFactor_GSR"]
+    subjectName = os.path.basename(subjectFolder[:-1])
+    
+    # Extract the Specific GSR Filename
+    gsrFilename = os.path.basename(gsrFile[:-1]).split(".")[0]
+    saveCompiledDataGSR = subjectFolder + "GSR Analysis/Compiled Data in Excel/" + gsrFilename + "/"
+    gsrAnalysisParameters = {"scaleFactor": scaleFactor_GSR, "stimulusTimes": settings["stimulusTimes"]}
+    # Load the Saved Features if This Recording was Already Analyzed
+    subjectGSRFeatures = None
+    gsrFingerprint = analyzedFeatureStore.createFingerprint([gsrFile], gsrAnalysisProtocol, gsrAnalysisParameters)
+    if not settings["reanalyzeData_GSR"]:
+        subjectGSRFeatures = analyzedFeatureStore.loadFeatures(subjectName, settings["listOfStressors"][featureLabel], "gsr", legacyExcelFile = saveCompiledDataGSR + "Feature List.xlsx", fingerprint = gsrFingerprint)
+
+    if subjectGSRFeatures is not None:
+        subjectGSRFeatures = subjectGSRFeatures[0]
+        # Quick Check that All Points Have the Correct Number of Features
+        assert len(subjectGSRFeatures) == len(gsrFeatureNames)
+    else:
+        # Read in the GSR Data from Excel
+        excelDataGSR = excelProcessing.processGSRData()
+        timePoints, currentGSR = excelDataGSR.getData(gsrFile, testSheetNum = 0, method = "processed")
+        currentGSR = currentGSR*scaleFactor_GSR # Get Data into micro-Ampes
+
+        # Process the Data
+        subjectGSRFeatures = gsrAnalysisProtocol.analyzeGSR(timePoints, currentGSR)
+        
+        # Quick Check that All Points Have the Correct Number of Features
+        assert len(subjectGSRFeatures) == len(gsrFeatureNames)
+        
+        # Save the Features and Filtered Data
+        excelProcessingGSR.saveResults([subjectGSRFeatures], gsrFeatureNames, saveCompiledDataGSR, "Feature List.xlsx", sheetName = "GSR Features")
+        analyzedFeatureStore.saveFeatures(subjectName, settings["listOfStressors"][featureLabel], "gsr", [subjectGSRFeatures], gsrFeatureNames, gsrAnalysisParameters, gsrFingerprint)
+    
+    rawGSRData = None
+    if settings["trackRawData"]:
+        # Read in the GSR Data from Excel
+        excelDataGSR = excelProcessing.processGSRData()
+        timePoints, currentGSR = excelDataGSR.getData(gsrFile, testSheetNum = 0, method = "processed")
+        currentGSR = currentGSR*scaleFactor_GSR # Get Data into micro-Ampes
+        # Track raw feature
+        rawGSRData = [timePoints, currentGSR]
+    
+    return subjectGSRFeatures, rawGSRData
+
+def analyzeTemperatureRecording(temperatureFile, subjectFolder, featureLabel, settings):
+    # Unpack the Shared Settings
+    analyzedFeatureStore = settings["analyzedFeatureStore"]
+    excelProcessingTemperature = settings["excelProcessingTemperature"]
+    temperatureAnalysisProtocol = settings["temperatureAnalysisProtocol"]
+    temperatureFeatureNames = settings["temperatureFeatureNames"]
+    scaleFactor_Temperature = settings["scaleFactor_Temperature"]
+    subjectName = os.path.basename(subjectFolder[:-1])
+    
+    # Extract the Specific temperature Filename
+    temperatureFilename = os.path.basename(temperatureFile[:-1]).split(".")[0]
+    saveCompiledDataTemperature = subjectFolder + "temperature Analysis/Compiled Data in Excel/" + temperatureFilename + "/"
+    temperatureAnalysisParameters = {"scaleFactor": scaleFactor_Temperature, "stimulusTimes": settings["stimulusTimes"]}
+    # Load the Saved Features if This Recording was Already Analyzed
+    subjectTemperatureFeatures = None
+    temperatureFingerprint = analyzedFeatureStore.createFingerprint([temperatureFile], temperatureAnalysisProtocol, temperatureAnalysisParameters)
+    if not settings["reanalyzeData_Temperature"]:
+        subjectTemperatureFeatures = analyzedFeatureStore.loadFeatures(subjectName, settings["listOfStressors"][featureLabel], "temp", legacyExcelFile = saveCompiledDataTemperature + "Feature List.xlsx", fingerprint = temperatureFingerprint)
+
+    if subjectTemperatureFeatures is not None:
+        subjectTemperatureFeatures = subjectTemperatureFeatures[0]
+        # Quick Check that All Points Have the Correct Number of Features
+        assert len(subjectTemperatureFeatures) == len(temperatureFeatureNames)
+    else:
+        # Read in the temperature Data from Excel
+        excelDataTemperature = excelProcessing.processTemperatureData()
+        timePoints, temperatureData = excelDataTemperature.getData(temperatureFile, testSheetNum = 0)
+        temperatureData = temperatureData*scaleFactor_Temperature # Get Data into micro-Ampes
+
+        # Process the Data
+        subjectTemperatureFeatures = temperatureAnalysisProtocol.analyzeTemperature(timePoints, temperatureData)
+        
+        # Quick Check that All Points Have the Correct Number of Features
+        assert len(subjectTemperatureFeatures) == len(temperatureFeatureNames)
+        
+        # Save the Features and Filtered Data
+        excelProcessingTemperature.saveResults([subjectTemperatureFeatures], temperatureFeatureNames, saveCompiledDataTemperature, "Feature List.xlsx", sheetName = "Temperature Features")
+        analyzedFeatureStore.saveFeatures(subjectName, settings["listOfStressors"][featureLabel], "temp", [subjectTemperatureFeatures], temperatureFeatureNames, temperatureAnalysisParameters, temperatureFingerprint)
+    
+    rawTempData = None
+    if settings["trackRawData"]:
+        # Read in the temperature Data from Excel
+        excelDataTemperature = excelProcessing.processTemperatureData()
+        timePoints, temperatureData = excelDataTemperature.getData(temperatureFile, testSheetNum = 0)
+        temperatureData = temperatureData*scaleFactor_Temperature # Get Data into micro-Ampes
+        # Track raw feature
+        rawTempData = [timePoints, temperatureData]
+    
+    return subjectTemperatureFeatures, rawTempData
+
 # -------------------------------------------------------------------------- #
 # --------------------------- Program Starts Here -------------------------- #
 
@@ -101,6 +521,7 @@ if __name__ == "__main__":
     timePermits = False                      # Construct Plots that Take a Long TIme
     plotFeatures = False                     # Plot the Analyzed Features
     trackRawData = False
+    headlessAnalysis = False                 # Batch Runs: No Figures, PDFs, or Diagnostic Workbooks (Overrides the Plot Flags)
     stimulusTimes = [1000, 1000 + 60*3]      # The [Beginning, End] of the Stimulus in Seconds; Type List.
     stimulusTimes_Delayed = [1500, 1500 + 60*3]     # The [Beginning, End] of the Stimulus in Seconds; Type List.
     
@@ -109,11 +530,14 @@ if __name__ == "__main__":
     extractPulse = True
     extractChemical = True
     extractTemperature = True
-    # Reanalyze Peaks from Scratch (Don't Use Saved Features)
+    # Reanalyze Peaks from Scratch (Don't Use Saved Features). Otherwise, Only Recordings Whose
+    #   Files, Analysis Parameters, or Analysis Code Changed are Reanalyzed
     reanalyzeData_GSR = False
     reanalyzeData_Pulse = False
     reanalyzeData_Chemical = False    
     reanalyzeData_Temperature = False
+    # Number of Processes Analyzing the Recordings in Parallel (1: Analyze in the Main Process)
+    numProcessingWorkers = 1
 
     # Specify the Unit of Data for Each 
     unitOfData_GSR = "micro"                # Specify the Unit the Data is Represented as: ['', 'milli', 'micro', 'nano', 'pico', 'fempto']
@@ -124,6 +548,7 @@ if __name__ == "__main__":
 
     # Specify the Location of the Subject Files
     dataFolderWithSubjects = './Input Data/Current Analysis/'  # Path to ALL the Subject Data. The Path Must End with '/'
+    featureStoreFolder = dataFolderWithSubjects + "Feature Store/"  # Path to the Saved Features of Every Subject. The Path Must End with '/'
     compiledFeatureNamesFolder = "./Helper Files/Machine Learning/Compiled Feature Names/All Features/"
 
     # Specify the Stressors/Sensors Used in this Experiment
@@ -136,6 +561,11 @@ if __name__ == "__main__":
     # ---------------------------------------------------------------------- #
     # ------------------------- Preparation Steps -------------------------- #
     
+    # Headless Runs Skip Every Plot (The Worker Processes Inherit the Mode)
+    if headlessAnalysis:
+        headlessMode.setHeadless(True)
+        timePermits = False; plotFeatures = False
+    
     # Create Instance of Excel Processing Methods
     excelProcessingGSR = excelProcessing.processGSRData()
     excelProcessingPulse = excelProcessing.processPulseData()
@@ -144,9 +574,11 @@ if __name__ == "__main__":
 
     # Create Instances of all Analysis Protocols
     gsrAnalysisProtocol = gsrAnalysis.signalProcessing(stimulusTimes)
-    pulseAnalysisProtocol = pulseAnalysis.signalProcessing()
-    chemicalAnalysisProtocol = chemicalAnalysis.signalProcessing(plotData = True)
+    pulseAnalysisProtocol = pulseAnalysis.signalProcessing(batchFilterPulses = True)
+    chemicalAnalysisProtocol = chemicalAnalysis.signalProcessing(plotData = not headlessAnalysis)
     temperatureAnalysisProtocol = temperatureAnalysis.signalProcessing(stimulusTimes)
+    # Create the Store of the Analyzed Features
+    analyzedFeatureStore = featureStore.featureStore(featureStoreFolder)
 
     subjectFolderPaths = []
     # Extract the Files for from Each Subject
@@ -171,6 +603,17 @@ if __name__ == "__main__":
     scaleFactor_Chemical_ISE = 1 #scaleFactorMap[unitOfData_Chemical_ISE]
     scaleFactor_Chemical_Enzym = 1 #scaleFactorMap[unitOfData_Chemical_Enzym]
     
+    # Settings Every Analysis Task Needs (Copied into Each Worker Process)
+    sharedAnalysisSettings = {
+        "timePermits": timePermits, "trackRawData": trackRawData, "listOfStressors": listOfStressors,
+        "stimulusTimes": stimulusTimes, "stimulusTimes_Delayed": stimulusTimes_Delayed,
+        "reanalyzeData_GSR": reanalyzeData_GSR, "reanalyzeData_Pulse": reanalyzeData_Pulse,
+        "reanalyzeData_Chemical": reanalyzeData_Chemical, "reanalyzeData_Temperature": reanalyzeData_Temperature,
+        "analyzedFeatureStore": analyzedFeatureStore,
+    }
+    # Where Each Sensor's Results Go: [Features, Labels, Raw Data, Feature Names]
+    sensorResults = {}
+    
     # ---------------------------------------------------------------------- #
     # ------------------------ Specify the Features ------------------------ #
         
@@ -196,6 +639,12 @@ if __name__ == "__main__":
         pulseFeatureLabels = []  
         # Track one pulse feature
         rawPulseFeatureData = []
+        sensorResults["pulse"] = [pulseFeatures, pulseFeatureLabels, rawPulseFeatureData, pulseFeatureNames]
+        sharedAnalysisSettings.update({
+            "excelProcessingPulse": excelProcessingPulse, "pulseAnalysisProtocol": pulseAnalysisProtocol, "scaleFactor_Pulse": scaleFactor_Pulse,
+            "pulseFeatureNames": pulseFeatureNames, "pulseFeatureNamesFull": pulseFeatureNamesFull,
+            "pulseFeatureNames_StressLevel": pulseFeatureNames_StressLevel, "pulseFeatureNames_SignalIncrease": pulseFeatureNames_SignalIncrease,
+        })
     
     if extractChemical:
         # Specify the Paths to the Chemical Feature Names
@@ -236,6 +685,17 @@ if __name__ == "__main__":
         # Track raw data
         rawISEData = []
         
+        sensorResults["enzym"] = [chemicalFeatures_Enzym, chemicalFeatureLabels_Enzym, rawEnzymData, chemicalFeatureNames_Enzym]
+        sensorResults["ise"] = [chemicalFeatures_ISE, chemicalFeatureLabels_ISE, rawISEData, chemicalFeatureNames_ISE]
+        sharedAnalysisSettings.update({
+            "excelProcessingChemical": excelProcessingChemical, "chemicalAnalysisProtocol": chemicalAnalysisProtocol,
+            "scaleFactor_Chemical_Enzym": scaleFactor_Chemical_Enzym, "scaleFactor_Chemical_ISE": scaleFactor_Chemical_ISE,
+            "chemicalFeatureNames_Enzym": chemicalFeatureNames_Enzym, "glucoseFeatureNames": glucoseFeatureNames,
+            "lactateFeatureNames": lactateFeatureNames, "uricAcidFeatureNames": uricAcidFeatureNames,
+            "chemicalFeatureNames_ISE": chemicalFeatureNames_ISE, "sodiumFeatureNames": sodiumFeatureNames,
+            "potassiumFeatureNames": potassiumFeatureNames, "ammoniumFeatureNames": ammoniumFeatureNames,
+        })
+        
     if extractGSR:
         # Specify the Paths to the GSR Feature Names
         gsrFeaturesFile = compiledFeatureNamesFolder + "gsrFeatureNames.txt"
@@ -246,6 +706,11 @@ if __name__ == "__main__":
         gsrFeatureLabels = []
         # Track raw data
         rawGSRData = []
+        sensorResults["gsr"] = [gsrFeatures, gsrFeatureLabels, rawGSRData, gsrFeatureNames]
+        sharedAnalysisSettings.update({
+            "excelProcessingGSR": excelProcessingGSR, "gsrAnalysisProtocol": gsrAnalysisProtocol,
+            "scaleFactor_GSR": scaleFactor_GSR, "gsrFeatureNames": gsrFeatureNames,
+        })
         
     if extractTemperature:
         # Specify the Paths to the Temperature Feature Names
@@ -257,13 +722,19 @@ if __name__ == "__main__":
         temperatureFeatureLabels = []
         # Track raw data
         rawTempData = []
+        sensorResults["temp"] = [temperatureFeatures, temperatureFeatureLabels, rawTempData, temperatureFeatureNames]
+        sharedAnalysisSettings.update({
+            "excelProcessingTemperature": excelProcessingTemperature, "temperatureAnalysisProtocol": temperatureAnalysisProtocol,
+            "scaleFactor_Temperature": scaleFactor_Temperature, "temperatureFeatureNames": temperatureFeatureNames,
+        })
         
     # ---------------------------------------------------------------------- #
     # -------------------- Data Collection and Analysis -------------------- #
     
+    # The Recordings to Analyze: (Sensor, File, Subject Folder, Stressor Label)
+    analysisTasks = []
     # Loop Through Each Subject
     for subjectFolder in subjectFolderPaths:
-        
         # CPT Score
         cptScore = subjectFolder.split("CPT")
         if len(cptScore) == 1:
@@ -332,381 +803,43 @@ if __name__ == "__main__":
             if None in stressorFiles:
                 print("\n\nNot all files found here:\n", stressorFiles, "\n\n")
                 
-        # ------------------------- Pulse Analysis ------------------------- #
+        # ------------ Queue the Analysis of Each Sensor's Files ----------- #
         
-        if extractPulse:
-            # Extract the Pulse Folder Paths in the Map
-            pulseFolders = fileMap[:, listOfSensors.index("pulse")]
-            
-            # Loop Through the Pulse Data for Each Stressor
-            for featureLabel, pulseFolder in enumerate(pulseFolders):
-                if pulseFolder == None:
-                    # Compile the Featues into One Array
-                    pulseFeatureLabels.append(None)
-                    pulseFeatures.append([None]*len(pulseFeatureNames))
-                    continue
-                
-                savePulseDataFolder = pulseFolder + "Pulse Analysis/"    # Data Folder to Save the Data; MUST END IN '/'
-                if not reanalyzeData_Pulse and os.path.isfile(pulseFolder + "/Pulse Analysis/Compiled Data in Excel/Feature List.xlsx"):
-                    pulseFeatureList_Full = excelProcessingPulse.getSavedFeatures(pulseFolder + "/Pulse Analysis/Compiled Data in Excel/Feature List.xlsx")
-                    featureTimes = pulseFeatureList_Full[:,0]
-                    pulseFeatureListExact = pulseFeatureList_Full[:,1:]
-                    
-                    numSecondsAverage = 30; pulseFeatureList = []
-                    # Calculate the Running Average
-                    for timePointInd in range(len(featureTimes)):
-                        currentTimePoint = featureTimes[timePointInd]
-                        
-                        # Get the Interval of Feature and Take the Average
-                        featureInterval = pulseFeatureListExact[0:timePointInd+1][featureTimes[0:timePointInd+1] > currentTimePoint - numSecondsAverage]
-                        pulseFeatureList.append(stats.trim_mean(featureInterval, 0.3))
-                    pulseFeatureList = np.array(pulseFeatureList)
-
-                else:
-                    pulseExcelFiles = []
-                    # Collect all the Pulse Files for the Stressor
-                    for file in os.listdir(pulseFolder):
-                        file = file.decode("utf-8") if type(file) == type(b'') else file
-                        if file.endswith(("xlsx", "xls")) and not file.startswith(("$", '~')):
-                            pulseExcelFiles.append(pulseFolder + file)
-                    pulseExcelFiles = natsorted(pulseExcelFiles)
-                
-                    # Loop Through Each Pulse File
-                    pulseAnalysisProtocol.resetGlobalVariables()
-                    for pulseExcelFile in pulseExcelFiles:
-                        
-                        # Read Data from Excel
-                        time, signalData = excelProcessingPulse.getData(pulseExcelFile, testSheetNum = 0)
-                        signalData = signalData*scaleFactor_Pulse
-                                        
-                        # Calibrate Systolic and Diastolic Pressure
-                        fileBasename = os.path.basename(pulseExcelFile)
-                        pressureInfo = fileBasename.split("SYS")
-                        if len(pressureInfo) > 1 and pulseAnalysisProtocol.systolicPressure0 == None:
-                            pressureInfo = pressureInfo[-1].split(".")[0]
-                            systolicPressure0, diastolicPressure0 = pressureInfo.split("_DIA")
-                            pulseAnalysisProtocol.setPressureCalibration(float(systolicPressure0), float(diastolicPressure0))
-                        
-                        # Check Whether the StartTime is Specified in the File
-                        if fileBasename.lower() in ["cpt", "exer", "vr", "start"] and not stimulusTimes[0]:
-                            stimulusTimes[0] = pulseAnalysisProtocol.timeOffset
-                                                    
-                        # Seperate Pulses, Perform Indivisual Analysis, and Extract Features
-                        pulseAnalysisProtocol.analyzePulse(time, signalData, minBPM = 30, maxBPM = 180)
-                    
-                    # Remove Previous Analysis if Present
-                    if os.path.isdir(savePulseDataFolder):
-                        shutil.rmtree(savePulseDataFolder)
-                    pulseAnalysisProtocol.featureListExact = np.array(pulseAnalysisProtocol.featureListExact)
-                    # Save the Features and Filtered Data
-                    saveCompiledDataPulse = savePulseDataFolder + "Compiled Data in Excel/"
-                    excelProcessingPulse.saveResults(pulseAnalysisProtocol.featureListExact, pulseFeatureNamesFull, saveCompiledDataPulse, "Feature List.xlsx", sheetName = "Pulse Features")
-                    excelProcessingPulse.saveFilteredData(pulseAnalysisProtocol.time, pulseAnalysisProtocol.signalData, pulseAnalysisProtocol.filteredData, saveCompiledDataPulse, "Filtered Data.xlsx", "Filtered Data")
-                    
-                    # Compile the Features from the Data
-                    featureTimes = pulseAnalysisProtocol.featureListExact[:,0]
-                    pulseFeatureList = np.array(pulseAnalysisProtocol.featureListAverage)
-                    pulseFeatureListExact = pulseAnalysisProtocol.featureListExact[:,1:]
-                    # Assert That There are Equal Features and Feature Times
-                    assert len(featureTimes) == len(pulseFeatureList)
-    
-                # Quick Check that All Points Have the Correct Number of Features
-                for feature in pulseFeatureList:
-                    assert len(feature) == len(pulseFeatureNames)
-                
-                # Plot the Features in Time
-                if timePermits:
-                    plotPulseFeatures = featureAnalysis.featureAnalysis(featureTimes, pulseFeatureListExact, pulseFeatureNamesFull[1:], stimulusTimes, savePulseDataFolder)
-                    plotPulseFeatures.singleFeatureAnalysis()   
-                    
-                # Downsize the Features into One Data Point
-                # ********************************
-                # FInd the Indices of the Stimuli
-                startStimulusInd = np.argmin(abs(featureTimes - stimulusTimes[0]))
-                endStimulusInd = np.argmin(abs(featureTimes - stimulusTimes[1]))
-                
-                # Caluclate the Baseline/Stress Levels
-                restValues = stats.trim_mean(pulseFeatureList[ int(startStimulusInd/6):int(2*startStimulusInd/4),:], 0.4)
-                stressValues = stats.trim_mean(pulseFeatureList[ int((endStimulusInd+startStimulusInd)/2) :endStimulusInd,: ], 0.4)
-                stressElevation = stressValues - restValues
-                # Calculate the Stress Rise/Fall
-                stressSlopes = np.polyfit(featureTimes[startStimulusInd:endStimulusInd], pulseFeatureList[ startStimulusInd:endStimulusInd,: ], 1)[0]
-    
-                # Organize the Signals
-                pulseFeatures_StressLevel = stressValues[0:len(pulseFeatureNames_StressLevel)]
-                pulseFeatures_SignalIncrease = stressElevation[len(pulseFeatureNames_StressLevel):]
-                # Compile the Signals
-                subjectPulseFeatures = []
-                subjectPulseFeatures.extend(pulseFeatures_StressLevel)
-                subjectPulseFeatures.extend(pulseFeatures_SignalIncrease)
-                # Assert the Number of Signals are Correct
-                assert len(subjectPulseFeatures) == len(pulseFeatureNames)
-                assert len(pulseFeatures_StressLevel) == len(pulseFeatureNames_StressLevel)
-                assert len(pulseFeatures_SignalIncrease) == len(pulseFeatureNames_SignalIncrease)
-                # ********************************
-                
-                # Compile the Featues into One Array
-                pulseFeatureLabels.append(featureLabel)
-                pulseFeatures.append(subjectPulseFeatures)
-                
-                if trackRawData:
-                    # Track raw feature
-                    rawPulseFeatureData.append([
-                            featureTimes, 
-                            # pulseFeatureList[:, pulseFeatureNames.index("centralAugmentationIndex_EST_SignalIncrease")]
-                            # pulseFeatureList[:, pulseFeatureNames.index("reflectionIndex_SignalIncrease")]
-                            # pulseFeatureList[:, pulseFeatureNames.index("systolicDicroticNotchAmpRatio_SignalIncrease")]
-                            # pulseFeatureList[:, pulseFeatureNames.index("dicroticRiseVelMaxTime_StressLevel")]
-                            pulseFeatureList[:, pulseFeatureNames.index("dicroticNotchDicroticAccelRatio_SignalIncrease")]
-                            
-                        ])
+        # Each Subject/Sensor/Stressor Recording is Analyzed Independently
+        for sensor in sensorResults:
+            for featureLabel, dataFile in enumerate(fileMap[:, listOfSensors.index(sensor)]):
+                analysisTasks.append((sensor, dataFile, subjectFolder, featureLabel))
     
-        # ------------------------ Chemical Analysis ----------------------- #
-        
-        if extractChemical:
-            # Extract the Chemical Folder Paths in the Map
-            chemicalFiles_ISE = fileMap[:, listOfSensors.index("ise")]
-            chemicalFiles_Enzym = fileMap[:, listOfSensors.index("enzym")]
-            
-            # --------------- Enzym
-            # Loop Through the Pulse Data for Each Stressor
-            for featureLabel, chemicalFile in enumerate(chemicalFiles_Enzym):
-                if chemicalFile == None:
-                    chemicalFeatureLabels_Enzym.append(None)
-                    chemicalFeatures_Enzym.append([None]*len(chemicalFeatureNames_Enzym))
-                    continue
-                # Extract the Specific Chemical Filename
-                chemicalFilename = os.path.basename(chemicalFile[:-1]).split(".")[0]
-                saveCompiledDataChemical = subjectFolder + "Chemical Analysis/Compiled Data in Excel/" + chemicalFilename + "/"
-    
-                if not reanalyzeData_Chemical and os.path.isfile(saveCompiledDataChemical + "Feature List.xlsx"):
-                    subjectChemicalFeatures = excelProcessingChemical.getSavedFeatures(saveCompiledDataChemical + "Feature List.xlsx")[0]
-                    
-                    # Organize the Features of Enzymatic
-                    glucoseFeatures = subjectChemicalFeatures[0:len(glucoseFeatureNames)]
-                    lactateFeatures = subjectChemicalFeatures[len(glucoseFeatureNames):len(glucoseFeatureNames) + len(lactateFeatureNames)]
-                    uricAcidFeatures = subjectChemicalFeatures[len(lactateFeatureNames) + len(glucoseFeatureNames):]
-                    
-                    # Quick Check that All Points Have the Correct Number of Features
-                    assert len(subjectChemicalFeatures) == len(chemicalFeatureNames_Enzym)
-                    assert len(glucoseFeatures) == len(glucoseFeatureNames)
-                    assert len(lactateFeatures) == len(lactateFeatureNames)
-                    assert len(uricAcidFeatures) == len(uricAcidFeatureNames)
-                else:
-                    # Read in the Chemical Data from Excel
-                    timePoints, chemicalData = excelProcessingChemical.getData(chemicalFile, testSheetNum = 0)
-                    glucose, lactate, uricAcid = chemicalData*scaleFactor_Chemical_Enzym # Extract the Specific Chemicals
-                    lactate = lactate*1000 # Correction on Lactate Data
-                    
-                    # Cull Subjects with Missing Data
-                    if len(glucose) == 0 or len(lactate) == 0 or len(uricAcid) == 0:
-                        print("Missing Chemical Data in Folder:", subjectFolder)
-                        sys.exit()
-            
-                    # Compile the Features from the Data
-                    chemicalAnalysisProtocol.resetGlobalVariables(stimulusTimes_Delayed, saveCompiledDataChemical)
-                    chemicalAnalysisProtocol.analyzeChemicals(timePoints, [glucose, lactate, uricAcid], ['glucose', 'lactate', 'uricAcid'], featureLabel)
-                    # Get the ChemicalFeatures
-                    glucoseFeatures = chemicalAnalysisProtocol.chemicalFeatures['glucoseFeatures'][0][0]
-                    lactateFeatures = chemicalAnalysisProtocol.chemicalFeatures['lactateFeatures'][0][0]
-                    uricAcidFeatures = chemicalAnalysisProtocol.chemicalFeatures['uricAcidFeatures'][0][0]
-                    chemicalAnalysisProtocol.resetGlobalVariables(stimulusTimes_Delayed)
-                    # Verify that Features were Found in for All Chemicals
-                    if len(glucoseFeatures) == 0 or len(lactateFeatures) == 0 or len(uricAcidFeatures) == 0:
-                        print("No Features Found in Some Chemical Data in Folder:", subjectFolder)
-                        sys.exit()   
-                        
-                    # Quick Check that All Points Have the Correct Number of Features
-                    assert len(glucoseFeatures) == len(glucoseFeatureNames)
-                    assert len(lactateFeatures) == len(lactateFeatureNames)
-                    assert len(uricAcidFeatures) == len(uricAcidFeatureNames)
-                    
-                    # Organize the Chemical Features
-                    subjectChemicalFeatures = []
-                    subjectChemicalFeatures.extend(glucoseFeatures)
-                    subjectChemicalFeatures.extend(lactateFeatures)
-                    subjectChemicalFeatures.extend(uricAcidFeatures)
-                    
-                    # Save the Features and Filtered Data
-                    excelProcessingChemical.saveResults([subjectChemicalFeatures], chemicalFeatureNames_Enzym, saveCompiledDataChemical, "Feature List.xlsx", sheetName = "Chemical Features")
-                
-                # Compile the Featues into One Array
-                chemicalFeatureLabels_Enzym.append(featureLabel)
-                chemicalFeatures_Enzym.append(subjectChemicalFeatures)
-                
-                if trackRawData:
-                    # Read in the Chemical Data from Excel
-                    timePoints, chemicalData = excelProcessingChemical.getData(chemicalFile, testSheetNum = 0)
-                    glucose, lactate, uricAcid = chemicalData*scaleFactor_Chemical_Enzym # Extract the Specific Chemicals
-                    lactate = lactate*1000 # Correction on Lactate Data
-                    # Track raw feature
-                    rawEnzymData.append([timePoints, glucose, lactate, uricAcid])
-            
-            # --------------- ISE
-            # Loop Through the Pulse Data for Each Stressor
-            for featureLabel, chemicalFile in enumerate(chemicalFiles_ISE):
-                if chemicalFile == None:
-                    chemicalFeatureLabels_ISE.append(None)
-                    chemicalFeatures_ISE.append([None]*len(chemicalFeatureNames_ISE))
-                    continue
-                # Extract the Specific Chemical Filename
-                chemicalFilename = os.path.basename(chemicalFile[:-1]).split(".")[0]
-                saveCompiledDataChemical = subjectFolder + "Chemical Analysis/Compiled Data in Excel/" + chemicalFilename + "/"
-    
-                if not reanalyzeData_Chemical and os.path.isfile(saveCompiledDataChemical + "Feature List.xlsx"):
-                    subjectChemicalFeatures = excelProcessingChemical.getSavedFeatures(saveCompiledDataChemical + "Feature List.xlsx")[0]
-                    
-                    # Organize the Features of ISE
-                    sodiumFeatures = subjectChemicalFeatures[0:len(sodiumFeatureNames)]
-                    potassiumFeatures = subjectChemicalFeatures[len(sodiumFeatureNames):len(sodiumFeatureNames) + len(potassiumFeatureNames)]
-                    ammoniumFeatures = subjectChemicalFeatures[len(sodiumFeatureNames) + len(potassiumFeatureNames):]
-                    
-                    # Quick Check that All Points Have the Correct Number of Features
-                    assert len(subjectChemicalFeatures) == len(chemicalFeatureNames_ISE)
-                    assert len(sodiumFeatures) == len(sodiumFeatureNames)
-                    assert len(potassiumFeatures) == len(potassiumFeatureNames)
-                    assert len(ammoniumFeatures) == len(ammoniumFeatureNames)
-                else:
-                    # Read in the Chemical Data from Excel
-                    timePoints, chemicalData = excelProcessingChemical.getData(chemicalFile, testSheetNum = 0)
-                    sodium, potassium, ammonium = chemicalData*scaleFactor_Chemical_ISE # Extract the Specific Chemicals
-                                        
-                    # Cull Subjects with Missing Data
-                    if len(sodium) == 0 or len(potassium) == 0 or len(ammonium) == 0:
-                        print("Missing Chemical Data in Folder:", subjectFolder)
-                        sys.exit()
-            
-                    # Compile the Features from the Data
-                    chemicalAnalysisProtocol.resetGlobalVariables(stimulusTimes_Delayed, saveCompiledDataChemical)
-                    chemicalAnalysisProtocol.analyzeChemicals(timePoints, [sodium, potassium, ammonium], ['sodium', 'potassium', 'ammonium'], featureLabel, iseData = True)
-                    # Get the ChemicalFeatures
-                    sodiumFeatures = chemicalAnalysisProtocol.chemicalFeatures['sodiumFeatures'][0]
-                    potassiumFeatures = chemicalAnalysisProtocol.chemicalFeatures['potassiumFeatures'][0]
-                    ammoniumFeatures = chemicalAnalysisProtocol.chemicalFeatures['ammoniumFeatures'][0]
-                    # Verify that Features were Found in for All Chemicals
-                    if len(sodiumFeatures) == 0 or len(potassiumFeatures) == 0 or len(ammoniumFeatures) == 0:
-                        print("No Features Found in Some Chemical Data in Folder:", subjectFolder)
-                        sys.exit()   
-                    chemicalAnalysisProtocol.resetGlobalVariables(stimulusTimes_Delayed)
-                        
-                    # Quick Check that All Points Have the Correct Number of Features
-                    assert len(sodiumFeatures) == len(sodiumFeatureNames)
-                    assert len(potassiumFeatures) == len(potassiumFeatureNames)
-                    assert len(ammoniumFeatures) == len(ammoniumFeatureNames)
-                    
-                    # Organize the Chemical Features
-                    subjectChemicalFeatures = []
-                    subjectChemicalFeatures.extend(sodiumFeatures)
-                    subjectChemicalFeatures.extend(potassiumFeatures)
-                    subjectChemicalFeatures.extend(ammoniumFeatures)
-                    
-                    # Save the Features and Filtered Data
-                    excelProcessingChemical.saveResults([subjectChemicalFeatures], chemicalFeatureNames_ISE, saveCompiledDataChemical, "Feature List.xlsx", sheetName = "Chemical Features")
-                
-                # Compile the Featues into One Array
-                chemicalFeatureLabels_ISE.append(featureLabel)
-                chemicalFeatures_ISE.append(subjectChemicalFeatures)
-                
-                if trackRawData:
-                    # Read in the Chemical Data from Excel
-                    timePoints, chemicalData = excelProcessingChemical.getData(chemicalFile, testSheetNum = 0)
-                    sodium, potassium, ammonium = chemicalData*scaleFactor_Chemical_ISE # Extract the Specific Chemicals
-                    # Track raw feature
-                    rawISEData.append([timePoints, sodium, potassium, ammonium])
-                        
-        # -------------------------- GSR Analysis -------------------------- #
-        
-        if extractGSR:
-            colorList = ['k', 'tab:blue', 'tab:red']
-            # Extract the Pulse Folder Paths in the Map
-            gsrFiles = fileMap[:, listOfSensors.index("gsr")]
-            # Loop Through the Pulse Data for Each Stressor
-            for featureLabel, gsrFile in enumerate(gsrFiles):
-                if gsrFile == None:
-                    gsrFeatureLabels.append(None)
-                    gsrFeatures.append([None]*len(gsrFeatureNames))
-                    continue
-                # Extract the Specific GSR Filename
-                gsrFilename = os.path.basename(gsrFile[:-1]).split(".")[0]
-                saveCompiledDataGSR = subjectFolder + "GSR Analysis/Compiled Data in Excel/" + gsrFilename + "/"
-    
-                if not reanalyzeData_GSR and os.path.isfile(saveCompiledDataGSR + "Feature List.xlsx"):
-                    subjectGSRFeatures = excelProcessingChemical.getSavedFeatures(saveCompiledDataGSR + "Feature List.xlsx")[0]
-                    # Quick Check that All Points Have the Correct Number of Features
-                    assert len(subjectGSRFeatures) == len(gsrFeatureNames)
-                else:
-                    # Read in the GSR Data from Excel
-                    excelDataGSR = excelProcessing.processGSRData()
-                    timePoints, currentGSR = excelDataGSR.getData(gsrFile, testSheetNum = 0, method = "processed")
-                    currentGSR = currentGSR*scaleFactor_GSR # Get Data into micro-Ampes
-
-                    # Process the Data
-                    subjectGSRFeatures = gsrAnalysisProtocol.analyzeGSR(timePoints, currentGSR)
-                    
-                    # Quick Check that All Points Have the Correct Number of Features
-                    assert len(subjectGSRFeatures) == len(gsrFeatureNames)
-                    
-                    # Save the Features and Filtered Data
-                    excelProcessingGSR.saveResults([subjectGSRFeatures], gsrFeatureNames, saveCompiledDataGSR, "Feature List.xlsx", sheetName = "GSR Features")
-
-                # Compile the Featues into One Array
-                gsrFeatureLabels.append(featureLabel)
-                gsrFeatures.append(subjectGSRFeatures)
-                
-                if trackRawData:
-                    # Read in the GSR Data from Excel
-                    excelDataGSR = excelProcessing.processGSRData()
-                    timePoints, currentGSR = excelDataGSR.getData(gsrFile, testSheetNum = 0, method = "processed")
-                    currentGSR = currentGSR*scaleFactor_GSR # Get Data into micro-Ampes
-                    # Track raw feature
-                    rawGSRData.append([timePoints, currentGSR])  
-                    
-        # ---------------------- Temperature Analysis ---------------------- #
+    # ---------------------------------------------------------------------- #
+    # ------------------------ Analyze the Recordings ---------------------- #
+    
+    # Only Analyze the Recordings That Exist
+    recordingTasks = [analysisTask for analysisTask in analysisTasks if analysisTask[1] is not None]
+    if numProcessingWorkers <= 1:
+        setAnalysisSettings(sharedAnalysisSettings)
+        analysisResults = [analyzeRecording(recordingTask) for recordingTask in recordingTasks]
+    else:
+        # Each Worker Receives its Own Copy of the Settings (Protocols, Stores, and Feature Names)
+        with ProcessPoolExecutor(max_workers = numProcessingWorkers, initializer = setAnalysisSettings, initargs = (sharedAnalysisSettings,)) as analysisPool:
+            # The Results Come Back in the Order the Tasks were Queued
+            analysisResults = list(analysisPool.map(analyzeRecording, recordingTasks))
+    analysisResults = iter(analysisResults)
+    
+    # Merge the Results in the Order of the Subjects, Then Stressors
+    for sensor, dataFile, subjectFolder, featureLabel in analysisTasks:
+        sensorFeatures, sensorFeatureLabels, rawSensorData, sensorFeatureNames = sensorResults[sensor]
+        if dataFile == None:
+            # Compile the Featues into One Array
+            sensorFeatureLabels.append(None)
+            sensorFeatures.append([None]*len(sensorFeatureNames))
+            continue
+        subjectFeatures, rawData = next(analysisResults)
         
-        if extractTemperature:
-            # Extract the Pulse Folder Paths in the Map
-            temperatureFiles = fileMap[:, listOfSensors.index("temp")]
-            # Loop Through the Pulse Data for Each Stressor
-            for featureLabel, temperatureFile in enumerate(temperatureFiles):
-                if temperatureFile == None:
-                    temperatureFeatureLabels.append(None)
-                    temperatureFeatures.append([None]*len(temperatureFeatureNames))
-                    continue
-                # Extract the Specific temperature Filename
-                temperatureFilename = os.path.basename(temperatureFile[:-1]).split(".")[0]
-                saveCompiledDataTemperature = subjectFolder + "temperature Analysis/Compiled Data in Excel/" + temperatureFilename + "/"
-    
-                if not reanalyzeData_Temperature and os.path.isfile(saveCompiledDataTemperature + "Feature List.xlsx"):
-                    subjectTemperatureFeatures = excelProcessingChemical.getSavedFeatures(saveCompiledDataTemperature + "Feature List.xlsx")[0]
-                    # Quick Check that All Points Have the Correct Number of Features
-                    assert len(subjectTemperatureFeatures) == len(temperatureFeatureNames)
-                else:
-                    # Read in the temperature Data from Excel
-                    excelDataTemperature = excelProcessing.processTemperatureData()
-                    timePoints, temperatureData = excelDataTemperature.getData(temperatureFile, testSheetNum = 0)
-                    temperatureData = temperatureData*scaleFactor_Temperature # Get Data into micro-Ampes
-
-                    # Process the Data
-                    subjectTemperatureFeatures = temperatureAnalysisProtocol.analyzeTemperature(timePoints, temperatureData)
-                    
-                    # Quick Check that All Points Have the Correct Number of Features
-                    assert len(subjectTemperatureFeatures) == len(temperatureFeatureNames)
-                    
-                    # Save the Features and Filtered Data
-                    excelProcessingTemperature.saveResults([subjectTemperatureFeatures], temperatureFeatureNames, saveCompiledDataTemperature, "Feature List.xlsx", sheetName = "Temperature Features")
-
-                # Compile the Featues into One Array
-                temperatureFeatureLabels.append(featureLabel)
-                temperatureFeatures.append(subjectTemperatureFeatures)
-                
-                if trackRawData:
-                    # Read in the temperature Data from Excel
-                    excelDataTemperature = excelProcessing.processTemperatureData()
-                    timePoints, temperatureData = excelDataTemperature.getData(temperatureFile, testSheetNum = 0)
-                    temperatureData = temperatureData*scaleFactor_Temperature # Get Data into micro-Ampes
-                    # Track raw feature
-                    rawTempData.append([timePoints, temperatureData])  
-
+        # Compile the Featues into One Array
+        sensorFeatureLabels.append(featureLabel)
+        sensorFeatures.append(subjectFeatures)
+        if trackRawData:
+            rawSensorData.append(rawData)
     # ---------------------- Compile Features Together --------------------- #
     # Compile Labels
     allLabels = []
@@ -765,6 +898,7 @@ if __name__ == "__main__":
     print("\nPlotting Feature Comparison")
     
     if plotFeatures:
+        import featureAnalysis       # Functions for Feature Analysis
         if extractChemical:
             chemicalFeatures_ISE = np.array(chemicalFeatures_ISE); chemicalFeatureLabels_ISE = np.array(chemicalFeatureLabels_ISE)
             chemicalFeatures_Enzym = np.array(chemicalFeatures_Enzym); chemicalFeatureLabels_Enzym = np.array(chemicalFeatureLabels_Enzym)
@@ -847,8 +981,11 @@ if __name__ == "__main__":
     # ---------------------------------------------------------------------- #
     # ---------------------- Machine Learning Analysis --------------------- #
     print("\nBeginning Machine Learning Section")
+    import machineLearningMain   # Class Header for All Machine Learning
     
     testStressScores = True
+    numSearchWorkers = 1  # Processes Scoring the Feature Combinations (1: Score Them One by One)
+    subsetScoreFile = dataFolderWithSubjects + "Machine Learning/Subset Scores.sqlite"  # Scores Kept Between Searches and Runs (None: Refit Every Subset)
     if testStressScores:
         signalLabels = scoreLabels
         # Machine Learning File/Model Paths + Titles
@@ -900,7 +1037,10 @@ if __name__ == "__main__":
         for numFeaturesCombine in numFeaturesCombineList:
             print(saveExcelName, numFeaturesCombine)
             performMachineLearning = machineLearningMain.predictionModelHead(modelType, modelPath, numFeatures = len(currentFeatureNames), machineLearningClasses = listOfStressors, saveDataFolder = saveFolder, supportVectorKernel = supportVectorKernel)
-            modelScores, modelSTDs, featureNames_Combinations = performMachineLearning.analyzeFeatureCombinations(signalData_Good, signalLabels, currentFeatureNames, numFeaturesCombine, saveData = True, saveExcelName = saveExcelName, printUpdateAfterTrial = 3000000, scaleY = testStressScores)
+            if subsetScoreFile: performMachineLearning.openScoreStore(subsetScoreFile)
+            modelScores, modelSTDs, featureNames_Combinations = performMachineLearning.analyzeFeatureCombinations(signalData_Good, signalLabels, currentFeatureNames, numFeaturesCombine, saveData = True, saveExcelName = saveExcelName, printUpdateAfterTrial = 3000000, scaleY = testStressScores, numWorkers = numSearchWorkers)
+            # Or Search Without Scoring Every Combination ("forward", "backward", "beam", or "branchAndBound")
+            # modelScores, modelSTDs, featureNames_Combinations = performMachineLearning.searchFeatureSubsets(signalData_Good, signalLabels, currentFeatureNames, numFeaturesCombine, searchMethod = "beam", beamWidth = 20, saveData = True, saveExcelName = saveExcelName, scaleY = testStressScores)
        
                 
     # numFeaturesCombine = 1
@@ -0,0 +1,106 @@
+"""
+Checks chemicalAnalysis.signalProcessing.findLinearBaseline (Lower Convex Hull and Chord
+Counting) Against the Original Brute Force Search Over Every Chord, on Stored Enzymatic Traces.
+
+The Traces (data/enzymaticBaselineTraces.npz) are What findLinearBaseline Receives: The Time
+Points, the Low Pass Filtered Signal (The Protocol's Own Filter), and the Peak From findPeak.
+They Were Made from Simulated Glucose/Lactate/Uric Acid Recordings (Stimulus at 1000-1240 s,
+Sampled at 1-2 Hz, Stored at 1E-4 Resolution), as No Measured Recordings are in the Repository.
+They Include:
+    Long Traces (Up to 3000 Points)
+    Traces Rounded After Filtering (Many Tied Samples)
+    Traces Whose Baseline Comes from the Tangent Chords, and Some Where Every Chord has Points
+    Below it (So the Points Below Each Chord are Counted Instead)
+
+Run with pytest, or Directly: python tests/test_baselineSearch.py
+"""
+
+# Basic Modules
+import os
+import sys
+import numpy as np
+import pytest
+
+# Import Analysis Files (And Their Locations)
+repositoryFolder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(repositoryFolder + '/Helper Files/Data Aquisition and Analysis/_Analysis Protocols')  # Folder with the Analysis Protocols
+sys.path.append(repositoryFolder + '/Helper Files/Data Aquisition and Analysis/')                     # Folder with All the Helper Files
+import chemicalAnalysis
+
+# -------------------------------------------------------------------------- #
+# ---------------------------- Stored Traces ------------------------------- #
+
+baselineTracesFile = os.path.dirname(os.path.abspath(__file__)) + "/data/enzymaticBaselineTraces.npz"
+
+def loadBaselineTraces():
+    """ The Stored Traces: [(traceName, xData, yData, peakInd), ...] """
+    with np.load(baselineTracesFile) as storedTraces:
+        return [(str(traceName), storedTraces["xData_" + str(traceInd)], storedTraces["yData_" + str(traceInd)], int(storedTraces["peakInd_" + str(traceInd)]))
+                for traceInd, traceName in enumerate(storedTraces["traceNames"])]
+
+baselineTraces = loadBaselineTraces()
+chemicalProtocol = chemicalAnalysis.signalProcessing()
+
+# -------------------------------------------------------------------------- #
+# ------------------------- Brute Force Reference -------------------------- #
+
+def findLinearBaseline_BruteForce(xData, yData, peakInd, minLeftBoundaryInd, minPeakDuration):
+    """ The Original Search Over Every Chord (O(N^3)): The Reference for findLinearBaseline """
+    # Define a threshold for distinguishing good/bad lines
+    maxBadPointsTotal = int(len(xData)/10)
+    # Store Possibly Good Tangent Indexes
+    goodTangentInd = [[] for _ in range(maxBadPointsTotal)]
+
+    # For Each Index Pair on the Left and Right of the Peak
+    for rightInd in range(peakInd+2, len(yData), 1):
+        for leftInd in range(peakInd-2, minLeftBoundaryInd, -1):
+
+            # Initialize range of data to check
+            xDataCut = xData[leftInd:rightInd]
+            yDataCut = yData[leftInd:rightInd]
+
+            # Draw a Linear Line Between the Points
+            lineSlope = (yData[leftInd] - yData[rightInd])/(xData[leftInd] - xData[rightInd])
+            slopeIntercept = yData[leftInd] - lineSlope*xData[leftInd]
+            linearFit = lineSlope*xDataCut + slopeIntercept
+
+            # Find the Number of Points Above the Tangent Line
+            numWrongSideOfTangent = len(linearFit[linearFit - yDataCut > 0])
+
+            # Define a threshold for distinguishing good/bad lines
+            maxBadPoints = int(len(linearFit)/15)
+            if numWrongSideOfTangent < maxBadPoints and rightInd - leftInd > minPeakDuration:
+                goodTangentInd[numWrongSideOfTangent].append((leftInd, rightInd))
+
+    # If Nothing Found, Try and Return a Semi-Optimal Tangent Position
+    for goodInd in range(maxBadPointsTotal):
+        if len(goodTangentInd[goodInd]) != 0:
+            return max(goodTangentInd[goodInd], key=lambda tangentPair: tangentPair[1]-tangentPair[0])
+    return None, None
+
+def usesTangentChord(xData, yData, peakInd):
+    """ Whether findLinearBaseline Takes its Baseline from the Tangent Chords (Not by Counting) """
+    return chemicalProtocol.findTangentBaseline(xData, yData, chemicalProtocol.minLeftBoundaryInd + 1, peakInd - 2, peakInd + 2) is not None
+
+# -------------------------------------------------------------------------- #
+# --------------------------------- Checks --------------------------------- #
+
+def test_tracesCoverBothSearches():
+    searchPaths = [usesTangentChord(xData, yData, peakInd) for _, xData, yData, peakInd in baselineTraces]
+    assert any(searchPaths), "No Stored Trace Uses the Tangent Chords"
+    assert not all(searchPaths), "No Stored Trace Counts the Points Below the Chords"
+    # Long Traces and Tied Samples
+    assert max(len(xData) for _, xData, _, _ in baselineTraces) >= 2500
+    assert any(len(np.unique(yData)) < len(yData)//2 for _, _, yData, _ in baselineTraces)
+
+@pytest.mark.parametrize("traceName, xData, yData, peakInd", baselineTraces, ids = [baselineTrace[0] for baselineTrace in baselineTraces])
+def test_findLinearBaselineMatchesBruteForce(traceName, xData, yData, peakInd):
+    linearBaseline = chemicalProtocol.findLinearBaseline(xData, yData, peakInd)
+    bruteForceBaseline = findLinearBaseline_BruteForce(xData, yData, peakInd, chemicalProtocol.minLeftBoundaryInd, chemicalProtocol.minPeakDuration)
+    assert tuple(linearBaseline) == tuple(bruteForceBaseline)
+
+if __name__ == "__main__":
+    test_tracesCoverBothSearches()
+    for traceName, xData, yData, peakInd in baselineTraces:
+        test_findLinearBaselineMatchesBruteForce(traceName, xData, yData, peakInd)
+        print("\t" + traceName + ": Same Baseline (" + ("Tangent Chord" if usesTangentChord(xData, yData, peakInd) else "Counted Chords") + ")")
@@ -0,0 +1,122 @@
+"""
+Checks the Bounded Collection of the Best Feature Combinations (_combinationSearch.topCombinations)
+and Resuming an Interrupted analyzeFeatureCombinations From its Checkpoint: The Resumed Search
+Must Rank the Same Combinations as One Uninterrupted Search, and Remove the Checkpoint File.
+
+Run with pytest, or Directly: python tests/test_combinationSearch.py
+"""
+
+# Basic Modules
+import os
+import sys
+import numpy as np
+import pytest
+from itertools import combinations
+
+# Import Machine Learning Files (And Their Locations)
+repositoryFolder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(repositoryFolder + '/Helper Files/Machine Learning/')                              # Folder with the Feature Combination Search
+sys.path.append(repositoryFolder + '/Helper Files/Machine Learning/Classification Methods/')       # Folder with Machine Learning Files
+sys.path.append(repositoryFolder + '/Helper Files/Data Aquisition and Analysis/_Plotting/')        # Folder with the Plotting Files
+sys.path.append(repositoryFolder + '/Helper Files/Data Aquisition and Analysis/')                  # Folder with All the Helper Files
+import _combinationSearch as combinationSearch
+import machineLearningMain
+
+# -------------------------------------------------------------------------- #
+# ------------------------------ Search Data ------------------------------- #
+
+numFeatures = 14; numFeaturesCombine = 3
+featureNames = ["feature" + str(featureInd) for featureInd in range(numFeatures)]
+numCombinations = combinationSearch.countCombinations(numFeatures, numFeaturesCombine)
+
+def getSearchData(randomSeed = 0):
+    """ 40 Subjects: The Labels Depend on Three of the Features """
+    randomGenerator = np.random.default_rng(randomSeed)
+    signalData = randomGenerator.standard_normal((40, numFeatures))
+    signalLabels = 2*signalData[:, 0] + signalData[:, 3] - signalData[:, 5] + 0.5*randomGenerator.standard_normal(40)
+    return signalData, signalLabels
+
+def createPredictionHead():
+    return machineLearningMain.predictionModelHead("RG", "", numFeatures, ["cpt", "exercise", "vr"], "", supportVectorKernel = "linear")
+
+class searchInterrupted(Exception):
+    pass
+
+def interruptAfterChunks(predictionHead, numChunks):
+    """ Score numChunks Chunks of Combinations, Then Stop the Search (Like a Crash); Returns the Scored Combinations """
+    scoredCombinations = []
+    scoreFeatureSubsets = predictionHead.scoreFeatureSubsets
+    def scoreUntilInterrupted(*scoreArgs):
+        if len(scoredCombinations) == numChunks:
+            raise searchInterrupted()
+        scoredCombinations.append(len(scoreArgs[2]))
+        return scoreFeatureSubsets(*scoreArgs)
+    predictionHead.scoreFeatureSubsets = scoreUntilInterrupted
+    return scoredCombinations
+
+# -------------------------------------------------------------------------- #
+# --------------------------------- Checks --------------------------------- #
+
+@pytest.mark.parametrize("maxKept", [1, 25, 1000])
+def test_topCombinationsMatchesSortingAll(maxKept):
+    """ Scores With Many Ties, Added in Uneven Chunks, Rank as Sorting Every Combination Would """
+    randomGenerator = np.random.default_rng(maxKept)
+    allScores = np.round(randomGenerator.uniform(0, 1, numCombinations), 1)
+    allSTDs = np.round(randomGenerator.uniform(0, 1, numCombinations), 1)
+    bestCombinations = combinationSearch.topCombinations(maxKept)
+    chunkStarts = [0, 1, 7, 60, 61, 200, numCombinations]
+    for startInd, stopInd in zip(chunkStarts[:-1], chunkStarts[1:]):
+        bestCombinations.addChunk(numFeatures, numFeaturesCombine, startInd, allScores[startInd:stopInd], allSTDs[startInd:stopInd])
+
+    # Sort Everything: Kept by (Score, STD, Earlier First), Then Listed Best to Worst by Name
+    allCombinations = list(combinations(range(numFeatures), numFeaturesCombine))
+    keptInds = sorted(range(numCombinations), key = lambda combinationInd: (allScores[combinationInd], allSTDs[combinationInd], -combinationInd), reverse = True)[0:maxKept]
+    namedCombinations = sorted(((allScores[combinationInd], allSTDs[combinationInd], ' '.join(np.array(featureNames)[list(allCombinations[combinationInd])])) for combinationInd in keptInds), reverse = True)
+    assert len(bestCombinations) == min(maxKept, numCombinations)
+    assert bestCombinations.getSortedCombinations(featureNames) == tuple(list(namedColumn) for namedColumn in zip(*namedCombinations))
+
+@pytest.mark.parametrize("numResumeWorkers", [1, 2])
+@pytest.mark.parametrize("maxKept", [50, numCombinations])
+def test_resumeInterruptedSearch(tmp_path, numResumeWorkers, maxKept):
+    signalData, signalLabels = getSearchData()
+    searchSettings = {"saveData": False, "printUpdateAfterTrial": 100, "randomSeed": 7, "maxCombinationsKept": maxKept}
+    fullSearch = createPredictionHead().analyzeFeatureCombinations(signalData, signalLabels, featureNames, numFeaturesCombine, checkpointFile = str(tmp_path) + "/Full Search.pkl", **searchSettings)
+    assert not os.path.exists(str(tmp_path) + "/Full Search.pkl")
+
+    # Stop the Search After a Few Chunks (Saving a Checkpoint After Every Chunk)
+    checkpointFile = str(tmp_path) + "/Checkpoint/Combination Search.pkl"
+    interruptedHead = createPredictionHead()
+    scoredCombinations = interruptAfterChunks(interruptedHead, 5)
+    with pytest.raises(searchInterrupted):
+        interruptedHead.analyzeFeatureCombinations(signalData, signalLabels, featureNames, numFeaturesCombine, checkpointFile = checkpointFile, checkpointMinutes = 0, **searchSettings)
+    assert os.path.exists(checkpointFile) and 0 < sum(scoredCombinations) < numCombinations
+
+    # Resume: Only the Combinations Left are Scored
+    resumedHead = createPredictionHead()
+    rescoredCombinations = interruptAfterChunks(resumedHead, numCombinations) if numResumeWorkers == 1 else None
+    resumedSearch = resumedHead.analyzeFeatureCombinations(signalData, signalLabels, featureNames, numFeaturesCombine, checkpointFile = checkpointFile, numWorkers = numResumeWorkers, **searchSettings)
+    if rescoredCombinations is not None:
+        assert sum(rescoredCombinations) == numCombinations - sum(scoredCombinations)
+    for resumedColumn, fullColumn in zip(resumedSearch, fullSearch):
+        assert np.array_equal(resumedColumn, fullColumn)
+    assert not os.path.exists(checkpointFile)
+
+def test_checkpointFromAnotherSearch(tmp_path):
+    """ A Checkpoint of Different Data is Ignored (The Search Starts Over) """
+    checkpointFile = str(tmp_path) + "/Combination Search.pkl"
+    signalData, signalLabels = getSearchData()
+    searchSettings = {"saveData": False, "printUpdateAfterTrial": 100, "maxCombinationsKept": 50}
+    interruptedHead = createPredictionHead()
+    interruptAfterChunks(interruptedHead, 3)
+    with pytest.raises(searchInterrupted):
+        interruptedHead.analyzeFeatureCombinations(signalData, signalLabels, featureNames, numFeaturesCombine, checkpointFile = checkpointFile, checkpointMinutes = 0, **searchSettings)
+
+    otherData, otherLabels = getSearchData(randomSeed = 1)
+    otherSearch = createPredictionHead().analyzeFeatureCombinations(otherData, otherLabels, featureNames, numFeaturesCombine, checkpointFile = checkpointFile, **searchSettings)
+    fullSearch = createPredictionHead().analyzeFeatureCombinations(otherData, otherLabels, featureNames, numFeaturesCombine, **searchSettings)
+    for otherColumn, fullColumn in zip(otherSearch, fullSearch):
+        assert np.array_equal(otherColumn, fullColumn)
+    assert not os.path.exists(checkpointFile)
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,145 @@
+"""
+Checks pulseAnalysis.signalProcessing.seperatePulses (Vectorized) Against the Original Point
+by Point Search: Both Must Give the Same Systolic Peaks, and Leave the Same peakStandard and
+peakStandardInd in the Session (The Next File of the Recording Starts From Them).
+
+The First Derivatives are Made as in analyzePulse (savgol_filter of the Signal) From Simulated
+Pulse Recordings (250 Hz, 45-170 BPM, Baseline Drift, Noise, and Motion Artifacts). They Cover:
+    The First File of a Recording (timeOffset = 0: No Peaks in the First 1.5 Seconds)
+    A Later File (timeOffset != 0, Starting From the Last File's peakStandard)
+    A peakStandard Too High for Any Peak (analyzePulse Halves it Until Peaks are Found)
+
+Run with pytest, or Directly: python tests/test_seperatePulses.py
+"""
+
+# Basic Modules
+import os
+import sys
+import math
+import numpy as np
+import pytest
+from scipy.signal import savgol_filter
+
+# Import Analysis Files (And Their Locations)
+repositoryFolder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(repositoryFolder + '/Helper Files/Data Aquisition and Analysis/_Analysis Protocols')  # Folder with the Analysis Protocols
+sys.path.append(repositoryFolder + '/Helper Files/Data Aquisition and Analysis/')                     # Folder with All the Helper Files
+import pulseAnalysis
+
+pulseProtocol = pulseAnalysis.signalProcessing()
+
+# -------------------------------------------------------------------------- #
+# -------------------------- Simulated Recordings -------------------------- #
+
+def simulatePulseDerivative(randomSeed, numSeconds = 30, samplingFreq = 250, heartRate = 75, noiseLevel = 0.01, numArtifacts = 0):
+    """ The Time and First Derivative (as in analyzePulse) of a Simulated Pulse Recording """
+    randomGenerator = np.random.default_rng(randomSeed)
+    time = np.arange(0, numSeconds, 1/samplingFreq)
+    signalData = 0.05*np.sin(2*np.pi*time/numSeconds) + noiseLevel*randomGenerator.standard_normal(len(time))
+    # Each Pulse: The Systolic, Tidal, and Dicrotic Waves (Beat to Beat Variability)
+    pulseStart = randomGenerator.uniform(0, 1)
+    while pulseStart < numSeconds:
+        pulseLength = 60/heartRate*(1 + 0.05*randomGenerator.standard_normal())
+        for waveCenter, waveAmp, waveWidth in [(0.15, 1, 0.05), (0.3, 0.55, 0.06), (0.5, 0.35, 0.08)]:
+            signalData += waveAmp*(1 + 0.05*randomGenerator.standard_normal())*np.exp(-(time - pulseStart - waveCenter*pulseLength)**2/(2*(waveWidth*pulseLength)**2))
+        pulseStart += pulseLength
+    # Motion Artifacts: Sudden Steps in the Signal (After the First 1.5 Seconds: One Before Sets a
+    #   peakStandard That analyzePulse's Halving Cannot Lower, in Both Searches)
+    for artifactTime in randomGenerator.uniform(2, numSeconds, numArtifacts):
+        signalData += randomGenerator.uniform(1, 4)*(time > artifactTime)
+    return time, savgol_filter(signalData, 9, 2, mode='nearest', delta=1/samplingFreq, deriv=1)
+
+def getMinPointsPerPulse(time, maxBPM = 180):
+    """ As in analyzePulse """
+    return math.floor(len(time)/(time[-1] - time[0])*60/maxBPM)
+
+# -------------------------------------------------------------------------- #
+# ------------------------ Point by Point Reference ------------------------ #
+
+def seperatePulses_Loop(time, firstDer, analysisSession):
+    """ The Original Point by Point Search: The Reference for seperatePulses """
+    analysisSession.peakStandardInd = 0
+    # Take First Derivative of Smoothened Data
+    systolicPeaks = []
+    for pointInd in range(len(firstDer)):
+        # Calcuate the Derivative at pointInd
+        firstDerVal = firstDer[pointInd]
+
+        # If the Derivative Stands Out, Its the Systolic Peak
+        if firstDerVal > analysisSession.peakStandard*0.5:
+
+            # Use the First Few Peaks as a Standard
+            if (analysisSession.timeOffset != 0 or 1.5 < time[pointInd]) and analysisSession.minPointsPerPulse < pointInd:
+                # If the Point is Sufficiently Far Away, its a New R-Peak
+                if analysisSession.peakStandardInd + analysisSession.minPointsPerPulse < pointInd:
+                    systolicPeaks.append(pointInd)
+                # Else, Find the Max of the Peak
+                elif firstDer[systolicPeaks[-1]] < firstDer[pointInd]:
+                    systolicPeaks[-1] = pointInd
+                # Else, Dont Update Pointer
+                else:
+                    continue
+                analysisSession.peakStandardInd = pointInd
+                analysisSession.peakStandard = firstDerVal
+            else:
+                analysisSession.peakStandard = max(analysisSession.peakStandard, firstDerVal)
+
+    return systolicPeaks
+
+def compareSeperatePulses(time, firstDer, minPointsPerPulse, timeOffset = 0, peakStandard = 0):
+    """ Both Searches, From the Same Session State, Until Peaks are Found (Halving peakStandard as analyzePulse Does) """
+    analysisSessions = [pulseProtocol.createSession(), pulseProtocol.createSession()]
+    for analysisSession in analysisSessions:
+        analysisSession.minPointsPerPulse = minPointsPerPulse
+        analysisSession.timeOffset = timeOffset
+        analysisSession.peakStandard = peakStandard
+
+    allSystolicPeaks = []
+    for separationMethod, analysisSession in zip([pulseProtocol.seperatePulses, seperatePulses_Loop], analysisSessions):
+        systolicPeaks = separationMethod(time, firstDer, analysisSession)
+        while len(systolicPeaks) == 0:
+            analysisSession.peakStandard = analysisSession.peakStandard/2
+            systolicPeaks = separationMethod(time, firstDer, analysisSession)
+        allSystolicPeaks.append(systolicPeaks)
+    assert allSystolicPeaks[0] == allSystolicPeaks[1]
+    assert analysisSessions[0].peakStandard == analysisSessions[1].peakStandard
+    assert analysisSessions[0].peakStandardInd == analysisSessions[1].peakStandardInd
+    return allSystolicPeaks[0], analysisSessions[0]
+
+# -------------------------------------------------------------------------- #
+# --------------------------------- Checks --------------------------------- #
+
+@pytest.mark.parametrize("heartRate, noiseLevel, numArtifacts", [(45, 0.005, 0), (75, 0.01, 0), (120, 0.02, 1), (170, 0.01, 0), (75, 0.05, 3)])
+def test_firstFile(heartRate, noiseLevel, numArtifacts):
+    time, firstDer = simulatePulseDerivative(heartRate, heartRate = heartRate, noiseLevel = noiseLevel, numArtifacts = numArtifacts)
+    systolicPeaks, _ = compareSeperatePulses(time, firstDer, getMinPointsPerPulse(time))
+    # No Peaks Before 1.5 Seconds; Without Artifacts, About One Peak per Pulse
+    assert time[systolicPeaks[0]] > 1.5
+    if numArtifacts == 0:
+        assert 0.8*heartRate*time[-1]/60 < len(systolicPeaks) < 1.2*heartRate*time[-1]/60
+
+def test_laterFiles():
+    """ Each File Continues From the Last File's Session State (timeOffset != 0) """
+    peakStandard = 0; timeOffset = 0
+    for fileInd, heartRate in enumerate([70, 95, 140, 80]):
+        time, firstDer = simulatePulseDerivative(100 + fileInd, numSeconds = 20, heartRate = heartRate, numArtifacts = fileInd % 2)
+        _, analysisSession = compareSeperatePulses(time, firstDer, getMinPointsPerPulse(time), timeOffset, peakStandard)
+        peakStandard = analysisSession.peakStandard; timeOffset += time[-1]
+        assert peakStandard > 0
+
+@pytest.mark.parametrize("timeOffset", [0, 60.5])
+def test_peakStandardTooHigh(timeOffset):
+    time, firstDer = simulatePulseDerivative(7, heartRate = 90)
+    compareSeperatePulses(time, firstDer, getMinPointsPerPulse(time), timeOffset, peakStandard = 20*np.max(firstDer))
+
+@pytest.mark.parametrize("randomSeed", range(60))
+def test_randomRecordings(randomSeed):
+    randomGenerator = np.random.default_rng(1000 + randomSeed)
+    time, firstDer = simulatePulseDerivative(randomSeed, numSeconds = randomGenerator.uniform(4, 40), heartRate = randomGenerator.uniform(40, 180),
+                                             noiseLevel = randomGenerator.uniform(0, 0.1), numArtifacts = randomGenerator.integers(0, 4))
+    timeOffset = [0, randomGenerator.uniform(1, 600)][randomSeed % 2]
+    peakStandard = [0, randomGenerator.uniform(0, 3)*np.max(firstDer)][(randomSeed // 2) % 2]
+    compareSeperatePulses(time, firstDer, getMinPointsPerPulse(time, maxBPM = randomGenerator.choice([180, 220, 480])), timeOffset, peakStandard)
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))